@@ -0,0 +1 @@
+"""Benchmarks for the midi converters (not part of the distributed package)."""
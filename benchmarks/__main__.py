@@ -0,0 +1,319 @@
+"""Measure time and peak memory of the midi converters.
+
+Run all scenarios and print the results::
+
+    python -m benchmarks
+
+Store the results as a baseline and later compare against it::
+
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --baseline baseline.json --threshold 0.25
+
+The comparison exits with a non-zero status if any case became slower
+(or allocates more memory) than allowed by the threshold.
+"""
+
+import argparse
+import functools
+import importlib.util
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import typing
+
+import mido
+
+from mutwo import midi_converters
+
+from . import workloads
+
+Case: typing.TypeAlias = typing.Callable[[], typing.Any]
+
+
+def _get_case_factory_tuple(
+    workload: workloads.Workload, seed: int
+) -> tuple[tuple[str, typing.Callable[[], Case]], ...]:
+    """Return the name and the factory of each case of a workload.
+
+    The data which is shared by several cases (the event, the midi file,
+    ...) is only prepared when the first case which needs it is created.
+    """
+
+    @functools.cache
+    def get_event():
+        return workload.to_event(seed)
+
+    @functools.cache
+    def get_midi_file():
+        return workload.to_event_to_midi_file(seed).convert(get_event())
+
+    @functools.cache
+    def get_midi_file_bytes():
+        return midi_converters.MidiFileToBytes().convert(get_midi_file())
+
+    # Each run uses a new converter, so that no cache is shared
+    # between runs.
+    def render():
+        return lambda e=get_event(): workload.to_event_to_midi_file(seed).convert(e)
+
+    def render_window():
+        # Render a tenth of the event (the index is prepared once)
+        event = get_event()
+        event_interval_index = midi_converters.EventIntervalIndex(event)
+        duration = event.duration.beat_count
+        render_range = (duration * 0.45, duration * 0.55)
+        return lambda: workload.to_event_to_midi_file(seed).convert(
+            event, render_range=render_range, event_interval_index=event_interval_index
+        )
+
+    def render_with_track_cache():
+        # Render an unchanged event again with a warm track cache
+        event = get_event()
+        event_to_midi_file = workload.to_event_to_midi_file(
+            seed, track_cache_size=2**24
+        )
+        event_to_midi_file.convert(event)
+        return lambda: event_to_midi_file.convert(event)
+
+    def render_mpe():
+        # Render all voices to one MPE zone
+        return lambda e=get_event(): workload.to_event_to_midi_file(
+            seed, mpe_member_channel_count=15
+        ).convert(e)
+
+    def encode():
+        return lambda c=midi_converters.MidiFileToBytes(), m=get_midi_file(): c.convert(
+            m
+        )
+
+    def parse(tick_range=None, seek_index=None):
+        return lambda c=midi_converters.MidiFileParser(
+            tick_range=tick_range, seek_index=seek_index
+        ), b=get_midi_file_bytes(): c.convert(b)
+
+    def parse_window(is_seek_index_used: bool):
+        # Parse a window in the middle of the file with and without seek index
+        seek_index = midi_converters.MidiFileIndexer(1).convert(get_midi_file_bytes())
+        last_tick = max(
+            (
+                track_seek_index.checkpoint_tuple[-1].tick
+                for track_seek_index in seek_index.track_seek_index_tuple
+                if track_seek_index.checkpoint_tuple
+            ),
+            default=0,
+        )
+        tick_range = (last_tick // 2, last_tick // 2 + seek_index.ticks_per_beat)
+        return parse(tick_range, seek_index if is_seek_index_used else None)
+
+    def parse_with_mido():
+        # Compare the native midi file parser with mido
+        return lambda b=get_midi_file_bytes(): mido.MidiFile(file=io.BytesIO(b))
+
+    def import_event():
+        return lambda c=midi_converters.MidiFileToEvent(), m=get_midi_file(): c.convert(
+            m
+        )
+
+    def import_lazy_event():
+        return lambda c=midi_converters.MidiFileToEvent(
+            is_lazy=True
+        ), b=get_midi_file_bytes(): c.convert(b)[:1]
+
+    def make_converter_case(converter_class):
+        return lambda c=converter_class(), b=get_midi_file_bytes(): c.convert(b)
+
+    def import_event_from_note_store():
+        note_store = midi_converters.MidiFileToNoteStore().convert(
+            get_midi_file_bytes()
+        )
+        return lambda c=midi_converters.NoteStoreToEvent(): c.convert(note_store)
+
+    def export_piano_roll():
+        piano_roll = midi_converters.MidiFileToPianoRoll().convert(
+            get_midi_file_bytes()
+        )
+        return lambda c=midi_converters.PianoRollToMidiFile(): c.convert(
+            piano_roll, io.BytesIO()
+        )
+
+    case_factory_list = [
+        ("EventToMidiFile", render),
+        ("EventToMidiFile[window]", render_window),
+        ("EventToMidiFile[track-cache]", render_with_track_cache),
+        ("EventToMidiFile[mpe]", render_mpe),
+        ("MidiFileToBytes", encode),
+        ("MidiFileParser", parse),
+        ("MidiFileParser[window]", lambda: parse_window(False)),
+        ("MidiFileParser[window+seek-index]", lambda: parse_window(True)),
+        ("mido.MidiFile", parse_with_mido),
+        ("MidiFileToEvent", import_event),
+        ("MidiFileToEvent[lazy]", import_lazy_event),
+        (
+            "MidiFileToStatistics",
+            lambda: make_converter_case(midi_converters.MidiFileToStatistics),
+        ),
+        (
+            "MidiFileToNoteStore",
+            lambda: make_converter_case(midi_converters.MidiFileToNoteStore),
+        ),
+        ("NoteStoreToEvent", import_event_from_note_store),
+    ]
+    # Piano rolls are only available if numpy is installed
+    if importlib.util.find_spec("numpy") is not None:
+        case_factory_list.extend(
+            (
+                (
+                    "MidiFileToPianoRoll",
+                    lambda: make_converter_case(midi_converters.MidiFileToPianoRoll),
+                ),
+                ("PianoRollToMidiFile", export_piano_roll),
+            )
+        )
+    return tuple(case_factory_list)
+
+
+def make_case_dict(
+    scenario_name_tuple: tuple[str, ...], seed: int, case_filter: str = ""
+) -> dict[str, Case]:
+    """Prepare all benchmark cases which contain ``case_filter``.
+
+    The preparation itself isn't measured. Workloads and cases which
+    aren't selected by ``case_filter`` aren't prepared.
+    """
+    case_dict = {}
+    for name in scenario_name_tuple:
+        workload = workloads.get_scenario(name)
+        for case_kind, make_case in _get_case_factory_tuple(workload, seed):
+            if case_filter in (case_name := f"{case_kind}/{name}"):
+                case_dict[case_name] = make_case()
+    return case_dict
+
+
+def measure(case: Case, repeat: int) -> dict[str, float]:
+    """Measure the runtime (best and median of n runs) and the peak memory."""
+    duration_list = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case()
+        duration_list.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        case()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": min(duration_list),
+        "median_seconds": statistics.median(duration_list),
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def compare(
+    result_dict: dict[str, dict[str, float]],
+    baseline_result_dict: dict[str, dict[str, float]],
+    threshold: float,
+    memory_threshold: float,
+) -> list[str]:
+    """Return a description of each case which regressed."""
+    regression_list = []
+    for case_name, result in result_dict.items():
+        try:
+            baseline_result = baseline_result_dict[case_name]
+        except KeyError:
+            continue
+        for key, allowed_ratio in (
+            ("seconds", 1 + threshold),
+            ("peak_memory_bytes", 1 + memory_threshold),
+        ):
+            if not baseline_result[key]:
+                continue
+            ratio = result[key] / baseline_result[key]
+            if ratio > allowed_ratio:
+                regression_list.append(
+                    f"{case_name}: '{key}' regressed by factor {ratio:.2f} "
+                    f"({baseline_result[key]:.6g} -> {result[key]:.6g})"
+                )
+    return regression_list
+
+
+def main(argument_list: typing.Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "-s",
+        "--scenario",
+        action="append",
+        choices=tuple(workloads.SCENARIO_DICT),
+        help="Only run the given scenario (can be passed multiple times).",
+    )
+    parser.add_argument(
+        "-k", "--filter", default="", help="Only run cases containing this string."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", help="Write the results to this json file.")
+    parser.add_argument("-b", "--baseline", help="Compare with this json file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown compared to the baseline.",
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=0.2,
+        help="Allowed relative increase of the peak memory.",
+    )
+    argument = parser.parse_args(argument_list)
+
+    scenario_name_tuple = tuple(argument.scenario or workloads.SCENARIO_DICT)
+    case_dict = make_case_dict(scenario_name_tuple, argument.seed, argument.filter)
+
+    result_dict = {}
+    for case_name, case in case_dict.items():
+        result = result_dict[case_name] = measure(case, argument.repeat)
+        print(
+            f"{case_name:<40} {result['seconds'] * 1000:>10.2f} ms"
+            f" {result['peak_memory_bytes'] / 2**20:>10.2f} MiB"
+        )
+
+    if argument.output:
+        with open(argument.output, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "seed": argument.seed,
+                    "result_dict": result_dict,
+                },
+                f,
+                indent=2,
+            )
+
+    if argument.baseline:
+        with open(argument.baseline) as f:
+            baseline_result_dict = json.load(f)["result_dict"]
+        regression_list = compare(
+            result_dict,
+            baseline_result_dict,
+            argument.threshold,
+            argument.memory_threshold,
+        )
+        if regression_list:
+            print("\nRegressions:\n\t" + "\n\t".join(regression_list))
+            return 1
+        print("\nNo regressions found.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
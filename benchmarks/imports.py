@@ -0,0 +1,62 @@
+"""Measure how long importing the midi converters takes.
+
+Each statement runs in a fresh interpreter, so that no module is cached::
+
+    python -m benchmarks.imports
+
+The first statement only imports the package (which loads the converter
+modules lazily), the second one also accesses a converter and therefore
+pays the full price of importing mido and the mutwo music stack.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import typing
+
+STATEMENT_TUPLE = (
+    "from mutwo import midi_converters",
+    "from mutwo import midi_converters; midi_converters.EventToMidiFile",
+    "from mutwo import midi_converters; midi_converters.MidiFileToEvent()",
+)
+
+_TIMER = """
+import time
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(statement: str, repeat: int) -> list[float]:
+    return [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", _TIMER.format(statement)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+
+
+def main(argument_list: typing.Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.imports", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    argument = parser.parse_args(argument_list)
+    for statement in STATEMENT_TUPLE:
+        duration_list = measure(statement, argument.repeat)
+        print(
+            f"{statement:<70} {min(duration_list) * 1000:>8.2f} ms (best)"
+            f" {statistics.median(duration_list) * 1000:>8.2f} ms (median)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
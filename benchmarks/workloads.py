@@ -0,0 +1,148 @@
+"""Seeded synthetic workloads for the midi converter benchmarks."""
+
+import dataclasses
+import random
+
+import mido
+
+from mutwo import core_events
+from mutwo import core_parameters
+from mutwo import midi_converters
+from mutwo import music_events
+from mutwo import music_parameters
+
+
+@dataclasses.dataclass(frozen=True)
+class Workload(object):
+    """Describe the shape of a synthetic score.
+
+    :param note_count: How many chronons each voice contains.
+    :param polyphony: How many pitches each chronon contains.
+    :param nesting_depth: How deep the chronons of each voice are nested in
+        :class:`mutwo.core_events.Consecution` objects.
+    :param glissando_density: The probability (0 - 1) that a pitch is a
+        :class:`mutwo.music_parameters.FlexPitch`.
+    :param tempo_change_count: How many breakpoints the tempo envelope has.
+    :param channel_count: How many voices (and therefore midi channels /
+        midi tracks) the score has.
+    :param rest_density: The probability (0 - 1) that a chronon is a rest.
+    :param distinct_note_count: If bigger than 0 each voice only repeats
+        this many different notes (pitch, duration and volume).
+    """
+
+    note_count: int = 500
+    polyphony: int = 1
+    nesting_depth: int = 0
+    glissando_density: float = 0
+    tempo_change_count: int = 0
+    channel_count: int = 1
+    rest_density: float = 0.1
+    distinct_note_count: int = 0
+
+    def to_tempo(self, seed: int = 0) -> core_parameters.abc.Tempo:
+        if not self.tempo_change_count:
+            return core_parameters.DirectTempo(120)
+        r = random.Random(seed)
+        duration = self.note_count * 0.5
+        step = duration / self.tempo_change_count
+        return core_parameters.FlexTempo(
+            [[i * step, r.uniform(40, 200)] for i in range(self.tempo_change_count + 1)]
+        )
+
+    def to_event(
+        self, seed: int = 0
+    ) -> core_events.Concurrence[core_events.Consecution]:
+        """Generate a deterministic score for the given seed."""
+        r = random.Random(seed)
+        return core_events.Concurrence(
+            [self._make_voice(r) for _ in range(self.channel_count)]
+        )
+
+    def to_event_to_midi_file(
+        self, seed: int = 0, **kwargs
+    ) -> midi_converters.EventToMidiFile:
+        """Create the converter which is used to render this workload.
+
+        Additional keyword arguments are passed to the converter.
+        """
+        return midi_converters.EventToMidiFile(
+            tempo=self.to_tempo(seed),
+            distribute_midi_channels=self.channel_count > 1,
+            midi_channel_count_per_track=max(
+                1,
+                len(midi_converters.constants.ALLOWED_MIDI_CHANNEL_TUPLE)
+                // self.channel_count,
+            ),
+            **kwargs,
+        )
+
+    def to_midi_file(self, seed: int = 0) -> mido.MidiFile:
+        """Render the score of this workload to a midi file."""
+        return self.to_event_to_midi_file(seed).convert(self.to_event(seed))
+
+    def _make_pitch(self, r: random.Random) -> music_parameters.abc.Pitch:
+        hertz = 110 * 2 ** r.uniform(0, 4)
+        if r.random() < self.glissando_density:
+            return music_parameters.FlexPitch(
+                [
+                    [0, music_parameters.DirectPitch(hertz)],
+                    [1, music_parameters.DirectPitch(hertz * r.uniform(0.9, 1.1))],
+                ]
+            )
+        return music_parameters.DirectPitch(hertz)
+
+    def _make_chronon(self, r: random.Random) -> core_events.Chronon:
+        duration = r.choice((0.25, 0.5, 0.5, 1))
+        if r.random() < self.rest_density:
+            return core_events.Chronon(duration)
+        return music_events.NoteLike(
+            [self._make_pitch(r) for _ in range(self.polyphony)],
+            duration,
+            music_parameters.DirectVolume(r.uniform(0.1, 1)),
+        )
+
+    def _nest(
+        self, chronon_list: list[core_events.Chronon], depth: int
+    ) -> list[core_events.Chronon | core_events.Consecution]:
+        if depth <= 0 or len(chronon_list) < 2:
+            return chronon_list
+        half = len(chronon_list) // 2
+        return [
+            core_events.Consecution(self._nest(chronon_list[:half], depth - 1)),
+            core_events.Consecution(self._nest(chronon_list[half:], depth - 1)),
+        ]
+
+    def _make_voice(self, r: random.Random) -> core_events.Consecution:
+        if self.distinct_note_count:
+            chronon_tuple = tuple(
+                self._make_chronon(r) for _ in range(self.distinct_note_count)
+            )
+            chronon_list = [
+                r.choice(chronon_tuple).copy() for _ in range(self.note_count)
+            ]
+        else:
+            chronon_list = [self._make_chronon(r) for _ in range(self.note_count)]
+        return core_events.Consecution(self._nest(chronon_list, self.nesting_depth))
+
+
+SCENARIO_DICT: dict[str, Workload] = {
+    "baseline": Workload(),
+    "many-notes": Workload(note_count=2000),
+    "repeated-notes": Workload(note_count=2000, distinct_note_count=8),
+    "chords": Workload(polyphony=4),
+    "nested": Workload(nesting_depth=6),
+    "glissandi": Workload(note_count=200, glissando_density=0.5),
+    "tempo-changes": Workload(tempo_change_count=200),
+    "many-channels": Workload(note_count=250, channel_count=16),
+}
+"""Named workloads which are measured by default."""
+
+
+def get_scenario(name: str) -> Workload:
+    try:
+        return SCENARIO_DICT[name]
+    except KeyError:
+        raise KeyError(
+            f"Unknown scenario '{name}'. Known scenarios are: "
+            f"{', '.join(SCENARIO_DICT)}."
+        )
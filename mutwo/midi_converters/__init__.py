@@ -1,10 +1,117 @@
+"""Convert mutwo events to midi files and midi files to mutwo events.
+
+The converter modules depend on :mod:`mido` and on the complete music
+parameter stack of mutwo. Because importing them is slow, they are only
+loaded when one of their objects is accessed for the first time.
+"""
+
+import importlib
+
 from . import configurations
 from . import constants
 
-from .backends import *
-from .frontends import *
+from .caches import *
+from .diagnostics import *
+
+from . import caches, diagnostics
+
+_MODULE_NAME_TO_ATTRIBUTE_NAME_TUPLE = {
+    "backends": (
+        "PitchBendingNumberToPitchInterval",
+        "PitchBendingNumberToDirectPitchInterval",
+        "MidiPitchToMutwoPitch",
+        "MidiPitchToDirectPitch",
+        "MidiPitchToMutwoMidiPitch",
+        "MidiVelocityToMutwoVolume",
+        "MidiVelocityToWesternVolume",
+        "LazyConcurrence",
+        "MidiFileToEvent",
+        "MidiFileToFingerprint",
+    ),
+    "parsers": (
+        "NoteMessage",
+        "PitchwheelMessage",
+        "ControlChangeMessage",
+        "SetTempoMessage",
+        "ParsedMidiMessage",
+        "ParsedMidiFile",
+        "MidiFileParser",
+    ),
+    "indexes": (
+        "SeekCheckpoint",
+        "TrackSeekIndex",
+        "MidiFileSeekIndex",
+        "MidiFileIndexer",
+    ),
+    "frontends": (
+        "ChrononToControlMessageTuple",
+        "ControlEnvelope",
+        "ChrononToControlEnvelopeTuple",
+        "CentDeviationToPitchBendingNumber",
+        "MutwoPitchToMidiPitch",
+        "MutwoPitchToMidiTuning",
+        "MidiFileToBytes",
+        "EventIntervalIndex",
+        "EventToMidiFile",
+    ),
+    "ports": (
+        "PlaybackMetrics",
+        "EventToMidiOutput",
+        "MidiInputToEvent",
+    ),
+    "corpora": (
+        "NoteStatistic",
+        "PitchClassHistogram",
+        "VelocityHistogram",
+        "NoteDensityCurve",
+        "PolyphonyProfile",
+        "MidiStatistics",
+        "MidiFileToStatistics",
+        "MidiCorpusConverter",
+        "MidiCorpusToStatistics",
+        "MidiCorpusToDuplicateTuple",
+    ),
+    "pianorolls": (
+        "PianoRoll",
+        "MidiFileToPianoRoll",
+        "PianoRollToMidiFile",
+    ),
+    "stores": (
+        "NoteStore",
+        "MidiFileToNoteStore",
+        "NoteStoreToEvent",
+    ),
+}
+"""Lazily loaded modules and the names which they export."""
+
+_ATTRIBUTE_NAME_TO_MODULE_NAME = {
+    attribute_name: module_name
+    for module_name, attribute_name_tuple in _MODULE_NAME_TO_ATTRIBUTE_NAME_TUPLE.items()
+    for attribute_name in attribute_name_tuple
+}
+
+__all__ = (
+    caches.__all__ + diagnostics.__all__ + tuple(_ATTRIBUTE_NAME_TO_MODULE_NAME)
+)
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _ATTRIBUTE_NAME_TO_MODULE_NAME[name]
+    except KeyError:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    module = importlib.import_module(f".{module_name}", __name__)
+    module_globals = globals()
+    for attribute_name in _MODULE_NAME_TO_ATTRIBUTE_NAME_TUPLE[module_name]:
+        module_globals[attribute_name] = getattr(module, attribute_name)
+    # Force flat structure
+    module_globals.pop(module_name, None)
+    return module_globals[name]
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
 
-__all__ = backends.__all__ + frontends.__all__
 
 # Force flat structure
-del backends, frontends
+del caches, diagnostics
@@ -1,7 +1,19 @@
 """Load midi files to mutwo"""
 
 import abc
+import bisect
+import collections
+import collections.abc
+import contextlib
 import copy
+import hashlib
+import heapq
+import io
+import itertools
+import math
+import mmap
+import os
+import struct
 import typing
 
 import mido
@@ -27,9 +39,16 @@ __all__ = (
     "MidiPitchToMutwoMidiPitch",
     "MidiVelocityToMutwoVolume",
     "MidiVelocityToWesternVolume",
+    "LazyConcurrence",
     "MidiFileToEvent",
+    "MidiFileToFingerprint",
 )
 
+MidiFileData = (
+    str | os.PathLike | bytes | bytearray | memoryview | typing.BinaryIO | mido.MidiFile
+)
+"""Everything which can be read by :class:`MidiFileToEvent`."""
+
 
 class PitchBendingNumberToPitchInterval(core_converters.abc.Converter):
     """Convert midi pitch bend number to :class:`mutwo.music_parameters.abc.PitchInterval`.
@@ -95,12 +114,16 @@ class MidiPitchToMutwoPitch(core_converters.abc.Converter):
 
     def __init__(
         self,
-        pitch_bending_number_to_pitch_interval: typing.Callable[
-            [midi_converters.constants.PitchBend], music_parameters.abc.PitchInterval
-        ] = PitchBendingNumberToDirectPitchInterval(),
+        pitch_bending_number_to_pitch_interval: typing.Optional[
+            typing.Callable[
+                [midi_converters.constants.PitchBend],
+                music_parameters.abc.PitchInterval,
+            ]
+        ] = None,
     ):
         self._pitch_bending_number_to_pitch_interval = (
             pitch_bending_number_to_pitch_interval
+            or PitchBendingNumberToDirectPitchInterval()
         )
 
     @abc.abstractmethod
@@ -126,9 +149,10 @@ class MidiPitchToMutwoMidiPitch(MidiPitchToMutwoPitch):
         self, midi_pitch_to_convert: midi_converters.constants.MidiPitch
     ) -> music_parameters.MidiPitch:
         midi_note, pitch_bend = midi_pitch_to_convert
-        midi_pitch = music_parameters.MidiPitch(midi_note)
         pitch_interval = self._pitch_bending_number_to_pitch_interval(pitch_bend)
-        return midi_pitch.add(pitch_interval)
+        # We don't use 'MidiPitch.add', because it converts the midi pitch
+        # number to hertz and back, which isn't exact.
+        return music_parameters.MidiPitch(midi_note + pitch_interval.cents / 100)
 
 
 class MidiVelocityToMutwoVolume(core_converters.abc.Converter):
@@ -177,10 +201,219 @@ class MidiVelocityToWesternVolume(MidiVelocityToMutwoVolume):
         return music_parameters.WesternVolume(dynamic_indicator)
 
 
-MessageTypeToMidiMessageList = dict[str, list[mido.Message | mido.MetaMessage]]
-NotePair = tuple[mido.Message, mido.Message]
+MidiMessage = mido.Message | mido.MetaMessage | midi_converters.ParsedMidiMessage
+MessageTypeToMidiMessageList = dict[str, list[MidiMessage]]
+NotePair = tuple[MidiMessage, MidiMessage]
 NotePairTuple = tuple[NotePair, ...]
 StartAndStopTupleToNotePairList = dict[tuple[int, int], list[NotePair]]
+# The start tick, the stop tick and the notes of each chronon of a voice
+Voice = tuple[tuple[int, int, list[NotePair]], ...]
+
+
+class _MidiChannelTimeline(object):
+    """Pitch wheel and controller states of each midi channel over time.
+
+    The messages are sorted once by channel (and controller), so that
+    the state in effect at a tick is found by bisection instead of
+    searching all messages again for each note.
+    """
+
+    def __init__(self, message_type_to_midi_message_list: MessageTypeToMidiMessageList):
+        key_to_tick_and_value_list: dict[tuple, list[tuple[int, int]]] = {}
+        for message_type, get_key, get_value in (
+            (
+                "pitchwheel",
+                lambda midi_message: (midi_message.channel, None),
+                lambda midi_message: midi_message.pitch,
+            ),
+            (
+                "control_change",
+                lambda midi_message: (midi_message.channel, midi_message.control),
+                lambda midi_message: midi_message.value,
+            ),
+        ):
+            for midi_message in message_type_to_midi_message_list.get(message_type, []):
+                key_to_tick_and_value_list.setdefault(get_key(midi_message), []).append(
+                    (midi_message.time, get_value(midi_message))
+                )
+
+        self._key_to_tick_list_and_value_list: dict[
+            tuple, tuple[list[int], list[int]]
+        ] = {}
+        self._channel_to_control_tuple: dict[int, tuple[int, ...]] = {}
+        for key, tick_and_value_list in sorted(
+            key_to_tick_and_value_list.items(),
+            # 'None' (the pitch wheel) can't be compared with controllers
+            key=lambda key_and_list: (
+                key_and_list[0][0],
+                -1 if key_and_list[0][1] is None else key_and_list[0][1],
+            ),
+        ):
+            # Stable sort: the last message of a tick is in effect.
+            tick_and_value_list.sort(key=lambda tick_and_value: tick_and_value[0])
+            self._key_to_tick_list_and_value_list[key] = tuple(
+                list(item) for item in zip(*tick_and_value_list)
+            )
+            channel, control = key
+            if control is not None:
+                self._channel_to_control_tuple[channel] = (
+                    self._channel_to_control_tuple.get(channel, tuple([])) + (control,)
+                )
+
+        self._channel_and_note_on_tick_set = {
+            (midi_message.channel, midi_message.time)
+            for midi_message in message_type_to_midi_message_list.get("note_on", [])
+            if midi_message.velocity
+        }
+
+    def get_value(
+        self, channel: int, control: typing.Optional[int], tick: int
+    ) -> typing.Optional[int]:
+        """Value of pitch wheel (control is ``None``) or controller at tick"""
+        try:
+            tick_list, value_list = self._key_to_tick_list_and_value_list[
+                (channel, control)
+            ]
+        except KeyError:
+            return None
+        if (index := bisect.bisect_right(tick_list, tick) - 1) < 0:
+            return None
+        return value_list[index]
+
+    def get_change_list(
+        self,
+        channel: int,
+        control: typing.Optional[int],
+        start_tick: int,
+        end_tick: int,
+    ) -> list[tuple[int, int]]:
+        """All (tick, value) pairs with ``start_tick < tick < end_tick``"""
+        try:
+            tick_list, value_list = self._key_to_tick_list_and_value_list[
+                (channel, control)
+            ]
+        except KeyError:
+            return []
+        start_index = bisect.bisect_right(tick_list, start_tick)
+        end_index = bisect.bisect_left(tick_list, end_tick, lo=start_index)
+        return list(
+            zip(tick_list[start_index:end_index], value_list[start_index:end_index])
+        )
+
+    def get_control_tuple(self, channel: int) -> tuple[int, ...]:
+        return self._channel_to_control_tuple.get(channel, tuple([]))
+
+    def is_note_on(self, channel: int, tick: int) -> bool:
+        return (channel, tick) in self._channel_and_note_on_tick_set
+
+
+class LazyConcurrence(collections.abc.Sequence):
+    """Concurrence of a midi file which only creates its consecutions when they are accessed.
+
+    :class:`MidiFileToEvent` returns a lazy concurrence if ``is_lazy`` is
+    ``True``. It only stores the start, the stop and the note messages of
+    the chronons of each consecution. A
+    :class:`mutwo.core_events.Consecution` and all its chronons are
+    created when it's accessed for the first time (by index, slice or
+    iteration) and the same object is returned for each later access.
+
+    **Example:**
+
+    >>> import mido
+    >>> from mutwo import midi_converters
+    >>> midi_file = mido.MidiFile(
+    ...     tracks=[
+    ...         mido.MidiTrack(
+    ...             [
+    ...                 mido.Message('note_on', note=60, time=0),
+    ...                 mido.Message('note_on', note=64, time=240),
+    ...                 mido.Message('note_off', note=60, time=240),
+    ...                 mido.Message('note_off', note=64, time=480),
+    ...             ]
+    ...         )
+    ...     ],
+    ...     ticks_per_beat=480,
+    ... )
+    >>> lazy_concurrence = midi_converters.MidiFileToEvent(is_lazy=True).convert(
+    ...     midi_file
+    ... )
+    >>> len(lazy_concurrence), lazy_concurrence.is_materialized(1)
+    (2, False)
+    >>> lazy_concurrence[1].duration
+    DirectDuration(2.0)
+    >>> lazy_concurrence.materialize() == midi_converters.MidiFileToEvent().convert(
+    ...     midi_file
+    ... )
+    True
+    """
+
+    def __init__(
+        self,
+        voice_tuple: tuple[Voice, ...],
+        ticks_per_beat: int,
+        midi_file_to_event: "MidiFileToEvent",
+        midi_channel_timeline: typing.Optional[_MidiChannelTimeline] = None,
+    ):
+        self._voice_tuple = voice_tuple
+        self._ticks_per_beat = ticks_per_beat
+        self._midi_file_to_event = midi_file_to_event
+        self._midi_channel_timeline = midi_channel_timeline
+        self._consecution_list: list[
+            typing.Optional[core_events.Consecution[core_events.Chronon]]
+        ] = [None] * len(voice_tuple)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(consecution_count={len(self)}, "
+            f"materialized_count={len(self) - self._consecution_list.count(None)})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._voice_tuple)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> core_events.Consecution: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> core_events.Concurrence: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> core_events.Consecution | core_events.Concurrence:
+        if isinstance(index, slice):
+            return core_events.Concurrence([self[i] for i in range(len(self))[index]])
+        if (consecution := self._consecution_list[index]) is None:
+            midi_file_to_event = self._midi_file_to_event
+            with midi_converters.DiagnosticCollector(midi_file_to_event._logger):
+                consecution = midi_file_to_event._voice_to_consecution(
+                    self._voice_tuple[index],
+                    self._ticks_per_beat,
+                    self._midi_channel_timeline,
+                )
+            self._consecution_list[index] = consecution
+        return consecution
+
+    @property
+    def duration(self) -> core_parameters.DirectDuration:
+        """The duration of the concurrence (nothing is materialized)"""
+        return MidiFileToEvent._tick_to_duration(
+            max((voice[-1][1] for voice in self._voice_tuple), default=0),
+            self._ticks_per_beat,
+        )
+
+    def is_materialized(self, index: int) -> bool:
+        """Check if the consecution at ``index`` has already been created."""
+        return self._consecution_list[index] is not None
+
+    def materialize(
+        self,
+    ) -> core_events.Concurrence[core_events.Consecution[core_events.Chronon]]:
+        """Create all consecutions.
+
+        :return: A :class:`mutwo.core_events.Concurrence` which contains
+            the (cached) consecutions of the lazy concurrence.
+        """
+        return self[:]
 
 
 class MidiFileToEvent(core_converters.abc.Converter):
@@ -199,6 +432,41 @@ class MidiFileToEvent(core_converters.abc.Converter):
         midi velocity (integer) to a :class:`mutwo.music_parameters.abc.Voume`.
         Default to :class:`MidiPitchToWesternVolume`.
     :type midi_velocity_to_mutwo_volume: typing.Callable[[midi_converters.constants.MidiVelocity], music_parameters.abc.Volume]
+    :param use_mido_parser: By default midi files which aren't passed as
+        :class:`mido.MidiFile` are read by :class:`MidiFileParser`, which
+        only decodes the messages that are needed for the conversion. Set
+        to ``True`` to read them with :mod:`mido` instead. Default to ``False``.
+    :type use_mido_parser: bool
+    :param track_index_tuple: Only convert the tracks with these indices.
+        If ``None`` all tracks are converted. Default to ``None``.
+    :type track_index_tuple: typing.Optional[typing.Iterable[int]]
+    :param midi_channel_tuple: Only convert messages of these midi channels.
+        If ``None`` messages of all channels are converted. Default to ``None``.
+    :type midi_channel_tuple: typing.Optional[typing.Iterable[int]]
+    :param message_type_tuple: Only convert messages of these types (see
+        :class:`MidiFileParser`). Default to ``None``.
+    :type message_type_tuple: typing.Optional[typing.Iterable[str]]
+    :param tick_range: Only convert notes which start within
+        ``start <= tick < end``. Default to ``None``.
+    :type tick_range: typing.Optional[tuple[int, int]]
+    :param seconds_range: Only convert notes which start within
+        ``start <= seconds < end``. Default to ``None``.
+    :type seconds_range: typing.Optional[tuple[float, float]]
+    :param seek_index: The :class:`MidiFileSeekIndex` of the converted midi
+        file (see :class:`MidiFileIndexer`). It speeds up the conversion of
+        a tick range or a seconds range of long midi files. Default to
+        ``None``.
+    :type seek_index: typing.Optional[MidiFileSeekIndex]
+    :param is_lazy: If ``True`` the converter returns a
+        :class:`LazyConcurrence`, which only creates the consecutions that
+        are accessed. This is useful to inspect some voices of big midi
+        files. Default to ``False``.
+    :type is_lazy: bool
+
+    All filters are applied by :class:`MidiFileParser` while parsing the
+    midi file, so that filtered data is never decoded (a
+    :class:`mido.MidiFile` is encoded to bytes first in this case, and
+    ``use_mido_parser`` is ignored).
 
     **Warning:**
 
@@ -209,29 +477,74 @@ class MidiFileToEvent(core_converters.abc.Converter):
 
     This conversion is incomplete: Not all information from a
     midi file will be used. In its current state the converter
-    only takes into account midi notes (pitch, velocity and duration)
-    and ignores all other midi messages.
+    only takes into account midi notes (pitch, velocity and duration),
+    pitch bends and control changes and ignores all other midi messages.
+    The pitch bend in effect at the start of a note is added to its
+    pitch and pitch bends during the note become a
+    :class:`mutwo.music_parameters.FlexPitch` (glissando). Controllers of
+    the midi channel of a chronon are added to the chronon as
+    :class:`ControlEnvelope` (see
+    :const:`mutwo.midi_converters.configurations.DEFAULT_CONTROL_ENVELOPE_TUPLE_ATTRIBUTE_NAME`).
     """
 
     def __init__(
         self,
-        mutwo_parameter_dict_to_chronon: typing.Callable[
-            [core_converters.MutwoParameterDict],
-            core_events.Chronon,
-        ] = music_converters.MutwoParameterDictToNoteLike(),
-        midi_pitch_to_mutwo_pitch: typing.Callable[
-            [midi_converters.constants.MidiPitch], music_parameters.abc.Pitch
-        ] = MidiPitchToMutwoMidiPitch(),
-        midi_velocity_to_mutwo_volume: typing.Callable[
-            [midi_converters.constants.MidiVelocity], music_parameters.abc.Volume
-        ] = MidiVelocityToWesternVolume(),
+        mutwo_parameter_dict_to_chronon: typing.Optional[
+            typing.Callable[
+                [core_converters.MutwoParameterDict],
+                core_events.Chronon,
+            ]
+        ] = None,
+        midi_pitch_to_mutwo_pitch: typing.Optional[
+            typing.Callable[
+                [midi_converters.constants.MidiPitch], music_parameters.abc.Pitch
+            ]
+        ] = None,
+        midi_velocity_to_mutwo_volume: typing.Optional[
+            typing.Callable[
+                [midi_converters.constants.MidiVelocity], music_parameters.abc.Volume
+            ]
+        ] = None,
+        use_mido_parser: bool = False,
+        track_index_tuple: typing.Optional[typing.Iterable[int]] = None,
+        midi_channel_tuple: typing.Optional[typing.Iterable[int]] = None,
+        message_type_tuple: typing.Optional[typing.Iterable[str]] = None,
+        tick_range: typing.Optional[tuple[int, int]] = None,
+        seconds_range: typing.Optional[tuple[float, float]] = None,
+        seek_index: typing.Optional[midi_converters.MidiFileSeekIndex] = None,
+        is_lazy: bool = False,
     ):
         self._logger = core_utilities.get_cls_logger(type(self))
         self._mutwo_parameter_dict_to_chronon = (
             mutwo_parameter_dict_to_chronon
+            or music_converters.MutwoParameterDictToNoteLike()
+        )
+        self._midi_pitch_to_mutwo_pitch = (
+            midi_pitch_to_mutwo_pitch or MidiPitchToMutwoMidiPitch()
+        )
+        self._midi_velocity_to_mutwo_volume = (
+            midi_velocity_to_mutwo_volume or MidiVelocityToWesternVolume()
+        )
+        self._use_mido_parser = use_mido_parser
+        self._is_lazy = is_lazy
+        self._is_filtered = any(
+            filter_argument is not None
+            for filter_argument in (
+                track_index_tuple,
+                midi_channel_tuple,
+                message_type_tuple,
+                tick_range,
+                seconds_range,
+            )
+        )
+        self._midi_file_parser = midi_converters.MidiFileParser(
+            track_index_tuple=track_index_tuple,
+            midi_channel_tuple=midi_channel_tuple,
+            message_type_tuple=message_type_tuple,
+            tick_range=tick_range,
+            seconds_range=seconds_range,
+            seek_index=seek_index,
         )
-        self._midi_pitch_to_mutwo_pitch = midi_pitch_to_mutwo_pitch
-        self._midi_velocity_to_mutwo_volume = midi_velocity_to_mutwo_volume
 
     # ###################################################################### #
     #                          static methods                                #
@@ -276,59 +589,105 @@ class MidiFileToEvent(core_converters.abc.Converter):
             )
         return start_and_stop_tuple_to_note_pair_list
 
+    @staticmethod
+    def _note_pair_tuple_to_voice_tuple(
+        note_pair_tuple: NotePairTuple,
+    ) -> tuple[Voice, ...]:
+        """Distribute the notes to voices without creating any event.
+
+        Notes with the same start and stop become one chronon and each
+        chronon is added to the first voice which has ended before it.
+        """
+        voice_list: list[list[tuple[int, int, list[NotePair]]]] = []
+        voice_end_tick_list: list[int] = []
+        start_and_stop_tuple_to_note_pair_list = (
+            MidiFileToEvent._note_pair_tuple_to_start_and_stop_tuple_to_note_pair_list(
+                note_pair_tuple
+            )
+        )
+        for start_and_stop_tuple in sorted(
+            start_and_stop_tuple_to_note_pair_list.keys(),
+            key=lambda start_and_stop_tuple: start_and_stop_tuple[0],
+        ):
+            start_tick, stop_tick = start_and_stop_tuple
+            for voice_index, end_tick in enumerate(voice_end_tick_list):
+                if start_tick >= end_tick:
+                    break
+            else:
+                voice_list.append([])
+                voice_end_tick_list.append(0)
+                voice_index = len(voice_list) - 1
+            voice_list[voice_index].append(
+                (
+                    start_tick,
+                    stop_tick,
+                    start_and_stop_tuple_to_note_pair_list[start_and_stop_tuple],
+                )
+            )
+            voice_end_tick_list[voice_index] = stop_tick
+        return tuple(map(tuple, voice_list))
+
     @staticmethod
     def _add_chronon_to_consecution(
         consecution: core_events.Consecution,
         start: int,
         chronon: core_events.Chronon,
+        consecution_beat_count: typing.Optional[fractions.Fraction] = None,
     ):
-        difference = start - consecution.duration.beat_count
+        if consecution_beat_count is None:
+            consecution_beat_count = consecution.duration.beat_count
+        difference = start - consecution_beat_count
         if difference > 0:
             rest = core_events.Chronon(difference)
             consecution.append(rest)
         consecution.append(chronon)
 
+    @staticmethod
+    def _change_list_to_point_list(
+        start_value: int,
+        change_list: list[tuple[int, int]],
+        start_tick: int,
+        end_tick: int,
+        ticks_per_beat: int,
+    ) -> list[list]:
+        # Midi values are kept until they change, but envelopes
+        # interpolate between their points: so we add the previous value
+        # one tick before each change.
+        point_list = [[0, start_value]]
+        for tick, value in change_list:
+            if value == point_list[-1][1]:
+                continue
+            tick -= start_tick
+            if tick - 1 > point_list[-1][0]:
+                point_list.append([tick - 1, point_list[-1][1]])
+            point_list.append([tick, value])
+        # Envelopes are stretched to the duration of the chronon (until
+        # one tick before its end, see 'EventToMidiFile').
+        if (
+            len(point_list) > 1
+            and (tick := end_tick - start_tick - 1) > point_list[-1][0]
+        ):
+            point_list.append([tick, point_list[-1][1]])
+        for point in point_list:
+            point[0] = fractions.Fraction(point[0], ticks_per_beat)
+        return point_list
+
     @staticmethod
     def _tick_to_duration(
         tick: int, ticks_per_beat: int
     ) -> core_parameters.DirectDuration:
         return core_parameters.DirectDuration(fractions.Fraction(tick, ticks_per_beat))
 
+    @staticmethod
+    def _get_midi_channel_timeline(
+        message_type_to_midi_message_list: MessageTypeToMidiMessageList,
+    ) -> _MidiChannelTimeline:
+        return _MidiChannelTimeline(message_type_to_midi_message_list)
+
     # ###################################################################### #
     #                          private methods                               #
     # ###################################################################### #
 
-    def _get_note_off_partner(
-        self,
-        note_on_message: mido.Message | mido.MetaMessage,
-        note_off_message_list: list[mido.Message | mido.MetaMessage],
-    ) -> typing.Optional[mido.Message]:
-        def is_valid_note_off_message(
-            note_off_message: mido.Message | mido.MetaMessage,
-        ) -> bool:
-            test_list = [
-                note_off_message.time >= note_on_message.time,  # type: ignore
-                note_on_message.note == note_off_message.note,  # type: ignore
-                note_on_message.channel == note_off_message.channel,  # type: ignore
-            ]
-            return all(test_list)
-
-        try:
-            note_off_message = next(
-                filter(is_valid_note_off_message, note_off_message_list)
-            )
-            assert isinstance(note_off_message, mido.Message)
-        except StopIteration:
-            self._logger.warning(
-                "Invalid midi file: "
-                "Found note on message without any suitable "
-                "note off message partner. The note on message is: "
-                f"'{note_on_message}'."
-            )
-            note_off_message = None
-
-        return note_off_message
-
     def _get_note_pair_tuple(
         self,
         message_type_to_midi_message_list: MessageTypeToMidiMessageList,
@@ -338,57 +697,159 @@ class MidiFileToEvent(core_converters.abc.Converter):
         except KeyError:
             self._logger.debug("No 'note_on' messages were found!")
             return tuple([])
+        note_off_message_list = message_type_to_midi_message_list.get("note_off", [])
+
+        # We sweep once over all note messages in chronological order
+        # (at the same tick note on messages come first). Each note off
+        # message stops the earliest sounding note with the same channel
+        # and note. Many midi files (especially with running status)
+        # don't use note off messages, but note on messages with
+        # velocity 0.
+        note_pair_or_none_list: list[typing.Optional[NotePair]] = [None] * len(
+            note_on_message_list
+        )
+        key_to_sounding_note_on_index_deque: dict[
+            tuple[int, int], collections.deque[int]
+        ] = {}
+        for note_on_index, note_message in heapq.merge(
+            enumerate(note_on_message_list),
+            zip(itertools.repeat(None), note_off_message_list),
+            key=lambda index_and_note_message: index_and_note_message[1].time,
+        ):
+            key = (note_message.channel, note_message.note)  # type: ignore
+            if note_on_index is not None and note_message.velocity:  # type: ignore
+                try:
+                    key_to_sounding_note_on_index_deque[key].append(note_on_index)
+                except KeyError:
+                    key_to_sounding_note_on_index_deque[key] = collections.deque(
+                        (note_on_index,)
+                    )
+            elif sounding_note_on_index_deque := (
+                key_to_sounding_note_on_index_deque.get(key)
+            ):
+                note_on_index = sounding_note_on_index_deque.popleft()
+                note_pair_or_none_list[note_on_index] = (
+                    note_on_message_list[note_on_index],
+                    note_message,
+                )
 
-        try:
-            note_off_message_list = copy.deepcopy(
-                message_type_to_midi_message_list["note_off"]
-            )
-        except KeyError:
-            self._logger.warning(
-                "No 'note_off' messages were found! "
-                "This is strange, because 'note_on' messages could be found. "
-                "Maybe you have a midi file which doesn't use 'note_off'"
-                "messages but only 'note_on' messages with velocity=0?"
-                " This is currently not supported, see"
-                " also https://github.com/mutwo-org/mutwo.midi/issues/4."
+        for note_on_index in sorted(
+            itertools.chain.from_iterable(key_to_sounding_note_on_index_deque.values())
+        ):
+            midi_converters.DiagnosticCollector.report(
+                self._logger,
+                "missing_note_off",
+                "Invalid midi file: "
+                "Found note on message without any suitable "
+                "note off message partner. The note on message is: "
+                "'%s'.",
+                note_on_message_list[note_on_index],
             )
-            return tuple([])
 
-        note_pair_list = []
-        for note_on_message in note_on_message_list:
-            note_off_message = self._get_note_off_partner(
-                note_on_message, note_off_message_list
+        # Note on messages are sorted by time, so the note pairs are too.
+        return tuple(filter(None, note_pair_or_none_list))
+
+    def _note_pair_to_mutwo_pitch(
+        self,
+        note_pair: NotePair,
+        ticks_per_beat: int,
+        midi_channel_timeline: typing.Optional[_MidiChannelTimeline],
+    ) -> tuple[midi_converters.constants.MidiPitch, music_parameters.abc.Pitch]:
+        note_on, note_off = note_pair
+        if midi_channel_timeline is None:
+            midi_pitch = (note_on.note, 0)  # type: ignore
+            return midi_pitch, self._midi_pitch_to_mutwo_pitch(midi_pitch)
+
+        channel = note_on.channel  # type: ignore
+        pitch_bend = midi_channel_timeline.get_value(channel, None, note_on.time) or 0
+        midi_pitch = (note_on.note, pitch_bend)  # type: ignore
+        pitch_bend_change_list = midi_channel_timeline.get_change_list(
+            channel, None, note_on.time, note_off.time  # type: ignore
+        )
+        # 'EventToMidiFile' sends the pitch bend of a note one tick before
+        # the note starts: this bend belongs to the next note.
+        while (
+            pitch_bend_change_list
+            and pitch_bend_change_list[-1][0] == note_off.time - 1  # type: ignore
+            and midi_channel_timeline.is_note_on(channel, note_off.time)  # type: ignore
+        ):
+            del pitch_bend_change_list[-1]
+        if not pitch_bend_change_list:
+            return midi_pitch, self._midi_pitch_to_mutwo_pitch(midi_pitch)
+
+        point_list = MidiFileToEvent._change_list_to_point_list(
+            pitch_bend,
+            pitch_bend_change_list,
+            note_on.time,  # type: ignore
+            note_off.time,  # type: ignore
+            ticks_per_beat,
+        )
+        if len(point_list) == 1:
+            return midi_pitch, self._midi_pitch_to_mutwo_pitch(midi_pitch)
+        return midi_pitch, music_parameters.FlexPitch(
+            [
+                [time, self._midi_pitch_to_mutwo_pitch((note_on.note, value))]  # type: ignore
+                for time, value in point_list
+            ]
+        )
+
+    def _note_pair_to_control_envelope_tuple(
+        self,
+        note_pair: NotePair,
+        ticks_per_beat: int,
+        midi_channel_timeline: _MidiChannelTimeline,
+    ) -> tuple[midi_converters.ControlEnvelope, ...]:
+        note_on, note_off = note_pair
+        channel = note_on.channel  # type: ignore
+        control_envelope_list = []
+        for control in midi_channel_timeline.get_control_tuple(channel):
+            value = midi_channel_timeline.get_value(channel, control, note_on.time)
+            control_change_list = midi_channel_timeline.get_change_list(
+                channel, control, note_on.time, note_off.time  # type: ignore
             )
-            if note_off_message is not None:
-                note_pair = (note_on_message, note_off_message)
-                self._logger.debug(
-                    f"Found note_pair (on: {note_on_message}, off: {note_off_message})"
+            if value is None:
+                if not control_change_list:
+                    continue
+                # The controller is unknown until its first message.
+                value = control_change_list[0][1]
+            control_envelope_list.append(
+                midi_converters.ControlEnvelope(
+                    "control_change",
+                    core_events.Envelope(
+                        MidiFileToEvent._change_list_to_point_list(
+                            value,
+                            control_change_list,
+                            note_on.time,  # type: ignore
+                            note_off.time,  # type: ignore
+                            ticks_per_beat,
+                        )
+                    ),
+                    control,
                 )
-                note_pair_list.append(note_pair)
-                del note_off_message_list[note_off_message_list.index(note_off_message)]
-
-        note_pair_list.sort(key=lambda note_pair: note_pair[0].time)
-        return tuple(note_pair_list)
+            )
+        return tuple(control_envelope_list)
 
     def _note_pair_list_to_chronon(
-        self, note_pair_list: list[NotePair], ticks_per_beat: int
+        self,
+        note_pair_list: list[NotePair],
+        ticks_per_beat: int,
+        midi_channel_timeline: typing.Optional[_MidiChannelTimeline] = None,
     ) -> core_events.Chronon:
         midi_pitch_list = []
+        mutwo_pitch_list = []
         velocity_list = []
         for note_pair in note_pair_list:
             note_on, _ = note_pair
-            # TODO(take pitch bend into account!)
-            midi_pitch_list.append((note_on.note, 0))  # type: ignore
+            midi_pitch, mutwo_pitch = self._note_pair_to_mutwo_pitch(
+                note_pair, ticks_per_beat, midi_channel_timeline
+            )
+            midi_pitch_list.append(midi_pitch)
+            mutwo_pitch_list.append(mutwo_pitch)
             velocity_list.append(note_on.velocity)  # type: ignore
 
         average_velocity = int(sum(velocity_list) / len(velocity_list))
         mutwo_volume = self._midi_velocity_to_mutwo_volume(average_velocity)
 
-        mutwo_pitch_list = [
-            self._midi_pitch_to_mutwo_pitch(midi_pitch)
-            for midi_pitch in midi_pitch_list
-        ]
-
         note_on, note_off = note_pair_list[0]
         tick = note_off.time - note_on.time  # type: ignore
         duration = MidiFileToEvent._tick_to_duration(tick, ticks_per_beat)
@@ -401,114 +862,336 @@ class MidiFileToEvent(core_converters.abc.Converter):
             music_converters.configurations.DEFAULT_VOLUME_TO_SEARCH_NAME: mutwo_volume,
         }
         chronon = self._mutwo_parameter_dict_to_chronon(mutwo_parameter_dict)
+        # All tones of a chronon share its controllers: we use the
+        # controllers of the midi channel of its first tone.
+        if midi_channel_timeline is not None and (
+            control_envelope_tuple := self._note_pair_to_control_envelope_tuple(
+                note_pair_list[0], ticks_per_beat, midi_channel_timeline
+            )
+        ):
+            setattr(
+                chronon,
+                midi_converters.configurations.DEFAULT_CONTROL_ENVELOPE_TUPLE_ATTRIBUTE_NAME,
+                control_envelope_tuple,
+            )
         self._logger.debug(
-            f"Midi data -> Mutwo data -> Chronon:\n\t"
-            f"Midi data: (tick={tick},velocity_list={velocity_list},midi_pitch_list={midi_pitch_list})\n\t"
-            f"Mutwo data: {mutwo_parameter_dict}\n\t"
-            f"Chronon: {chronon}"
+            "Midi data -> Mutwo data -> Chronon:\n\t"
+            "Midi data: (tick=%s,velocity_list=%s,midi_pitch_list=%s)\n\t"
+            "Mutwo data: %s\n\t"
+            "Chronon: %s",
+            tick,
+            velocity_list,
+            midi_pitch_list,
+            mutwo_parameter_dict,
+            chronon,
         )
         return chronon
 
+    def _voice_to_consecution(
+        self,
+        voice: Voice,
+        ticks_per_beat: int,
+        midi_channel_timeline: typing.Optional[_MidiChannelTimeline] = None,
+    ) -> core_events.Consecution[core_events.Chronon]:
+        consecution = core_events.Consecution([])
+        # We remember where the consecution ends, because
+        # 'Consecution.duration' sums the durations of all its events.
+        end_tick = 0
+        for start_tick, stop_tick, note_pair_list in voice:
+            self._add_chronon_to_consecution(
+                consecution,
+                self._tick_to_duration(start_tick, ticks_per_beat),
+                self._note_pair_list_to_chronon(
+                    note_pair_list, ticks_per_beat, midi_channel_timeline
+                ),
+                fractions.Fraction(end_tick, ticks_per_beat),
+            )
+            end_tick = stop_tick
+        return consecution
+
     def _note_pair_tuple_to_concurrence(
-        self, note_pair_tuple: NotePairTuple, ticks_per_beat: int
+        self,
+        note_pair_tuple: NotePairTuple,
+        ticks_per_beat: int,
+        midi_channel_timeline: typing.Optional[_MidiChannelTimeline] = None,
     ) -> core_events.Concurrence[
         core_events.Consecution[core_events.Chronon]
     ]:
-        concurrence = core_events.Concurrence([])
-
-        start_and_stop_tuple_to_note_pair_list = (
-            MidiFileToEvent._note_pair_tuple_to_start_and_stop_tuple_to_note_pair_list(
-                note_pair_tuple
-            )
-        )
-        for start_and_stop_tuple in sorted(
-            start_and_stop_tuple_to_note_pair_list.keys(),
-            key=lambda start_and_stop_tuple: start_and_stop_tuple[0],
-        ):
-            start_tick, _ = start_and_stop_tuple
-            start = self._tick_to_duration(start_tick, ticks_per_beat)
-            note_pair_list = start_and_stop_tuple_to_note_pair_list[
-                start_and_stop_tuple
+        return core_events.Concurrence(
+            [
+                self._voice_to_consecution(voice, ticks_per_beat, midi_channel_timeline)
+                for voice in self._note_pair_tuple_to_voice_tuple(note_pair_tuple)
             ]
-            chronon = self._note_pair_list_to_chronon(
-                note_pair_list, ticks_per_beat
-            )
-            is_added = False
-            for consecution in concurrence:
-                duration = consecution.duration
-                difference = start - duration
-                if difference >= 0:
-                    self._add_chronon_to_consecution(
-                        consecution, start, chronon
-                    )
-                    is_added = True
-                    break
-            if not is_added:
-                concurrence.append(core_events.Consecution([]))
-                self._add_chronon_to_consecution(
-                    concurrence[-1], start, chronon
-                )
-
-        return concurrence
+        )
 
     def _note_pair_tuple_and_set_tempo_message_list_to_concurrence(
         self,
         note_pair_tuple: NotePairTuple,
-        set_tempo_message_list: list[mido.Message | mido.MetaMessage],
+        set_tempo_message_list: list[MidiMessage],
         ticks_per_beat: int,
-    ) -> core_events.Concurrence[
-        core_events.Consecution[core_events.Chronon]
-    ]:
+        midi_channel_timeline: typing.Optional[_MidiChannelTimeline] = None,
+    ) -> (
+        core_events.Concurrence[core_events.Consecution[core_events.Chronon]]
+        | LazyConcurrence
+    ):
+        if self._is_lazy:
+            return LazyConcurrence(
+                self._note_pair_tuple_to_voice_tuple(note_pair_tuple),
+                ticks_per_beat,
+                self,
+                midi_channel_timeline,
+            )
         concurrence = self._note_pair_tuple_to_concurrence(
-            note_pair_tuple, ticks_per_beat
+            note_pair_tuple, ticks_per_beat, midi_channel_timeline
         )
         # TODO(apply tempo messages)
         return concurrence
 
-    def _midi_file_to_mutwo_event(
-        self, midi_file_to_convert: mido.MidiFile
+    def _message_type_to_midi_message_list_to_mutwo_event(
+        self,
+        message_type_to_midi_message_list: MessageTypeToMidiMessageList,
+        ticks_per_beat: int,
     ) -> core_events.abc.Event:
-        ticks_per_beat = midi_file_to_convert.ticks_per_beat
-        message_type_to_midi_message_list = (
-            MidiFileToEvent._get_message_type_to_midi_message_list(midi_file_to_convert)
-        )
         note_pair_tuple = self._get_note_pair_tuple(message_type_to_midi_message_list)
         try:
             set_tempo_message_list = message_type_to_midi_message_list["set_tempo"]
         except KeyError:
             set_tempo_message_list = []
         return self._note_pair_tuple_and_set_tempo_message_list_to_concurrence(
-            note_pair_tuple, set_tempo_message_list, ticks_per_beat
+            note_pair_tuple,
+            set_tempo_message_list,
+            ticks_per_beat,
+            self._get_midi_channel_timeline(message_type_to_midi_message_list),
+        )
+
+    @staticmethod
+    def _raise_unsupported_midi_file_data(midi_file_data: typing.Any):
+        raise TypeError(
+            f"Found '{midi_file_data}' of unsupported type "
+            f"'{type(midi_file_data)}' for parameter "
+            "'midi_file_path_or_mido_midi_file'! Please enter either "
+            "a file path (str or os.PathLike), bytes, a buffer, a "
+            "binary file object or a MidiFile object (from the mido "
+            "package)."
+        )
+
+    def _midi_file_data_to_midi_file(
+        self, midi_file_data: MidiFileData
+    ) -> mido.MidiFile:
+        match midi_file_data:
+            case mido.MidiFile():
+                return midi_file_data
+            case str() | os.PathLike():
+                path = os.fspath(midi_file_data)
+                if (
+                    os.path.getsize(path)
+                    < midi_converters.configurations.MEMORY_MAP_FILE_SIZE_THRESHOLD
+                ):
+                    return mido.MidiFile(path)
+                with open(path, "rb") as f, mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                ) as midi_file_mmap:
+                    return mido.MidiFile(file=midi_file_mmap)
+            # 'io.BytesIO' shares the memory of 'bytes' and copies
+            # other buffers only once (instead of reading them byte by byte
+            # in python).
+            case bytes() | bytearray() | memoryview():
+                return mido.MidiFile(file=io.BytesIO(midi_file_data))
+            case _ if hasattr(midi_file_data, "read"):
+                return mido.MidiFile(file=midi_file_data)
+            case _:
+                self._raise_unsupported_midi_file_data(midi_file_data)
+
+    @contextlib.contextmanager
+    def _midi_file_data_to_buffer(
+        self, midi_file_data: MidiFileData
+    ) -> typing.Iterator[bytes | bytearray | memoryview | mmap.mmap]:
+        match midi_file_data:
+            case str() | os.PathLike():
+                with open(midi_file_data, "rb") as f:
+                    if (
+                        os.fstat(f.fileno()).st_size
+                        < midi_converters.configurations.MEMORY_MAP_FILE_SIZE_THRESHOLD
+                    ):
+                        yield f.read()
+                    else:
+                        with mmap.mmap(
+                            f.fileno(), 0, access=mmap.ACCESS_READ
+                        ) as midi_file_mmap:
+                            yield midi_file_mmap
+            case bytes() | bytearray() | memoryview():
+                yield midi_file_data
+            case _ if hasattr(midi_file_data, "read"):
+                yield midi_file_data.read()
+            case _:
+                self._raise_unsupported_midi_file_data(midi_file_data)
+
+    def _read_midi_file_data(
+        self, midi_file_data: MidiFileData
+    ) -> tuple[MessageTypeToMidiMessageList, int]:
+        """Read all (not filtered) messages sorted by type and the ticks per beat"""
+        if self._is_filtered:
+            if isinstance(midi_file_data, mido.MidiFile):
+                midi_file_data = midi_converters.MidiFileToBytes().convert(
+                    midi_file_data
+                )
+        elif self._use_mido_parser or isinstance(midi_file_data, mido.MidiFile):
+            midi_file = self._midi_file_data_to_midi_file(midi_file_data)
+            return (
+                MidiFileToEvent._get_message_type_to_midi_message_list(midi_file),
+                midi_file.ticks_per_beat,
+            )
+
+        with self._midi_file_data_to_buffer(midi_file_data) as buffer:
+            parsed_midi_file = self._midi_file_parser.convert(buffer)
+        return (
+            parsed_midi_file.message_type_to_midi_message_list,
+            parsed_midi_file.ticks_per_beat,
         )
 
+    def _read_note_pair_tuple(
+        self, midi_file_data: MidiFileData
+    ) -> tuple[NotePairTuple, int]:
+        """Read the note pairs and the ticks per beat without creating events"""
+        (
+            message_type_to_midi_message_list,
+            ticks_per_beat,
+        ) = self._read_midi_file_data(midi_file_data)
+        with midi_converters.DiagnosticCollector(self._logger):
+            return (
+                self._get_note_pair_tuple(message_type_to_midi_message_list),
+                ticks_per_beat,
+            )
+
     # ###################################################################### #
     #                          public methods                                #
     # ###################################################################### #
 
     def convert(
-        self, midi_file_path_or_mido_midi_file: str | mido.MidiFile
+        self, midi_file_path_or_mido_midi_file: MidiFileData
     ) -> core_events.abc.Event:
         """Convert midi file to mutwo event.
 
         :param midi_file_path_or_mido_midi_file: The midi file which shall
-            be converted. Can either be a file path or a :class:`MidiFile`
-            object from the `mido <https://github.com/mido/mido>`_ package.
-        :type midi_file_path_or_mido_midi_file: str | mido.MidiFile
+            be converted. Can either be a file path, the content of a
+            midi file (bytes, bytearray or memoryview), a binary file
+            object or a :class:`MidiFile` object from the
+            `mido <https://github.com/mido/mido>`_ package. Big files are
+            memory-mapped (see
+            :const:`mutwo.midi_converters.configurations.MEMORY_MAP_FILE_SIZE_THRESHOLD`).
+        :type midi_file_path_or_mido_midi_file: MidiFileData
         """
 
-        if isinstance(midi_file_path_or_mido_midi_file, str):
-            midi_file = mido.MidiFile(midi_file_path_or_mido_midi_file)
-        elif isinstance(midi_file_path_or_mido_midi_file, mido.MidiFile):
-            midi_file = midi_file_path_or_mido_midi_file
-        else:
-            raise TypeError(
-                (
-                    f"Found '{midi_file_path_or_mido_midi_file}' of"
-                    "unsupported type"
-                    f"'{type(midi_file_path_or_mido_midi_file)}' for"
-                    "parameter 'midi_file_path_or_mido_midi_file'! "
-                    "Please enter either a file name (str) or a MidiFile"
-                    " object (from the mido package)."
-                )
+        (
+            message_type_to_midi_message_list,
+            ticks_per_beat,
+        ) = self._read_midi_file_data(midi_file_path_or_mido_midi_file)
+        with midi_converters.DiagnosticCollector(self._logger):
+            return self._message_type_to_midi_message_list_to_mutwo_event(
+                message_type_to_midi_message_list, ticks_per_beat
+            )
+
+
+class MidiFileToFingerprint(core_converters.abc.Converter):
+    """Hash the note content of a midi file.
+
+    :param is_velocity_included: If ``False`` midi files which only
+        differ in the velocities of their notes get the same fingerprint.
+        Default to ``True``.
+    :type is_velocity_included: bool
+    :param midi_file_to_event: The converter which reads the midi file and
+        pairs its note messages (its filter arguments are applied). If
+        ``None`` a :class:`MidiFileToEvent` which only decodes note
+        messages is used. Default to ``None``.
+    :type midi_file_to_event: typing.Optional[MidiFileToEvent]
+
+    The fingerprint only depends on the start and the duration (in beats),
+    the midi note and the velocity of each note. Midi files which only
+    differ in meta messages (like tempo messages or track names), in the
+    order of their tracks, in the midi channels of their notes or in their
+    resolution (ticks per beat) get the same fingerprint. No mutwo events
+    are created.
+
+    **Example:**
+
+    >>> import mido
+    >>> from mutwo import midi_converters
+    >>> def make_midi_file(ticks_per_beat, track_name):
+    ...     return mido.MidiFile(
+    ...         tracks=[
+    ...             mido.MidiTrack(
+    ...                 [
+    ...                     mido.MetaMessage('track_name', name=track_name),
+    ...                     mido.Message('note_on', note=60, time=0),
+    ...                     mido.Message('note_off', note=60, time=ticks_per_beat),
+    ...                 ]
+    ...             )
+    ...         ],
+    ...         ticks_per_beat=ticks_per_beat,
+    ...     )
+    >>> midi_file_to_fingerprint = midi_converters.MidiFileToFingerprint()
+    >>> midi_file_to_fingerprint.convert(
+    ...     make_midi_file(480, 'piano')
+    ... ) == midi_file_to_fingerprint.convert(make_midi_file(96, 'flute'))
+    True
+    """
+
+    _VERSION = 1
+
+    def __init__(
+        self,
+        is_velocity_included: bool = True,
+        midi_file_to_event: typing.Optional[MidiFileToEvent] = None,
+    ):
+        self._is_velocity_included = is_velocity_included
+        self._midi_file_to_event = midi_file_to_event or MidiFileToEvent(
+            message_type_tuple=("note_on", "note_off")
+        )
+
+    def _note_pair_tuple_to_fingerprint(
+        self, note_pair_tuple: NotePairTuple, ticks_per_beat: int
+    ) -> str:
+        is_velocity_included = self._is_velocity_included
+        note_tuple_list = sorted(
+            (
+                note_on.time,  # type: ignore
+                note_off.time - note_on.time,  # type: ignore
+                note_on.note,  # type: ignore
+                note_on.velocity if is_velocity_included else 0,  # type: ignore
             )
-        return self._midi_file_to_mutwo_event(midi_file)
+            for note_on, note_off in note_pair_tuple
+        )
+        # We reduce the resolution as much as possible, so that the same
+        # notes always have the same ticks (the order of the notes
+        # doesn't change, because all times are divided by the same
+        # number).
+        divisor = math.gcd(
+            ticks_per_beat,
+            *(tick for note_tuple in note_tuple_list for tick in note_tuple[:2]),
+        )
+        value_list = [self._VERSION, ticks_per_beat // divisor]
+        for start, duration, note, velocity in note_tuple_list:
+            value_list.extend((start // divisor, duration // divisor, note, velocity))
+        return hashlib.blake2b(
+            struct.pack(f"<{len(value_list)}q", *value_list), digest_size=16
+        ).hexdigest()
+
+    @property
+    def empty_fingerprint(self) -> str:
+        """The fingerprint of midi files without any note"""
+        return self._note_pair_tuple_to_fingerprint(tuple([]), 1)
+
+    def convert(self, midi_file_path_or_mido_midi_file: MidiFileData) -> str:
+        """Hash the note content of a midi file.
+
+        :param midi_file_path_or_mido_midi_file: The midi file (see
+            :meth:`MidiFileToEvent.convert`).
+        :type midi_file_path_or_mido_midi_file: MidiFileData
+        :return: The hexadecimal digest of the note content.
+        """
+
+        return self._note_pair_tuple_to_fingerprint(
+            *self._midi_file_to_event._read_note_pair_tuple(
+                midi_file_path_or_mido_midi_file
+            )
+        )
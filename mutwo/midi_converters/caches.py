@@ -0,0 +1,116 @@
+"""Bounded caches which are used by the midi converters."""
+
+import collections
+import typing
+
+__all__ = ("CacheInfo", "LeastRecentlyUsedCache")
+
+
+class CacheInfo(typing.NamedTuple):
+    """Statistics of a cache (similar to :func:`functools.lru_cache`)."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+    eviction_policy: str
+
+
+class LeastRecentlyUsedCache(object):
+    """Mapping with a bounded size which evicts the least recently used entry.
+
+    :param maxsize: The maximum total size of all entries. If this is 0 the
+        cache doesn't store anything.
+    :type maxsize: int
+    :param get_size: Function which returns the size of a value. If ``None``
+        each entry has the size 1 (so that ``maxsize`` is the maximum
+        number of entries). Default to ``None``.
+    :type get_size: typing.Optional[typing.Callable[[typing.Any], int]]
+
+    **Example:**
+
+    >>> from mutwo import midi_converters
+    >>> cache = midi_converters.LeastRecentlyUsedCache(2)
+    >>> cache["a"] = 1
+    >>> cache["b"] = 2
+    >>> cache.get("a")
+    1
+    >>> cache["c"] = 3  # evicts "b"
+    >>> cache.get("b") is None
+    True
+    >>> cache.cache_info()
+    CacheInfo(hits=1, misses=1, evictions=1, maxsize=2, currsize=2, eviction_policy='least recently used')
+    """
+
+    eviction_policy = "least recently used"
+
+    def __init__(
+        self,
+        maxsize: int,
+        get_size: typing.Optional[typing.Callable[[typing.Any], int]] = None,
+    ):
+        if maxsize < 0:
+            raise ValueError(f"Found invalid maxsize '{maxsize}', must be >= 0.")
+        self._maxsize = maxsize
+        self._get_size = get_size
+        # key -> (value, size)
+        self._data: collections.OrderedDict = collections.OrderedDict()
+        self._size = 0
+        self._hits = self._misses = self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self._data
+
+    def __setitem__(self, key: typing.Hashable, value: typing.Any):
+        size = self._get_size(value) if self._get_size else 1
+        # Values which are bigger than the complete cache are never stored
+        if size > self._maxsize:
+            return
+        data = self._data
+        if key in data:
+            del self[key]
+        data[key] = (value, size)
+        self._size += size
+        while self._size > self._maxsize:
+            _, (_, evicted_size) = data.popitem(last=False)
+            self._size -= evicted_size
+            self._evictions += 1
+
+    def __delitem__(self, key: typing.Hashable):
+        _, size = self._data.pop(key)
+        self._size -= size
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        """Return the value for key (or default) and update the statistics."""
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            self._misses += 1
+            return default
+        self._data.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self._data.clear()
+        self._size = self._hits = self._misses = self._evictions = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return hits, misses, evictions, maximum and current total size."""
+        return CacheInfo(
+            self._hits,
+            self._misses,
+            self._evictions,
+            self._maxsize,
+            self._size,
+            self.eviction_policy,
+        )
@@ -27,5 +27,61 @@ DEFAULT_TICKS_PER_BEAT = 480
 DEFAULT_CONTROL_MESSAGE_TUPLE_ATTRIBUTE_NAME = "control_message_tuple"
 """The expected attribute name of a :class:`mutwo.core_events.Chronon` for control messages."""
 
+DEFAULT_CONTROL_ENVELOPE_TUPLE_ATTRIBUTE_NAME = "control_envelope_tuple"
+"""The expected attribute name of a :class:`mutwo.core_events.Chronon` for control envelopes."""
+
+DEFAULT_CONTROL_VALUE_TOLERANCE = 0
+"""default value for ``control_value_tolerance`` in `mutwo.midi_converters.EventToMidiFile`"""
+
+DEFAULT_MESSAGE_TEMPLATE_CACHE_SIZE = 2**16
+"""default value for ``message_template_cache_size`` in `mutwo.midi_converters.EventToMidiFile`
+(the maximum number of cached midi messages)"""
+
+DEFAULT_TRACK_CACHE_SIZE = 0
+"""default value for ``track_cache_size`` in `mutwo.midi_converters.EventToMidiFile`
+(the maximum number of cached midi messages, 0 disables the cache)"""
+
+DEFAULT_TUNING_MODE = "pitch_bend"
+"""default value for ``tuning_mode`` in `mutwo.midi_converters.EventToMidiFile`"""
+
+DEFAULT_MPE_MEMBER_CHANNEL_COUNT = 0
+"""default value for ``mpe_member_channel_count`` in `mutwo.midi_converters.EventToMidiFile`
+(0 disables the MPE mode)"""
+
+DEFAULT_TEMPO_TOLERANCE_IN_BEATS_PER_MINUTE = 0.5
+"""default value for ``tempo_tolerance_in_beats_per_minute`` in `mutwo.midi_converters.EventToMidiFile`"""
+
+MEMORY_MAP_FILE_SIZE_THRESHOLD = 2**20
+"""Midi files with at least this size (in bytes) are memory-mapped when
+they are read by :class:`mutwo.midi_converters.MidiFileToEvent`."""
+
+DEFAULT_SEEK_INDEX_INTERVAL_IN_BEATS = 16
+"""default value for ``interval_in_beats`` in `mutwo.midi_converters.MidiFileIndexer`"""
+
+DEFAULT_PLAYBACK_LOOKAHEAD_IN_SECONDS = 0.1
+"""default value for ``lookahead_in_seconds`` in `mutwo.midi_converters.EventToMidiOutput`"""
+
+DEFAULT_PLAYBACK_BUSY_WAIT_IN_SECONDS = 0.002
+"""default value for ``busy_wait_in_seconds`` in `mutwo.midi_converters.EventToMidiOutput`"""
+
+DEFAULT_NOTE_DENSITY_INTERVAL_IN_BEATS = 1
+"""default value for ``interval_in_beats`` in `mutwo.midi_converters.NoteDensityCurve`"""
+
+DEFAULT_CORPUS_CHUNK_SIZE = 16
+"""default value for ``chunk_size`` in `mutwo.midi_converters.MidiCorpusConverter`"""
+
+MIDI_FILE_EXTENSION_TUPLE = (".mid", ".midi", ".kar", ".smf")
+"""Files with these extensions (case insensitive) are read if a directory
+is passed to a :class:`mutwo.midi_converters.MidiCorpusConverter`."""
+
+DEFAULT_PIANO_ROLL_STEPS_PER_BEAT = 4
+"""default value for ``steps_per_beat`` in `mutwo.midi_converters.MidiFileToPianoRoll`"""
+
+DEFAULT_PIANO_ROLL_VELOCITY_ENCODING = "velocity"
+"""default value for ``velocity_encoding`` in `mutwo.midi_converters.MidiFileToPianoRoll`"""
+
+DEFAULT_PIANO_ROLL_VELOCITY = 64
+"""default value for ``velocity`` in `mutwo.midi_converters.PianoRollToMidiFile`"""
+
 
 del core_events, core_parameters
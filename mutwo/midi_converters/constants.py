@@ -10,6 +10,10 @@ midi file definition)."""
 
 MAXIMUM_MICROSECONDS_PER_BEAT = 16777215
 
+DEFAULT_MICROSECONDS_PER_BEAT = 500000
+"""the tempo which is assumed if a midi file doesn't set any
+tempo (120 BPM)"""
+
 MIDI_TEMPO_FACTOR = 1000000
 """factor to multiply beats-in-seconds to get
 beats-in-microseconds (which is the tempo unit for midi)"""
@@ -21,6 +25,37 @@ doesn't change"""
 MAXIMUM_PITCH_BEND = 16382
 """the highest allowed value for midi pitch bend"""
 
+SINGLE_NOTE_TUNING_CHANGE_HEADER = (0x7F, 0x7F, 0x08, 0x02)
+"""data of a real time 'single note tuning change' system exclusive message
+of the midi tuning standard (for all devices) before the tuning program"""
+
+SCALE_OCTAVE_TUNING_HEADER = (0x7F, 0x7F, 0x08, 0x09)
+"""data of a real time 'scale/octave tuning' (2 byte format) system
+exclusive message of the midi tuning standard (for all devices) before
+the channel mask"""
+
+MAXIMUM_SINGLE_NOTE_TUNING_CHANGE_COUNT = 127
+"""the highest number of keys which can be retuned with one 'single note
+tuning change' message"""
+
+MIDI_TUNING_RESOLUTION = 16384
+"""number of steps per semitone of the midi tuning standard (14 bit)"""
+
+MPE_CONFIGURATION_MESSAGE_RPN = (0, 6)
+"""most and least significant byte of the registered parameter number of
+the MIDI polyphonic expression configuration message (which sets the
+number of member channels of a zone)"""
+
+PITCH_BEND_SENSITIVITY_RPN = (0, 0)
+"""most and least significant byte of the registered parameter number
+which sets the pitch bend range of a midi channel"""
+
+MPE_LOWER_ZONE_MASTER_CHANNEL = 0
+"""the master channel of the lower MPE zone (member channels start after it)"""
+
+MAXIMUM_MPE_MEMBER_CHANNEL_COUNT = 15
+"""the highest number of member channels of one MPE zone"""
+
 MidiNote: typing.TypeAlias = int
 """MidiNote type alias"""
 
@@ -33,5 +68,9 @@ MidiPitch: typing.TypeAlias = tuple[MidiNote, PitchBend]
 MidiVelocity: typing.TypeAlias = int
 """MidiVelocity type alias"""
 
+MidiTuningFrequency: typing.TypeAlias = tuple[int, int, int]
+"""Frequency data of the midi tuning standard: semitone and the most and
+least significant 7 bit of the fraction of a semitone"""
+
 
 del typing  # Cleanup
@@ -0,0 +1,578 @@
+"""Analyse big collections of midi files without converting them to mutwo events.
+
+The midi files are read and their note messages are paired like in
+:class:`mutwo.midi_converters.MidiFileToEvent`, but no
+:mod:`mutwo.core_events` objects are created. Each
+:class:`NoteStatistic` counts a property of the notes of one midi file
+and the counters of all files of a corpus are summed in a process pool.
+:class:`MidiCorpusToDuplicateTuple` finds midi files with the same note
+content by their :class:`mutwo.midi_converters.MidiFileToFingerprint`.
+"""
+
+import abc
+import collections
+import concurrent.futures
+import itertools
+import os
+import typing
+
+try:
+    import quicktions as fractions
+except ImportError:
+    import fractions
+
+from mutwo import core_converters
+from mutwo import core_utilities
+from mutwo import midi_converters
+
+__all__ = (
+    "NoteStatistic",
+    "PitchClassHistogram",
+    "VelocityHistogram",
+    "NoteDensityCurve",
+    "PolyphonyProfile",
+    "MidiStatistics",
+    "MidiFileToStatistics",
+    "MidiCorpusConverter",
+    "MidiCorpusToStatistics",
+    "MidiCorpusToDuplicateTuple",
+)
+
+# The note on and note off message of each note (sorted by the time of
+# the note on messages), see 'MidiFileToEvent._get_note_pair_tuple'.
+NotePairTuple = tuple[tuple[typing.Any, typing.Any], ...]
+
+
+class NoteStatistic(core_converters.abc.Converter):
+    """Count a property of the notes of one midi file.
+
+    :param name: The key of the statistic in
+        :attr:`MidiStatistics.statistic_name_to_counter`. If ``None`` the
+        default name of the statistic is used. Default to ``None``.
+    :type name: typing.Optional[str]
+
+    The counters of all files of a corpus are summed, so each statistic
+    returns a :class:`collections.Counter`.
+    """
+
+    default_name: str = "note_statistic"
+
+    def __init__(self, name: typing.Optional[str] = None):
+        self.name = name or self.default_name
+
+    @abc.abstractmethod
+    def convert(
+        self, note_pair_tuple: NotePairTuple, ticks_per_beat: int
+    ) -> collections.Counter:
+        """Count the notes of one midi file.
+
+        :param note_pair_tuple: The note on and note off message of each
+            note of the midi file (times are absolute ticks).
+        :type note_pair_tuple: NotePairTuple
+        :param ticks_per_beat: The resolution of the midi file.
+        :type ticks_per_beat: int
+        """
+
+
+class PitchClassHistogram(NoteStatistic):
+    """Count the pitch classes (0 = c, ..., 11 = b) of the midi notes.
+
+    :param is_weighted_by_duration: If ``True`` the duration of the notes
+        (in beats) is summed instead of counting the notes. Default to
+        ``False``.
+    :type is_weighted_by_duration: bool
+    :param name: See :class:`NoteStatistic`.
+    :type name: typing.Optional[str]
+    """
+
+    default_name = "pitch_class_histogram"
+
+    def __init__(
+        self, is_weighted_by_duration: bool = False, name: typing.Optional[str] = None
+    ):
+        super().__init__(name)
+        self._is_weighted_by_duration = is_weighted_by_duration
+
+    def convert(
+        self, note_pair_tuple: NotePairTuple, ticks_per_beat: int
+    ) -> collections.Counter:
+        if not self._is_weighted_by_duration:
+            return collections.Counter(
+                note_on.note % 12 for note_on, _ in note_pair_tuple
+            )
+        pitch_class_to_tick_count = [0] * 12
+        for note_on, note_off in note_pair_tuple:
+            pitch_class_to_tick_count[note_on.note % 12] += note_off.time - note_on.time
+        return collections.Counter(
+            {
+                pitch_class: fractions.Fraction(tick_count, ticks_per_beat)
+                for pitch_class, tick_count in enumerate(pitch_class_to_tick_count)
+                if tick_count
+            }
+        )
+
+
+class VelocityHistogram(NoteStatistic):
+    """Count the velocities of the notes."""
+
+    default_name = "velocity_histogram"
+
+    def convert(
+        self, note_pair_tuple: NotePairTuple, ticks_per_beat: int
+    ) -> collections.Counter:
+        return collections.Counter(note_on.velocity for note_on, _ in note_pair_tuple)
+
+
+class NoteDensityCurve(NoteStatistic):
+    """Count the notes which start within each interval of the midi file.
+
+    :param interval_in_beats: The duration of one interval. If ``None``
+        it's set to
+        :const:`mutwo.midi_converters.configurations.DEFAULT_NOTE_DENSITY_INTERVAL_IN_BEATS`.
+        Default to ``None``.
+    :type interval_in_beats: typing.Optional[fractions.Fraction | int]
+    :param name: See :class:`NoteStatistic`.
+    :type name: typing.Optional[str]
+
+    The keys of the counter are the indices of the intervals, so that
+    summing the counters of many files gives the average development of
+    the note density from the start of a piece on.
+    """
+
+    default_name = "note_density_curve"
+
+    def __init__(
+        self,
+        interval_in_beats: typing.Optional[fractions.Fraction | int] = None,
+        name: typing.Optional[str] = None,
+    ):
+        super().__init__(name)
+        if interval_in_beats is None:
+            interval_in_beats = (
+                midi_converters.configurations.DEFAULT_NOTE_DENSITY_INTERVAL_IN_BEATS
+            )
+        if interval_in_beats <= 0:
+            raise ValueError(
+                f"Found invalid interval '{interval_in_beats}', must be > 0."
+            )
+        self._interval_in_beats = fractions.Fraction(interval_in_beats)
+
+    def convert(
+        self, note_pair_tuple: NotePairTuple, ticks_per_beat: int
+    ) -> collections.Counter:
+        interval_in_ticks = self._interval_in_beats * ticks_per_beat
+        if interval_in_ticks.denominator == 1:
+            interval_in_ticks = interval_in_ticks.numerator
+        return collections.Counter(
+            int(note_on.time // interval_in_ticks) for note_on, _ in note_pair_tuple
+        )
+
+
+class PolyphonyProfile(NoteStatistic):
+    """Sum the duration (in beats) during which n notes are sounding.
+
+    The profile starts with the first note and ends with the last note of
+    the midi file, so that silence between notes is counted with 0
+    sounding notes.
+    """
+
+    default_name = "polyphony_profile"
+
+    def convert(
+        self, note_pair_tuple: NotePairTuple, ticks_per_beat: int
+    ) -> collections.Counter:
+        # At the same tick notes stop before other notes start, so that
+        # legato notes don't overlap.
+        tick_and_change_list = sorted(
+            itertools.chain.from_iterable(
+                ((note_on.time, 1), (note_off.time, -1))
+                for note_on, note_off in note_pair_tuple
+            )
+        )
+        polyphony_to_tick_count: dict[int, int] = {}
+        polyphony = 0
+        previous_tick = tick_and_change_list[0][0] if tick_and_change_list else 0
+        for tick, change in tick_and_change_list:
+            if tick_count := tick - previous_tick:
+                polyphony_to_tick_count[polyphony] = (
+                    polyphony_to_tick_count.get(polyphony, 0) + tick_count
+                )
+            polyphony += change
+            previous_tick = tick
+        return collections.Counter(
+            {
+                polyphony: fractions.Fraction(tick_count, ticks_per_beat)
+                for polyphony, tick_count in polyphony_to_tick_count.items()
+            }
+        )
+
+
+class MidiStatistics(typing.NamedTuple):
+    """Statistics of one midi file or of a corpus of midi files.
+
+    ``beat_count`` is the summed duration of all files (from their start
+    to the end of their last note) and ``failed_path_tuple`` contains the
+    paths of all midi files which couldn't be read.
+    """
+
+    file_count: int
+    note_count: int
+    beat_count: fractions.Fraction
+    statistic_name_to_counter: dict[str, collections.Counter]
+    failed_path_tuple: tuple[str, ...] = tuple([])
+
+    def merge(self, other: "MidiStatistics") -> "MidiStatistics":
+        """Sum the statistics of two (distinct) sets of midi files."""
+        statistic_name_to_counter = {
+            statistic_name: collections.Counter(counter)
+            for statistic_name, counter in self.statistic_name_to_counter.items()
+        }
+        for statistic_name, counter in other.statistic_name_to_counter.items():
+            try:
+                statistic_name_to_counter[statistic_name].update(counter)
+            except KeyError:
+                statistic_name_to_counter[statistic_name] = collections.Counter(counter)
+        return MidiStatistics(
+            self.file_count + other.file_count,
+            self.note_count + other.note_count,
+            self.beat_count + other.beat_count,
+            statistic_name_to_counter,
+            self.failed_path_tuple + other.failed_path_tuple,
+        )
+
+
+class MidiFileToStatistics(core_converters.abc.Converter):
+    """Count the notes of a midi file without converting it to a mutwo event.
+
+    :param note_statistic_sequence: The statistics which are computed.
+        If ``None`` a :class:`PitchClassHistogram`, a
+        :class:`VelocityHistogram`, a :class:`NoteDensityCurve` and a
+        :class:`PolyphonyProfile` are computed. Default to ``None``.
+    :type note_statistic_sequence: typing.Optional[typing.Sequence[NoteStatistic]]
+    :param midi_file_to_event: The converter which reads the midi file and
+        pairs its note messages (its filter arguments are applied). If
+        ``None`` a :class:`MidiFileToEvent` which only decodes note
+        messages is used. Default to ``None``.
+    :type midi_file_to_event: typing.Optional[MidiFileToEvent]
+
+    **Example:**
+
+    >>> import mido
+    >>> from mutwo import midi_converters
+    >>> midi_file = mido.MidiFile(
+    ...     tracks=[
+    ...         mido.MidiTrack(
+    ...             [
+    ...                 mido.Message('note_on', note=60, time=0),
+    ...                 mido.Message('note_on', note=64, time=0),
+    ...                 mido.Message('note_off', note=60, time=480),
+    ...                 mido.Message('note_off', note=64, time=480),
+    ...             ]
+    ...         )
+    ...     ],
+    ...     ticks_per_beat=480,
+    ... )
+    >>> midi_statistics = midi_converters.MidiFileToStatistics(
+    ...     [midi_converters.PitchClassHistogram()]
+    ... ).convert(midi_file)
+    >>> midi_statistics.statistic_name_to_counter
+    {'pitch_class_histogram': Counter({0: 1, 4: 1})}
+    """
+
+    def __init__(
+        self,
+        note_statistic_sequence: typing.Optional[typing.Sequence[NoteStatistic]] = None,
+        midi_file_to_event: typing.Optional["midi_converters.MidiFileToEvent"] = None,
+    ):
+        if note_statistic_sequence is None:
+            note_statistic_sequence = (
+                PitchClassHistogram(),
+                VelocityHistogram(),
+                NoteDensityCurve(),
+                PolyphonyProfile(),
+            )
+        self._note_statistic_tuple = tuple(note_statistic_sequence)
+        statistic_name_list = [
+            note_statistic.name for note_statistic in self._note_statistic_tuple
+        ]
+        if len(set(statistic_name_list)) != len(statistic_name_list):
+            raise ValueError(
+                f"Found statistics with the same name: '{statistic_name_list}'."
+            )
+        self._midi_file_to_event = (
+            midi_file_to_event
+            or midi_converters.MidiFileToEvent(
+                message_type_tuple=("note_on", "note_off")
+            )
+        )
+
+    def convert(
+        self, midi_file_path_or_mido_midi_file: "midi_converters.backends.MidiFileData"
+    ) -> MidiStatistics:
+        """Count the notes of a midi file.
+
+        :param midi_file_path_or_mido_midi_file: The midi file (see
+            :meth:`MidiFileToEvent.convert`).
+        :type midi_file_path_or_mido_midi_file: MidiFileData
+        """
+
+        note_pair_tuple, ticks_per_beat = (
+            self._midi_file_to_event._read_note_pair_tuple(
+                midi_file_path_or_mido_midi_file
+            )
+        )
+        return MidiStatistics(
+            1,
+            len(note_pair_tuple),
+            fractions.Fraction(
+                max((note_off.time for _, note_off in note_pair_tuple), default=0),
+                ticks_per_beat,
+            ),
+            {
+                note_statistic.name: note_statistic.convert(
+                    note_pair_tuple, ticks_per_beat
+                )
+                for note_statistic in self._note_statistic_tuple
+            },
+        )
+
+
+class MidiCorpusConverter(core_converters.abc.Converter):
+    """Abstract base class for converters which read many midi files in a process pool.
+
+    :param process_count: How many processes read midi files at the same
+        time. If ``None`` one process per cpu is used. If ``1`` all files
+        are read in the current process. Default to ``None``.
+    :type process_count: typing.Optional[int]
+    :param chunk_size: How many midi files are read by a process before
+        it returns their results. If ``None`` it's set to
+        :const:`mutwo.midi_converters.configurations.DEFAULT_CORPUS_CHUNK_SIZE`.
+        Default to ``None``.
+    :type chunk_size: typing.Optional[int]
+
+    The corpus is either a directory (all midi files of the directory and
+    its subdirectories are read, see
+    :const:`mutwo.midi_converters.configurations.MIDI_FILE_EXTENSION_TUPLE`)
+    or an iterable of paths. Iterables are read lazily, so they can
+    e.g. be generators.
+    """
+
+    def __init__(
+        self,
+        process_count: typing.Optional[int] = None,
+        chunk_size: typing.Optional[int] = None,
+    ):
+        if chunk_size is None:
+            chunk_size = midi_converters.configurations.DEFAULT_CORPUS_CHUNK_SIZE
+        for name, value in (
+            ("process_count", process_count),
+            ("chunk_size", chunk_size),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"Found invalid {name} '{value}', must be > 0.")
+        self._logger = core_utilities.get_cls_logger(type(self))
+        self._process_count = process_count
+        self._chunk_size = chunk_size
+
+    @staticmethod
+    def _get_midi_file_path_iterator(
+        midi_corpus: str | os.PathLike | typing.Iterable[str | os.PathLike],
+    ) -> typing.Iterator[str]:
+        if isinstance(midi_corpus, (str, os.PathLike)):
+            midi_file_extension_tuple = (
+                midi_converters.configurations.MIDI_FILE_EXTENSION_TUPLE
+            )
+            for directory_path, directory_name_list, file_name_list in os.walk(
+                midi_corpus
+            ):
+                # Sort to get the same order on all file systems
+                directory_name_list.sort()
+                for file_name in sorted(file_name_list):
+                    if file_name.lower().endswith(midi_file_extension_tuple):
+                        yield os.path.join(directory_path, file_name)
+        else:
+            yield from map(os.fspath, midi_corpus)
+
+    @abc.abstractmethod
+    def _midi_file_path_tuple_to_result(
+        self, midi_file_path_tuple: tuple[str, ...]
+    ) -> typing.Any:
+        """Read a chunk of midi files (this is called in the processes)"""
+
+    def _midi_corpus_to_result_iterator(
+        self, midi_corpus: str | os.PathLike | typing.Iterable[str | os.PathLike]
+    ) -> typing.Iterator[typing.Any]:
+        """Yield the result of each chunk (in the order of the paths)"""
+        midi_file_path_iterator = self._get_midi_file_path_iterator(midi_corpus)
+        midi_file_path_tuple_iterator = iter(
+            lambda: tuple(itertools.islice(midi_file_path_iterator, self._chunk_size)),
+            tuple([]),
+        )
+        if self._process_count == 1:
+            yield from map(
+                self._midi_file_path_tuple_to_result, midi_file_path_tuple_iterator
+            )
+            return
+
+        process_count = self._process_count or os.cpu_count() or 1
+        with concurrent.futures.ProcessPoolExecutor(process_count) as executor:
+            # Only a few chunks are submitted in advance, so that the
+            # paths are still read lazily.
+            future_deque: collections.deque[concurrent.futures.Future] = (
+                collections.deque()
+            )
+            for midi_file_path_tuple in midi_file_path_tuple_iterator:
+                future_deque.append(
+                    executor.submit(
+                        self._midi_file_path_tuple_to_result, midi_file_path_tuple
+                    )
+                )
+                if len(future_deque) >= 2 * process_count:
+                    yield future_deque.popleft().result()
+            while future_deque:
+                yield future_deque.popleft().result()
+
+    def _report_failed_path_tuple(self, failed_path_tuple: tuple[str, ...]):
+        if failed_path_tuple:
+            self._logger.warning(
+                "Skipped %s midi files which couldn't be read.", len(failed_path_tuple)
+            )
+
+    @abc.abstractmethod
+    def convert(
+        self, midi_corpus: str | os.PathLike | typing.Iterable[str | os.PathLike]
+    ) -> typing.Any: ...
+
+
+class MidiCorpusToStatistics(MidiCorpusConverter):
+    """Sum the statistics of many midi files in a process pool.
+
+    :param midi_file_to_statistics: The converter which counts the notes
+        of each midi file. If ``None`` the default
+        :class:`MidiFileToStatistics` is used. Default to ``None``.
+    :type midi_file_to_statistics: typing.Optional[MidiFileToStatistics]
+    :param process_count: See :class:`MidiCorpusConverter`.
+    :type process_count: typing.Optional[int]
+    :param chunk_size: See :class:`MidiCorpusConverter`.
+    :type chunk_size: typing.Optional[int]
+
+    Midi files which can't be read are skipped and returned in
+    :attr:`MidiStatistics.failed_path_tuple`.
+    """
+
+    def __init__(
+        self,
+        midi_file_to_statistics: typing.Optional[MidiFileToStatistics] = None,
+        process_count: typing.Optional[int] = None,
+        chunk_size: typing.Optional[int] = None,
+    ):
+        super().__init__(process_count, chunk_size)
+        self._midi_file_to_statistics = (
+            midi_file_to_statistics or MidiFileToStatistics()
+        )
+
+    def _midi_file_path_tuple_to_result(
+        self, midi_file_path_tuple: tuple[str, ...]
+    ) -> MidiStatistics:
+        midi_statistics = MidiStatistics(0, 0, fractions.Fraction(0), {})
+        for midi_file_path in midi_file_path_tuple:
+            try:
+                midi_file_statistics = self._midi_file_to_statistics.convert(
+                    midi_file_path
+                )
+            except (OSError, EOFError, ValueError) as error:
+                self._logger.debug("Skipped midi file '%s': %s", midi_file_path, error)
+                midi_file_statistics = MidiStatistics(
+                    0, 0, fractions.Fraction(0), {}, (midi_file_path,)
+                )
+            midi_statistics = midi_statistics.merge(midi_file_statistics)
+        return midi_statistics
+
+    def convert(
+        self, midi_corpus: str | os.PathLike | typing.Iterable[str | os.PathLike]
+    ) -> MidiStatistics:
+        """Sum the statistics of midi files.
+
+        :param midi_corpus: A directory or the paths of the midi files
+            (see :class:`MidiCorpusConverter`).
+        :type midi_corpus: str | os.PathLike | typing.Iterable[str | os.PathLike]
+        """
+
+        midi_statistics = MidiStatistics(0, 0, fractions.Fraction(0), {})
+        for chunk_midi_statistics in self._midi_corpus_to_result_iterator(midi_corpus):
+            midi_statistics = midi_statistics.merge(chunk_midi_statistics)
+        self._report_failed_path_tuple(midi_statistics.failed_path_tuple)
+        return midi_statistics
+
+
+class MidiCorpusToDuplicateTuple(MidiCorpusConverter):
+    """Find midi files with the same note content in a process pool.
+
+    :param midi_file_to_fingerprint: The converter which hashes the note
+        content of each midi file. If ``None`` the default
+        :class:`MidiFileToFingerprint` is used. Default to ``None``.
+    :type midi_file_to_fingerprint: typing.Optional[MidiFileToFingerprint]
+    :param process_count: See :class:`MidiCorpusConverter`.
+    :type process_count: typing.Optional[int]
+    :param chunk_size: See :class:`MidiCorpusConverter`.
+    :type chunk_size: typing.Optional[int]
+
+    Midi files without any note and midi files which can't be read are
+    skipped.
+    """
+
+    def __init__(
+        self,
+        midi_file_to_fingerprint: typing.Optional[
+            "midi_converters.MidiFileToFingerprint"
+        ] = None,
+        process_count: typing.Optional[int] = None,
+        chunk_size: typing.Optional[int] = None,
+    ):
+        super().__init__(process_count, chunk_size)
+        self._midi_file_to_fingerprint = (
+            midi_file_to_fingerprint or midi_converters.MidiFileToFingerprint()
+        )
+
+    def _midi_file_path_tuple_to_result(
+        self, midi_file_path_tuple: tuple[str, ...]
+    ) -> list[tuple[str, typing.Optional[str]]]:
+        path_and_fingerprint_list = []
+        for midi_file_path in midi_file_path_tuple:
+            try:
+                fingerprint = self._midi_file_to_fingerprint.convert(midi_file_path)
+            except (OSError, EOFError, ValueError) as error:
+                self._logger.debug("Skipped midi file '%s': %s", midi_file_path, error)
+                fingerprint = None
+            path_and_fingerprint_list.append((midi_file_path, fingerprint))
+        return path_and_fingerprint_list
+
+    def convert(
+        self, midi_corpus: str | os.PathLike | typing.Iterable[str | os.PathLike]
+    ) -> tuple[tuple[str, ...], ...]:
+        """Group the paths of midi files with the same note content.
+
+        :param midi_corpus: A directory or the paths of the midi files
+            (see :class:`MidiCorpusConverter`).
+        :type midi_corpus: str | os.PathLike | typing.Iterable[str | os.PathLike]
+        :return: One tuple of paths for each note content which was
+            found in more than one midi file (in the order of the paths).
+        """
+
+        empty_fingerprint = self._midi_file_to_fingerprint.empty_fingerprint
+        fingerprint_to_path_list: dict[str, list[str]] = {}
+        failed_path_list = []
+        for path_and_fingerprint_list in self._midi_corpus_to_result_iterator(
+            midi_corpus
+        ):
+            for path, fingerprint in path_and_fingerprint_list:
+                if fingerprint is None:
+                    failed_path_list.append(path)
+                elif fingerprint != empty_fingerprint:
+                    fingerprint_to_path_list.setdefault(fingerprint, []).append(path)
+        self._report_failed_path_tuple(tuple(failed_path_list))
+        return tuple(
+            tuple(path_list)
+            for path_list in fingerprint_to_path_list.values()
+            if len(path_list) > 1
+        )
@@ -0,0 +1,142 @@
+"""Collect conditions which are reported during a conversion.
+
+Some conditions (like a too large pitch bending or a too slow tempo) can
+occur very often during the conversion of one event, e.g. for each tick of
+a glissando. Instead of formatting and logging a warning for each
+occurrence, mutwo converters report those conditions to a
+:class:`DiagnosticCollector` which counts them and emits one summary
+at the end of the conversion.
+"""
+
+import contextvars
+import logging
+import typing
+
+__all__ = ("DiagnosticCollector",)
+
+
+_active_diagnostic_collector: contextvars.ContextVar[
+    typing.Optional["DiagnosticCollector"]
+] = contextvars.ContextVar("active_diagnostic_collector", default=None)
+
+
+class DiagnosticCollector(object):
+    """Count and deduplicate conditions reported during one conversion.
+
+    :param logger: The logger to which the summary is written if a
+        condition has been reported without an explicit logger.
+    :type logger: logging.Logger
+
+    A collector is activated by using it as a context manager. While it
+    is active, all conditions which are reported via
+    :meth:`DiagnosticCollector.report` are only counted. When leaving the
+    context, one summary is logged per logger. If no collector is active,
+    :meth:`DiagnosticCollector.report` logs the message immediately.
+
+    **Example:**
+
+    >>> import logging
+    >>> from mutwo import midi_converters
+    >>> logger = logging.getLogger("example")
+    >>> with midi_converters.DiagnosticCollector(logger) as collector:
+    ...     for _ in range(1000):
+    ...         midi_converters.DiagnosticCollector.report(
+    ...             logger, "too-loud", "Found too loud note '%s'.", 130
+    ...         )
+    ...     collector.count("too-loud")
+    1000
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+        # condition -> [logger, message, argument_tuple, count]
+        self._condition_to_data: dict[typing.Hashable, list] = {}
+        self._token_list: list[contextvars.Token] = []
+
+    def __enter__(self) -> "DiagnosticCollector":
+        self._token_list.append(_active_diagnostic_collector.set(self))
+        return self
+
+    def __exit__(self, *_):
+        _active_diagnostic_collector.reset(self._token_list.pop())
+        self.flush()
+
+    # ###################################################################### #
+    #                          public methods                                #
+    # ###################################################################### #
+
+    @staticmethod
+    def report(
+        logger: logging.Logger,
+        condition: typing.Hashable,
+        message: str,
+        *argument: typing.Any,
+    ):
+        """Report a condition to the active collector (or log it directly).
+
+        :param logger: The logger of the reporting object.
+        :type logger: logging.Logger
+        :param condition: A hashable key which identifies the condition.
+            Reports with the same condition are merged into one line
+            of the summary.
+        :type condition: typing.Hashable
+        :param message: A %-style format string. It is only formatted
+            once per condition, when the summary is emitted.
+        :type message: str
+        :param argument: The arguments for the format string.
+        :type argument: typing.Any
+        """
+        collector = _active_diagnostic_collector.get()
+        if collector is None:
+            logger.warning(message, *argument)
+        else:
+            collector.add(condition, message, *argument, logger=logger)
+
+    def add(
+        self,
+        condition: typing.Hashable,
+        message: str,
+        *argument: typing.Any,
+        logger: typing.Optional[logging.Logger] = None,
+    ):
+        """Count a condition. Only the arguments of the first report are kept.
+
+        :param condition: A hashable key which identifies the condition.
+        :type condition: typing.Hashable
+        :param message: A %-style format string.
+        :type message: str
+        :param argument: The arguments for the format string.
+        :type argument: typing.Any
+        :param logger: The logger to which the summary line of this
+            condition is written. If ``None`` the logger of the collector
+            is used. Default to ``None``.
+        :type logger: typing.Optional[logging.Logger]
+        """
+        try:
+            self._condition_to_data[condition][3] += 1
+        except KeyError:
+            self._condition_to_data[condition] = [
+                logger or self._logger,
+                message,
+                argument,
+                1,
+            ]
+
+    def count(self, condition: typing.Hashable) -> int:
+        """How often the condition has been reported since the last flush."""
+        try:
+            return self._condition_to_data[condition][3]
+        except KeyError:
+            return 0
+
+    def flush(self):
+        """Log one summary per logger and reset all counters."""
+        logger_to_line_list: dict[logging.Logger, list[str]] = {}
+        for logger, message, argument, count in self._condition_to_data.values():
+            line = message % argument if argument else message
+            if count > 1:
+                line = f"{line} (reported {count} times)"
+            logger_to_line_list.setdefault(logger, []).append(line)
+        self._condition_to_data = {}
+        for logger, line_list in logger_to_line_list.items():
+            logger.warning("\n\t".join(line_list))
@@ -2,9 +2,14 @@
 
 """
 
+import bisect
+import collections
 import functools
+import heapq
 import itertools
 import operator
+import os
+import struct
 import typing
 
 import mido  # type: ignore
@@ -20,8 +25,13 @@ from mutwo import music_parameters
 
 __all__ = (
     "ChrononToControlMessageTuple",
+    "ControlEnvelope",
+    "ChrononToControlEnvelopeTuple",
     "CentDeviationToPitchBendingNumber",
     "MutwoPitchToMidiPitch",
+    "MutwoPitchToMidiTuning",
+    "MidiFileToBytes",
+    "EventIntervalIndex",
     "EventToMidiFile",
 )
 
@@ -31,6 +41,9 @@ ConvertableEvent = (
     | core_events.Concurrence[core_events.Consecution[core_events.Chronon]]
 )
 
+WritableBuffer = bytearray | memoryview
+"""Preallocated buffer into which a midi file can be written."""
+
 
 class ChrononToControlMessageTuple(core_converters.ChrononToAttribute):
     """Convert :class:`mutwo.core_events.Chronon` to a tuple of control messages"""
@@ -47,6 +60,50 @@ class ChrononToControlMessageTuple(core_converters.ChrononToAttribute):
         )
 
 
+class ControlEnvelope(typing.NamedTuple):
+    """Continuous change of a midi controller during a chronon.
+
+    The envelope is stretched to the duration of the chronon and rendered
+    for each of its tones on the midi channel of the tone. Its values
+    are midi values (from 0 to 127).
+
+    **Example:**
+
+    >>> from mutwo import core_events
+    >>> from mutwo import midi_converters
+    >>> from mutwo import music_events
+    >>> note_like = music_events.NoteLike('c', 4)
+    >>> # Crescendo by using the expression controller
+    >>> note_like.control_envelope_tuple = (
+    ...     midi_converters.ControlEnvelope(
+    ...         'control_change', core_events.Envelope([[0, 40], [1, 100]]), 11
+    ...     ),
+    ... )
+    """
+
+    message_type: str
+    """Either 'control_change', 'aftertouch' (channel pressure) or
+    'polytouch' (key pressure of the tone)"""
+    envelope: core_events.Envelope
+    control: int = 0
+    """The controller number (only used for 'control_change')"""
+
+
+class ChrononToControlEnvelopeTuple(core_converters.ChrononToAttribute):
+    """Convert :class:`mutwo.core_events.Chronon` to a tuple of :class:`ControlEnvelope`"""
+
+    def __init__(
+        self,
+        attribute_name: typing.Optional[str] = None,
+        exception_value: tuple[ControlEnvelope, ...] = tuple([]),
+    ):
+        super().__init__(
+            attribute_name
+            or midi_converters.configurations.DEFAULT_CONTROL_ENVELOPE_TUPLE_ATTRIBUTE_NAME,
+            exception_value,
+        )
+
+
 class CentDeviationToPitchBendingNumber(core_converters.abc.Converter):
     """Convert cent deviation to midi pitch bend number.
 
@@ -60,22 +117,23 @@ class CentDeviationToPitchBendingNumber(core_converters.abc.Converter):
 
     def __init__(self, maximum_pitch_bend_deviation: typing.Optional[float] = None):
         self._logger = core_utilities.get_cls_logger(type(self))
-        self._maximum_pitch_bend_deviation = maximum_pitch_bend_deviation = (
+        self._maximum_pitch_bend_deviation = (
             maximum_pitch_bend_deviation
             or midi_converters.configurations.DEFAULT_MAXIMUM_PITCH_BEND_DEVIATION_IN_CENTS
         )
-        self._pitch_bending_warning = (
-            f"Maximum pitch bending is {maximum_pitch_bend_deviation} cents up or down!"
-        )
 
     def _warn_pitch_bending(self, cent_deviation: core_constants.Real):
-        self._logger.warning(
-            f"Maximum pitch bending is {self._maximum_pitch_bend_deviation} "
+        midi_converters.DiagnosticCollector.report(
+            self._logger,
+            ("pitch_bending", self._maximum_pitch_bend_deviation),
+            "Maximum pitch bending is %s "
             "cents up or down! Found prohibited necessity for pitch "
-            f"bending with cent_deviation = {cent_deviation}. "
+            "bending with cent_deviation = %s. "
             "Mutwo normalized pitch bending to the allowed border."
             " Increase the 'maximum_pitch_bend_deviation' argument in the "
-            "CentDeviationToPitchBendingNumber instance."
+            "CentDeviationToPitchBendingNumber instance.",
+            self._maximum_pitch_bend_deviation,
+            cent_deviation,
         )
 
     def convert(
@@ -113,10 +171,13 @@ class MutwoPitchToMidiPitch(core_converters.abc.Converter):
 
     def __init__(
         self,
-        cent_deviation_to_pitch_bending_number: CentDeviationToPitchBendingNumber = CentDeviationToPitchBendingNumber(),
+        cent_deviation_to_pitch_bending_number: typing.Optional[
+            CentDeviationToPitchBendingNumber
+        ] = None,
     ):
         self._cent_deviation_to_pitch_bending_number = (
             cent_deviation_to_pitch_bending_number
+            or CentDeviationToPitchBendingNumber()
         )
 
     def convert(
@@ -151,6 +212,628 @@ class MutwoPitchToMidiPitch(core_converters.abc.Converter):
         return closest_midi_pitch, pb
 
 
+class MutwoPitchToMidiTuning(core_converters.abc.Converter):
+    """Convert mutwo pitch to midi note and frequency of the midi tuning standard.
+
+    The midi note is the closest midi pitch (like in
+    :class:`MutwoPitchToMidiPitch`). The frequency is represented by a
+    semitone and a fraction with a resolution of 1/16384 semitone, so it
+    can be sent to any key with a 'single note tuning change' message.
+    Frequencies outside of the midi range are clipped.
+
+    **Example:**
+
+    >>> from mutwo import midi_converters
+    >>> from mutwo import music_parameters
+    >>> mutwo_pitch_to_midi_tuning = midi_converters.MutwoPitchToMidiTuning()
+    >>> mutwo_pitch_to_midi_tuning.convert(music_parameters.WesternPitch('a', 4))
+    (69, (69, 0, 0))
+    >>> mutwo_pitch_to_midi_tuning.convert(music_parameters.WesternPitch('aqs', 4))
+    (69, (69, 64, 0))
+    """
+
+    def convert(
+        self, mutwo_pitch_to_convert: music_parameters.abc.Pitch
+    ) -> tuple[
+        midi_converters.constants.MidiNote,
+        midi_converters.constants.MidiTuningFrequency,
+    ]:
+        """Find midi note and midi tuning frequency for given mutwo pitch
+
+        :param mutwo_pitch_to_convert: The mutwo pitch which shall be converted.
+        :type mutwo_pitch_to_convert: music_parameters.abc.Pitch
+        """
+        f = mutwo_pitch_to_convert.hertz
+        midi_pitch_frequency_tuple = (
+            music_parameters.constants.MIDI_PITCH_FREQUENCY_TUPLE
+        )
+        closest_midi_pitch = core_utilities.find_closest_index(
+            f, midi_pitch_frequency_tuple
+        )
+        resolution = midi_converters.constants.MIDI_TUNING_RESOLUTION
+        step_count = closest_midi_pitch * resolution + round(
+            music_parameters.abc.Pitch.hertz_to_cents(
+                midi_pitch_frequency_tuple[closest_midi_pitch], f
+            )
+            * resolution
+            / 100
+        )
+        # 127, 127, 127 means 'no change', so the highest frequency
+        # is one step lower.
+        step_count = min(max(step_count, 0), 128 * resolution - 2)
+        semitone, fraction = divmod(step_count, resolution)
+        return closest_midi_pitch, (semitone, fraction >> 7, fraction & 0x7F)
+
+
+class _TuningRequest(mido.Message):
+    """Request the tuning of the next 'note_on' message of the same track.
+
+    Its data is a valid 'single note tuning change' of one key, but all
+    requests are replaced by :meth:`EventToMidiFile._resolve_tuning_requests`.
+    """
+
+    @classmethod
+    def from_frequency(
+        cls,
+        midi_note: midi_converters.constants.MidiNote,
+        frequency: midi_converters.constants.MidiTuningFrequency,
+        time: int,
+    ) -> "_TuningRequest":
+        return cls(
+            "sysex",
+            data=midi_converters.constants.SINGLE_NOTE_TUNING_CHANGE_HEADER
+            + (0, 1, midi_note)
+            + frequency,
+            time=time,
+        )
+
+    @property
+    def frequency(self) -> midi_converters.constants.MidiTuningFrequency:
+        return tuple(self.data[-3:])
+
+
+class _ControlEnvelopeMessage(mido.Message):
+    """A message which has been rendered from a :class:`ControlEnvelope`.
+
+    Unlike control messages which are passed by the user, these messages
+    are omitted if they don't change the value of their controller.
+    """
+
+
+class _SingleNoteTuningState(object):
+    """Assign keys to tuned notes and collect 'single note tuning changes'.
+
+    Keys keep their tuning until they are retuned, so a key which is
+    already tuned to the frequency of a new note is used again. Otherwise
+    the requested key, or the closest key which is neither sounding nor
+    released in the same tick, is retuned.
+    """
+
+    def __init__(self, logger):
+        self._logger = logger
+        self._key_to_frequency: list[midi_converters.constants.MidiTuningFrequency] = [
+            (key, 0, 0) for key in range(128)
+        ]
+        self._frequency_to_key_set: dict[
+            midi_converters.constants.MidiTuningFrequency, set[int]
+        ] = {(key, 0, 0): {key} for key in range(128)}
+        self._key_to_sounding_channel_list: list[list[int]] = [[] for _ in range(128)]
+        # No key has been released yet
+        self._key_to_release_tick = [-2] * 128
+        # (track index, midi channel, requested key) -> keys of sounding notes
+        self._note_key_to_key_deque: dict[tuple[int, int, int], collections.deque] = {}
+        self._tick_to_retuning_dict: dict[int, dict[int, tuple]] = {}
+
+    def _is_free(self, key: int, tick: int) -> bool:
+        return (
+            not self._key_to_sounding_channel_list[key]
+            # Tuning messages are sent one tick before the note starts
+            and self._key_to_release_tick[key] < tick - 1
+        )
+
+    def _find_key(
+        self,
+        tick: int,
+        midi_channel: int,
+        requested_key: int,
+        frequency: midi_converters.constants.MidiTuningFrequency,
+    ) -> int:
+        sounding_channel_list = self._key_to_sounding_channel_list
+        tuned_key_list = sorted(
+            (
+                key
+                for key in self._frequency_to_key_set.get(frequency, ())
+                if midi_channel not in sounding_channel_list[key]
+            ),
+            key=lambda key: abs(key - requested_key),
+        )
+        if tuned_key_list:
+            return tuned_key_list[0]
+        for distance in range(128):
+            for key in (requested_key - distance, requested_key + distance):
+                if 0 <= key < 128 and self._is_free(key, tick):
+                    return key
+        midi_converters.DiagnosticCollector.report(
+            self._logger,
+            "no_free_midi_key",
+            "Found no free key to tune note on message at tick %s, "
+            "sounding notes are retuned.",
+            tick,
+        )
+        return requested_key
+
+    def start_note(
+        self,
+        tick: int,
+        track_index: int,
+        midi_message: mido.Message,
+        frequency: midi_converters.constants.MidiTuningFrequency,
+    ) -> int:
+        midi_channel, requested_key = midi_message.channel, midi_message.note
+        key = self._find_key(tick, midi_channel, requested_key, frequency)
+        if (previous_frequency := self._key_to_frequency[key]) != frequency:
+            self._frequency_to_key_set[previous_frequency].discard(key)
+            self._frequency_to_key_set.setdefault(frequency, set()).add(key)
+            self._key_to_frequency[key] = frequency
+            self._tick_to_retuning_dict.setdefault(tick, {})[key] = frequency
+        self._key_to_sounding_channel_list[key].append(midi_channel)
+        self._note_key_to_key_deque.setdefault(
+            (track_index, midi_channel, requested_key), collections.deque()
+        ).append(key)
+        return key
+
+    def stop_note(self, tick: int, track_index: int, midi_message: mido.Message) -> int:
+        note_key = (track_index, midi_message.channel, midi_message.note)
+        try:
+            key_deque = self._note_key_to_key_deque[note_key]
+        except KeyError:
+            return midi_message.note
+        key = key_deque.popleft()
+        if not key_deque:
+            del self._note_key_to_key_deque[note_key]
+        self._key_to_sounding_channel_list[key].remove(midi_message.channel)
+        self._key_to_release_tick[key] = tick
+        return key
+
+    def get_key(self, track_index: int, midi_message: mido.Message) -> int:
+        """Find the key of the sounding note of a 'polytouch' message."""
+        key_deque = self._note_key_to_key_deque.get(
+            (track_index, midi_message.channel, midi_message.note)
+        )
+        return key_deque[-1] if key_deque else midi_message.note
+
+    def get_tuning_message_data_list(self) -> list[tuple[int, tuple[int, ...]]]:
+        tuning_message_data_list = []
+        maximum_count = (
+            midi_converters.constants.MAXIMUM_SINGLE_NOTE_TUNING_CHANGE_COUNT
+        )
+        for tick, retuning_dict in self._tick_to_retuning_dict.items():
+            retuning_list = sorted(retuning_dict.items())
+            for index in range(0, len(retuning_list), maximum_count):
+                retuning_tuple = retuning_list[index : index + maximum_count]
+                tuning_message_data_list.append(
+                    (
+                        tick,
+                        midi_converters.constants.SINGLE_NOTE_TUNING_CHANGE_HEADER
+                        + (0, len(retuning_tuple))
+                        + tuple(
+                            value
+                            for key, frequency in retuning_tuple
+                            for value in (key,) + frequency
+                        ),
+                    )
+                )
+        return tuning_message_data_list
+
+
+class _ScaleOctaveTuningState(object):
+    """Collect 'scale/octave tuning' messages for all tuned notes.
+
+    All keys of one pitch class share the same tuning, so notes are never
+    moved to other keys. If a pitch class needs to be retuned while one
+    of its notes is sounding, the sounding note is retuned as well.
+    """
+
+    def __init__(self, logger):
+        self._logger = logger
+        neutral_value = midi_converters.constants.MIDI_TUNING_RESOLUTION // 2
+        self._pitch_class_to_value = [neutral_value] * 12
+        self._pitch_class_to_sounding_count = [0] * 12
+        self._tick_to_value_tuple: dict[int, tuple[int, ...]] = {}
+
+    def start_note(
+        self,
+        tick: int,
+        track_index: int,
+        midi_message: mido.Message,
+        frequency: midi_converters.constants.MidiTuningFrequency,
+    ) -> int:
+        resolution = midi_converters.constants.MIDI_TUNING_RESOLUTION
+        semitone, msb, lsb = frequency
+        # The 14 bit value covers -100 to 100 cents
+        value = min(
+            max(
+                resolution // 2
+                + round(
+                    ((semitone - midi_message.note) * resolution + (msb << 7) + lsb) / 2
+                ),
+                0,
+            ),
+            resolution - 1,
+        )
+        pitch_class = midi_message.note % 12
+        if self._pitch_class_to_value[pitch_class] != value:
+            if self._pitch_class_to_sounding_count[pitch_class]:
+                midi_converters.DiagnosticCollector.report(
+                    self._logger,
+                    "scale_octave_tuning_conflict",
+                    "Pitch class %s is retuned at tick %s while one "
+                    "of its notes is sounding.",
+                    pitch_class,
+                    tick,
+                )
+            self._pitch_class_to_value[pitch_class] = value
+            self._tick_to_value_tuple[tick] = tuple(self._pitch_class_to_value)
+        self._pitch_class_to_sounding_count[pitch_class] += 1
+        return midi_message.note
+
+    def stop_note(self, tick: int, track_index: int, midi_message: mido.Message) -> int:
+        pitch_class = midi_message.note % 12
+        if self._pitch_class_to_sounding_count[pitch_class]:
+            self._pitch_class_to_sounding_count[pitch_class] -= 1
+        return midi_message.note
+
+    def get_key(self, track_index: int, midi_message: mido.Message) -> int:
+        return midi_message.note
+
+    def get_tuning_message_data_list(self) -> list[tuple[int, tuple[int, ...]]]:
+        return [
+            (
+                tick,
+                midi_converters.constants.SCALE_OCTAVE_TUNING_HEADER
+                # All midi channels
+                + (0x03, 0x7F, 0x7F)
+                + tuple(
+                    byte for value in value_tuple for byte in (value >> 7, value & 0x7F)
+                ),
+            )
+            for tick, value_tuple in self._tick_to_value_tuple.items()
+        ]
+
+
+class MidiFileToBytes(core_converters.abc.Converter):
+    """Encode a :class:`mido.MidiFile` to the bytes of a standard midi file.
+
+    The result is identical to :meth:`mido.MidiFile.save`, but the file
+    is encoded into one buffer without writing to the disk and with
+    fast paths for channel messages.
+
+    **Example:**
+
+    >>> import mido
+    >>> from mutwo import midi_converters
+    >>> midi_file = mido.MidiFile(tracks=[mido.MidiTrack([mido.Message('note_on')])])
+    >>> midi_converters.MidiFileToBytes().convert(midi_file)[:4]
+    b'MThd'
+    """
+
+    # Status bytes of channel messages with two data bytes
+    _MESSAGE_TYPE_TO_STATUS_BYTE = {
+        "note_off": 0x80,
+        "note_on": 0x90,
+        "polytouch": 0xA0,
+        "control_change": 0xB0,
+    }
+    _MESSAGE_TYPE_TO_DATA_ATTRIBUTE_NAME_PAIR = {
+        "note_off": ("note", "velocity"),
+        "note_on": ("note", "velocity"),
+        "polytouch": ("note", "value"),
+        "control_change": ("control", "value"),
+    }
+    # Meta messages with text which is encoded with the charset of the
+    # midi file (all other meta messages are encoded by mido).
+    _META_MESSAGE_TYPE_TO_TYPE_BYTE_AND_TEXT_ATTRIBUTE_NAME = {
+        "text": (0x01, "text"),
+        "copyright": (0x02, "text"),
+        "track_name": (0x03, "name"),
+        "instrument_name": (0x04, "name"),
+        "lyrics": (0x05, "text"),
+        "marker": (0x06, "text"),
+        "cue_marker": (0x07, "text"),
+        "device_name": (0x09, "name"),
+    }
+
+    @staticmethod
+    def _extend_by_variable_int(data: bytearray, value: int):
+        if value < 0x80:
+            data.append(value)
+        else:
+            byte_list = [value & 0x7F]
+            value >>= 7
+            while value:
+                byte_list.append((value & 0x7F) | 0x80)
+                value >>= 7
+            data.extend(reversed(byte_list))
+
+    @staticmethod
+    def _get_message_iterator(
+        track: mido.MidiTrack,
+    ) -> typing.Iterator[mido.Message | mido.MetaMessage]:
+        """Iterate over the messages of a track with exactly one 'end_of_track' at its end"""
+        # Delta time of the removed 'end_of_track' messages
+        accumulated_time = 0
+        for message in track:
+            if message.type == "end_of_track":
+                accumulated_time += message.time
+            elif accumulated_time:
+                yield message.copy(time=accumulated_time + message.time)
+                accumulated_time = 0
+            else:
+                yield message
+        yield mido.MetaMessage("end_of_track", time=accumulated_time)
+
+    def _extend_by_meta_message(
+        self, data: bytearray, message: mido.MetaMessage, charset: str
+    ):
+        try:
+            (
+                type_byte,
+                attribute_name,
+            ) = self._META_MESSAGE_TYPE_TO_TYPE_BYTE_AND_TEXT_ATTRIBUTE_NAME[
+                message.type
+            ]
+        except KeyError:
+            data.extend(message.bytes())
+        else:
+            text_bytes = getattr(message, attribute_name).encode(charset)
+            data.append(0xFF)
+            data.append(type_byte)
+            self._extend_by_variable_int(data, len(text_bytes))
+            data.extend(text_bytes)
+
+    def _encode_track(self, data: bytearray, track: mido.MidiTrack, charset: str):
+        status_byte_dict = self._MESSAGE_TYPE_TO_STATUS_BYTE
+        attribute_name_pair_dict = self._MESSAGE_TYPE_TO_DATA_ATTRIBUTE_NAME_PAIR
+        extend_by_variable_int = self._extend_by_variable_int
+
+        data.extend(b"MTrk\0\0\0\0")
+        track_start = len(data)
+        running_status_byte = None
+        for message in self._get_message_iterator(track):
+            if not isinstance(message.time, int) or message.time < 0:
+                raise ValueError(
+                    f"Found invalid time '{message.time}' of message '{message}': "
+                    "message time must be a non-negative int in midi files."
+                )
+            extend_by_variable_int(data, message.time)
+            message_type = message.type
+            if (status_byte := status_byte_dict.get(message_type)) is not None:
+                status_byte |= message.channel
+                if status_byte != running_status_byte:
+                    data.append(status_byte)
+                    running_status_byte = status_byte
+                attribute_name0, attribute_name1 = attribute_name_pair_dict[
+                    message_type
+                ]
+                data.append(getattr(message, attribute_name0))
+                data.append(getattr(message, attribute_name1))
+            elif message_type == "pitchwheel":
+                status_byte = 0xE0 | message.channel
+                if status_byte != running_status_byte:
+                    data.append(status_byte)
+                    running_status_byte = status_byte
+                pitch = message.pitch - mido.MIN_PITCHWHEEL
+                data.append(pitch & 0x7F)
+                data.append(pitch >> 7)
+            elif message.is_meta:
+                self._extend_by_meta_message(data, message, charset)
+                running_status_byte = None
+            elif message_type == "sysex":
+                data.append(0xF0)
+                # length (+ 1 for end byte (0xf7))
+                extend_by_variable_int(data, len(message.data) + 1)
+                data.extend(message.data)
+                data.append(0xF7)
+                running_status_byte = None
+            elif message.is_realtime:
+                raise ValueError(
+                    f"Found realtime message '{message}': realtime messages "
+                    "are not allowed in midi files."
+                )
+            else:
+                message_bytes = message.bytes()
+                status_byte = message_bytes[0]
+                if status_byte == running_status_byte:
+                    data.extend(message_bytes[1:])
+                else:
+                    data.extend(message_bytes)
+                running_status_byte = status_byte if status_byte < 0xF0 else None
+
+        struct.pack_into(">L", data, track_start - 4, len(data) - track_start)
+
+    def _encode(self, midi_file: mido.MidiFile) -> bytearray:
+        if midi_file.type == 0 and len(midi_file.tracks) != 1:
+            raise ValueError("Midi files of type 0 must have exactly 1 track.")
+        data = bytearray(b"MThd")
+        data.extend(
+            struct.pack(
+                ">Lhhh",
+                6,
+                midi_file.type,
+                len(midi_file.tracks),
+                midi_file.ticks_per_beat,
+            )
+        )
+        for track in midi_file.tracks:
+            self._encode_track(data, track, midi_file.charset)
+        return data
+
+    def convert(
+        self,
+        midi_file: mido.MidiFile,
+        buffer: typing.Optional[WritableBuffer | typing.BinaryIO] = None,
+    ) -> bytes | int:
+        """Encode a midi file.
+
+        :param midi_file: The midi file which shall be encoded.
+        :type midi_file: mido.MidiFile
+        :param buffer: If ``None`` the encoded midi file is returned as
+            bytes. If this is a binary file-like object (anything with a
+            ``write`` method, e.g. a socket file or :class:`io.BytesIO`) the
+            encoded midi file is written to it. If this is a preallocated
+            :class:`bytearray` or :class:`memoryview` the encoded midi file
+            is written to its start (a :class:`ValueError` is raised if the
+            buffer is too small). Default to ``None``.
+        :type buffer: typing.Optional[WritableBuffer | typing.BinaryIO]
+        :return: The bytes of the midi file if no buffer has been passed,
+            otherwise the number of written bytes.
+        """
+        data = self._encode(midi_file)
+        if buffer is None:
+            return bytes(data)
+        elif hasattr(buffer, "write"):
+            buffer.write(data)
+        else:
+            buffer = memoryview(buffer).cast("B")
+            if (byte_count := len(data)) > len(buffer):
+                raise ValueError(
+                    f"Buffer of size '{len(buffer)}' is too small for "
+                    f"midi file of size '{byte_count}'."
+                )
+            buffer[:byte_count] = data
+        return len(data)
+
+
+class EventIntervalIndex(object):
+    """Interval index over the absolute times of all chronons of an event.
+
+    :param event: The event which shall be indexed. Like in
+        :class:`EventToMidiFile` each :class:`mutwo.core_events.Consecution`
+        of a :class:`mutwo.core_events.Concurrence` is one track.
+    :type event: ConvertableEvent
+
+    The chronons of a :class:`mutwo.core_events.Consecution` follow each
+    other without gaps, so their start and end times are sorted. The
+    chronons which overlap a time range are therefore found by binary
+    search. Build the index once and pass it to
+    :meth:`EventToMidiFile.convert` to render many time ranges of a
+    long event: the rendering time then only depends on the size of the
+    time range. The index doesn't notice if the event is changed later.
+
+    **Example:**
+
+    >>> from mutwo import core_events
+    >>> from mutwo import midi_converters
+    >>> consecution = core_events.Consecution(
+    ...     [core_events.Chronon(duration) for duration in (1, 2, 1)]
+    ... )
+    >>> event_interval_index = midi_converters.EventIntervalIndex(consecution)
+    >>> [
+    ...     (float(absolute_time), float(chronon.duration))
+    ...     for absolute_time, chronon in event_interval_index.get_overlapping_chronon_tuple(0, 2, 3.5)
+    ... ]
+    [(1.0, 2.0), (3.0, 1.0)]
+    """
+
+    def __init__(self, event: ConvertableEvent):
+        match event:
+            case core_events.Concurrence():
+                self._consecution_tuple = tuple(event)
+            case core_events.Consecution():
+                self._consecution_tuple = (event,)
+            case core_events.Chronon():
+                self._consecution_tuple = (core_events.Consecution([event]),)
+            case _:
+                raise TypeError(
+                    f"Can't index object '{event}' of type '{type(event)}'."
+                )
+
+        # Per track: (start tuple, end tuple, chronon tuple)
+        self._track_data_list = []
+        for consecution in self._consecution_tuple:
+            start_list: list[float] = []
+            chronon_list: list[core_events.Chronon] = []
+            self._flatten(consecution, 0, start_list, chronon_list)
+            self._track_data_list.append(
+                (
+                    tuple(start_list),
+                    tuple(
+                        start + chronon.duration.beat_count
+                        for start, chronon in zip(start_list, chronon_list)
+                    ),
+                    tuple(chronon_list),
+                )
+            )
+
+    @staticmethod
+    def _flatten(
+        consecution: core_events.Consecution,
+        absolute_time: float,
+        start_list: list[float],
+        chronon_list: list[core_events.Chronon],
+    ):
+        # Durations are rounded floats: adding them as 'DirectDuration'
+        # (like EventToMidiFile does) leads to the same absolute times,
+        # but it's much slower.
+        for local_absolute_time, event in zip(
+            consecution.absolute_time_in_floats_tuple, consecution
+        ):
+            if absolute_time:
+                local_absolute_time = core_parameters.DirectDuration(
+                    local_absolute_time + absolute_time
+                ).beat_count
+            if isinstance(event, core_events.Chronon):
+                start_list.append(local_absolute_time)
+                chronon_list.append(event)
+            else:
+                EventIntervalIndex._flatten(
+                    event, local_absolute_time, start_list, chronon_list
+                )
+
+    @property
+    def consecution_tuple(self) -> tuple[core_events.Consecution, ...]:
+        """The indexed consecutions (one for each track)."""
+        return self._consecution_tuple
+
+    @property
+    def duration(self) -> core_parameters.abc.Duration:
+        """The duration of the indexed event."""
+        return max(
+            (consecution.duration for consecution in self._consecution_tuple),
+            default=core_parameters.DirectDuration(0),
+        )
+
+    def get_overlapping_chronon_tuple(
+        self,
+        track_index: int,
+        start: core_parameters.abc.Duration.Type,
+        end: core_parameters.abc.Duration.Type,
+    ) -> tuple[tuple[core_parameters.abc.Duration, core_events.Chronon], ...]:
+        """Find all chronons of a track which overlap ``start <= time < end``.
+
+        :param track_index: The index of the consecution.
+        :type track_index: int
+        :param start: The start of the time range.
+        :type start: core_parameters.abc.Duration.Type
+        :param end: The end of the time range.
+        :type end: core_parameters.abc.Duration.Type
+        :return: Tuple of absolute times and chronons (sorted by time).
+        """
+        start = core_parameters.abc.Duration.from_any(start).beat_count
+        end = core_parameters.abc.Duration.from_any(end).beat_count
+        start_tuple, end_tuple, chronon_tuple = self._track_data_list[track_index]
+        # Chronons which end after the start and start before the end
+        first_index = bisect.bisect_right(end_tuple, start)
+        last_index = bisect.bisect_left(start_tuple, end, lo=first_index)
+        return tuple(
+            (core_parameters.DirectDuration(absolute_time), chronon)
+            for absolute_time, chronon in zip(
+                start_tuple[first_index:last_index],
+                chronon_tuple[first_index:last_index],
+            )
+        )
+
+
 class EventToMidiFile(core_converters.abc.Converter):
     """Class for rendering standard midi files (SMF) from mutwo data.
 
@@ -229,6 +912,91 @@ class EventToMidiFile(core_converters.abc.Converter):
         midi-file-reading-software if no tempo has been specified). Tempo changes
         are supported (and will be written to the resulting midi file).
     :type tempo: core_parameters.abc.Tempo
+    :param message_template_cache_size: The midi messages of a tone only depend
+        on its pitch (frequency or glissando), velocity and duration. Mutwo
+        therefore caches the messages of each rendered tone as a template and
+        reuses them for identical tones. This parameter sets how many midi
+        messages are stored at most in all templates (the least recently used
+        template is evicted first).
+        Set to 0 to disable the cache, e.g. if a custom ``mutwo_pitch_to_midi_pitch``
+        depends on other pitch properties than the frequency. The cache
+        statistics are available via :attr:`message_template_cache`.
+    :type message_template_cache_size: typing.Optional[int]
+    :param tempo_tolerance_in_beats_per_minute: Midi files can only express
+        constant tempi. Gradual tempo changes of a
+        :class:`mutwo.core_parameters.FlexTempo` (e.g. accelerandi) are
+        therefore approximated by steps. This parameter sets how much the tempo
+        of a step may deviate from the tempo curve. Smaller values lead to more
+        exact timing and to more 'set_tempo' messages.
+    :type tempo_tolerance_in_beats_per_minute: typing.Optional[float]
+    :param clip_notes_to_render_range: Only relevant if a ``render_range``
+        is passed to :meth:`convert`. Notes which cross the start of the
+        render range always start at the beginning of the resulting midi
+        file. If set to ``True`` notes which cross the end of the render
+        range are stopped at its end, otherwise they keep their
+        complete duration. Default to ``True``.
+    :type clip_notes_to_render_range: bool
+    :param track_cache_size: If bigger than 0 the midi messages of each
+        converted :class:`mutwo.core_events.Consecution` are cached. The key
+        of a cached track is the structure of the consecution (durations,
+        pitches, velocities and control messages of all chronons) and its
+        midi channels. When an event is converted again, only the
+        consecutions which changed are rendered again. This parameter sets
+        how many midi messages are stored at most in all cached tracks (the
+        least recently used track is evicted first). Use
+        :attr:`track_cache` to inspect or clear the cache. Default to
+        ``None`` (which uses
+        :const:`mutwo.midi_converters.configurations.DEFAULT_TRACK_CACHE_SIZE`).
+    :type track_cache_size: typing.Optional[int]
+    :param tuning_mode: How microtonal pitches are tuned. ``"pitch_bend"``
+        sends a 'pitchwheel' message before each note, so that only one
+        note per midi channel can be tuned at the same time.
+        ``"single_note"`` and ``"scale_octave"`` send system exclusive
+        messages of the midi tuning standard instead. With
+        ``"single_note"`` each note is played by a key which is tuned to
+        its exact pitch, so that arbitrarily dense microtonal chords can be
+        played on one midi channel. Keys which already have the
+        right tuning are reused and all retunings of one tick are sent in
+        one message. With ``"scale_octave"`` all keys of one pitch class
+        share the same tuning (on all midi channels), which is retuned
+        whenever a note needs another tuning. Glissandi
+        (:class:`mutwo.music_parameters.FlexPitch`) are always rendered with
+        pitch bending. The tuning modes assume that the synthesizer starts
+        in equal temperament. Default to ``None`` (which uses
+        :const:`mutwo.midi_converters.configurations.DEFAULT_TUNING_MODE`).
+    :type tuning_mode: typing.Optional[str]
+    :param mpe_member_channel_count: If bigger than 0 the midi file is
+        rendered for the lower zone of MIDI polyphonic expression (MPE):
+        channel 0 is the master channel and the next
+        ``mpe_member_channel_count`` channels are member channels. Each
+        tone gets its own member channel with its own pitch bending
+        messages (also for glissandi), so that overlapping tones never
+        share a channel. Member channels are taken from a pool which is
+        ordered by release time, so the channel which has been silent the
+        longest is used first. The MPE configuration and the pitch bend
+        range of all member channels are sent once at the start of the
+        first track and pitch bending messages which don't change the
+        pitch bend of their channel are omitted.
+        ``available_midi_channel_tuple`` and ``distribute_midi_channels``
+        are ignored in MPE mode. Default to ``None`` (which uses
+        :const:`mutwo.midi_converters.configurations.DEFAULT_MPE_MEMBER_CHANNEL_COUNT`).
+    :type mpe_member_channel_count: typing.Optional[int]
+    :param chronon_to_control_envelope_tuple: Function to extract a tuple of
+        :class:`ControlEnvelope` from a :class:`mutwo.core_events.Chronon`.
+        Each envelope is rendered for each tone of the chronon on the midi
+        channel of the tone (so in MPE mode each tone has its own
+        expression). By default it asks the chronon for its
+        ``control_envelope_tuple`` attribute and no envelopes are
+        rendered if the chronon doesn't have this attribute.
+    :type chronon_to_control_envelope_tuple: typing.Callable[
+            [core_events.Chronon], tuple[ControlEnvelope, ...]]
+    :param control_value_tolerance: Control envelopes are sampled
+        adaptively: a new message is only sent when the envelope deviates
+        by more than this tolerance (in midi values) from the last sent
+        value. Messages which don't change the value of their controller
+        are omitted. Default to ``None`` (which uses
+        :const:`mutwo.midi_converters.configurations.DEFAULT_CONTROL_VALUE_TOLERANCE`).
+    :type control_value_tolerance: typing.Optional[int]
 
     **Example**:
 
@@ -244,27 +1012,79 @@ class EventToMidiFile(core_converters.abc.Converter):
         signature is always 4/4 for now).
     """
 
+    _TUNING_MODE_TUPLE = ("pitch_bend", "single_note", "scale_octave")
+    _TUNING_MODE_TO_TUNING_STATE_CLASS = {
+        "single_note": _SingleNoteTuningState,
+        "scale_octave": _ScaleOctaveTuningState,
+    }
+
     def __init__(
         self,
-        chronon_to_pitch_list: typing.Callable[
-            [core_events.Chronon], tuple[music_parameters.abc.Pitch, ...]
-        ] = music_converters.ChrononToPitchList(),  # type: ignore
-        chronon_to_volume: typing.Callable[
-            [core_events.Chronon], music_parameters.abc.Volume
-        ] = music_converters.ChrononToVolume(),  # type: ignore
-        chronon_to_control_message_tuple: typing.Callable[
-            [core_events.Chronon], tuple[mido.Message, ...]
-        ] = ChrononToControlMessageTuple(),
+        chronon_to_pitch_list: typing.Optional[
+            typing.Callable[
+                [core_events.Chronon], tuple[music_parameters.abc.Pitch, ...]
+            ]
+        ] = None,
+        chronon_to_volume: typing.Optional[
+            typing.Callable[[core_events.Chronon], music_parameters.abc.Volume]
+        ] = None,
+        chronon_to_control_message_tuple: typing.Optional[
+            typing.Callable[[core_events.Chronon], tuple[mido.Message, ...]]
+        ] = None,
         midi_file_type: int = None,
         available_midi_channel_tuple: tuple[int, ...] = None,
         distribute_midi_channels: bool = False,
         midi_channel_count_per_track: typing.Optional[int] = None,
-        mutwo_pitch_to_midi_pitch: MutwoPitchToMidiPitch = MutwoPitchToMidiPitch(),
+        mutwo_pitch_to_midi_pitch: typing.Optional[MutwoPitchToMidiPitch] = None,
         ticks_per_beat: typing.Optional[int] = None,
         instrument_name: typing.Optional[str] = None,
         tempo: typing.Optional[core_parameters.abc.Tempo] = None,
+        message_template_cache_size: typing.Optional[int] = None,
+        tempo_tolerance_in_beats_per_minute: typing.Optional[float] = None,
+        clip_notes_to_render_range: bool = True,
+        track_cache_size: typing.Optional[int] = None,
+        tuning_mode: typing.Optional[str] = None,
+        mpe_member_channel_count: typing.Optional[int] = None,
+        chronon_to_control_envelope_tuple: typing.Optional[
+            typing.Callable[[core_events.Chronon], tuple[ControlEnvelope, ...]]
+        ] = None,
+        control_value_tolerance: typing.Optional[int] = None,
     ):
         self._logger = core_utilities.get_cls_logger(type(self))
+        self._chronon_to_control_envelope_tuple = (
+            chronon_to_control_envelope_tuple or ChrononToControlEnvelopeTuple()
+        )
+        if control_value_tolerance is None:
+            control_value_tolerance = (
+                midi_converters.configurations.DEFAULT_CONTROL_VALUE_TOLERANCE
+            )
+        self._control_value_tolerance = control_value_tolerance
+        if mpe_member_channel_count is None:
+            mpe_member_channel_count = (
+                midi_converters.configurations.DEFAULT_MPE_MEMBER_CHANNEL_COUNT
+            )
+        if not (
+            0
+            <= mpe_member_channel_count
+            <= midi_converters.constants.MAXIMUM_MPE_MEMBER_CHANNEL_COUNT
+        ):
+            raise ValueError(
+                f"Found invalid MPE member channel count '{mpe_member_channel_count}',"
+                " must be between 0 and "
+                f"{midi_converters.constants.MAXIMUM_MPE_MEMBER_CHANNEL_COUNT}."
+            )
+        master_channel = midi_converters.constants.MPE_LOWER_ZONE_MASTER_CHANNEL
+        self._mpe_member_channel_tuple = tuple(
+            range(master_channel + 1, master_channel + 1 + mpe_member_channel_count)
+        )
+        tuning_mode = tuning_mode or midi_converters.configurations.DEFAULT_TUNING_MODE
+        if tuning_mode not in self._TUNING_MODE_TUPLE:
+            raise ValueError(
+                f"Found invalid tuning mode '{tuning_mode}', "
+                f"must be one of {self._TUNING_MODE_TUPLE}."
+            )
+        self._tuning_mode = tuning_mode
+        self._mutwo_pitch_to_midi_tuning = MutwoPitchToMidiTuning()
         self._midi_file_type = (
             midi_file_type or midi_converters.configurations.DEFAULT_MIDI_FILE_TYPE
         )
@@ -284,11 +1104,44 @@ class EventToMidiFile(core_converters.abc.Converter):
             or midi_converters.configurations.DEFAULT_MIDI_INSTRUMENT_NAME
         )
         self._tempo = tempo or midi_converters.configurations.DEFAULT_TEMPO
-        self._chronon_to_pitch_list = chronon_to_pitch_list
-        self._chronon_to_volume = chronon_to_volume
-        self._chronon_to_control_message_tuple = chronon_to_control_message_tuple
+        self._chronon_to_pitch_list = (
+            chronon_to_pitch_list or music_converters.ChrononToPitchList()
+        )
+        self._chronon_to_volume = (
+            chronon_to_volume or music_converters.ChrononToVolume()
+        )
+        self._chronon_to_control_message_tuple = (
+            chronon_to_control_message_tuple or ChrononToControlMessageTuple()
+        )
         self._distribute_midi_channels = distribute_midi_channels
-        self._mutwo_pitch_to_midi_pitch = mutwo_pitch_to_midi_pitch
+        self._mutwo_pitch_to_midi_pitch = (
+            mutwo_pitch_to_midi_pitch or MutwoPitchToMidiPitch()
+        )
+        if message_template_cache_size is None:
+            message_template_cache_size = (
+                midi_converters.configurations.DEFAULT_MESSAGE_TEMPLATE_CACHE_SIZE
+            )
+        self._message_template_cache = midi_converters.LeastRecentlyUsedCache(
+            message_template_cache_size, len
+        )
+        if track_cache_size is None:
+            track_cache_size = midi_converters.configurations.DEFAULT_TRACK_CACHE_SIZE
+        self._track_cache = midi_converters.LeastRecentlyUsedCache(
+            track_cache_size, len
+        )
+        self._midi_file_to_bytes = MidiFileToBytes()
+        self._tempo_tolerance_in_beats_per_minute = (
+            tempo_tolerance_in_beats_per_minute
+            or midi_converters.configurations.DEFAULT_TEMPO_TOLERANCE_IN_BEATS_PER_MINUTE
+        )
+        self._clip_notes_to_render_range = clip_notes_to_render_range
+        # Tempo signature -> (tick, tempo point, beat length in microseconds)
+        self._tempo_cache = midi_converters.LeastRecentlyUsedCache(4)
+        # Chronon class -> function which extracts the midi relevant data
+        self._chronon_class_to_extractor: dict[
+            typing.Type[core_events.Chronon],
+            typing.Callable[[core_events.Chronon], typing.Optional[tuple]],
+        ] = {}
         self._assert_midi_file_type_has_correct_value(self._midi_file_type)
         self._assert_available_midi_channel_tuple_has_correct_value(
             self._available_midi_channel_tuple
@@ -351,12 +1204,16 @@ class EventToMidiFile(core_converters.abc.Converter):
             bpm = mido.tempo2bpm(
                 midi_converters.constants.MAXIMUM_MICROSECONDS_PER_BEAT
             )
-            self._logger.warning(
-                f"TempoPoint '{tempo_point}' is too slow for "
+            midi_converters.DiagnosticCollector.report(
+                self._logger,
+                "too_slow_tempo",
+                "TempoPoint '%s' is too slow for "
                 "Standard Midi Files. "
-                f"The slowest possible tempo is '{bpm}' BPM."
-                "Tempo has been set to"
-                f" '{bpm}' BPM.",
+                "The slowest possible tempo is '%s' BPM. "
+                "Tempo has been set to '%s' BPM.",
+                tempo_point,
+                bpm,
+                bpm,
             )
         return bl
 
@@ -397,33 +1254,336 @@ class EventToMidiFile(core_converters.abc.Converter):
         abs_t = core_parameters.abc.Duration.from_any(absolute_time)
         return int(self._ticks_per_beat * abs_t.beat_count)
 
+    @staticmethod
+    def _make_attribute_getter(
+        chronon_class: typing.Type[core_events.Chronon],
+        chronon_to_attribute: typing.Callable[[core_events.Chronon], typing.Any],
+    ) -> typing.Optional[typing.Callable[[core_events.Chronon], typing.Any]]:
+        """Specialise a :class:`mutwo.core_converters.ChrononToAttribute`.
+
+        Return ``None`` if the extraction function isn't a plain
+        ``ChrononToAttribute`` (or if its attribute name and exception
+        value can't be found). Otherwise return a function which has the
+        same behaviour, but which skips the converter call overhead and (if
+        the attribute is a property of the class) the attribute lookup.
+        """
+        if (
+            not isinstance(chronon_to_attribute, core_converters.ChrononToAttribute)
+            or type(chronon_to_attribute).convert
+            is not core_converters.ChrononToAttribute.convert
+        ):
+            return None
+
+        # 'ChrononToAttribute' doesn't expose its arguments publicly. If
+        # they are renamed in mutwo.core, the converter itself is called.
+        try:
+            attribute_name = chronon_to_attribute._attribute_name
+            exception_value = chronon_to_attribute._exception_value
+        except AttributeError:
+            return None
+        if not isinstance(attribute_name, str):
+            return None
+        descriptor = getattr(chronon_class, attribute_name, None)
+
+        if isinstance(descriptor, property) and descriptor.fget is not None:
+            fget = descriptor.fget
+
+            def get_attribute(chronon: core_events.Chronon) -> typing.Any:
+                try:
+                    return fget(chronon)
+                except AttributeError:
+                    return exception_value
+
+        else:
+
+            def get_attribute(chronon: core_events.Chronon) -> typing.Any:
+                return getattr(chronon, attribute_name, exception_value)
+
+        return get_attribute
+
+    def _make_chronon_to_extracted_data(
+        self, chronon_class: typing.Type[core_events.Chronon]
+    ) -> typing.Callable[[core_events.Chronon], typing.Optional[tuple]]:
+        """Build the function which extracts all midi relevant data of a chronon.
+
+        The returned function returns either ``None`` (if the chronon is a
+        rest and therefore doesn't produce any midi messages) or a tuple
+        with pitch list, volume, control message tuple and control envelope
+        tuple. The function is built once per chronon class (see
+        :meth:`_chronon_to_midi_message_tuple`).
+        """
+        parameter_name_tuple = (
+            "pitch_list",
+            "volume",
+            "control_message_tuple",
+            "control_envelope_tuple",
+        )
+        extraction_function_tuple = (
+            self._chronon_to_pitch_list,
+            self._chronon_to_volume,
+            self._chronon_to_control_message_tuple,
+            self._chronon_to_control_envelope_tuple,
+        )
+        attribute_getter_tuple = tuple(
+            self._make_attribute_getter(chronon_class, extraction_function)
+            for extraction_function in extraction_function_tuple
+        )
+        logger = self._logger
+
+        def report_none(extracted_data: tuple, chronon: core_events.Chronon):
+            p = parameter_name_tuple[extracted_data.index(None)]
+            midi_converters.DiagnosticCollector.report(
+                logger,
+                ("extracted_none", p),
+                "Extracting '%s' from event '%s' "
+                "returned 'None'! Converter autoset this event to "
+                "a rest.",
+                p,
+                chronon,
+            )
+
+        if all(attribute_getter_tuple):
+            # ChrononToAttribute never raises an AttributeError
+            (
+                get_pitch_list,
+                get_volume,
+                get_control_message_tuple,
+                get_control_envelope_tuple,
+            ) = attribute_getter_tuple
+
+            def chronon_to_extracted_data(
+                chronon: core_events.Chronon,
+            ) -> typing.Optional[tuple]:
+                extracted_data = (
+                    get_pitch_list(chronon),
+                    get_volume(chronon),
+                    get_control_message_tuple(chronon),
+                    get_control_envelope_tuple(chronon),
+                )
+                (
+                    pitch_list,
+                    volume,
+                    control_message_tuple,
+                    control_envelope_tuple,
+                ) = extracted_data
+                if (
+                    pitch_list is None
+                    or volume is None
+                    or control_message_tuple is None
+                    or control_envelope_tuple is None
+                ):
+                    report_none(extracted_data, chronon)
+                    return None
+                if not (pitch_list or control_message_tuple):
+                    return None
+                return extracted_data
+
+        else:
+            (
+                chronon_to_pitch_list,
+                chronon_to_volume,
+                chronon_to_control_message_tuple,
+                chronon_to_control_envelope_tuple,
+            ) = extraction_function_tuple
+
+            def chronon_to_extracted_data(
+                chronon: core_events.Chronon,
+            ) -> typing.Optional[tuple]:
+                # If one of the extraction functions raises an
+                # AttributeError the chronon is interpreted as a rest.
+                try:
+                    extracted_data = (
+                        chronon_to_pitch_list(chronon),
+                        chronon_to_volume(chronon),
+                        chronon_to_control_message_tuple(chronon),
+                        chronon_to_control_envelope_tuple(chronon),
+                    )
+                except AttributeError:
+                    return None
+                (
+                    pitch_list,
+                    volume,
+                    control_message_tuple,
+                    control_envelope_tuple,
+                ) = extracted_data
+                if (
+                    pitch_list is None
+                    or volume is None
+                    or control_message_tuple is None
+                    or control_envelope_tuple is None
+                ):
+                    report_none(extracted_data, chronon)
+                    return None
+                if not (pitch_list or control_message_tuple):
+                    return None
+                return extracted_data
+
+        return chronon_to_extracted_data
+
+    def _get_chronon_to_extracted_data(
+        self, chronon_class: typing.Type[core_events.Chronon]
+    ) -> typing.Callable[[core_events.Chronon], typing.Optional[tuple]]:
+        try:
+            return self._chronon_class_to_extractor[chronon_class]
+        except KeyError:
+            chronon_to_extracted_data = self._chronon_class_to_extractor[
+                chronon_class
+            ] = self._make_chronon_to_extracted_data(chronon_class)
+            return chronon_to_extracted_data
+
     # ###################################################################### #
     #             methods for converting mutwo data to midi data             #
     # ###################################################################### #
 
+    def _discretize_tempo_segment(
+        self,
+        segment_start_beat: float,
+        segment_end_beat: float,
+        segment_start_tempo_point: float,
+        segment_end_tempo_point: float,
+        curve_shape: float,
+    ) -> list[tuple[int, float]]:
+        """Approximate a gradual tempo change by constant tempo steps.
+
+        Because the tempo curve between two points is monotonic, the
+        tempo of a step (the tempo at its centre) deviates at most
+        by the difference to the tempi at its borders from the curve.
+        If this difference is bigger than the tolerance, the step is
+        split into two halves (until a step is shorter than two ticks).
+        """
+        tolerance = self._tempo_tolerance_in_beats_per_minute
+        minimum_step_length = 2 / self._ticks_per_beat
+        step_list = []
+
+        def discretize(
+            start_beat: float,
+            end_beat: float,
+            start_tempo_point: float,
+            end_tempo_point: float,
+        ):
+            center_beat = (start_beat + end_beat) / 2
+            center_tempo_point = core_utilities.scale(
+                center_beat,
+                segment_start_beat,
+                segment_end_beat,
+                segment_start_tempo_point,
+                segment_end_tempo_point,
+                curve_shape,
+            )
+            if (end_beat - start_beat) < minimum_step_length or (
+                abs(center_tempo_point - start_tempo_point) <= tolerance
+                and abs(center_tempo_point - end_tempo_point) <= tolerance
+            ):
+                step_list.append((self._beats_to_ticks(start_beat), center_tempo_point))
+            else:
+                discretize(
+                    start_beat, center_beat, start_tempo_point, center_tempo_point
+                )
+                discretize(center_beat, end_beat, center_tempo_point, end_tempo_point)
+
+        discretize(
+            segment_start_beat,
+            segment_end_beat,
+            segment_start_tempo_point,
+            segment_end_tempo_point,
+        )
+        return step_list
+
+    def _tempo_to_tempo_step_tuple(
+        self, tempo_envelope: core_parameters.FlexTempo
+    ) -> tuple[tuple[int, float, int], ...]:
+        step_list = []
+        point_list = list(
+            zip(
+                (float(t) for t in tempo_envelope.absolute_time_tuple),
+                tempo_envelope.value_tuple,
+                (tempo_envelope.event_to_curve_shape(e) for e in tempo_envelope),
+            )
+        )
+        for (start_beat, start_tempo_point, curve_shape), (
+            end_beat,
+            end_tempo_point,
+            _,
+        ) in zip(point_list, point_list[1:] + [(None, None, None)]):
+            if (
+                end_beat is None
+                or end_beat == start_beat
+                or start_tempo_point == end_tempo_point
+            ):
+                step_list.append((self._beats_to_ticks(start_beat), start_tempo_point))
+            else:
+                step_list.extend(
+                    self._discretize_tempo_segment(
+                        start_beat,
+                        end_beat,
+                        start_tempo_point,
+                        end_tempo_point,
+                        curve_shape,
+                    )
+                )
+        return tuple(
+            (
+                absolute_tick,
+                tempo_point,
+                self._beats_per_minute_to_beat_length_in_microseconds(tempo_point),
+            )
+            for absolute_tick, tempo_point in step_list
+        )
+
     def _tempo_to_midi_message_tuple(
-        self, tempo: core_parameters.abc.Tempo
+        self,
+        tempo: core_parameters.abc.Tempo,
+        tick_range: typing.Optional[tuple[int, int]] = None,
     ) -> tuple[mido.MetaMessage, ...]:
-        """Converts a Consecution of ``EnvelopeEvent`` to midi Tempo messages."""
+        """Converts a tempo to midi 'set_tempo' messages.
+
+        Gradual tempo changes are approximated by tempo steps which
+        deviate at most by ``tempo_tolerance_in_beats_per_minute`` from
+        the tempo curve. The steps are cached for each tempo signature.
+        If ``tick_range`` is set, only messages for the tempo step in
+        effect at its start and for the steps within ``start < tick <= end``
+        are created.
+        """
 
         if isinstance(tempo, core_parameters.FlexTempo):
             tempo_envelope = tempo
         else:
             tempo_envelope = core_parameters.FlexTempo([[0, tempo]])
 
-        offset_iterator = core_utilities.accumulate_from_n(
-            tempo_envelope.get_parameter("duration"), core_parameters.DirectDuration(0)
+        # FlexTempo are mutable and therefore not hashable
+        key = tuple(
+            (float(absolute_time), tempo_point, tempo_envelope.event_to_curve_shape(e))
+            for absolute_time, tempo_point, e in zip(
+                tempo_envelope.absolute_time_tuple,
+                tempo_envelope.value_tuple,
+                tempo_envelope,
+            )
         )
+        if (tempo_step_tuple := self._tempo_cache.get(key)) is None:
+            tempo_step_tuple = self._tempo_cache[key] = self._tempo_to_tempo_step_tuple(
+                tempo_envelope
+            )
 
-        mlist = []
-        for abs_t, tempo_point in zip(offset_iterator, tempo_envelope.value_tuple):
-            absolute_tick = self._beats_to_ticks(abs_t)
-            bl = self._beats_per_minute_to_beat_length_in_microseconds(tempo_point)
-            bl = self._adjust_beat_length_in_microseconds(tempo_point, bl)
-            tempom = mido.MetaMessage("set_tempo", tempo=bl, time=absolute_tick)
-            mlist.append(tempom)
+        if tick_range is not None:
+            start_tick, end_tick = tick_range
+            get_tick = operator.itemgetter(0)
+            tempo_step_tuple = tempo_step_tuple[
+                max(
+                    bisect.bisect_right(tempo_step_tuple, start_tick, key=get_tick) - 1,
+                    0,
+                ) : bisect.bisect_right(tempo_step_tuple, end_tick, key=get_tick)
+            ]
 
-        return tuple(mlist)
+        # Create new messages for each call: they are mutated when
+        # they are added to a midi track.
+        return tuple(
+            mido.MetaMessage(
+                "set_tempo",
+                tempo=self._adjust_beat_length_in_microseconds(tempo_point, bl),
+                time=absolute_tick,
+            )
+            for absolute_tick, tempo_point, bl in tempo_step_tuple
+        )
 
     def _tune_pitch(
         self,
@@ -433,7 +1593,7 @@ class EventToMidiFile(core_converters.abc.Converter):
         midi_channel: int,
     ) -> tuple[midi_converters.constants.MidiNote, tuple[mido.Message, ...]]:
         # Simple case: we don't have any glissando
-        if not isinstance(pitch_to_tune, music_parameters.FlexPitch):
+        if not self._is_flex_pitch_class(type(pitch_to_tune)):
             midi_pitch, pitch_bend = self._mutwo_pitch_to_midi_pitch.convert(
                 pitch_to_tune
             )
@@ -514,7 +1674,7 @@ class EventToMidiFile(core_converters.abc.Converter):
 
         return midi_pitch, tuple(pbm_list)
 
-    def _note_information_to_midi_message_tuple(
+    def _render_note_information(
         self,
         absolute_tick_start: int,
         absolute_tick_end: int,
@@ -522,15 +1682,19 @@ class EventToMidiFile(core_converters.abc.Converter):
         pitch: music_parameters.abc.Pitch,
         midi_channel: int,
     ) -> tuple[mido.Message, ...]:
-        """Generate 'pitch bending', 'note on' and 'note off' messages for one tone."""
-        p, pitch_bending_message_tuple = self._tune_pitch(
-            absolute_tick_start,
-            absolute_tick_end,
-            pitch,
-            midi_channel,
-        )
-
-        midi_message_list = list(pitch_bending_message_tuple)
+        if self._is_tuned_by_tuning_standard(pitch):
+            p, frequency = self._mutwo_pitch_to_midi_tuning.convert(pitch)
+            midi_message_list = [
+                _TuningRequest.from_frequency(p, frequency, absolute_tick_start)
+            ]
+        else:
+            p, pitch_bending_message_tuple = self._tune_pitch(
+                absolute_tick_start,
+                absolute_tick_end,
+                pitch,
+                midi_channel,
+            )
+            midi_message_list = list(pitch_bending_message_tuple)
 
         for t, m in (
             (absolute_tick_start, "note_on"),
@@ -542,6 +1706,99 @@ class EventToMidiFile(core_converters.abc.Converter):
 
         return tuple(midi_message_list)
 
+    @staticmethod
+    @functools.cache
+    def _is_flex_pitch_class(pitch_class: typing.Type) -> bool:
+        # 'isinstance' checks of abstract base classes are slow
+        return issubclass(pitch_class, music_parameters.FlexPitch)
+
+    def _is_tuned_by_tuning_standard(self, pitch: music_parameters.abc.Pitch) -> bool:
+        return self._tuning_mode != "pitch_bend" and not self._is_flex_pitch_class(
+            type(pitch)
+        )
+
+    @staticmethod
+    def _get_pitch_key(pitch: music_parameters.abc.Pitch) -> typing.Hashable:
+        if EventToMidiFile._is_flex_pitch_class(type(pitch)):
+            # The glissando signature
+            return tuple(
+                (float(absolute_time), p.hertz, e.curve_shape)
+                for absolute_time, p, e in zip(
+                    pitch.absolute_time_tuple, pitch.parameter_tuple, pitch
+                )
+            )
+        return pitch.hertz
+
+    def _get_message_template_key(
+        self, tick_count: int, velocity: int, pitch: music_parameters.abc.Pitch
+    ) -> tuple:
+        return tick_count, velocity, self._get_pitch_key(pitch)
+
+    @staticmethod
+    def _midi_message_to_template_item(
+        midi_message: mido.Message, absolute_tick_start: int
+    ) -> tuple[str, dict, int]:
+        attribute_dict = vars(midi_message).copy()
+        del attribute_dict["type"], attribute_dict["time"], attribute_dict["channel"]
+        return (
+            midi_message.type,
+            attribute_dict,
+            midi_message.time - absolute_tick_start,
+        )
+
+    def _note_information_to_midi_message_tuple(
+        self,
+        absolute_tick_start: int,
+        absolute_tick_end: int,
+        velocity: int,
+        pitch: music_parameters.abc.Pitch,
+        midi_channel: int,
+    ) -> tuple[mido.Message, ...]:
+        """Generate 'pitch bending', 'note on' and 'note off' messages for one tone.
+
+        The messages of a tone only depend on its pitch, velocity and
+        duration. They are therefore rendered once and stored as a template
+        (with timing relative to the tone start and without channel) in
+        the message template cache.
+        """
+        # Tones which are tuned by the midi tuning standard are cheap to
+        # render and their tuning requests can't be stored as templates.
+        if not (
+            cache := self._message_template_cache
+        ).maxsize or self._is_tuned_by_tuning_standard(pitch):
+            return self._render_note_information(
+                absolute_tick_start, absolute_tick_end, velocity, pitch, midi_channel
+            )
+
+        key = self._get_message_template_key(
+            absolute_tick_end - absolute_tick_start, velocity, pitch
+        )
+        if (template := cache.get(key)) is None:
+            midi_message_tuple = self._render_note_information(
+                absolute_tick_start, absolute_tick_end, velocity, pitch, midi_channel
+            )
+            # Pitch bending messages which are placed before the tone start
+            # may have been clipped at tick 0, so they can't be used as a
+            # template.
+            if absolute_tick_start > 0:
+                cache[key] = tuple(
+                    self._midi_message_to_template_item(m, absolute_tick_start)
+                    for m in midi_message_tuple
+                )
+            return midi_message_tuple
+
+        # Values have already been checked when rendering the template
+        return tuple(
+            mido.Message(
+                message_type,
+                skip_checks=True,
+                channel=midi_channel,
+                time=t if (t := absolute_tick_start + relative_tick) > 0 else 0,
+                **attribute_dict,
+            )
+            for message_type, attribute_dict, relative_tick in template
+        )
+
     def _extracted_data_to_midi_message_tuple(
         self,
         absolute_time: core_parameters.abc.Duration,
@@ -550,11 +1807,12 @@ class EventToMidiFile(core_converters.abc.Converter):
         pitch_list: tuple[music_parameters.abc.Pitch, ...],
         volume: music_parameters.abc.Volume,
         control_message_tuple: tuple[mido.Message, ...],
+        control_envelope_tuple: tuple[ControlEnvelope, ...] = tuple([]),
     ) -> tuple[mido.Message, ...]:
         """Generates pitch-bend / note-on / note-off messages for each tone in a chord.
 
         Concatenates the midi messages for every played tone with the global control
-        messages.
+        messages and the messages of the control envelopes of each tone.
 
         Gets as an input relevant data for midi message generation that has been
         extracted from a :class:`mutwo.core_events.abc.Event` object.
@@ -564,27 +1822,173 @@ class EventToMidiFile(core_converters.abc.Converter):
         abs_tick_end = abs_tick_start + self._beats_to_ticks(duration)
         velocity = volume.midi_velocity
 
-        mlist = []
+        # add control messages (they are copied, because the same message
+        # may be returned for many chronons)
+        mlist = [cm.copy(time=abs_tick_start) for cm in control_message_tuple]
 
-        # add control messages
-        for cm in control_message_tuple:
-            cm.time = abs_tick_start
-            mlist.append(cm)
+        # Envelopes are sampled once per chronon
+        control_envelope_step_list = [
+            (
+                control_envelope,
+                self._discretize_control_envelope(
+                    control_envelope.envelope, abs_tick_start, abs_tick_end
+                ),
+            )
+            for control_envelope in control_envelope_tuple
+        ]
 
         # add note related messages
         for p in pitch_list:
-            mlist.extend(
-                self._note_information_to_midi_message_tuple(
-                    abs_tick_start,
-                    abs_tick_end,
-                    velocity,
-                    p,
-                    next(available_midi_channel_tuple_cycle),
-                )
+            midi_channel = next(available_midi_channel_tuple_cycle)
+            note_midi_message_tuple = self._note_information_to_midi_message_tuple(
+                abs_tick_start, abs_tick_end, velocity, p, midi_channel
             )
+            mlist.extend(note_midi_message_tuple)
+            # The 'note_on' message is always the second last message
+            midi_note = note_midi_message_tuple[-2].note
+            for control_envelope, step_tuple in control_envelope_step_list:
+                mlist.extend(
+                    self._control_envelope_step_tuple_to_midi_message_tuple(
+                        control_envelope, step_tuple, midi_channel, midi_note
+                    )
+                )
 
         return tuple(mlist)
 
+    @staticmethod
+    def _get_control_envelope_key(control_envelope: ControlEnvelope) -> tuple:
+        envelope = control_envelope.envelope
+        return (
+            control_envelope.message_type,
+            control_envelope.control,
+            tuple(
+                (float(absolute_time), value, envelope.event_to_curve_shape(e))
+                for absolute_time, value, e in zip(
+                    envelope.absolute_time_tuple, envelope.value_tuple, envelope
+                )
+            ),
+        )
+
+    def _discretize_control_envelope(
+        self,
+        envelope: core_events.Envelope,
+        absolute_tick_start: int,
+        absolute_tick_end: int,
+    ) -> tuple[tuple[int, int], ...]:
+        """Approximate a control envelope by steps of constant midi values.
+
+        The envelope is stretched to the duration of the tone (like a
+        glissando it reaches its end one tick before the tone stops).
+        Each envelope segment is monotonic, so a step deviates at most
+        by the difference of the values at its borders from the
+        envelope. If this difference is bigger than the tolerance, the
+        step is split into two halves (like tempo steps in
+        :meth:`_discretize_tempo_segment`, but on ticks).
+        """
+        point_list = list(
+            zip(
+                (float(t) for t in envelope.absolute_time_tuple),
+                envelope.value_tuple,
+                (envelope.event_to_curve_shape(e) for e in envelope),
+            )
+        )
+        if not point_list:
+            return tuple([])
+
+        def to_midi_value(value: float) -> int:
+            return min(max(round(value), 0), 127)
+
+        tick_count = max(absolute_tick_end - absolute_tick_start - 1, 0)
+        envelope_duration = point_list[-1][0]
+        if not (tick_count and envelope_duration):
+            return ((absolute_tick_start, to_midi_value(point_list[0][1])),)
+
+        tolerance = self._control_value_tolerance
+        step_list: list[tuple[int, int]] = []
+
+        def discretize(
+            start_tick: int,
+            end_tick: int,
+            start_value: int,
+            end_value: int,
+            value_at: typing.Callable[[int], float],
+        ):
+            if end_tick - start_tick < 2 or abs(end_value - start_value) <= tolerance:
+                step_list.append((start_tick, start_value))
+            else:
+                center_tick = (start_tick + end_tick) // 2
+                center_value = to_midi_value(value_at(center_tick))
+                discretize(start_tick, center_tick, start_value, center_value, value_at)
+                discretize(center_tick, end_tick, center_value, end_value, value_at)
+
+        for (start_time, start_value, curve_shape), (end_time, end_value, _) in zip(
+            point_list, point_list[1:]
+        ):
+            start_tick, end_tick = (
+                absolute_tick_start + round(time / envelope_duration * tick_count)
+                for time in (start_time, end_time)
+            )
+            if start_tick == end_tick:
+                continue
+            discretize(
+                start_tick,
+                end_tick,
+                to_midi_value(start_value),
+                to_midi_value(end_value),
+                functools.partial(
+                    core_utilities.scale,
+                    old_min=start_tick,
+                    old_max=end_tick,
+                    new_min=start_value,
+                    new_max=end_value,
+                    translation_shape=curve_shape,
+                ),
+            )
+        step_list.append(
+            (absolute_tick_start + tick_count, to_midi_value(point_list[-1][1]))
+        )
+
+        # Remove steps which don't change the value or which are replaced
+        # by a jump at the same tick.
+        filtered_step_list: list[tuple[int, int]] = []
+        for tick, value in step_list:
+            if filtered_step_list and filtered_step_list[-1][0] == tick:
+                filtered_step_list.pop()
+            if not filtered_step_list or filtered_step_list[-1][1] != value:
+                filtered_step_list.append((tick, value))
+        return tuple(filtered_step_list)
+
+    @staticmethod
+    def _control_envelope_step_tuple_to_midi_message_tuple(
+        control_envelope: ControlEnvelope,
+        step_tuple: tuple[tuple[int, int], ...],
+        midi_channel: int,
+        midi_note: midi_converters.constants.MidiNote,
+    ) -> tuple[mido.Message, ...]:
+        match control_envelope.message_type:
+            case "control_change":
+                attribute_dict = {"control": control_envelope.control}
+            case "aftertouch":
+                attribute_dict = {}
+            case "polytouch":
+                attribute_dict = {"note": midi_note}
+            case message_type:
+                raise ValueError(
+                    f"Found invalid message type '{message_type}' of control "
+                    "envelope, must be one of 'control_change', 'aftertouch' "
+                    "or 'polytouch'."
+                )
+        return tuple(
+            _ControlEnvelopeMessage(
+                control_envelope.message_type,
+                channel=midi_channel,
+                value=value,
+                time=tick,
+                **attribute_dict,
+            )
+            for tick, value in step_tuple
+        )
+
     def _chronon_to_midi_message_tuple(
         self,
         chronon: core_events.Chronon,
@@ -601,34 +2005,11 @@ class EventToMidiFile(core_converters.abc.Converter):
         becomes relative
         """
 
-        extracted_data_list = []
-
-        # try to extract the relevant data
-        is_rest = False
-        for p, extraction_function in (
-            ("pitch_list", self._chronon_to_pitch_list),
-            ("volume", self._chronon_to_volume),
-            ("control_message_tuple", self._chronon_to_control_message_tuple),
-        ):
-            try:
-                d = extraction_function(chronon)
-            except AttributeError:
-                is_rest = True
-            else:
-                if d is None:
-                    self._logger.warning(
-                        "Extracting '{p}' from event '{chronon}' "
-                        "returned 'None'! Converter autoset this event to "
-                        "a rest."
-                    )
-                    is_rest = True
-            if is_rest:
-                break
-            extracted_data_list.append(d)
+        chronon_to_extracted_data = self._get_chronon_to_extracted_data(type(chronon))
 
         # if not all relevant data could be extracted, simply ignore the
         # event
-        if is_rest:
+        if (extracted_data := chronon_to_extracted_data(chronon)) is None:
             return tuple([])
 
         # otherwise generate midi messages from the extracted data
@@ -636,7 +2017,7 @@ class EventToMidiFile(core_converters.abc.Converter):
             absolute_time,
             chronon.duration,
             available_midi_channel_tuple_cycle,
-            *extracted_data_list,  # type: ignore
+            *extracted_data,  # type: ignore
         )
 
     def _consecution_to_midi_message_tuple(
@@ -646,15 +2027,29 @@ class EventToMidiFile(core_converters.abc.Converter):
         ],
         available_midi_channel_tuple: tuple[int, ...],
         absolute_time: core_parameters.abc.Duration = core_parameters.DirectDuration(0),
+        extracted_data_iterator: typing.Optional[
+            typing.Iterator[typing.Optional[tuple]]
+        ] = None,
+        midi_channel_iterator: typing.Optional[typing.Iterator[int]] = None,
     ) -> tuple[mido.Message, ...]:
         """Iterates through the ``Consecution`` and converts each ``Chronon``.
 
         Return unsorted tuple of Midi messages where the time attribute of each message
-        is the absolute time in ticks.
+        is the absolute time in ticks. If the data of all chronons has
+        already been extracted, it can be passed as ``extracted_data_iterator``
+        (in the order of :meth:`_consecution_to_extracted_data_list`).
+        In MPE mode ``available_midi_channel_tuple`` contains the member
+        channel of each tone (see :meth:`_allocate_mpe_member_channels`),
+        which are shared with nested consecutions via ``midi_channel_iterator``.
         """
 
         mlist: list[mido.Message] = []
-        mchannel_cycle = itertools.cycle(available_midi_channel_tuple)
+        if not self._mpe_member_channel_tuple:
+            mchannel_cycle = itertools.cycle(available_midi_channel_tuple)
+        elif midi_channel_iterator is None:
+            mchannel_cycle = iter(available_midi_channel_tuple)
+        else:
+            mchannel_cycle = midi_channel_iterator
 
         # fill midi track with the content of the consecution
         for local_abs_time, sim_or_seq in zip(
@@ -662,35 +2057,461 @@ class EventToMidiFile(core_converters.abc.Converter):
         ):
             global_abs_time = local_abs_time + absolute_time
             if isinstance(sim_or_seq, core_events.Chronon):
-                mtuple = self._chronon_to_midi_message_tuple(
-                    sim_or_seq, global_abs_time, mchannel_cycle
-                )
+                if extracted_data_iterator is None:
+                    mtuple = self._chronon_to_midi_message_tuple(
+                        sim_or_seq, global_abs_time, mchannel_cycle
+                    )
+                elif (extracted_data := next(extracted_data_iterator)) is None:
+                    mtuple = tuple([])
+                else:
+                    mtuple = self._extracted_data_to_midi_message_tuple(
+                        global_abs_time,
+                        sim_or_seq.duration,
+                        mchannel_cycle,
+                        *extracted_data,
+                    )
                 self._logger.debug(
-                    f"Chronon -> MidiMessageData:\n\t{sim_or_seq} -> {mtuple}"
+                    "Chronon -> MidiMessageData:\n\t%s -> %s", sim_or_seq, mtuple
                 )
             else:
                 mtuple = self._consecution_to_midi_message_tuple(
                     sim_or_seq,
                     available_midi_channel_tuple,
                     global_abs_time,
+                    extracted_data_iterator,
+                    mchannel_cycle,
                 )
             mlist.extend(mtuple)
 
         return tuple(mlist)
 
+    def _consecution_to_extracted_data_list(
+        self,
+        consecution: core_events.Consecution[
+            core_events.Chronon | core_events.Consecution
+        ],
+        extracted_data_list: list[tuple[core_events.Chronon, typing.Optional[tuple]]],
+    ):
+        """Collect all chronons and their extracted data (depth first)."""
+        for sim_or_seq in consecution:
+            if isinstance(sim_or_seq, core_events.Chronon):
+                extracted_data_list.append(
+                    (
+                        sim_or_seq,
+                        self._get_chronon_to_extracted_data(type(sim_or_seq))(
+                            sim_or_seq
+                        ),
+                    )
+                )
+            else:
+                self._consecution_to_extracted_data_list(
+                    sim_or_seq, extracted_data_list
+                )
+
+    def _get_track_key(
+        self,
+        extracted_data_list: list[tuple],
+        available_midi_channel_tuple: tuple[int, ...],
+    ) -> tuple:
+        """Describe everything which influences the midi messages of a track.
+
+        All other parameters of the conversion are attributes of the
+        converter and can't change.
+        """
+        get_pitch_key = self._get_pitch_key
+        chronon_key_list = []
+        for chronon, extracted_data in extracted_data_list:
+            if extracted_data is None:
+                chronon_key_list.append((chronon.duration.beat_count,))
+            else:
+                (
+                    pitch_list,
+                    volume,
+                    control_message_tuple,
+                    control_envelope_tuple,
+                ) = extracted_data
+                chronon_key_list.append(
+                    (
+                        chronon.duration.beat_count,
+                        tuple(get_pitch_key(pitch) for pitch in pitch_list),
+                        volume.midi_velocity,
+                        tuple(
+                            tuple(control_message.bytes())
+                            for control_message in control_message_tuple
+                        ),
+                        tuple(
+                            self._get_control_envelope_key(control_envelope)
+                            for control_envelope in control_envelope_tuple
+                        ),
+                    )
+                )
+        return available_midi_channel_tuple, tuple(chronon_key_list)
+
+    def _consecution_to_cached_midi_message_tuple(
+        self,
+        consecution: core_events.Consecution[
+            core_events.Chronon | core_events.Consecution
+        ],
+        available_midi_channel_tuple: tuple[int, ...],
+    ) -> tuple[mido.Message, ...]:
+        """Like :meth:`_consecution_to_midi_message_tuple`, but use the track cache.
+
+        The cache only stores copies of the messages, because the returned
+        messages are mutated when they are added to a midi track.
+        """
+        extracted_data_list: list[tuple] = []
+        self._consecution_to_extracted_data_list(consecution, extracted_data_list)
+        key = self._get_track_key(extracted_data_list, available_midi_channel_tuple)
+        if (cached_midi_message_tuple := self._track_cache.get(key)) is not None:
+            return tuple(
+                midi_message.copy() for midi_message in cached_midi_message_tuple
+            )
+
+        midi_message_tuple = self._consecution_to_midi_message_tuple(
+            consecution,
+            available_midi_channel_tuple,
+            extracted_data_iterator=(
+                extracted_data for _, extracted_data in extracted_data_list
+            ),
+        )
+        self._track_cache[key] = tuple(
+            midi_message.copy() for midi_message in midi_message_tuple
+        )
+        return midi_message_tuple
+
+    def _chronon_to_tone_tick_range_tuple(
+        self,
+        chronon: core_events.Chronon,
+        absolute_time: core_parameters.abc.Duration,
+    ) -> tuple[tuple[int, int], ...]:
+        """Return start and end tick of each tone (like they are rendered)."""
+        if (
+            extracted_data := self._get_chronon_to_extracted_data(type(chronon))(
+                chronon
+            )
+        ) is None:
+            return tuple([])
+        abs_tick_start = self._beats_to_ticks(absolute_time)
+        abs_tick_end = abs_tick_start + self._beats_to_ticks(
+            core_parameters.abc.Duration.from_any(chronon.duration)
+        )
+        pitch_list = extracted_data[0]
+        return ((abs_tick_start, abs_tick_end),) * len(pitch_list)
+
+    def _consecution_to_tone_tick_range_list(
+        self,
+        consecution: core_events.Consecution[
+            core_events.Chronon | core_events.Consecution
+        ],
+        tone_tick_range_list: list[tuple[int, int]],
+        absolute_time: core_parameters.abc.Duration = core_parameters.DirectDuration(0),
+    ):
+        """Collect start and end tick of all tones (in rendering order)."""
+        for local_abs_time, sim_or_seq in zip(
+            consecution.absolute_time_tuple, consecution
+        ):
+            global_abs_time = local_abs_time + absolute_time
+            if isinstance(sim_or_seq, core_events.Chronon):
+                tone_tick_range_list.extend(
+                    self._chronon_to_tone_tick_range_tuple(sim_or_seq, global_abs_time)
+                )
+            else:
+                self._consecution_to_tone_tick_range_list(
+                    sim_or_seq, tone_tick_range_list, global_abs_time
+                )
+
+    def _allocate_mpe_member_channels(
+        self, tone_tick_range_list_tuple: tuple[list[tuple[int, int]], ...]
+    ) -> tuple[tuple[int, ...], ...]:
+        """Assign a member channel to each tone of each track.
+
+        The tones of all tracks are processed in chronological order.
+        Free member channels are kept in a heap which is ordered by
+        release time, so that each tone gets the channel which has been
+        silent the longest. A channel isn't free before the tick after
+        its release, because pitch bending messages are sent one tick
+        before a tone starts. If all member channels are sounding, the
+        channel which is released first is shared.
+        """
+        free_channel_heap = [
+            (-1, channel) for channel in self._mpe_member_channel_tuple
+        ]
+        sounding_channel_heap: list[tuple[int, int]] = []
+        channel_list_tuple = tuple(
+            [0] * len(tone_tick_range_list)
+            for tone_tick_range_list in tone_tick_range_list_tuple
+        )
+        for start, end, track_index, tone_index in sorted(
+            (start, end, track_index, tone_index)
+            for track_index, tone_tick_range_list in enumerate(
+                tone_tick_range_list_tuple
+            )
+            for tone_index, (start, end) in enumerate(tone_tick_range_list)
+        ):
+            while sounding_channel_heap and sounding_channel_heap[0][0] < start:
+                heapq.heappush(free_channel_heap, heapq.heappop(sounding_channel_heap))
+            if free_channel_heap:
+                _, channel = heapq.heappop(free_channel_heap)
+            else:
+                midi_converters.DiagnosticCollector.report(
+                    self._logger,
+                    "mpe_member_channel_collision",
+                    "Found no free MPE member channel for tone at tick %s, "
+                    "it shares its channel with a sounding tone.",
+                    start,
+                )
+                _, channel = heapq.heappop(sounding_channel_heap)
+            heapq.heappush(sounding_channel_heap, (end, channel))
+            channel_list_tuple[track_index][tone_index] = channel
+        return tuple(tuple(channel_list) for channel_list in channel_list_tuple)
+
+    def _get_mpe_configuration_message_tuple(self) -> tuple[mido.Message, ...]:
+        """Configure the MPE zone and the pitch bend range of its member channels.
+
+        The MPE configuration message resets the pitch bend range of all
+        member channels, so it has to be sent first.
+        """
+
+        def set_registered_parameter(
+            midi_channel: int, rpn: tuple[int, int], *data: int
+        ) -> tuple[mido.Message, ...]:
+            return tuple(
+                mido.Message(
+                    "control_change", channel=midi_channel, control=control, value=value
+                )
+                for control, value in zip((101, 100, 6, 38), rpn + data)
+            )
+
+        maximum_pitch_bend_deviation = (
+            self._mutwo_pitch_to_midi_pitch._cent_deviation_to_pitch_bending_number._maximum_pitch_bend_deviation
+        )
+        semitone_count, cent_count = divmod(round(maximum_pitch_bend_deviation), 100)
+        midi_message_list = list(
+            set_registered_parameter(
+                midi_converters.constants.MPE_LOWER_ZONE_MASTER_CHANNEL,
+                midi_converters.constants.MPE_CONFIGURATION_MESSAGE_RPN,
+                len(self._mpe_member_channel_tuple),
+            )
+        )
+        for midi_channel in self._mpe_member_channel_tuple:
+            midi_message_list.extend(
+                set_registered_parameter(
+                    midi_channel,
+                    midi_converters.constants.PITCH_BEND_SENSITIVITY_RPN,
+                    semitone_count,
+                    cent_count,
+                )
+            )
+        return tuple(midi_message_list)
+
+    @staticmethod
+    def _get_state_key_and_value(
+        midi_message: mido.Message,
+    ) -> tuple[typing.Optional[tuple], int]:
+        """Return which state a message sets (e.g. a controller) and its value."""
+        match midi_message.type:
+            case "pitchwheel":
+                return ("pitchwheel", midi_message.channel), midi_message.pitch
+            case "control_change":
+                return (
+                    "control_change",
+                    midi_message.channel,
+                    midi_message.control,
+                ), midi_message.value
+            case "aftertouch":
+                return ("aftertouch", midi_message.channel), midi_message.value
+            case "polytouch":
+                return (
+                    "polytouch",
+                    midi_message.channel,
+                    midi_message.note,
+                ), midi_message.value
+        return None, 0
+
+    def _remove_redundant_state_messages(
+        self, midi_data_per_seq_tuple: tuple[tuple[mido.Message, ...], ...]
+    ) -> tuple[tuple[mido.Message, ...], ...]:
+        """Remove messages which don't change the state of their channel.
+
+        Only messages which have been rendered from control envelopes and
+        (in MPE mode) 'pitchwheel' messages are removed, all other
+        messages only set the state. The state of all channels is followed
+        in chronological order over all tracks (channels may be shared by
+        tracks). The first message of each state is always kept.
+        """
+        state_message_type_set = {"control_change", "aftertouch", "polytouch"}
+        if self._mpe_member_channel_tuple:
+            state_message_type_set.add("pitchwheel")
+        state_message_list = [
+            (midi_message.time, track_index, message_index, midi_message)
+            for track_index, midi_message_tuple in enumerate(midi_data_per_seq_tuple)
+            for message_index, midi_message in enumerate(midi_message_tuple)
+            if midi_message.type in state_message_type_set
+        ]
+        if not state_message_list:
+            return midi_data_per_seq_tuple
+
+        state_key_to_value: dict[tuple, int] = {}
+        redundant_message_set = set()
+        get_state_key_and_value = self._get_state_key_and_value
+        for _, track_index, message_index, midi_message in sorted(
+            state_message_list, key=operator.itemgetter(0, 1, 2)
+        ):
+            state_key, value = get_state_key_and_value(midi_message)
+            if state_key_to_value.get(state_key) == value and (
+                midi_message.type == "pitchwheel"
+                or isinstance(midi_message, _ControlEnvelopeMessage)
+            ):
+                redundant_message_set.add((track_index, message_index))
+            else:
+                state_key_to_value[state_key] = value
+        if not redundant_message_set:
+            return midi_data_per_seq_tuple
+        return tuple(
+            tuple(
+                midi_message
+                for message_index, midi_message in enumerate(midi_message_tuple)
+                if (track_index, message_index) not in redundant_message_set
+            )
+            for track_index, midi_message_tuple in enumerate(midi_data_per_seq_tuple)
+        )
+
+    def _midi_message_tuple_to_render_tick_range(
+        self,
+        midi_message_tuple: tuple[mido.Message | mido.MetaMessage, ...],
+        render_tick_range: tuple[int, int],
+    ) -> tuple[mido.Message | mido.MetaMessage, ...]:
+        """Move messages with absolute timing to the start of the render range.
+
+        Messages before the render range are moved to its start, except
+        of 'pitchwheel' and 'set_tempo' messages: from those only the last
+        message (per channel) is kept, so that the state at the start of
+        the render range is restored. If ``clip_notes_to_render_range``
+        is ``True``, 'note_off' messages after the render range are moved
+        to its end and all other messages after the render range are
+        removed.
+        """
+        start_tick, end_tick = render_tick_range
+        clip = self._clip_notes_to_render_range
+        # (message type, midi channel) -> last message before render range
+        state_message_dict: dict[tuple, mido.Message | mido.MetaMessage] = {}
+        midi_message_list = []
+        for midi_message in midi_message_tuple:
+            tick = midi_message.time
+            if tick < start_tick:
+                if (message_type := midi_message.type) in ("pitchwheel", "set_tempo"):
+                    key = (message_type, getattr(midi_message, "channel", None))
+                    if (
+                        previous_midi_message := state_message_dict.get(key)
+                    ) is None or previous_midi_message.time <= tick:
+                        state_message_dict[key] = midi_message
+                    continue
+                tick = start_tick
+            elif clip and tick > end_tick:
+                if midi_message.type != "note_off":
+                    continue
+                tick = end_tick
+            midi_message.time = tick - start_tick
+            midi_message_list.append(midi_message)
+
+        for midi_message in state_message_dict.values():
+            midi_message.time = 0
+        # State messages are placed before all other messages at the start
+        return tuple(state_message_dict.values()) + tuple(midi_message_list)
+
+    def _resolve_tuning_requests(
+        self, midi_data_per_seq_tuple: tuple[tuple[mido.Message, ...], ...]
+    ) -> tuple[tuple[mido.Message, ...], ...]:
+        """Replace all tuning requests by messages of the midi tuning standard.
+
+        The messages of all tracks are processed in chronological order,
+        because all tracks share the same keys. The tuning messages are
+        added to the first track, one tick before the tuned notes start
+        (like pitch bending messages).
+        """
+        tuning_state = self._TUNING_MODE_TO_TUNING_STATE_CLASS[self._tuning_mode](
+            self._logger
+        )
+        midi_message_list_tuple = tuple([] for _ in midi_data_per_seq_tuple)
+        equal_temperament_frequency_tuple = tuple(
+            (midi_note, 0, 0) for midi_note in range(128)
+        )
+        time_getter = operator.attrgetter("time")
+        tuning_request = None
+        # 'heapq.merge' keeps the order of messages with equal time in
+        # each track, so a tuning request is directly followed by its
+        # 'note_on' message.
+        for _, track_index, midi_message in heapq.merge(
+            *(
+                (
+                    (midi_message.time, track_index, midi_message)
+                    for midi_message in sorted(midi_message_tuple, key=time_getter)
+                )
+                for track_index, midi_message_tuple in enumerate(
+                    midi_data_per_seq_tuple
+                )
+            ),
+            key=operator.itemgetter(0),
+        ):
+            if isinstance(midi_message, _TuningRequest):
+                tuning_request = midi_message
+                continue
+            # Messages may be shared with the track cache, so they are
+            # copied before their key is changed.
+            match midi_message.type:
+                case "note_on" if midi_message.velocity:
+                    # Glissandi are bent from the equal tempered key
+                    frequency = (
+                        tuning_request.frequency
+                        if tuning_request
+                        else equal_temperament_frequency_tuple[midi_message.note]
+                    )
+                    key = tuning_state.start_note(
+                        midi_message.time, track_index, midi_message, frequency
+                    )
+                    if key != midi_message.note:
+                        midi_message = midi_message.copy(note=key)
+                case "note_on" | "note_off":
+                    key = tuning_state.stop_note(
+                        midi_message.time, track_index, midi_message
+                    )
+                    if key != midi_message.note:
+                        midi_message = midi_message.copy(note=key)
+                case "polytouch":
+                    key = tuning_state.get_key(track_index, midi_message)
+                    if key != midi_message.note:
+                        midi_message = midi_message.copy(note=key)
+            tuning_request = None
+            midi_message_list_tuple[track_index].append(midi_message)
+
+        # Tuning messages are put before all other messages, so that
+        # they precede notes which start at the same tick (tracks are
+        # sorted stable).
+        if midi_message_list_tuple:
+            midi_message_list_tuple[0][:0] = [
+                mido.Message("sysex", data=data, time=tick - 1 if tick else tick)
+                for tick, data in tuning_state.get_tuning_message_data_list()
+            ]
+        return tuple(
+            tuple(midi_message_list) for midi_message_list in midi_message_list_tuple
+        )
+
     def _midi_message_tuple_to_midi_track(
         self,
         midi_message_tuple: tuple[mido.Message | mido.MetaMessage, ...],
         duration: core_parameters.abc.Duration.Type,
         is_first_track: bool = False,
+        render_tick_range: typing.Optional[tuple[int, int]] = None,
     ) -> mido.MidiTrack:
         """Convert unsorted midi message with absolute timing to a midi track.
 
         In the resulting midi track the timing of the messages is relative.
+        If ``render_tick_range`` is set, the midi track starts at the
+        beginning of the render range.
         """
         duration = core_parameters.abc.Duration.from_any(duration)
         self._logger.debug(
-            "Convert midi messages -> MidiTrack\n\t" f"msg-tuple: {midi_message_tuple}"
+            "Convert midi messages -> MidiTrack\n\tmsg-tuple: %s", midi_message_tuple
         )
 
         track = mido.MidiTrack([])
@@ -699,7 +2520,28 @@ class EventToMidiFile(core_converters.abc.Converter):
         if is_first_track:
             # standard time signature 4/4
             track.append(mido.MetaMessage("time_signature", numerator=4, denominator=4))
-            midi_message_tuple += self._tempo_to_midi_message_tuple(self._tempo)
+            if render_tick_range is None:
+                tempo_tick_range = None
+            else:
+                # Without clipping notes may sound after the render range
+                # and they need the tempo steps until their end.
+                start_tick, end_tick = render_tick_range
+                if not self._clip_notes_to_render_range:
+                    end_tick = max(
+                        itertools.chain(
+                            (end_tick,),
+                            (midi_message.time for midi_message in midi_message_tuple),
+                        )
+                    )
+                tempo_tick_range = (start_tick, end_tick)
+            midi_message_tuple += self._tempo_to_midi_message_tuple(
+                self._tempo, tempo_tick_range
+            )
+
+        if render_tick_range is not None:
+            midi_message_tuple = self._midi_message_tuple_to_render_tick_range(
+                midi_message_tuple, render_tick_range
+            )
 
         # If event is empty and it isn't the first track
         # (e.g. no tempo envelope was added)
@@ -753,14 +2595,122 @@ class EventToMidiFile(core_converters.abc.Converter):
         # Depending on the midi_file_type either adds a tuple of MidiTrack
         # objects (for midi_file_type = 1) or adds only one MidiTrack
         # (for midi_file_type = 0).
-        midi_channel_data = self._find_available_midi_channel_tuple_per_consecution(
-            concurrence
-        )
+        if self._mpe_member_channel_tuple:
+            tone_tick_range_list_tuple = tuple([] for _ in concurrence)
+            for consecution, tone_tick_range_list in zip(
+                concurrence, tone_tick_range_list_tuple
+            ):
+                self._consecution_to_tone_tick_range_list(
+                    consecution, tone_tick_range_list
+                )
+            midi_channel_data = self._allocate_mpe_member_channels(
+                tone_tick_range_list_tuple
+            )
+        else:
+            midi_channel_data = self._find_available_midi_channel_tuple_per_consecution(
+                concurrence
+            )
+        if self._track_cache.maxsize:
+            consecution_to_midi_message_tuple = (
+                self._consecution_to_cached_midi_message_tuple
+            )
+        else:
+            consecution_to_midi_message_tuple = self._consecution_to_midi_message_tuple
         midi_data_per_seq_tuple = tuple(
-            self._consecution_to_midi_message_tuple(seq, m)
+            consecution_to_midi_message_tuple(seq, m)
             for seq, m in zip(concurrence, midi_channel_data)
         )
-        duration = concurrence.duration
+        self._add_midi_data_per_consecution_tuple_to_midi_file(
+            midi_data_per_seq_tuple, concurrence.duration, midi_file
+        )
+
+    def _add_event_interval_index_to_midi_file(
+        self,
+        event_interval_index: EventIntervalIndex,
+        render_range: tuple[
+            core_parameters.abc.Duration.Type, core_parameters.abc.Duration.Type
+        ],
+        midi_file: mido.MidiFile,
+    ) -> None:
+        # Only the chronons which overlap the render range are converted.
+        # They are converted at their original position, so that glissandi
+        # and tempo changes are the same as when converting the
+        # complete event.
+        start, end = (
+            core_parameters.abc.Duration.from_any(time) for time in render_range
+        )
+        if end <= start:
+            raise ValueError(
+                f"Found invalid render range '{render_range}': "
+                "the end must be after the start."
+            )
+        overlapping_chronon_tuple_tuple = tuple(
+            event_interval_index.get_overlapping_chronon_tuple(track_index, start, end)
+            for track_index, _ in enumerate(event_interval_index.consecution_tuple)
+        )
+        if self._mpe_member_channel_tuple:
+            midi_channel_data = self._allocate_mpe_member_channels(
+                tuple(
+                    [
+                        tone_tick_range
+                        for absolute_time, chronon in overlapping_chronon_tuple
+                        for tone_tick_range in self._chronon_to_tone_tick_range_tuple(
+                            chronon, absolute_time
+                        )
+                    ]
+                    for overlapping_chronon_tuple in overlapping_chronon_tuple_tuple
+                )
+            )
+        else:
+            midi_channel_data = self._find_available_midi_channel_tuple_per_consecution(
+                event_interval_index.consecution_tuple
+            )
+        midi_data_per_seq_list = []
+        for available_midi_channel_tuple, overlapping_chronon_tuple in zip(
+            midi_channel_data, overlapping_chronon_tuple_tuple
+        ):
+            if self._mpe_member_channel_tuple:
+                mchannel_cycle = iter(available_midi_channel_tuple)
+            else:
+                mchannel_cycle = itertools.cycle(available_midi_channel_tuple)
+            mlist: list[mido.Message] = []
+            for absolute_time, chronon in overlapping_chronon_tuple:
+                mlist.extend(
+                    self._chronon_to_midi_message_tuple(
+                        chronon, absolute_time, mchannel_cycle
+                    )
+                )
+            midi_data_per_seq_list.append(tuple(mlist))
+        self._add_midi_data_per_consecution_tuple_to_midi_file(
+            tuple(midi_data_per_seq_list),
+            end - start,
+            midi_file,
+            (self._beats_to_ticks(start), self._beats_to_ticks(end)),
+        )
+
+    def _add_midi_data_per_consecution_tuple_to_midi_file(
+        self,
+        midi_data_per_seq_tuple: tuple[tuple[mido.Message, ...], ...],
+        duration: core_parameters.abc.Duration.Type,
+        midi_file: mido.MidiFile,
+        render_tick_range: typing.Optional[tuple[int, int]] = None,
+    ) -> None:
+        if self._tuning_mode != "pitch_bend":
+            midi_data_per_seq_tuple = self._resolve_tuning_requests(
+                midi_data_per_seq_tuple
+            )
+
+        midi_data_per_seq_tuple = self._remove_redundant_state_messages(
+            midi_data_per_seq_tuple
+        )
+
+        if self._mpe_member_channel_tuple and midi_data_per_seq_tuple:
+            # The configuration is placed before all other messages of
+            # the first track (tracks are sorted stable).
+            midi_data_per_seq_tuple = (
+                self._get_mpe_configuration_message_tuple()
+                + midi_data_per_seq_tuple[0],
+            ) + midi_data_per_seq_tuple[1:]
 
         # midi file type 0 -> only one track
         if self._midi_file_type == 0:
@@ -768,7 +2718,10 @@ class EventToMidiFile(core_converters.abc.Converter):
                 operator.add, midi_data_per_seq_tuple
             )
             midi_track = self._midi_message_tuple_to_midi_track(
-                midi_data_for_one_track, duration, is_first_track=True
+                midi_data_for_one_track,
+                duration,
+                is_first_track=True,
+                render_tick_range=render_tick_range,
             )
             midi_file.tracks.append(midi_track)
 
@@ -776,19 +2729,38 @@ class EventToMidiFile(core_converters.abc.Converter):
         else:
             midi_track_iterator = (
                 self._midi_message_tuple_to_midi_track(
-                    m, duration, is_first_track=i == 0
+                    m,
+                    duration,
+                    is_first_track=i == 0,
+                    render_tick_range=render_tick_range,
                 )
                 for i, m in enumerate(midi_data_per_seq_tuple)
             )
             midi_file.tracks.extend(midi_track_iterator)
 
-    def _event_to_midi_file(self, event_to_convert: ConvertableEvent) -> mido.MidiFile:
+    def _event_to_midi_file(
+        self,
+        event_to_convert: ConvertableEvent,
+        render_range: typing.Optional[
+            tuple[core_parameters.abc.Duration.Type, core_parameters.abc.Duration.Type]
+        ] = None,
+        event_interval_index: typing.Optional[EventIntervalIndex] = None,
+    ) -> mido.MidiFile:
         """Convert mutwo event object to mido `MidiFile` object."""
 
         midi_file = mido.MidiFile(
             ticks_per_beat=self._ticks_per_beat, type=self._midi_file_type
         )
 
+        if render_range is not None:
+            self._logger.debug("EventIntervalIndex -> MidiFile")
+            self._add_event_interval_index_to_midi_file(
+                event_interval_index or EventIntervalIndex(event_to_convert),
+                render_range,
+                midi_file,
+            )
+            return midi_file
+
         # depending on the event types timing structure different methods are called
         match event_to_convert:
             case core_events.Concurrence():
@@ -810,13 +2782,47 @@ class EventToMidiFile(core_converters.abc.Converter):
 
         return midi_file
 
+    # ###################################################################### #
+    #                          public properties                             #
+    # ###################################################################### #
+
+    @property
+    def track_cache(self) -> midi_converters.LeastRecentlyUsedCache:
+        """The cache of rendered tracks (see ``track_cache_size``).
+
+        Use :meth:`mutwo.midi_converters.LeastRecentlyUsedCache.clear` to
+        invalidate all tracks, e.g. if a custom extraction function or
+        ``mutwo_pitch_to_midi_pitch`` depends on other data than the
+        durations, pitches, volumes and control messages of the chronons.
+        """
+        return self._track_cache
+
+    @property
+    def message_template_cache(self) -> midi_converters.LeastRecentlyUsedCache:
+        """The cache of rendered tones.
+
+        Use :meth:`mutwo.midi_converters.LeastRecentlyUsedCache.cache_info`
+        to inspect hit rates and evictions or
+        :meth:`mutwo.midi_converters.LeastRecentlyUsedCache.clear` to empty it.
+        """
+        return self._message_template_cache
+
     # ###################################################################### #
     #               public methods for interaction with the user             #
     # ###################################################################### #
 
     def convert(
-        self, event_to_convert: ConvertableEvent, path: typing.Optional[str] = None
-    ) -> mido.MidiFile:
+        self,
+        event_to_convert: ConvertableEvent,
+        path: typing.Optional[
+            str | os.PathLike | typing.BinaryIO | WritableBuffer
+        ] = None,
+        render_range: typing.Optional[
+            tuple[core_parameters.abc.Duration.Type, core_parameters.abc.Duration.Type]
+        ] = None,
+        event_interval_index: typing.Optional[EventIntervalIndex] = None,
+        return_bytes: bool = False,
+    ) -> mido.MidiFile | bytes | int:
         """Render a Midi file to the converters path attribute from the given event.
 
         :param event_to_convert: The given event that shall be translated
@@ -826,8 +2832,33 @@ class EventToMidiFile(core_converters.abc.Converter):
             file to the given path. The typical file type extension '.mid'
             is recommended, but not mandatory. If set to `None` the
             method won't write a midi file to the disk, but it will simply
-            return a :class:`mido.MidiFile` object. Default to `None`.
-        :type path: typing.Optional[str]
+            return a :class:`mido.MidiFile` object. Instead of a path it's
+            also possible to pass a binary file-like object or a preallocated
+            :class:`bytearray` or :class:`memoryview` (see
+            :class:`MidiFileToBytes`) to which the midi file is written.
+            In this case the number of written bytes is returned instead
+            of the :class:`mido.MidiFile` object. Default to `None`.
+        :type path: typing.Optional[str | os.PathLike | typing.BinaryIO | WritableBuffer]
+        :param render_range: If set only the part ``start <= time < end``
+            of the event is converted and the resulting midi file starts
+            at ``start``. The tempo and pitch bending which are active at
+            ``start`` are set at the beginning of the midi file (see also
+            ``clip_notes_to_render_range``). Default to ``None``.
+        :type render_range: typing.Optional[tuple[core_parameters.abc.Duration.Type, core_parameters.abc.Duration.Type]]
+        :param event_interval_index: The :class:`EventIntervalIndex` of
+            ``event_to_convert``. It's only used if ``render_range`` is set.
+            If ``None`` the index is built for each call. Pass a prebuilt
+            index to convert many render ranges of one event. Default to
+            ``None``.
+        :type event_interval_index: typing.Optional[EventIntervalIndex]
+        :param return_bytes: If set to ``True`` the bytes of the standard
+            midi file are returned instead of a :class:`mido.MidiFile`
+            object. It's not possible to set both ``path`` and
+            ``return_bytes``. Default to ``False``.
+        :type return_bytes: bool
+        :return: The :class:`mido.MidiFile` object, its bytes (if
+            ``return_bytes`` is ``True``) or the number of bytes which
+            have been written to a file-like object or buffer.
 
         The following example generates a midi file that contains a simple ascending
         pentatonic scale:
@@ -865,12 +2896,23 @@ class EventToMidiFile(core_converters.abc.Converter):
         MidiTrack inside one MidiFile.
         """
 
-        midi_file = self._event_to_midi_file(event_to_convert)
+        if return_bytes and path is not None:
+            raise ValueError("It's not possible to set both 'path' and 'return_bytes'.")
 
+        with midi_converters.DiagnosticCollector(self._logger):
+            midi_file = self._event_to_midi_file(
+                event_to_convert, render_range, event_interval_index
+            )
+
+        if return_bytes:
+            return self._midi_file_to_bytes.convert(midi_file)
         if path is not None:
-            try:
-                midi_file.save(filename=path)
-            except Exception:
-                raise AssertionError(midi_file)
+            if isinstance(path, (str, os.PathLike)):
+                try:
+                    midi_file.save(filename=path)
+                except Exception:
+                    raise AssertionError(midi_file)
+            else:
+                return self._midi_file_to_bytes.convert(midi_file, path)
 
         return midi_file
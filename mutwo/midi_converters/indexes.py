@@ -0,0 +1,487 @@
+"""Seek indices which allow to parse a part of a midi file without reading all of it.
+
+:class:`MidiFileIndexer` scans a midi file once and records for each track
+the parser state (byte offset, running status, absolute tick, the sounding
+notes and the last pitch bending and controller values of each midi
+channel) at regular tick intervals. :class:`MidiFileParser` can use the
+resulting :class:`MidiFileSeekIndex` to start decoding each track at the
+checkpoint which is closest to the start of its tick range. The index can
+be stored as a small json sidecar file next to the midi file, it's
+invalidated by the hash of the midi file.
+"""
+
+import bisect
+import hashlib
+import json
+import operator
+import os
+import struct
+import typing
+
+from mutwo import core_converters
+from mutwo import midi_converters
+
+__all__ = (
+    "SeekCheckpoint",
+    "TrackSeekIndex",
+    "MidiFileSeekIndex",
+    "MidiFileIndexer",
+)
+
+
+class SeekCheckpoint(typing.NamedTuple):
+    """The state of the parser before reading the message at ``position``.
+
+    ``tick`` is the absolute time (in ticks) of the previous message (the
+    message at ``position`` is always later), ``running_status`` is
+    ``None`` if no running status is active, ``active_note_count_tuple``
+    contains (midi channel, note, count) of the sounding notes (like in
+    :class:`mutwo.midi_converters.MidiFileToEvent` each stop message stops
+    one sounding note), ``pitchwheel_message_tuple`` contains the last
+    'pitchwheel' message of each midi channel and
+    ``control_change_message_tuple`` the last 'control_change' message of
+    each controller of each midi channel before ``position``.
+    """
+
+    tick: int
+    position: int
+    running_status: typing.Optional[int]
+    active_note_count_tuple: tuple[tuple[int, int, int], ...]
+    pitchwheel_message_tuple: tuple["midi_converters.PitchwheelMessage", ...]
+    control_change_message_tuple: tuple["midi_converters.ControlChangeMessage", ...]
+
+
+class TrackSeekIndex(typing.NamedTuple):
+    """All checkpoints of one track (sorted by time).
+
+    ``start`` and ``end`` are the byte offsets of the track data within the
+    midi file.
+    """
+
+    start: int
+    end: int
+    checkpoint_tuple: tuple[SeekCheckpoint, ...]
+
+    def get_checkpoint(self, tick: int) -> typing.Optional[SeekCheckpoint]:
+        """Find the last checkpoint from which all messages at ``tick`` can be read.
+
+        :param tick: The absolute time (in ticks) from which the track
+            shall be parsed.
+        :type tick: int
+        :return: ``None`` if the track needs to be parsed from its start.
+        """
+        checkpoint_index = bisect.bisect_left(
+            self.checkpoint_tuple, tick, key=operator.attrgetter("tick")
+        )
+        if checkpoint_index:
+            return self.checkpoint_tuple[checkpoint_index - 1]
+        return None
+
+
+class MidiFileSeekIndex(typing.NamedTuple):
+    """The result of :class:`MidiFileIndexer`.
+
+    ``digest`` is the hash of the indexed midi file,
+    ``set_tempo_message_tuple`` contains all 'set_tempo' messages of the
+    midi file (so that seconds can be converted to ticks without reading
+    the midi file) and ``track_seek_index_tuple`` contains one
+    :class:`TrackSeekIndex` for each track.
+    """
+
+    digest: str
+    midi_file_size: int
+    ticks_per_beat: int
+    interval_in_ticks: int
+    set_tempo_message_tuple: tuple["midi_converters.SetTempoMessage", ...]
+    track_seek_index_tuple: tuple[TrackSeekIndex, ...]
+
+    _VERSION = 3
+
+    @staticmethod
+    def get_digest(midi_file_data: bytes | bytearray | memoryview) -> str:
+        """Hash the content of a midi file."""
+        with memoryview(midi_file_data) as view, view.cast("B") as data:
+            return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    @staticmethod
+    def get_sidecar_path(midi_file_path: str | os.PathLike) -> str:
+        """Return the default path of the sidecar file of a midi file."""
+        return f"{os.fspath(midi_file_path)}.mutwo-seek-index.json"
+
+    def is_valid(self, midi_file_data: bytes | bytearray | memoryview) -> bool:
+        """Check if the index belongs to the given midi file content."""
+        with memoryview(midi_file_data) as view:
+            if view.nbytes != self.midi_file_size:
+                return False
+        return self.digest == self.get_digest(midi_file_data)
+
+    def write(self, path: str | os.PathLike):
+        """Store the index as a json file."""
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "version": self._VERSION,
+                    "digest": self.digest,
+                    "midi_file_size": self.midi_file_size,
+                    "ticks_per_beat": self.ticks_per_beat,
+                    "interval_in_ticks": self.interval_in_ticks,
+                    "set_tempo": [
+                        [set_tempo_message.time, set_tempo_message.tempo]
+                        for set_tempo_message in self.set_tempo_message_tuple
+                    ],
+                    "track": [
+                        [
+                            track_seek_index.start,
+                            track_seek_index.end,
+                            [
+                                [
+                                    checkpoint.tick,
+                                    checkpoint.position,
+                                    checkpoint.running_status,
+                                    checkpoint.active_note_count_tuple,
+                                    [
+                                        [
+                                            pitchwheel_message.time,
+                                            pitchwheel_message.channel,
+                                            pitchwheel_message.pitch,
+                                        ]
+                                        for pitchwheel_message in checkpoint.pitchwheel_message_tuple
+                                    ],
+                                    [
+                                        [
+                                            control_change_message.time,
+                                            control_change_message.channel,
+                                            control_change_message.control,
+                                            control_change_message.value,
+                                        ]
+                                        for control_change_message in checkpoint.control_change_message_tuple
+                                    ],
+                                ]
+                                for checkpoint in track_seek_index.checkpoint_tuple
+                            ],
+                        ]
+                        for track_seek_index in self.track_seek_index_tuple
+                    ],
+                },
+                f,
+                separators=(",", ":"),
+            )
+
+    @classmethod
+    def read(cls, path: str | os.PathLike) -> "MidiFileSeekIndex":
+        """Load an index which has been stored by :meth:`write`.
+
+        :raises ValueError: If the file isn't a valid seek index.
+        """
+        with open(path) as f:
+            try:
+                data = json.load(f)
+                if data["version"] != cls._VERSION:
+                    raise ValueError(
+                        f"Unsupported seek index version '{data['version']}'."
+                    )
+                return cls(
+                    data["digest"],
+                    data["midi_file_size"],
+                    data["ticks_per_beat"],
+                    data["interval_in_ticks"],
+                    tuple(
+                        midi_converters.SetTempoMessage("set_tempo", time, tempo)
+                        for time, tempo in data["set_tempo"]
+                    ),
+                    tuple(
+                        TrackSeekIndex(
+                            start,
+                            end,
+                            tuple(
+                                SeekCheckpoint(
+                                    tick,
+                                    position,
+                                    running_status,
+                                    tuple(
+                                        (channel, note, count)
+                                        for channel, note, count in active_note_count_list
+                                    ),
+                                    tuple(
+                                        midi_converters.PitchwheelMessage(
+                                            "pitchwheel", time, channel, pitch
+                                        )
+                                        for time, channel, pitch in pitchwheel_list
+                                    ),
+                                    tuple(
+                                        midi_converters.ControlChangeMessage(
+                                            "control_change",
+                                            time,
+                                            channel,
+                                            control,
+                                            value,
+                                        )
+                                        for time, channel, control, value in control_change_list
+                                    ),
+                                )
+                                for tick, position, running_status, active_note_count_list, pitchwheel_list, control_change_list in checkpoint_list
+                            ),
+                        )
+                        for start, end, checkpoint_list in data["track"]
+                    ),
+                )
+            except (KeyError, TypeError) as error:
+                raise ValueError(f"Invalid seek index file '{path}': {error}.")
+
+
+class MidiFileIndexer(core_converters.abc.Converter):
+    """Build a :class:`MidiFileSeekIndex` of a standard midi file.
+
+    :param interval_in_beats: The distance between two checkpoints of a
+        track. Smaller intervals make seeking faster, but the index
+        bigger. If ``None`` it's set to
+        :const:`mutwo.midi_converters.configurations.DEFAULT_SEEK_INDEX_INTERVAL_IN_BEATS`.
+        Default to ``None``.
+    :type interval_in_beats: typing.Optional[int]
+
+    **Example:**
+
+    >>> import mido
+    >>> from mutwo import midi_converters
+    >>> midi_file = mido.MidiFile(
+    ...     tracks=[
+    ...         mido.MidiTrack(
+    ...             [
+    ...                 mido.Message('note_on', note=60, time=0),
+    ...                 mido.Message('note_on', note=62, time=480),
+    ...                 mido.Message('note_off', note=60, time=480),
+    ...                 mido.Message('note_off', note=62, time=480),
+    ...             ]
+    ...         )
+    ...     ],
+    ...     ticks_per_beat=480,
+    ... )
+    >>> midi_file_bytes = midi_converters.MidiFileToBytes().convert(midi_file)
+    >>> seek_index = midi_converters.MidiFileIndexer(1).convert(midi_file_bytes)
+    >>> seek_index.track_seek_index_tuple[0].get_checkpoint(1000).tick
+    960
+    >>> midi_converters.MidiFileParser(
+    ...     tick_range=(1000, 2000), seek_index=seek_index
+    ... ).convert(midi_file_bytes).message_type_to_midi_message_list
+    {}
+    """
+
+    def __init__(self, interval_in_beats: typing.Optional[int] = None):
+        if interval_in_beats is None:
+            interval_in_beats = (
+                midi_converters.configurations.DEFAULT_SEEK_INDEX_INTERVAL_IN_BEATS
+            )
+        if interval_in_beats <= 0:
+            raise ValueError(
+                f"Found invalid interval '{interval_in_beats}', must be > 0."
+            )
+        self._interval_in_beats = interval_in_beats
+
+    @staticmethod
+    def _index_track(
+        data: memoryview,
+        position: int,
+        end: int,
+        interval_in_ticks: int,
+        set_tempo_message_list: list["midi_converters.SetTempoMessage"],
+    ) -> TrackSeekIndex:
+        # Status of 'set_tempo' meta events (see 'iter_track_events')
+        set_tempo_status = 0x100 | 0x51
+        start = position
+        checkpoint_list = []
+        # (midi channel, note) -> count of sounding notes
+        active_note_dict: dict[tuple[int, int], int] = {}
+        # Like in MidiFileToEvent 'note_off' messages stop notes after all
+        # 'note_on' messages of the same tick.
+        note_off_key_list: list[tuple[int, int]] = []
+        # midi channel -> (tick, pitch) of the last 'pitchwheel' message
+        pitchwheel_state_dict: dict[int, tuple[int, int]] = {}
+        # (midi channel, control) -> (tick, value) of the last
+        # 'control_change' message
+        control_change_state_dict: dict[tuple[int, int], tuple[int, int]] = {}
+
+        def stop_note(key: tuple[int, int]):
+            if (count := active_note_dict.get(key)) == 1:
+                del active_note_dict[key]
+            elif count:
+                active_note_dict[key] = count - 1
+
+        next_checkpoint_tick = interval_in_ticks
+        # The position, tick and running status before the current event
+        event_position = position
+        previous_tick = 0
+        running_status = None
+        for (
+            tick,
+            status,
+            position,
+            next_position,
+        ) in midi_converters.MidiFileParser.iter_track_events(data, position, end):
+            if tick != previous_tick:
+                for key in note_off_key_list:
+                    stop_note(key)
+                note_off_key_list.clear()
+                # The checkpoint is placed between two ticks, so that no
+                # message of its tick follows.
+                if previous_tick >= next_checkpoint_tick:
+                    checkpoint_list.append(
+                        SeekCheckpoint(
+                            previous_tick,
+                            event_position,
+                            running_status,
+                            tuple(
+                                (channel, note, count)
+                                for (channel, note), count in sorted(
+                                    active_note_dict.items()
+                                )
+                            ),
+                            tuple(
+                                midi_converters.PitchwheelMessage(
+                                    "pitchwheel", pitchwheel_tick, channel, pitch
+                                )
+                                for channel, (pitchwheel_tick, pitch) in sorted(
+                                    pitchwheel_state_dict.items()
+                                )
+                            ),
+                            tuple(
+                                midi_converters.ControlChangeMessage(
+                                    "control_change",
+                                    control_change_tick,
+                                    channel,
+                                    control,
+                                    value,
+                                )
+                                for (channel, control), (
+                                    control_change_tick,
+                                    value,
+                                ) in sorted(control_change_state_dict.items())
+                            ),
+                        )
+                    )
+                    next_checkpoint_tick = (
+                        previous_tick // interval_in_ticks + 1
+                    ) * interval_in_ticks
+                previous_tick = tick
+
+            if status < 0xF0:
+                running_status = status
+                kind = status & 0xF0
+                if kind == 0x90 or kind == 0x80:
+                    key = (status & 0x0F, data[position])
+                    if kind == 0x80:
+                        note_off_key_list.append(key)
+                    elif data[position + 1]:
+                        active_note_dict[key] = active_note_dict.get(key, 0) + 1
+                    else:
+                        stop_note(key)
+                elif kind == 0xE0:
+                    pitchwheel_state_dict[status & 0x0F] = (
+                        tick,
+                        (data[position] | (data[position + 1] << 7)) - 8192,
+                    )
+                elif kind == 0xB0:
+                    control_change_state_dict[(status & 0x0F, data[position])] = (
+                        tick,
+                        data[position + 1],
+                    )
+            else:
+                running_status = None
+                if status == set_tempo_status and next_position - position == 3:
+                    set_tempo_message_list.append(
+                        midi_converters.SetTempoMessage(
+                            "set_tempo",
+                            tick,
+                            (data[position] << 16)
+                            | (data[position + 1] << 8)
+                            | data[position + 2],
+                        )
+                    )
+            event_position = next_position
+
+        return TrackSeekIndex(start, end, tuple(checkpoint_list))
+
+    def _build(
+        self, midi_file_data: bytes | bytearray | memoryview
+    ) -> MidiFileSeekIndex:
+        with memoryview(midi_file_data) as view, view.cast("B") as data:
+            (
+                _,
+                track_count,
+                ticks_per_beat,
+                position,
+            ) = midi_converters.MidiFileParser._parse_header(data)
+            interval_in_ticks = max(self._interval_in_beats * ticks_per_beat, 1)
+            set_tempo_message_list: list[midi_converters.SetTempoMessage] = []
+            track_seek_index_list = []
+            data_size = len(data)
+            while len(track_seek_index_list) < track_count and position < data_size:
+                if position + 8 > data_size:
+                    raise ValueError("Invalid midi file: truncated chunk header.")
+                chunk_name = data[position : position + 4]
+                (chunk_size,) = struct.unpack(">L", data[position + 4 : position + 8])
+                position += 8
+                end = position + chunk_size
+                if end > data_size:
+                    raise ValueError("Invalid midi file: truncated track.")
+                if chunk_name == b"MTrk":
+                    try:
+                        track_seek_index_list.append(
+                            self._index_track(
+                                data,
+                                position,
+                                end,
+                                interval_in_ticks,
+                                set_tempo_message_list,
+                            )
+                        )
+                    except IndexError:
+                        raise ValueError("Invalid midi file: unexpected end of track.")
+                position = end
+
+            digest = MidiFileSeekIndex.get_digest(data)
+
+        set_tempo_message_list.sort(key=operator.attrgetter("time"))
+        return MidiFileSeekIndex(
+            digest,
+            data_size,
+            ticks_per_beat,
+            interval_in_ticks,
+            tuple(set_tempo_message_list),
+            tuple(track_seek_index_list),
+        )
+
+    def convert(
+        self,
+        midi_file_data: bytes | bytearray | memoryview,
+        sidecar_path: typing.Optional[str | os.PathLike] = None,
+    ) -> MidiFileSeekIndex:
+        """Build the seek index of a midi file.
+
+        :param midi_file_data: The content of a standard midi file (any
+            object which supports the buffer protocol, e.g. ``bytes`` or
+            :class:`mmap.mmap`).
+        :type midi_file_data: bytes | bytearray | memoryview
+        :param sidecar_path: If set, the index is loaded from this json file
+            if it exists and if it belongs to ``midi_file_data`` (same
+            hash). Otherwise the index is built and written to this file.
+            Use :meth:`MidiFileSeekIndex.get_sidecar_path` to get the
+            default path for a midi file. Default to ``None``.
+        :type sidecar_path: typing.Optional[str | os.PathLike]
+        """
+        if sidecar_path is not None:
+            try:
+                seek_index = MidiFileSeekIndex.read(sidecar_path)
+            except (OSError, ValueError):
+                pass
+            else:
+                if (
+                    seek_index.interval_in_ticks
+                    == self._interval_in_beats * seek_index.ticks_per_beat
+                    and seek_index.is_valid(midi_file_data)
+                ):
+                    return seek_index
+
+        seek_index = self._build(midi_file_data)
+        if sidecar_path is not None:
+            seek_index.write(sidecar_path)
+        return seek_index
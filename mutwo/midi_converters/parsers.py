@@ -0,0 +1,784 @@
+"""Parse standard midi files (SMF) without decoding unused messages.
+
+:class:`MidiFileParser` reads the bytes of a midi file and only creates
+python objects for the messages which are needed to convert the midi file
+to mutwo events. All other messages (sysex, most meta messages, program
+changes, ...) are skipped without being decoded.
+"""
+
+import bisect
+import math
+import operator
+import struct
+import sys
+import typing
+
+from mutwo import core_converters
+from mutwo import midi_converters
+
+__all__ = (
+    "NoteMessage",
+    "PitchwheelMessage",
+    "ControlChangeMessage",
+    "SetTempoMessage",
+    "ParsedMidiMessage",
+    "ParsedMidiFile",
+    "MidiFileParser",
+)
+
+
+class NoteMessage(typing.NamedTuple):
+    """A 'note_on' or 'note_off' message with absolute timing (in ticks)."""
+
+    type: str
+    time: int
+    channel: int
+    note: int
+    velocity: int
+
+
+class PitchwheelMessage(typing.NamedTuple):
+    """A 'pitchwheel' message with absolute timing (in ticks)."""
+
+    type: str
+    time: int
+    channel: int
+    pitch: int
+
+
+class ControlChangeMessage(typing.NamedTuple):
+    """A 'control_change' message with absolute timing (in ticks)."""
+
+    type: str
+    time: int
+    channel: int
+    control: int
+    value: int
+
+
+class SetTempoMessage(typing.NamedTuple):
+    """A 'set_tempo' meta message with absolute timing (in ticks)."""
+
+    type: str
+    time: int
+    tempo: int
+
+
+ParsedMidiMessage: typing.TypeAlias = (
+    NoteMessage | PitchwheelMessage | ControlChangeMessage | SetTempoMessage
+)
+
+
+class ParsedMidiFile(typing.NamedTuple):
+    """The result of :class:`MidiFileParser`.
+
+    ``message_type_to_midi_message_list`` contains the parsed messages of
+    all tracks sorted by their absolute time (message types without any
+    message are omitted).
+    """
+
+    midi_file_type: int
+    ticks_per_beat: int
+    track_count: int
+    message_type_to_midi_message_list: dict[str, list[ParsedMidiMessage]]
+
+
+class MidiFileParser(core_converters.abc.Converter):
+    """Parse the bytes of a standard midi file.
+
+    :param track_index_tuple: Only parse the tracks with these indices. If
+        ``None`` all tracks are parsed. Default to ``None``.
+    :type track_index_tuple: typing.Optional[typing.Iterable[int]]
+    :param midi_channel_tuple: Only parse channel messages of these midi
+        channels. If ``None`` messages of all channels are parsed. Default
+        to ``None``.
+    :type midi_channel_tuple: typing.Optional[typing.Iterable[int]]
+    :param message_type_tuple: Only parse messages of these types (any of
+        'note_on', 'note_off', 'pitchwheel', 'control_change' and
+        'set_tempo'). If ``None`` all of them are parsed. Default to ``None``.
+    :type message_type_tuple: typing.Optional[typing.Iterable[str]]
+    :param tick_range: Only parse messages with ``start <= tick < end``.
+        Notes which are started in this range keep their 'note_off' message
+        even if it is placed after the end of the range, notes which are
+        started before the range (and the messages which stop them) are
+        omitted. Notes are paired like in
+        :class:`mutwo.midi_converters.MidiFileToEvent`, but separately for
+        each track. The last 'pitchwheel' and
+        'control_change' messages of each midi channel (and controller)
+        and the last 'set_tempo' message before the range are moved to its
+        start, so that the pitch bending, the controllers and the tempo of
+        the notes at the start are kept. A
+        'pitchwheel' message one tick before the end of the range is only
+        parsed if a note of the same midi channel starts at this tick
+        (otherwise it belongs to a note after the range). If ``None`` all
+        messages are parsed. Default to ``None``.
+    :type tick_range: typing.Optional[tuple[int, int]]
+    :param seconds_range: Like ``tick_range``, but in seconds. The
+        'set_tempo' messages of all tracks are used to convert seconds to
+        ticks. It's not possible to set both ``tick_range`` and
+        ``seconds_range``. Default to ``None``.
+    :type seconds_range: typing.Optional[tuple[float, float]]
+    :param seek_index: The :class:`MidiFileSeekIndex` of the parsed midi
+        file. If a tick range or a seconds range is set, each track is
+        parsed from the checkpoint which is closest to the start of the
+        range (instead of from the start of the track) and seconds are
+        converted to ticks with the tempo map of the index. The parser
+        only checks if the size and the ticks per beat of the midi file
+        match the index (its hash isn't compared, because this would read
+        the complete midi file): use :meth:`MidiFileSeekIndex.is_valid`
+        or the ``sidecar_path`` of :meth:`MidiFileIndexer.convert` to make
+        sure that the index belongs to the midi file. Default to ``None``.
+    :type seek_index: typing.Optional[MidiFileSeekIndex]
+
+    The parser reads delta times, running status and event bytes directly
+    from the buffer. It only creates messages for 'note_on', 'note_off',
+    'pitchwheel', 'control_change' and 'set_tempo' events. The timing
+    of the resulting messages is absolute (in ticks) and the messages of
+    all tracks are merged. All filters are applied while parsing:
+    filtered tracks are skipped and filtered messages never become python
+    objects. Once the end of the tick range is reached and all notes
+    in the range have been stopped, the rest of a track is skipped.
+
+    **Example:**
+
+    >>> import mido
+    >>> from mutwo import midi_converters
+    >>> midi_file = mido.MidiFile(
+    ...     tracks=[
+    ...         mido.MidiTrack(
+    ...             [
+    ...                 mido.Message('program_change', program=3),
+    ...                 mido.Message('note_on', note=60, time=10),
+    ...                 mido.Message('note_off', note=60, time=20),
+    ...             ]
+    ...         )
+    ...     ]
+    ... )
+    >>> midi_file_bytes = midi_converters.MidiFileToBytes().convert(midi_file)
+    >>> parsed_midi_file = midi_converters.MidiFileParser().convert(midi_file_bytes)
+    >>> parsed_midi_file.message_type_to_midi_message_list['note_off']
+    [NoteMessage(type='note_off', time=30, channel=0, note=60, velocity=64)]
+    """
+
+    # Count of data bytes of channel messages (index = status >> 4 - 8)
+    _CHANNEL_MESSAGE_DATA_BYTE_COUNT_TUPLE = (2, 2, 2, 2, 1, 1, 2)
+    # Count of data bytes of system common and real time messages
+    # (index = status - 0xF0, sysex and meta messages have a length)
+    _SYSTEM_MESSAGE_DATA_BYTE_COUNT_TUPLE = (
+        0, 1, 2, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0
+    )  # fmt: skip
+    _MESSAGE_TYPE_TUPLE = (
+        "note_on",
+        "note_off",
+        "pitchwheel",
+        "control_change",
+        "set_tempo",
+    )
+
+    def __init__(
+        self,
+        track_index_tuple: typing.Optional[typing.Iterable[int]] = None,
+        midi_channel_tuple: typing.Optional[typing.Iterable[int]] = None,
+        message_type_tuple: typing.Optional[typing.Iterable[str]] = None,
+        tick_range: typing.Optional[tuple[int, int]] = None,
+        seconds_range: typing.Optional[tuple[float, float]] = None,
+        seek_index: typing.Optional["midi_converters.MidiFileSeekIndex"] = None,
+    ):
+        if tick_range is not None and seconds_range is not None:
+            raise ValueError(
+                "It's not possible to set both 'tick_range' and 'seconds_range'."
+            )
+        self._track_index_set = (
+            None if track_index_tuple is None else frozenset(track_index_tuple)
+        )
+        if midi_channel_tuple is None:
+            midi_channel_tuple = range(16)
+        midi_channel_set = frozenset(midi_channel_tuple)
+        self._is_midi_channel_allowed_tuple = tuple(
+            midi_channel in midi_channel_set for midi_channel in range(16)
+        )
+        if message_type_tuple is None:
+            message_type_tuple = self._MESSAGE_TYPE_TUPLE
+        self._message_type_set = frozenset(message_type_tuple)
+        if unknown_message_type_set := self._message_type_set.difference(
+            self._MESSAGE_TYPE_TUPLE
+        ):
+            raise ValueError(
+                f"Found unsupported message types '{unknown_message_type_set}'. "
+                f"Supported message types are '{self._MESSAGE_TYPE_TUPLE}'."
+            )
+        self._tick_range = tick_range
+        self._seconds_range = seconds_range
+        self._seek_index = seek_index
+
+    @staticmethod
+    def _parse_header(data: memoryview) -> tuple[int, int, int, int]:
+        if len(data) < 14 or data[:4] != b"MThd":
+            raise ValueError("Invalid midi file: no MThd header at start of file.")
+        (header_size,) = struct.unpack(">L", data[4:8])
+        midi_file_type, track_count, ticks_per_beat = struct.unpack(">hhh", data[8:14])
+        return midi_file_type, track_count, ticks_per_beat, 8 + header_size
+
+    @classmethod
+    def iter_track_events(
+        cls,
+        data: memoryview,
+        position: int,
+        end: int,
+        tick: int = 0,
+        running_status: typing.Optional[int] = None,
+    ) -> typing.Iterator[tuple[int, int, int, int]]:
+        """Iterate over the events of a track without decoding them.
+
+        :param data: The bytes of the midi file (cast to unsigned bytes).
+        :type data: memoryview
+        :param position: The byte offset at which the delta time of the
+            first event starts.
+        :type position: int
+        :param end: The byte offset of the end of the track.
+        :type end: int
+        :param tick: The absolute time (in ticks) of the event before
+            ``position``. Default to 0.
+        :type tick: int
+        :param running_status: The running status at ``position``.
+            Default to ``None``.
+        :type running_status: typing.Optional[int]
+        :return: For each event a tuple with its absolute time (in
+            ticks), its status, the byte offset of its data and the byte
+            offset of the next event. The status of channel messages is
+            resolved from the running status, meta events have the
+            status ``0x100 | meta type`` (their data starts after the
+            length).
+
+        Only delta times, status bytes and lengths are read. The running
+        status after an event is its status if it's a channel message and
+        ``None`` otherwise. A :class:`ValueError` is raised if the last
+        event exceeds ``end``.
+        """
+        channel_data_byte_count_tuple = cls._CHANNEL_MESSAGE_DATA_BYTE_COUNT_TUPLE
+        system_data_byte_count_tuple = cls._SYSTEM_MESSAGE_DATA_BYTE_COUNT_TUPLE
+        while position < end:
+            # Delta time (variable length quantity)
+            delta = data[position]
+            position += 1
+            if delta & 0x80:
+                delta &= 0x7F
+                while True:
+                    byte = data[position]
+                    position += 1
+                    delta = (delta << 7) | (byte & 0x7F)
+                    if byte < 0x80:
+                        break
+            tick += delta
+
+            status = data[position]
+            if status < 0x80:
+                if running_status is None:
+                    raise ValueError(
+                        "Invalid midi file: running status without last status "
+                        f"at byte {position}."
+                    )
+                status = running_status
+            else:
+                position += 1
+
+            if status < 0xF0:
+                running_status = status
+                next_position = (
+                    position + channel_data_byte_count_tuple[(status >> 4) - 8]
+                )
+                yield tick, status, position, next_position
+                position = next_position
+                continue
+
+            # Meta messages and sysex cancel running status
+            running_status = None
+            if status == 0xFF:
+                status = 0x100 | data[position]
+                position += 1
+            elif status != 0xF0 and status != 0xF7:
+                next_position = position + system_data_byte_count_tuple[status - 0xF0]
+                yield tick, status, position, next_position
+                position = next_position
+                continue
+
+            length = data[position]
+            position += 1
+            if length & 0x80:
+                length &= 0x7F
+                while True:
+                    byte = data[position]
+                    position += 1
+                    length = (length << 7) | (byte & 0x7F)
+                    if byte < 0x80:
+                        break
+            next_position = position + length
+            yield tick, status, position, next_position
+            position = next_position
+
+        if position > end:
+            raise ValueError("Invalid midi file: message exceeds end of track.")
+
+    def _seconds_range_to_tick_range(
+        self, data: memoryview, ticks_per_beat: int
+    ) -> tuple[int, int]:
+        if self._seek_index is not None:
+            set_tempo_message_list = self._seek_index.set_tempo_message_tuple
+        else:
+            set_tempo_message_list = (
+                MidiFileParser(message_type_tuple=("set_tempo",))
+                .convert(data)
+                .message_type_to_midi_message_list.get("set_tempo", [])
+            )
+
+        def seconds_to_tick(seconds: float) -> int:
+            tick, elapsed_seconds = 0, 0.0
+            microseconds_per_beat = (
+                midi_converters.constants.DEFAULT_MICROSECONDS_PER_BEAT
+            )
+            for set_tempo_message in set_tempo_message_list:
+                seconds_per_tick = microseconds_per_beat / 1e6 / ticks_per_beat
+                next_elapsed_seconds = elapsed_seconds + (
+                    (set_tempo_message.time - tick) * seconds_per_tick
+                )
+                if next_elapsed_seconds >= seconds:
+                    break
+                tick, elapsed_seconds = set_tempo_message.time, next_elapsed_seconds
+                microseconds_per_beat = set_tempo_message.tempo
+            seconds_per_tick = microseconds_per_beat / 1e6 / ticks_per_beat
+            return tick + math.ceil((seconds - elapsed_seconds) / seconds_per_tick)
+
+        start, end = self._seconds_range
+        return seconds_to_tick(start), seconds_to_tick(end)
+
+    @staticmethod
+    def _update_state_dict(
+        state_dict: dict[typing.Any, tuple[int, int]],
+        key: typing.Any,
+        tick: int,
+        value: int,
+    ):
+        # Keep the latest value (of all tracks)
+        if (previous_state := state_dict.get(key)) is None or previous_state[0] <= tick:
+            state_dict[key] = (tick, value)
+
+    def _parse_track(
+        self,
+        data: memoryview,
+        position: int,
+        end: int,
+        message_type_to_midi_message_list: dict[str, list[ParsedMidiMessage]],
+        tick_range: typing.Optional[tuple[int, int]],
+        tick: int = 0,
+        running_status: typing.Optional[int] = None,
+        pitchwheel_state_dict: typing.Optional[dict[int, tuple[int, int]]] = None,
+        control_change_state_dict: typing.Optional[
+            dict[tuple[int, int], tuple[int, int]]
+        ] = None,
+        skipped_note_dict: typing.Optional[dict[int, int]] = None,
+        set_tempo_state_dict: typing.Optional[dict[None, tuple[int, int]]] = None,
+    ):
+        """Parse the messages of one track.
+
+        ``pitchwheel_state_dict`` (midi channel -> (tick, pitch)),
+        ``control_change_state_dict`` ((midi channel, control) -> (tick,
+        value)) and ``set_tempo_state_dict`` (``None`` -> (tick, tempo))
+        are updated with the last messages before the tick range.
+        ``skipped_note_dict`` ((midi channel << 7 | note) -> count) contains
+        the notes which are sounding at ``position`` and is updated too.
+        """
+        # Status of 'set_tempo' meta events (see 'iter_track_events')
+        set_tempo_status = 0x100 | 0x51
+        is_midi_channel_allowed_tuple = self._is_midi_channel_allowed_tuple
+        message_type_set = self._message_type_set
+        parse_note_on = "note_on" in message_type_set
+        parse_note_off = "note_off" in message_type_set
+        parse_pitchwheel = "pitchwheel" in message_type_set
+        parse_control_change = "control_change" in message_type_set
+        parse_set_tempo = "set_tempo" in message_type_set
+        note_on_list = message_type_to_midi_message_list["note_on"]
+        note_off_list = message_type_to_midi_message_list["note_off"]
+        pitchwheel_list = message_type_to_midi_message_list["pitchwheel"]
+        control_change_list = message_type_to_midi_message_list["control_change"]
+        set_tempo_list = message_type_to_midi_message_list["set_tempo"]
+
+        is_windowed = tick_range is not None
+        start_tick, end_tick = tick_range if is_windowed else (0, sys.maxsize)
+        # (midi channel << 7 | note) -> count of sounding notes which are
+        # started in the tick range
+        active_note_dict: dict[int, int] = {}
+        # (midi channel << 7 | note) -> count of sounding notes which are
+        # started before the tick range
+        if skipped_note_dict is None:
+            skipped_note_dict = {}
+        # 'note_off' messages of the current tick: like in MidiFileToEvent
+        # they stop notes after all 'note_on' messages of the same tick.
+        # Before the tick range only their keys are stored, otherwise
+        # (key, channel, note, velocity).
+        note_off_item_list: list = []
+        note_off_tick = 0
+        # midi channel or (midi channel, control) -> (tick, position)
+        track_pitchwheel_state_dict: dict[int, tuple[int, int]] = {}
+        track_control_change_state_dict: dict[tuple[int, int], tuple[int, int]] = {}
+        track_set_tempo_state: typing.Optional[tuple[int, int]] = None
+        # 'pitchwheel' messages one tick before the end of the tick range
+        # are kept until a note of their channel starts at the same tick.
+        last_tick = end_tick - 1
+        last_tick_pitchwheel_dict: dict[int, PitchwheelMessage] = {}
+        last_tick_note_channel_set: set[int] = set()
+
+        def stop_note(key: int, tick: int) -> bool:
+            # Like in MidiFileToEvent each note stop message stops the
+            # earliest sounding note: so the notes which are started before
+            # the tick range are stopped first and their messages are
+            # omitted. Return if the message is kept.
+            if count := skipped_note_dict.get(key):
+                if count == 1:
+                    del skipped_note_dict[key]
+                else:
+                    skipped_note_dict[key] = count - 1
+                return False
+            if tick < start_tick:
+                return False
+            if count := active_note_dict.get(key):
+                if count == 1:
+                    del active_note_dict[key]
+                else:
+                    active_note_dict[key] = count - 1
+                return True
+            # Messages without sounding note are ignored by MidiFileToEvent
+            return tick < end_tick
+
+        def stop_notes_of_note_off_tick():
+            for key, channel, note, velocity in note_off_item_list:
+                if stop_note(key, note_off_tick) and parse_note_off:
+                    note_off_list.append(
+                        NoteMessage("note_off", note_off_tick, channel, note, velocity)
+                    )
+            note_off_item_list.clear()
+
+        for tick, status, position, next_position in self.iter_track_events(
+            data, position, end, tick, running_status
+        ):
+            if note_off_item_list and tick != note_off_tick:
+                if note_off_tick < start_tick:
+                    for key in note_off_item_list:
+                        if (count := skipped_note_dict.get(key)) == 1:
+                            del skipped_note_dict[key]
+                        elif count:
+                            skipped_note_dict[key] = count - 1
+                    note_off_item_list.clear()
+                else:
+                    stop_notes_of_note_off_tick()
+            if tick >= end_tick and not active_note_dict:
+                # Nothing which is part of the tick range can follow.
+                break
+
+            if status < 0xF0:
+                kind = status & 0xF0
+                channel = status & 0x0F
+                if not is_midi_channel_allowed_tuple[channel]:
+                    pass
+                elif kind == 0x90 or kind == 0x80:
+                    note = data[position]
+                    velocity = data[position + 1]
+                    # Keep track of all notes which are sounding at the
+                    # start of the tick range or which are started in the
+                    # tick range, so that the 'note_off' messages of the
+                    # notes in the tick range are found (even after the end
+                    # of the tick range). 'note_on' messages with velocity
+                    # 0 are 'note_off' messages.
+                    if is_windowed:
+                        key = (channel << 7) | note
+                        if kind == 0x80:
+                            note_off_item_list.append(
+                                key
+                                if tick < start_tick
+                                else (key, channel, note, velocity)
+                            )
+                            note_off_tick = tick
+                            continue
+                        elif not velocity:
+                            if not stop_note(key, tick):
+                                continue
+                        elif tick < start_tick:
+                            skipped_note_dict[key] = skipped_note_dict.get(key, 0) + 1
+                            continue
+                        elif tick < end_tick:
+                            active_note_dict[key] = active_note_dict.get(key, 0) + 1
+                            if tick == last_tick:
+                                last_tick_note_channel_set.add(channel)
+                                if (
+                                    pitchwheel_message := last_tick_pitchwheel_dict.pop(
+                                        channel, None
+                                    )
+                                ) is not None:
+                                    pitchwheel_list.append(pitchwheel_message)
+                        else:
+                            continue
+                    if kind == 0x90:
+                        if parse_note_on:
+                            note_on_list.append(
+                                NoteMessage("note_on", tick, channel, note, velocity)
+                            )
+                    elif parse_note_off:
+                        note_off_list.append(
+                            NoteMessage("note_off", tick, channel, note, velocity)
+                        )
+                elif tick < start_tick:
+                    # Remember the position of the last messages before
+                    # the tick range (they are decoded at the end).
+                    if kind == 0xE0:
+                        if parse_pitchwheel:
+                            track_pitchwheel_state_dict[channel] = (tick, position)
+                    elif kind == 0xB0:
+                        if parse_control_change:
+                            track_control_change_state_dict[
+                                (channel, data[position])
+                            ] = (tick, position)
+                elif tick >= end_tick:
+                    pass
+                elif kind == 0xE0:
+                    if parse_pitchwheel:
+                        pitchwheel_message = PitchwheelMessage(
+                            "pitchwheel",
+                            tick,
+                            channel,
+                            (data[position] | (data[position + 1] << 7)) - 8192,
+                        )
+                        if (
+                            tick == last_tick
+                            and channel not in last_tick_note_channel_set
+                        ):
+                            last_tick_pitchwheel_dict[channel] = pitchwheel_message
+                        else:
+                            pitchwheel_list.append(pitchwheel_message)
+                elif kind == 0xB0:
+                    if parse_control_change:
+                        control_change_list.append(
+                            ControlChangeMessage(
+                                "control_change",
+                                tick,
+                                channel,
+                                data[position],
+                                data[position + 1],
+                            )
+                        )
+            elif (
+                status == set_tempo_status
+                and next_position - position == 3
+                and parse_set_tempo
+            ):
+                if tick < start_tick:
+                    track_set_tempo_state = (tick, position)
+                elif tick < end_tick:
+                    set_tempo_list.append(
+                        SetTempoMessage(
+                            "set_tempo",
+                            tick,
+                            (data[position] << 16)
+                            | (data[position + 1] << 8)
+                            | data[position + 2],
+                        )
+                    )
+
+        if note_off_item_list and note_off_tick >= start_tick:
+            stop_notes_of_note_off_tick()
+
+        if pitchwheel_state_dict is not None:
+            for channel, (tick, position) in track_pitchwheel_state_dict.items():
+                self._update_state_dict(
+                    pitchwheel_state_dict,
+                    channel,
+                    tick,
+                    (data[position] | (data[position + 1] << 7)) - 8192,
+                )
+        if control_change_state_dict is not None:
+            for key, (tick, position) in track_control_change_state_dict.items():
+                self._update_state_dict(
+                    control_change_state_dict, key, tick, data[position + 1]
+                )
+        if set_tempo_state_dict is not None and track_set_tempo_state is not None:
+            tick, position = track_set_tempo_state
+            self._update_state_dict(
+                set_tempo_state_dict,
+                None,
+                tick,
+                (data[position] << 16) | (data[position + 1] << 8) | data[position + 2],
+            )
+
+    def convert(self, midi_file_data: bytes | bytearray | memoryview) -> ParsedMidiFile:
+        """Parse the bytes of a midi file.
+
+        :param midi_file_data: The content of a standard midi file. This
+            can be any object which supports the buffer protocol (e.g.
+            ``bytes``, ``memoryview`` or :class:`mmap.mmap`). The data
+            isn't copied.
+        :type midi_file_data: bytes | bytearray | memoryview
+        """
+        with memoryview(midi_file_data) as view, view.cast("B") as data:
+            midi_file_type, track_count, ticks_per_beat, position = self._parse_header(
+                data
+            )
+            seek_index = self._seek_index
+            if seek_index is not None and (
+                seek_index.midi_file_size != len(data)
+                or seek_index.ticks_per_beat != ticks_per_beat
+            ):
+                raise ValueError("The seek index doesn't belong to this midi file.")
+            if self._seconds_range is not None:
+                tick_range = self._seconds_range_to_tick_range(data, ticks_per_beat)
+            else:
+                tick_range = self._tick_range
+            if tick_range is None:
+                seek_index = None
+            message_type_to_midi_message_list: dict[str, list[ParsedMidiMessage]] = {
+                message_type: [] for message_type in self._MESSAGE_TYPE_TUPLE
+            }
+            pitchwheel_state_dict: dict[int, tuple[int, int]] = {}
+            control_change_state_dict: dict[tuple[int, int], tuple[int, int]] = {}
+            # Only one tempo is active for all tracks
+            set_tempo_state_dict: dict[None, tuple[int, int]] = {}
+            if seek_index is not None and "set_tempo" in self._message_type_set:
+                # The index contains all 'set_tempo' messages (also the
+                # ones before the checkpoints).
+                set_tempo_message_tuple = seek_index.set_tempo_message_tuple
+                if set_tempo_index := bisect.bisect_left(
+                    set_tempo_message_tuple,
+                    tick_range[0],
+                    key=operator.attrgetter("time"),
+                ):
+                    set_tempo_message = set_tempo_message_tuple[set_tempo_index - 1]
+                    set_tempo_state_dict[None] = (
+                        set_tempo_message.time,
+                        set_tempo_message.tempo,
+                    )
+            track_index = 0
+            data_size = len(data)
+            while track_index < track_count and position < data_size:
+                if position + 8 > data_size:
+                    raise ValueError("Invalid midi file: truncated chunk header.")
+                chunk_name = data[position : position + 4]
+                (chunk_size,) = struct.unpack(">L", data[position + 4 : position + 8])
+                position += 8
+                end = position + chunk_size
+                if end > data_size:
+                    raise ValueError("Invalid midi file: truncated track.")
+                # Unknown chunks must be ignored (see midi file specification)
+                if chunk_name == b"MTrk":
+                    if (
+                        self._track_index_set is None
+                        or track_index in self._track_index_set
+                    ):
+                        # Seek to the checkpoint before the tick range
+                        if seek_index is not None and (
+                            checkpoint := seek_index.track_seek_index_tuple[
+                                track_index
+                            ].get_checkpoint(tick_range[0])
+                        ):
+                            track_state = (
+                                checkpoint.position,
+                                checkpoint.tick,
+                                checkpoint.running_status,
+                                {
+                                    (channel << 7) | note: count
+                                    for channel, note, count in checkpoint.active_note_count_tuple
+                                },
+                            )
+                            # Restore the state of the skipped messages
+                            for (
+                                pitchwheel_message
+                            ) in checkpoint.pitchwheel_message_tuple:
+                                self._update_state_dict(
+                                    pitchwheel_state_dict,
+                                    pitchwheel_message.channel,
+                                    pitchwheel_message.time,
+                                    pitchwheel_message.pitch,
+                                )
+                            for (
+                                control_change_message
+                            ) in checkpoint.control_change_message_tuple:
+                                self._update_state_dict(
+                                    control_change_state_dict,
+                                    (
+                                        control_change_message.channel,
+                                        control_change_message.control,
+                                    ),
+                                    control_change_message.time,
+                                    control_change_message.value,
+                                )
+                        else:
+                            track_state = (position, 0, None, {})
+                        (
+                            track_position,
+                            tick,
+                            running_status,
+                            skipped_note_dict,
+                        ) = track_state
+                        try:
+                            self._parse_track(
+                                data,
+                                track_position,
+                                end,
+                                message_type_to_midi_message_list,
+                                tick_range,
+                                tick,
+                                running_status,
+                                pitchwheel_state_dict,
+                                control_change_state_dict,
+                                skipped_note_dict,
+                                # Already known from the seek index
+                                (
+                                    None
+                                    if seek_index is not None
+                                    else set_tempo_state_dict
+                                ),
+                            )
+                        except IndexError:
+                            raise ValueError(
+                                "Invalid midi file: unexpected end of track."
+                            )
+                    track_index += 1
+                position = end
+
+        if tick_range is not None:
+            # The state messages are placed before the messages at the
+            # start of the tick range (sorting is stable).
+            start_tick = tick_range[0]
+            is_midi_channel_allowed_tuple = self._is_midi_channel_allowed_tuple
+            if "pitchwheel" in self._message_type_set:
+                message_type_to_midi_message_list["pitchwheel"][:0] = [
+                    PitchwheelMessage("pitchwheel", start_tick, channel, pitch)
+                    for channel, (_, pitch) in sorted(pitchwheel_state_dict.items())
+                    if is_midi_channel_allowed_tuple[channel]
+                ]
+            if "control_change" in self._message_type_set:
+                message_type_to_midi_message_list["control_change"][:0] = [
+                    ControlChangeMessage(
+                        "control_change", start_tick, channel, control, value
+                    )
+                    for (channel, control), (_, value) in sorted(
+                        control_change_state_dict.items()
+                    )
+                    if is_midi_channel_allowed_tuple[channel]
+                ]
+            if set_tempo_state_dict:
+                _, tempo = set_tempo_state_dict[None]
+                message_type_to_midi_message_list["set_tempo"].insert(
+                    0, SetTempoMessage("set_tempo", start_tick, tempo)
+                )
+
+        get_time = operator.attrgetter("time")
+        for midi_message_list in message_type_to_midi_message_list.values():
+            midi_message_list.sort(key=get_time)
+
+        return ParsedMidiFile(
+            midi_file_type,
+            ticks_per_beat,
+            track_index,
+            {
+                message_type: midi_message_list
+                for message_type, midi_message_list in message_type_to_midi_message_list.items()
+                if midi_message_list
+            },
+        )
@@ -0,0 +1,393 @@
+"""Convert midi files to piano roll matrices and piano roll matrices to midi files.
+
+A piano roll is a :class:`numpy.ndarray` with one row for each midi note
+(0 - 127) and one column for each time step. The notes of the midi file
+are paired like in :class:`mutwo.midi_converters.MidiFileToEvent` and
+written with :class:`mutwo.midi_converters.MidiFileToBytes`, but no
+:mod:`mutwo.core_events` objects are created.
+
+The converters of this module depend on :mod:`numpy`, which isn't a
+required dependency of ``mutwo.midi``. It can be installed with
+``pip3 install mutwo.midi[numpy]``.
+"""
+
+import os
+import typing
+
+import mido
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mutwo import core_converters
+from mutwo import midi_converters
+
+__all__ = ("PianoRoll", "MidiFileToPianoRoll", "PianoRollToMidiFile")
+
+
+def _assert_numpy_is_installed():
+    if numpy is None:
+        raise ImportError(
+            "Piano roll converters need 'numpy'. Please install it with "
+            "'pip3 install mutwo.midi[numpy]'."
+        )
+
+
+def _round_division(dividend: "numpy.ndarray", divisor: int) -> "numpy.ndarray":
+    """Divide integers and round halves up (without floating point errors)"""
+    return (2 * dividend + divisor) // (2 * divisor)
+
+
+class PianoRoll(typing.NamedTuple):
+    """Notes of a midi file as matrix of midi notes and time steps.
+
+    ``matrix`` has the shape ``(128, step_count)``: ``matrix[60, 4]`` is
+    the value of the midi note 60 during the fifth time step. Notes which
+    don't sound have the value 0. The value of sounding notes depends on
+    the velocity encoding (see :class:`MidiFileToPianoRoll`).
+    ``onset_matrix`` is an optional boolean matrix of the same shape which
+    is ``True`` at the first time step of each note, so that repeated
+    notes can be distinguished from one long note.
+    """
+
+    matrix: "numpy.ndarray"
+    steps_per_beat: int
+    onset_matrix: typing.Optional["numpy.ndarray"] = None
+
+
+class MidiFileToPianoRoll(core_converters.abc.Converter):
+    """Convert a midi file to a :class:`PianoRoll`.
+
+    :param steps_per_beat: The time resolution of the piano roll. If
+        ``None`` it's set to
+        :const:`mutwo.midi_converters.configurations.DEFAULT_PIANO_ROLL_STEPS_PER_BEAT`.
+        Default to ``None``.
+    :type steps_per_beat: typing.Optional[int]
+    :param velocity_encoding: How the velocity of the notes is encoded.
+        ``"velocity"`` keeps the midi velocity (``numpy.uint8``),
+        ``"normalized"`` divides it by 127 (``numpy.float32``) and
+        ``"binary"`` only marks sounding notes (``bool``). If ``None``
+        it's set to
+        :const:`mutwo.midi_converters.configurations.DEFAULT_PIANO_ROLL_VELOCITY_ENCODING`.
+        Default to ``None``.
+    :type velocity_encoding: typing.Optional[str]
+    :param is_onset_matrix_included: If ``True`` the
+        :attr:`PianoRoll.onset_matrix` is set. Default to ``False``.
+    :type is_onset_matrix_included: bool
+    :param midi_file_to_event: The converter which reads the midi file and
+        pairs its note messages (its filter arguments are applied). If
+        ``None`` a :class:`MidiFileToEvent` which only decodes note
+        messages is used. Default to ``None``.
+    :type midi_file_to_event: typing.Optional[MidiFileToEvent]
+
+    The start and the end of each note are rounded to the nearest time
+    step and each note lasts at least one time step. The notes of all
+    tracks and midi channels are merged. If notes with the same midi note
+    overlap, the highest velocity is used. Pitch bends, control changes
+    and tempo changes are ignored.
+
+    **Example:**
+
+    >>> import mido
+    >>> from mutwo import midi_converters
+    >>> midi_file = mido.MidiFile(
+    ...     tracks=[
+    ...         mido.MidiTrack(
+    ...             [
+    ...                 mido.Message('note_on', note=60, velocity=100, time=0),
+    ...                 mido.Message('note_off', note=60, time=240),
+    ...             ]
+    ...         )
+    ...     ],
+    ...     ticks_per_beat=480,
+    ... )
+    >>> piano_roll = midi_converters.MidiFileToPianoRoll(4).convert(midi_file)
+    >>> piano_roll.matrix.shape
+    (128, 2)
+    >>> piano_roll.matrix[60].tolist()
+    [100, 100]
+    """
+
+    _VELOCITY_ENCODING_TUPLE = ("velocity", "normalized", "binary")
+
+    def __init__(
+        self,
+        steps_per_beat: typing.Optional[int] = None,
+        velocity_encoding: typing.Optional[str] = None,
+        is_onset_matrix_included: bool = False,
+        midi_file_to_event: typing.Optional["midi_converters.MidiFileToEvent"] = None,
+    ):
+        _assert_numpy_is_installed()
+        if steps_per_beat is None:
+            steps_per_beat = (
+                midi_converters.configurations.DEFAULT_PIANO_ROLL_STEPS_PER_BEAT
+            )
+        if velocity_encoding is None:
+            velocity_encoding = (
+                midi_converters.configurations.DEFAULT_PIANO_ROLL_VELOCITY_ENCODING
+            )
+        if steps_per_beat <= 0:
+            raise ValueError(
+                f"Found invalid steps_per_beat '{steps_per_beat}', must be > 0."
+            )
+        if velocity_encoding not in self._VELOCITY_ENCODING_TUPLE:
+            raise ValueError(
+                f"Found invalid velocity_encoding '{velocity_encoding}', must be "
+                f"one of '{self._VELOCITY_ENCODING_TUPLE}'."
+            )
+        self._steps_per_beat = steps_per_beat
+        self._velocity_encoding = velocity_encoding
+        self._is_onset_matrix_included = is_onset_matrix_included
+        self._midi_file_to_event = (
+            midi_file_to_event
+            or midi_converters.MidiFileToEvent(
+                message_type_tuple=("note_on", "note_off")
+            )
+        )
+
+    def _note_pair_tuple_to_piano_roll(
+        self,
+        note_pair_tuple: "midi_converters.backends.NotePairTuple",
+        ticks_per_beat: int,
+    ) -> PianoRoll:
+        note_array = numpy.array(
+            [
+                (note_on.time, note_off.time, note_on.note, note_on.velocity)
+                for note_on, note_off in note_pair_tuple
+            ],
+            dtype=numpy.int64,
+        ).reshape(-1, 4)
+        start_tick_array, end_tick_array, pitch_array, velocity_array = note_array.T
+        start_step_array = _round_division(
+            start_tick_array * self._steps_per_beat, ticks_per_beat
+        )
+        end_step_array = numpy.maximum(
+            _round_division(end_tick_array * self._steps_per_beat, ticks_per_beat),
+            start_step_array + 1,
+        )
+        step_count = int(end_step_array.max(initial=0))
+
+        # Each note is spread to one (pitch, step) index per time step.
+        step_count_array = end_step_array - start_step_array
+        note_index_array = numpy.repeat(
+            numpy.arange(len(step_count_array)), step_count_array
+        )
+        step_array = (
+            numpy.arange(len(note_index_array))
+            - numpy.repeat(
+                numpy.cumsum(step_count_array) - step_count_array, step_count_array
+            )
+            + start_step_array[note_index_array]
+        )
+        velocity_matrix = numpy.zeros((128, step_count), dtype=numpy.uint8)
+        numpy.maximum.at(
+            velocity_matrix,
+            (pitch_array[note_index_array], step_array),
+            velocity_array[note_index_array].astype(numpy.uint8),
+        )
+        match self._velocity_encoding:
+            case "velocity":
+                matrix = velocity_matrix
+            case "normalized":
+                matrix = velocity_matrix.astype(numpy.float32) / 127
+            case "binary":
+                matrix = velocity_matrix.astype(bool)
+
+        onset_matrix = None
+        if self._is_onset_matrix_included:
+            onset_matrix = numpy.zeros((128, step_count), dtype=bool)
+            onset_matrix[pitch_array, start_step_array] = True
+
+        return PianoRoll(matrix, self._steps_per_beat, onset_matrix)
+
+    def convert(
+        self, midi_file_path_or_mido_midi_file: "midi_converters.backends.MidiFileData"
+    ) -> PianoRoll:
+        """Convert a midi file to a piano roll.
+
+        :param midi_file_path_or_mido_midi_file: The midi file (see
+            :meth:`MidiFileToEvent.convert`).
+        :type midi_file_path_or_mido_midi_file: MidiFileData
+        :return: The piano roll. It starts at the beginning of the midi
+            file and ends with the last note.
+        """
+
+        return self._note_pair_tuple_to_piano_roll(
+            *self._midi_file_to_event._read_note_pair_tuple(
+                midi_file_path_or_mido_midi_file
+            )
+        )
+
+
+class PianoRollToMidiFile(core_converters.abc.Converter):
+    """Convert a :class:`PianoRoll` to a midi file.
+
+    :param ticks_per_beat: The resolution of the midi file. If ``None``
+        it's set to
+        :const:`mutwo.midi_converters.configurations.DEFAULT_TICKS_PER_BEAT`.
+        Default to ``None``.
+    :type ticks_per_beat: typing.Optional[int]
+    :param velocity: The velocity of the notes of boolean piano rolls.
+        If ``None`` it's set to
+        :const:`mutwo.midi_converters.configurations.DEFAULT_PIANO_ROLL_VELOCITY`.
+        Default to ``None``.
+    :type velocity: typing.Optional[int]
+    :param midi_channel: The midi channel of all notes. Default to 0.
+    :type midi_channel: int
+
+    The encoding of the velocities is found by the type of the matrix:
+    boolean matrices only mark sounding notes, floating point matrices
+    contain velocities between 0 and 1 and integer matrices contain midi
+    velocities. A note starts where a midi note starts to sound, where its
+    velocity changes or where the :attr:`PianoRoll.onset_matrix` is
+    ``True``. All notes are written to one track of a midi file of type 0
+    without any tempo message (so they are played with the default tempo
+    of 120 beats per minute).
+
+    **Example:**
+
+    >>> import numpy
+    >>> from mutwo import midi_converters
+    >>> matrix = numpy.zeros((128, 4), dtype=bool)
+    >>> matrix[60, :2] = matrix[64, 2:] = True
+    >>> midi_file = midi_converters.PianoRollToMidiFile().convert(
+    ...     midi_converters.PianoRoll(matrix, 2)
+    ... )
+    >>> [(message.type, message.note, message.time) for message in midi_file.tracks[0][:4]]
+    [('note_on', 60, 0), ('note_off', 60, 480), ('note_on', 64, 0), ('note_off', 64, 480)]
+    """
+
+    def __init__(
+        self,
+        ticks_per_beat: typing.Optional[int] = None,
+        velocity: typing.Optional[int] = None,
+        midi_channel: int = 0,
+    ):
+        _assert_numpy_is_installed()
+        self._ticks_per_beat = (
+            ticks_per_beat or midi_converters.configurations.DEFAULT_TICKS_PER_BEAT
+        )
+        if velocity is None:
+            velocity = midi_converters.configurations.DEFAULT_PIANO_ROLL_VELOCITY
+        self._velocity = velocity
+        self._midi_channel = midi_channel
+        self._midi_file_to_bytes = midi_converters.MidiFileToBytes()
+
+    def _matrix_to_velocity_matrix(self, matrix: "numpy.ndarray") -> "numpy.ndarray":
+        if matrix.dtype == bool:
+            return matrix.astype(numpy.uint8) * self._velocity
+        if numpy.issubdtype(matrix.dtype, numpy.floating):
+            velocity_matrix = numpy.rint(matrix * 127)
+        else:
+            velocity_matrix = matrix
+        # Sounding notes have at least velocity 1 (velocity 0 is note off)
+        return numpy.where(matrix != 0, numpy.clip(velocity_matrix, 1, 127), 0).astype(
+            numpy.uint8
+        )
+
+    def _piano_roll_to_midi_track(self, piano_roll: PianoRoll) -> mido.MidiTrack:
+        velocity_matrix = self._matrix_to_velocity_matrix(piano_roll.matrix)
+        if velocity_matrix.ndim != 2 or velocity_matrix.shape[0] != 128:
+            raise ValueError(
+                f"Found piano roll of invalid shape '{velocity_matrix.shape}', "
+                "expected '(128, step_count)'."
+            )
+        step_count = velocity_matrix.shape[1]
+        is_sounding_matrix = velocity_matrix != 0
+
+        is_start_matrix = is_sounding_matrix.copy()
+        is_start_matrix[:, 1:] &= (~is_sounding_matrix[:, :-1]) | (
+            velocity_matrix[:, 1:] != velocity_matrix[:, :-1]
+        )
+        if piano_roll.onset_matrix is not None:
+            is_start_matrix |= is_sounding_matrix & piano_roll.onset_matrix
+        # The last time step of each note
+        is_end_matrix = is_sounding_matrix.copy()
+        is_end_matrix[:, :-1] &= (~is_sounding_matrix[:, 1:]) | is_start_matrix[:, 1:]
+
+        # 'numpy.nonzero' sorts by pitch and then by step, so that the
+        # n-th start and the n-th end belong to the same note.
+        pitch_array, start_step_array = numpy.nonzero(is_start_matrix)
+        end_step_array = numpy.nonzero(is_end_matrix)[1] + 1
+        velocity_array = velocity_matrix[pitch_array, start_step_array]
+
+        steps_per_beat = piano_roll.steps_per_beat
+        ticks_per_beat = self._ticks_per_beat
+        note_count = len(pitch_array)
+        start_tick_array = _round_division(
+            start_step_array.astype(numpy.int64) * ticks_per_beat, steps_per_beat
+        )
+        # Notes last at least one tick, even if a time step is shorter.
+        end_tick_array = numpy.maximum(
+            _round_division(
+                end_step_array.astype(numpy.int64) * ticks_per_beat, steps_per_beat
+            ),
+            start_tick_array + 1,
+        )
+        tick_array = numpy.concatenate((start_tick_array, end_tick_array))
+        is_note_on_array = numpy.repeat((True, False), note_count)
+        # At the same tick notes stop before other notes start.
+        sort_index_array = numpy.lexsort(
+            (numpy.tile(pitch_array, 2), is_note_on_array, tick_array)
+        )
+        tick_array = tick_array[sort_index_array]
+        delta_tick_array = numpy.diff(tick_array, prepend=0)
+
+        channel = self._midi_channel
+        track = mido.MidiTrack()
+        for delta_tick, is_note_on, pitch, velocity in zip(
+            delta_tick_array.tolist(),
+            is_note_on_array[sort_index_array].tolist(),
+            numpy.tile(pitch_array, 2)[sort_index_array].tolist(),
+            numpy.tile(velocity_array, 2)[sort_index_array].tolist(),
+        ):
+            # Values are already valid, so they don't need to be checked.
+            track.append(
+                mido.Message(
+                    "note_on" if is_note_on else "note_off",
+                    skip_checks=True,
+                    channel=channel,
+                    note=pitch,
+                    velocity=velocity if is_note_on else 0,
+                    time=delta_tick,
+                )
+            )
+        end_tick = int(_round_division(step_count * ticks_per_beat, steps_per_beat))
+        track.append(
+            mido.MetaMessage(
+                "end_of_track",
+                time=end_tick - (int(tick_array[-1]) if note_count else 0),
+            )
+        )
+        return track
+
+    def convert(
+        self,
+        piano_roll: PianoRoll,
+        path: typing.Optional[
+            str | os.PathLike | typing.BinaryIO | bytearray | memoryview
+        ] = None,
+    ) -> mido.MidiFile | int:
+        """Convert a piano roll to a midi file.
+
+        :param piano_roll: The piano roll which shall be converted.
+        :type piano_roll: PianoRoll
+        :param path: If set the midi file is also written to this path,
+            binary file-like object or preallocated buffer (see
+            :meth:`EventToMidiFile.convert`). Default to ``None``.
+        :type path: typing.Optional[str | os.PathLike | typing.BinaryIO | bytearray | memoryview]
+        :return: The midi file or, if it's written to a binary file-like
+            object or buffer, the number of written bytes.
+        """
+
+        midi_file = mido.MidiFile(type=0, ticks_per_beat=self._ticks_per_beat)
+        midi_file.tracks.append(self._piano_roll_to_midi_track(piano_roll))
+        if path is not None:
+            if isinstance(path, (str, os.PathLike)):
+                with open(path, "wb") as f:
+                    self._midi_file_to_bytes.convert(midi_file, f)
+            else:
+                return self._midi_file_to_bytes.convert(midi_file, path)
+        return midi_file
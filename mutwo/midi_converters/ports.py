@@ -0,0 +1,599 @@
+"""Play mutwo events in real time on midi ports.
+
+The converters in this module don't write midi files, but they send midi
+messages to (or receive them from) :mod:`mido` ports while the music is
+playing. :class:`EventToMidiOutput` uses the same message generation as
+:class:`mutwo.midi_converters.EventToMidiFile`.
+"""
+
+import collections
+import heapq
+import math
+import threading
+import time
+import typing
+
+import mido
+
+from mutwo import core_converters
+from mutwo import core_events
+from mutwo import core_parameters
+from mutwo import core_utilities
+from mutwo import midi_converters
+
+__all__ = ("PlaybackMetrics", "EventToMidiOutput", "MidiInputToEvent")
+
+
+TimedMidiMessage = tuple[float, mido.Message]
+"""A midi message and its absolute time in seconds."""
+
+
+class PlaybackMetrics(typing.NamedTuple):
+    """Timing statistics of one playback.
+
+    The latency of a message is the difference between the moment when it
+    has been sent and the moment when it should have been sent (both
+    measured with the clock of the player). The jitter is the standard
+    deviation of all latencies.
+    """
+
+    message_count: int
+    mean_latency_in_seconds: float
+    max_latency_in_seconds: float
+    jitter_in_seconds: float
+    duration_in_seconds: float
+
+
+class _LatencyStatistics(object):
+    """Running mean and variance of latencies (Welford's algorithm).
+
+    Playbacks can take hours, so the latencies aren't stored.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = self.max = self._squared_deviation_sum = 0.0
+
+    def add(self, latency: float):
+        self.count += 1
+        delta = latency - self.mean
+        self.mean += delta / self.count
+        self._squared_deviation_sum += delta * (latency - self.mean)
+        if latency > self.max:
+            self.max = latency
+
+    @property
+    def standard_deviation(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self._squared_deviation_sum / self.count)
+
+
+class EventToMidiOutput(core_converters.abc.Converter):
+    """Play mutwo events on a midi output port.
+
+    :param event_to_midi_file: Converter which renders the midi messages.
+        All its arguments (tempo, midi channels, pitch bending, ...) are
+        respected. If ``None`` a new :class:`mutwo.midi_converters.EventToMidiFile`
+        with default arguments is used. Default to ``None``.
+    :type event_to_midi_file: typing.Optional[midi_converters.EventToMidiFile]
+    :param lookahead_in_seconds: How far messages are prepared (their
+        ticks are converted to seconds) ahead of the playhead. The buffer
+        is refilled while the player waits for the next message, so that
+        no work needs to be done when a message is due. Default to ``None``
+        (which uses
+        :const:`mutwo.midi_converters.configurations.DEFAULT_PLAYBACK_LOOKAHEAD_IN_SECONDS`).
+    :type lookahead_in_seconds: typing.Optional[float]
+    :param busy_wait_in_seconds: The player sleeps until this time before
+        the next message is due and then polls the clock. Higher values
+        reduce the jitter (because the wake up time of the operating
+        system is imprecise), but use more CPU. Default to ``None`` (which
+        uses :const:`mutwo.midi_converters.configurations.DEFAULT_PLAYBACK_BUSY_WAIT_IN_SECONDS`).
+    :type busy_wait_in_seconds: typing.Optional[float]
+    :param clock: Monotonic clock which returns the current time in seconds.
+        Default to :func:`time.monotonic`.
+    :type clock: typing.Callable[[], float]
+    :param sleep: Function which pauses for the given number of seconds.
+        Default to :func:`time.sleep`.
+    :type sleep: typing.Callable[[float], typing.Any]
+
+    The complete event (or the complete ``render_range``) is rendered
+    with :class:`mutwo.midi_converters.EventToMidiFile` before the first
+    message is sent. So the time until the playback starts and the memory
+    which it needs grow with the length of the event. Use the
+    ``render_range`` and ``event_interval_index`` arguments of
+    :meth:`convert` to quickly start the playback of a part of a long
+    event.
+
+    **Example:**
+
+    >>> import mido
+    >>> from mutwo import midi_converters
+    >>> from mutwo import music_events
+    >>> event_to_midi_output = midi_converters.EventToMidiOutput()
+    >>> with mido.open_output() as output_port:  # doctest: +SKIP
+    ...     event_to_midi_output.convert(music_events.NoteLike('c', 1), output_port)
+    """
+
+    def __init__(
+        self,
+        event_to_midi_file: typing.Optional[midi_converters.EventToMidiFile] = None,
+        lookahead_in_seconds: typing.Optional[float] = None,
+        busy_wait_in_seconds: typing.Optional[float] = None,
+        clock: typing.Callable[[], float] = time.monotonic,
+        sleep: typing.Callable[[float], typing.Any] = time.sleep,
+    ):
+        if event_to_midi_file is None:
+            event_to_midi_file = midi_converters.EventToMidiFile()
+        if lookahead_in_seconds is None:
+            lookahead_in_seconds = (
+                midi_converters.configurations.DEFAULT_PLAYBACK_LOOKAHEAD_IN_SECONDS
+            )
+        if busy_wait_in_seconds is None:
+            busy_wait_in_seconds = (
+                midi_converters.configurations.DEFAULT_PLAYBACK_BUSY_WAIT_IN_SECONDS
+            )
+        for name, value in (
+            ("lookahead_in_seconds", lookahead_in_seconds),
+            ("busy_wait_in_seconds", busy_wait_in_seconds),
+        ):
+            if value < 0:
+                raise ValueError(f"Found invalid {name} '{value}', must be >= 0.")
+        self._event_to_midi_file = event_to_midi_file
+        self._lookahead_in_seconds = lookahead_in_seconds
+        self._busy_wait_in_seconds = busy_wait_in_seconds
+        self._clock = clock
+        self._sleep = sleep
+
+    # ###################################################################### #
+    #                          private methods                               #
+    # ###################################################################### #
+
+    @staticmethod
+    def _midi_file_to_timed_message_iterator(
+        midi_file: mido.MidiFile,
+    ) -> typing.Iterator[tuple[float, mido.Message]]:
+        """Yield all messages which can be sent and their absolute time in seconds.
+
+        The ticks are converted with the tempo which is active at the
+        position of each message.
+        """
+        ticks_per_beat = midi_file.ticks_per_beat
+        tempo = midi_converters.constants.DEFAULT_MICROSECONDS_PER_BEAT
+        absolute_time_in_seconds = 0.0
+        for midi_message in mido.merge_tracks(midi_file.tracks, skip_checks=True):
+            if midi_message.time:
+                absolute_time_in_seconds += mido.tick2second(
+                    midi_message.time, ticks_per_beat, tempo
+                )
+            if midi_message.is_meta:
+                if midi_message.type == "set_tempo":
+                    tempo = midi_message.tempo
+            else:
+                yield absolute_time_in_seconds, midi_message
+
+    def _wait_until(self, deadline: float):
+        clock, busy_wait_in_seconds = self._clock, self._busy_wait_in_seconds
+        while (remaining_time := deadline - clock()) > busy_wait_in_seconds:
+            self._sleep(remaining_time - busy_wait_in_seconds)
+        while clock() < deadline:
+            pass
+
+    @staticmethod
+    def _stop_active_notes(
+        active_note_set: set[tuple[int, int]], output_port: mido.ports.BaseOutput
+    ):
+        for midi_channel, midi_pitch in sorted(active_note_set):
+            output_port.send(
+                mido.Message("note_off", channel=midi_channel, note=midi_pitch)
+            )
+        active_note_set.clear()
+
+    # ###################################################################### #
+    #               public methods for interaction with the user             #
+    # ###################################################################### #
+
+    def convert(
+        self,
+        event_to_convert: (
+            core_events.Chronon
+            | core_events.Consecution[core_events.Chronon]
+            | core_events.Concurrence[core_events.Consecution[core_events.Chronon]]
+        ),
+        output_port: mido.ports.BaseOutput,
+        render_range: typing.Optional[
+            tuple[core_parameters.abc.Duration.Type, core_parameters.abc.Duration.Type]
+        ] = None,
+        event_interval_index: typing.Optional[
+            midi_converters.EventIntervalIndex
+        ] = None,
+    ) -> PlaybackMetrics:
+        """Play an event on a midi output port and wait until it's finished.
+
+        :param event_to_convert: The event which shall be played.
+        :type event_to_convert: core_events.Chronon | core_events.Consecution[core_events.Chronon] | core_events.Concurrence[core_events.Consecution[core_events.Chronon]]
+        :param output_port: The port to which the midi messages are sent.
+            Any object with a ``send`` method which accepts
+            :class:`mido.Message` objects can be used.
+        :type output_port: mido.ports.BaseOutput
+        :param render_range: Only play this part of the event (see
+            :meth:`mutwo.midi_converters.EventToMidiFile.convert`).
+            Default to ``None``.
+        :type render_range: typing.Optional[tuple[core_parameters.abc.Duration.Type, core_parameters.abc.Duration.Type]]
+        :param event_interval_index: A prepared index of the event for
+            ``render_range``. Default to ``None``.
+        :type event_interval_index: typing.Optional[midi_converters.EventIntervalIndex]
+        :return: Timing statistics of the playback.
+
+        The event is rendered before the playback starts and the clock
+        of the playback starts after rendering. If the playback is
+        interrupted (for instance by a :class:`KeyboardInterrupt`), all
+        sounding notes are stopped before the exception is raised again.
+        """
+        midi_file = self._event_to_midi_file.convert(
+            event_to_convert,
+            render_range=render_range,
+            event_interval_index=event_interval_index,
+        )
+        timed_message_iterator = self._midi_file_to_timed_message_iterator(midi_file)
+        clock, lookahead_in_seconds = self._clock, self._lookahead_in_seconds
+
+        buffer: collections.deque[tuple[float, mido.Message]] = collections.deque()
+        latency_statistics = _LatencyStatistics()
+        active_note_set: set[tuple[int, int]] = set()
+        is_exhausted = False
+
+        start = clock()
+        try:
+            while True:
+                playhead = clock() - start
+                while not is_exhausted and (
+                    not buffer or buffer[-1][0] < playhead + lookahead_in_seconds
+                ):
+                    try:
+                        buffer.append(next(timed_message_iterator))
+                    except StopIteration:
+                        is_exhausted = True
+                if not buffer:
+                    break
+                absolute_time_in_seconds, midi_message = buffer.popleft()
+                self._wait_until(start + absolute_time_in_seconds)
+                latency_statistics.add(clock() - start - absolute_time_in_seconds)
+                # Remember notes before sending them, so that they are
+                # also stopped if sending is interrupted.
+                match midi_message.type:
+                    case "note_on" if midi_message.velocity:
+                        active_note_set.add((midi_message.channel, midi_message.note))
+                    case "note_on" | "note_off":
+                        active_note_set.discard(
+                            (midi_message.channel, midi_message.note)
+                        )
+                output_port.send(midi_message)
+        finally:
+            if active_note_set:
+                self._stop_active_notes(active_note_set, output_port)
+
+        return PlaybackMetrics(
+            latency_statistics.count,
+            latency_statistics.mean,
+            latency_statistics.max,
+            latency_statistics.standard_deviation,
+            clock() - start,
+        )
+
+
+class MidiInputToEvent(core_converters.abc.Converter):
+    """Record midi messages into a mutwo event while they are played.
+
+    :param midi_file_to_event: The converter whose note pairing, voice
+        allocation and parameter conversion are used. If ``None`` a new
+        :class:`mutwo.midi_converters.MidiFileToEvent` with default
+        arguments is used. Default to ``None``.
+    :type midi_file_to_event: typing.Optional[midi_converters.MidiFileToEvent]
+    :param tempo: The constant tempo which is used to convert seconds to
+        beats. Default to ``None`` (which uses
+        :const:`mutwo.midi_converters.configurations.DEFAULT_TEMPO`).
+    :type tempo: typing.Optional[core_parameters.DirectTempo]
+    :param ticks_per_beat: All times are quantized to ticks before the
+        notes are converted, so that the result equals the conversion of
+        a midi file with the same resolution. Default to ``None`` (which
+        uses :const:`mutwo.midi_converters.configurations.DEFAULT_TICKS_PER_BEAT`).
+    :type ticks_per_beat: typing.Optional[int]
+    :param clock: Monotonic clock which is used to timestamp messages
+        without explicit time. Default to :func:`time.monotonic`.
+    :type clock: typing.Callable[[], float]
+
+    Notes are paired and grouped exactly like by
+    :class:`mutwo.midi_converters.MidiFileToEvent`, but incrementally: each
+    message only needs amortized constant work (apart from the search for
+    a free voice), so the recorded event is ready as soon as the input
+    ends. A note is added to the event when it and all notes which started
+    before it have been stopped and when a later message has been
+    received (so that notes without duration which start at the same time
+    are grouped to one chord). 'note_on' messages with velocity 0 stop
+    notes, all messages which aren't note messages are ignored.
+
+    **Example:**
+
+    >>> import mido
+    >>> from mutwo import midi_converters
+    >>> midi_input_to_event = midi_converters.MidiInputToEvent()
+    >>> concurrence = midi_input_to_event.convert(
+    ...     [
+    ...         (0, mido.Message('note_on', note=60)),
+    ...         (0.5, mido.Message('note_off', note=60)),
+    ...     ]
+    ... )
+    >>> concurrence[0][0].duration
+    DirectDuration(1.0)
+    """
+
+    def __init__(
+        self,
+        midi_file_to_event: typing.Optional[midi_converters.MidiFileToEvent] = None,
+        tempo: typing.Optional[core_parameters.DirectTempo] = None,
+        ticks_per_beat: typing.Optional[int] = None,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        self._logger = core_utilities.get_cls_logger(type(self))
+        self._midi_file_to_event = (
+            midi_file_to_event or midi_converters.MidiFileToEvent()
+        )
+        self._ticks_per_beat = (
+            ticks_per_beat or midi_converters.configurations.DEFAULT_TICKS_PER_BEAT
+        )
+        self._ticks_per_second = (
+            (tempo or midi_converters.configurations.DEFAULT_TEMPO).bpm
+            / 60
+            * self._ticks_per_beat
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    # ###################################################################### #
+    #                          private methods                               #
+    # ###################################################################### #
+
+    def _start_note(self, tick: int, midi_message: mido.Message):
+        note_index = self._note_count
+        self._note_count += 1
+        self._note_key_to_active_note_deque.setdefault(
+            (midi_message.channel, midi_message.note), collections.deque()
+        ).append(
+            (
+                note_index,
+                midi_converters.NoteMessage(
+                    "note_on",
+                    tick,
+                    midi_message.channel,
+                    midi_message.note,
+                    midi_message.velocity,
+                ),
+            )
+        )
+        self._active_note_deque.append((tick, note_index))
+
+    def _stop_note(self, tick: int, midi_message: mido.Message):
+        note_key = (midi_message.channel, midi_message.note)
+        try:
+            active_note_deque = self._note_key_to_active_note_deque[note_key]
+        except KeyError:
+            self._logger.debug("Ignored note off without note on: %s", midi_message)
+            return
+        # The first note on is paired with the first note off (like in
+        # MidiFileToEvent).
+        note_index, note_on_message = active_note_deque.popleft()
+        if not active_note_deque:
+            del self._note_key_to_active_note_deque[note_key]
+        self._stopped_note_index_set.add(note_index)
+        note_off_message = midi_converters.NoteMessage(
+            midi_message.type, tick, *note_key, midi_message.velocity
+        )
+        start_and_stop_tuple = (note_on_message.time, tick)
+        try:
+            note_pair_list = self._start_and_stop_tuple_to_note_pair_list[
+                start_and_stop_tuple
+            ]
+        except KeyError:
+            note_pair_list = self._start_and_stop_tuple_to_note_pair_list[
+                start_and_stop_tuple
+            ] = []
+            heapq.heappush(self._start_and_stop_tuple_heap, start_and_stop_tuple)
+        note_pair_list.append((note_index, (note_on_message, note_off_message)))
+
+    def _add_stopped_notes_to_concurrence(self, is_final: bool = False):
+        """Add all stopped notes which can't be preceded by another note.
+
+        Notes are added in the same order as in :class:`MidiFileToEvent`:
+        sorted by their start and, for equal starts, by their first note on.
+        So a note is only added if no sounding note started at the same
+        time or earlier. Notes which start at the current tick are kept
+        as well: other notes without duration could still join their
+        chord.
+        """
+        active_note_deque = self._active_note_deque
+        stopped_note_index_set = self._stopped_note_index_set
+        while active_note_deque and active_note_deque[0][1] in stopped_note_index_set:
+            stopped_note_index_set.remove(active_note_deque.popleft()[1])
+        start_and_stop_tuple_heap = self._start_and_stop_tuple_heap
+        if is_final:
+            earliest_active_start = math.inf
+        elif active_note_deque:
+            earliest_active_start = active_note_deque[0][0]
+        else:
+            earliest_active_start = self._tick
+        item_list = []
+        while (
+            start_and_stop_tuple_heap
+            and start_and_stop_tuple_heap[0][0] < earliest_active_start
+        ):
+            start_and_stop_tuple = heapq.heappop(start_and_stop_tuple_heap)
+            item_list.append(
+                (
+                    start_and_stop_tuple,
+                    sorted(
+                        self._start_and_stop_tuple_to_note_pair_list.pop(
+                            start_and_stop_tuple
+                        )
+                    ),
+                )
+            )
+        if not item_list:
+            return
+        item_list.sort(key=lambda item: (item[0][0], item[1][0][0]))
+
+        with self._lock:
+            for (start_tick, stop_tick), indexed_note_pair_list in item_list:
+                self._add_chronon_to_concurrence(
+                    start_tick,
+                    stop_tick,
+                    self._midi_file_to_event._note_pair_list_to_chronon(
+                        [note_pair for _, note_pair in indexed_note_pair_list],
+                        self._ticks_per_beat,
+                    ),
+                )
+
+    def _add_chronon_to_concurrence(
+        self, start_tick: int, stop_tick: int, chronon: core_events.Chronon
+    ):
+        # The chronon is added to the first voice which is already
+        # silent at its start (like in MidiFileToEvent). The end of each
+        # voice is stored, because the duration of a consecution needs
+        # linear time.
+        voice_end_tick_list = self._voice_end_tick_list
+        for voice_index, voice_end_tick in enumerate(voice_end_tick_list):
+            if voice_end_tick <= start_tick:
+                break
+        else:
+            voice_index = len(voice_end_tick_list)
+            voice_end_tick_list.append(0)
+            self._concurrence.append(core_events.Consecution([]))
+        consecution = self._concurrence[voice_index]
+        if (rest_tick_count := start_tick - voice_end_tick_list[voice_index]) > 0:
+            consecution.append(
+                core_events.Chronon(
+                    midi_converters.MidiFileToEvent._tick_to_duration(
+                        rest_tick_count, self._ticks_per_beat
+                    )
+                )
+            )
+        consecution.append(chronon)
+        voice_end_tick_list[voice_index] = stop_tick
+
+    # ###################################################################### #
+    #               public methods for interaction with the user             #
+    # ###################################################################### #
+
+    def reset(self):
+        """Forget all recorded messages and start a new recording."""
+        with self._lock:
+            self._concurrence = core_events.Concurrence([])
+        self._voice_end_tick_list: list[int] = []
+        self._start_time: typing.Optional[float] = None
+        self._tick = 0
+        self._note_count = 0
+        # (channel, note) -> deque[(note index, note on message)]
+        self._note_key_to_active_note_deque: dict[
+            tuple[int, int], collections.deque
+        ] = {}
+        # (start tick, note index) of all notes in the order of their start,
+        # stopped notes are removed lazily.
+        self._active_note_deque: collections.deque[tuple[int, int]] = (
+            collections.deque()
+        )
+        self._stopped_note_index_set: set[int] = set()
+        self._start_and_stop_tuple_to_note_pair_list: dict[tuple[int, int], list] = {}
+        self._start_and_stop_tuple_heap: list[tuple[int, int]] = []
+
+    def add_message(
+        self,
+        midi_message: mido.Message,
+        absolute_time_in_seconds: typing.Optional[float] = None,
+    ):
+        """Record one midi message.
+
+        :param midi_message: The received message.
+        :type midi_message: mido.Message
+        :param absolute_time_in_seconds: The time of the message since the
+            start of the recording. Messages must be added in chronological
+            order (earlier times are moved to the time of the previous
+            message). If ``None`` the message is timestamped with the clock
+            of the recorder, the recording starts with the first message.
+            Default to ``None``.
+        :type absolute_time_in_seconds: typing.Optional[float]
+        """
+        if absolute_time_in_seconds is None:
+            now = self._clock()
+            if self._start_time is None:
+                self._start_time = now
+            absolute_time_in_seconds = now - self._start_time
+        previous_tick = self._tick
+        tick = self._tick = max(
+            round(absolute_time_in_seconds * self._ticks_per_second), previous_tick
+        )
+        match midi_message.type:
+            case "note_on" if midi_message.velocity:
+                if tick > previous_tick:
+                    # Notes without duration at the previous tick are
+                    # complete now.
+                    self._add_stopped_notes_to_concurrence()
+                self._start_note(tick, midi_message)
+            case "note_on" | "note_off":
+                self._stop_note(tick, midi_message)
+                self._add_stopped_notes_to_concurrence()
+
+    def finish(self) -> core_events.Concurrence[core_events.Consecution]:
+        """Add all stopped notes to the event and return a copy of it.
+
+        Notes which are still sounding are ignored (like notes without
+        note off messages in :class:`MidiFileToEvent`).
+        """
+        for active_note_deque in self._note_key_to_active_note_deque.values():
+            for _, note_on_message in active_note_deque:
+                midi_converters.DiagnosticCollector.report(
+                    self._logger,
+                    "missing_note_off",
+                    "Found note on message without any suitable "
+                    "note off message partner. The note on message is: "
+                    "'%s'.",
+                    note_on_message,
+                )
+        self._add_stopped_notes_to_concurrence(is_final=True)
+        return self.snapshot()
+
+    def snapshot(self) -> core_events.Concurrence[core_events.Consecution]:
+        """Return a copy of the event which has been recorded until now.
+
+        It's safe to call this method from another thread than the thread
+        which adds the messages.
+        """
+        with self._lock:
+            return self._concurrence.copy()
+
+    def convert(
+        self,
+        midi_message_source: typing.Iterable[mido.Message | TimedMidiMessage],
+    ) -> core_events.Concurrence[core_events.Consecution]:
+        """Record all messages of a midi input port or of another source.
+
+        :param midi_message_source: A :mod:`mido` input port (the
+            recording stops when the port is closed) or any iterable which
+            yields midi messages or tuples of an absolute time in seconds
+            and a midi message (see :meth:`add_message`).
+        :type midi_message_source: typing.Iterable[mido.Message | TimedMidiMessage]
+        :return: The recorded event.
+
+        All previously recorded messages are forgotten. Use
+        :meth:`snapshot` to get the event which has been recorded so far
+        while the recording is running.
+        """
+        self.reset()
+        with midi_converters.DiagnosticCollector(self._logger):
+            for item in midi_message_source:
+                if isinstance(item, tuple):
+                    absolute_time_in_seconds, midi_message = item
+                    self.add_message(midi_message, absolute_time_in_seconds)
+                else:
+                    self.add_message(item)
+            return self.finish()
@@ -0,0 +1,430 @@
+"""Store the notes of parsed midi files in a memory-mappable columnar file.
+
+:class:`MidiFileToNoteStore` pairs the note messages of a midi file like
+:class:`mutwo.midi_converters.MidiFileToEvent` and stores each property of
+the notes in a typed column. A :class:`NoteStore` can be written to a
+file and opened again with :meth:`NoteStore.read`: the columns are then
+:class:`numpy.memmap` views of the file, so neither the midi file is
+parsed again nor any python object is created for the notes.
+:class:`NoteStoreToEvent` converts a note store to a mutwo event.
+
+Reading note store files needs :mod:`numpy`, which isn't a required
+dependency of ``mutwo.midi``. It can be installed with
+``pip3 install mutwo.midi[numpy]``.
+"""
+
+import array
+import heapq
+import itertools
+import json
+import os
+import struct
+import sys
+import typing
+
+import mido
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mutwo import core_converters
+from mutwo import core_events
+from mutwo import midi_converters
+
+__all__ = ("NoteStore", "MidiFileToNoteStore", "NoteStoreToEvent")
+
+# 'array.array' in memory, 'numpy.memmap' if read from a file
+ColumnArray: typing.TypeAlias = typing.Any
+
+
+class NoteStore(typing.NamedTuple):
+    """The notes of a midi file as typed columns.
+
+    Each note has one row in the note columns (``onset_tick_array``,
+    ``duration_array``, ``pitch_array``, ``bend_array``,
+    ``velocity_array``, ``channel_array`` and ``track_array``). The rows
+    are sorted by onset (and by track for notes with the same onset).
+    Onsets and durations are in ticks, ``pitch_array`` contains the midi
+    notes and ``bend_array`` the pitch bend (-8192 - 8191) of the midi
+    channel at the start of each note. ``tempo_tick_array`` and
+    ``tempo_array`` are the tempo map of the midi file (in microseconds
+    per beat, like 'set_tempo' messages). ``metadata`` can contain any
+    json serializable data (e.g. the path of the midi file).
+
+    **File format:**
+
+    A note store file starts with the magic bytes ``b"MUTWONS\\0"``, the
+    version and the size of the header (two little-endian unsigned 32 bit
+    integers). The header is a utf-8 encoded json object with the file
+    level data and a ``"column"`` object which maps the name of each
+    column (the field name without ``"_array"``) to its numpy dtype, its
+    byte offset from the start of the file and its length. All columns
+    are little-endian and aligned to 64 bytes, so each column can be read
+    with ``numpy.memmap(path, dtype, mode="r", offset=offset, shape=(length,))``.
+    """
+
+    ticks_per_beat: int
+    midi_file_type: int
+    track_count: int
+    metadata: dict[str, typing.Any]
+    onset_tick_array: ColumnArray
+    duration_array: ColumnArray
+    pitch_array: ColumnArray
+    bend_array: ColumnArray
+    velocity_array: ColumnArray
+    channel_array: ColumnArray
+    track_array: ColumnArray
+    tempo_tick_array: ColumnArray
+    tempo_array: ColumnArray
+
+    _MAGIC = b"MUTWONS\0"
+    _VERSION = 1
+    _ALIGNMENT = 64
+    # (field name, 'array' type code, numpy dtype)
+    _COLUMN_TUPLE = (
+        ("onset_tick_array", "q", "<i8"),
+        ("duration_array", "q", "<i8"),
+        ("pitch_array", "B", "|u1"),
+        ("bend_array", "h", "<i2"),
+        ("velocity_array", "B", "|u1"),
+        ("channel_array", "B", "|u1"),
+        ("track_array", "H", "<u2"),
+        ("tempo_tick_array", "q", "<i8"),
+        ("tempo_array", "I", "<u4"),
+    )
+
+    @property
+    def note_count(self) -> int:
+        return len(self.onset_tick_array)
+
+    def _align(self, position: int) -> int:
+        return -(-position // self._ALIGNMENT) * self._ALIGNMENT
+
+    def write(self, path: str | os.PathLike):
+        """Store the columns in a file which can be memory-mapped."""
+        column_data_list = []
+        for field_name, type_code, _ in self._COLUMN_TUPLE:
+            column_data = array.array(type_code, getattr(self, field_name))
+            if sys.byteorder == "big":
+                column_data.byteswap()
+            column_data_list.append(column_data)
+
+        # The offsets of the columns depend on the size of the header, so
+        # the header is built again until its size fits.
+        data_start = self._ALIGNMENT
+        while True:
+            column_dict, offset = {}, data_start
+            for (field_name, _, dtype), column_data in zip(
+                self._COLUMN_TUPLE, column_data_list
+            ):
+                column_dict[field_name.removesuffix("_array")] = [
+                    dtype,
+                    offset,
+                    len(column_data),
+                ]
+                offset = self._align(offset + len(column_data) * column_data.itemsize)
+            header = json.dumps(
+                {
+                    "ticks_per_beat": self.ticks_per_beat,
+                    "midi_file_type": self.midi_file_type,
+                    "track_count": self.track_count,
+                    "metadata": self.metadata,
+                    "column": column_dict,
+                },
+                separators=(",", ":"),
+            ).encode("utf-8")
+            if 16 + len(header) <= data_start:
+                break
+            data_start = self._align(16 + len(header))
+
+        with open(path, "wb") as f:
+            f.write(self._MAGIC)
+            f.write(struct.pack("<II", self._VERSION, data_start - 16))
+            # Json allows trailing whitespace
+            f.write(header.ljust(data_start - 16))
+            for column_data in column_data_list:
+                f.write(column_data.tobytes())
+                f.write(b"\0" * (self._align(f.tell()) - f.tell()))
+
+    @classmethod
+    def read(cls, path: str | os.PathLike) -> "NoteStore":
+        """Open a note store file which has been written by :meth:`write`.
+
+        The columns are read-only :class:`numpy.memmap` views of the file:
+        the data is only loaded when it's accessed.
+
+        :raises ValueError: If the file isn't a valid note store.
+        """
+        if numpy is None:
+            raise ImportError(
+                "Reading note stores needs 'numpy'. Please install it with "
+                "'pip3 install mutwo.midi[numpy]'."
+            )
+        try:
+            data = numpy.memmap(path, dtype=numpy.uint8, mode="r")
+        except ValueError as error:
+            raise ValueError(f"Invalid note store file '{path}': {error}.")
+        if len(data) < 16 or data[:8].tobytes() != cls._MAGIC:
+            raise ValueError(f"Invalid note store file '{path}': no magic bytes.")
+        version, header_size = struct.unpack("<II", data[8:16])
+        if version != cls._VERSION:
+            raise ValueError(f"Unsupported note store version '{version}'.")
+        try:
+            header = json.loads(data[16 : 16 + header_size].tobytes())
+            column_array_list = []
+            for field_name, _, _ in cls._COLUMN_TUPLE:
+                dtype, offset, length = header["column"][
+                    field_name.removesuffix("_array")
+                ]
+                dtype = numpy.dtype(dtype)
+                end = offset + length * dtype.itemsize
+                if end > len(data):
+                    raise ValueError("column exceeds end of file")
+                column_array_list.append(data[offset:end].view(dtype))
+            return cls(
+                header["ticks_per_beat"],
+                header["midi_file_type"],
+                header["track_count"],
+                header["metadata"],
+                *column_array_list,
+            )
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError(f"Invalid note store file '{path}': {error}.")
+
+
+class MidiFileToNoteStore(core_converters.abc.Converter):
+    """Convert a midi file to a :class:`NoteStore` without creating mutwo events.
+
+    The note messages of each track are paired like in
+    :class:`mutwo.midi_converters.MidiFileToEvent`. Only the pitch bend
+    at the start of a note is stored (pitch bends during a note and
+    control changes are ignored).
+
+    **Example:**
+
+    >>> import mido
+    >>> from mutwo import midi_converters
+    >>> midi_file = mido.MidiFile(
+    ...     tracks=[
+    ...         mido.MidiTrack(
+    ...             [
+    ...                 mido.Message('pitchwheel', pitch=4096),
+    ...                 mido.Message('note_on', note=60, velocity=100, time=0),
+    ...                 mido.Message('note_off', note=60, time=480),
+    ...             ]
+    ...         )
+    ...     ],
+    ...     ticks_per_beat=480,
+    ... )
+    >>> note_store = midi_converters.MidiFileToNoteStore().convert(midi_file)
+    >>> note_store.pitch_array.tolist(), note_store.bend_array.tolist()
+    ([60], [4096])
+    """
+
+    _MESSAGE_TYPE_TUPLE = ("note_on", "note_off", "pitchwheel", "set_tempo")
+
+    def __init__(self):
+        self._midi_file_to_event = midi_converters.MidiFileToEvent(
+            message_type_tuple=self._MESSAGE_TYPE_TUPLE
+        )
+
+    def _get_parsed_track_iterator(
+        self, buffer: bytes | bytearray | memoryview
+    ) -> typing.Iterator["midi_converters.ParsedMidiFile"]:
+        """Parse each track separately, so that notes know their track"""
+        track_index, track_count = 0, 1
+        while track_index < track_count:
+            parsed_midi_file = midi_converters.MidiFileParser(
+                track_index_tuple=(track_index,),
+                message_type_tuple=self._MESSAGE_TYPE_TUPLE,
+            ).convert(buffer)
+            track_count = parsed_midi_file.track_count
+            yield parsed_midi_file
+            track_index += 1
+
+    def _parsed_midi_file_list_to_note_store(
+        self,
+        parsed_midi_file_list: list["midi_converters.ParsedMidiFile"],
+        metadata: dict[str, typing.Any],
+    ) -> NoteStore:
+        first_parsed_midi_file = parsed_midi_file_list[0]
+        ticks_per_beat = first_parsed_midi_file.ticks_per_beat
+        # Pitch bends and tempo changes are valid for all tracks.
+        pitchwheel_list, set_tempo_list = (
+            list(
+                heapq.merge(
+                    *(
+                        parsed_midi_file.message_type_to_midi_message_list.get(
+                            message_type, []
+                        )
+                        for parsed_midi_file in parsed_midi_file_list
+                    ),
+                    key=lambda midi_message: midi_message.time,
+                )
+            )
+            for message_type in ("pitchwheel", "set_tempo")
+        )
+        midi_channel_timeline = self._midi_file_to_event._get_midi_channel_timeline(
+            {"pitchwheel": pitchwheel_list}
+        )
+
+        with midi_converters.DiagnosticCollector(self._midi_file_to_event._logger):
+            track_note_pair_tuple_list = [
+                self._midi_file_to_event._get_note_pair_tuple(
+                    parsed_midi_file.message_type_to_midi_message_list
+                )
+                for parsed_midi_file in parsed_midi_file_list
+            ]
+        column_list = [[] for _ in range(7)]
+        for track_index, (note_on, note_off) in heapq.merge(
+            *(
+                zip(itertools.repeat(track_index), note_pair_tuple)
+                for track_index, note_pair_tuple in enumerate(
+                    track_note_pair_tuple_list
+                )
+            ),
+            key=lambda track_index_and_note_pair: track_index_and_note_pair[1][0].time,
+        ):
+            channel = note_on.channel
+            for column, value in zip(
+                column_list,
+                (
+                    note_on.time,
+                    note_off.time - note_on.time,
+                    note_on.note,
+                    midi_channel_timeline.get_value(channel, None, note_on.time) or 0,
+                    note_on.velocity,
+                    channel,
+                    track_index,
+                ),
+            ):
+                column.append(value)
+
+        return NoteStore(
+            ticks_per_beat,
+            first_parsed_midi_file.midi_file_type,
+            first_parsed_midi_file.track_count,
+            metadata,
+            *(
+                array.array(type_code, column)
+                for (_, type_code, _), column in zip(
+                    NoteStore._COLUMN_TUPLE,
+                    column_list
+                    + [
+                        [set_tempo.time for set_tempo in set_tempo_list],
+                        [set_tempo.tempo for set_tempo in set_tempo_list],
+                    ],
+                )
+            ),
+        )
+
+    def convert(
+        self,
+        midi_file_path_or_mido_midi_file: "midi_converters.backends.MidiFileData",
+        path: typing.Optional[str | os.PathLike] = None,
+        metadata: typing.Optional[dict[str, typing.Any]] = None,
+    ) -> NoteStore:
+        """Convert a midi file to a note store.
+
+        :param midi_file_path_or_mido_midi_file: The midi file (see
+            :meth:`MidiFileToEvent.convert`).
+        :type midi_file_path_or_mido_midi_file: MidiFileData
+        :param path: If set the note store is also written to this file
+            (see :meth:`NoteStore.write`). Default to ``None``.
+        :type path: typing.Optional[str | os.PathLike]
+        :param metadata: Json serializable data which is stored together
+            with the notes. Default to ``None``.
+        :type metadata: typing.Optional[dict[str, typing.Any]]
+        """
+
+        if isinstance(midi_file_path_or_mido_midi_file, mido.MidiFile):
+            midi_file_path_or_mido_midi_file = (
+                midi_converters.MidiFileToBytes().convert(
+                    midi_file_path_or_mido_midi_file
+                )
+            )
+        with self._midi_file_to_event._midi_file_data_to_buffer(
+            midi_file_path_or_mido_midi_file
+        ) as buffer:
+            parsed_midi_file_list = list(self._get_parsed_track_iterator(buffer))
+        note_store = self._parsed_midi_file_list_to_note_store(
+            parsed_midi_file_list, metadata or {}
+        )
+        if path is not None:
+            note_store.write(path)
+        return note_store
+
+
+class NoteStoreToEvent(core_converters.abc.Converter):
+    """Convert a :class:`NoteStore` to a mutwo event.
+
+    :param midi_file_to_event: The converter which creates the chronons
+        (its pitch, volume and chronon converters are used). If ``None``
+        the default :class:`MidiFileToEvent` is used. Default to ``None``.
+    :type midi_file_to_event: typing.Optional[MidiFileToEvent]
+
+    The notes are distributed to consecutions like in
+    :meth:`mutwo.midi_converters.MidiFileToEvent.convert`, so that a note
+    store gives the same event as its midi file if the midi file doesn't
+    contain pitch bends during notes or control changes.
+    """
+
+    def __init__(
+        self,
+        midi_file_to_event: typing.Optional["midi_converters.MidiFileToEvent"] = None,
+    ):
+        self._midi_file_to_event = (
+            midi_file_to_event or midi_converters.MidiFileToEvent()
+        )
+
+    def convert(
+        self, note_store: NoteStore
+    ) -> core_events.Concurrence[core_events.Consecution[core_events.Chronon]]:
+        """Convert a note store to a mutwo event.
+
+        :param note_store: The note store which shall be converted.
+        :type note_store: NoteStore
+        """
+
+        note_message_class = midi_converters.NoteMessage
+        note_pair_list, pitchwheel_list = [], []
+        # Each note gets its own channel, so that the pitch bend of a note
+        # doesn't change the pitch of other sounding notes.
+        for channel, (onset_tick, duration, pitch, bend, velocity) in enumerate(
+            zip(
+                note_store.onset_tick_array.tolist(),
+                note_store.duration_array.tolist(),
+                note_store.pitch_array.tolist(),
+                note_store.bend_array.tolist(),
+                note_store.velocity_array.tolist(),
+            )
+        ):
+            note_pair_list.append(
+                (
+                    note_message_class("note_on", onset_tick, channel, pitch, velocity),
+                    note_message_class(
+                        "note_off", onset_tick + duration, channel, pitch, 0
+                    ),
+                )
+            )
+            if bend:
+                pitchwheel_list.append(
+                    midi_converters.PitchwheelMessage(
+                        "pitchwheel", onset_tick, channel, bend
+                    )
+                )
+        midi_file_to_event = self._midi_file_to_event
+        with midi_converters.DiagnosticCollector(midi_file_to_event._logger):
+            return midi_file_to_event._note_pair_tuple_to_concurrence(
+                tuple(note_pair_list),
+                note_store.ticks_per_beat,
+                (
+                    midi_file_to_event._get_midi_channel_timeline(
+                        {"pitchwheel": pitchwheel_list}
+                    )
+                    if pitchwheel_list
+                    else None
+                ),
+            )
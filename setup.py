@@ -9,7 +9,9 @@ VERSION = version["VERSION"]
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
-extras_require = {"testing": ["pytest>=7.1.1"]}
+extras_require = {"numpy": ["numpy>=1.25.0, <3"]}
+# The piano roll and note store tests need numpy
+extras_require["testing"] = ["pytest>=7.1.1"] + extras_require["numpy"]
 
 setuptools.setup(
     name="mutwo.midi",
@@ -31,7 +33,7 @@ setuptools.setup(
     install_requires=[
         "mutwo.core>=2.0.0, <3.0.0",
         "mutwo.music>=0.27.0, <1.0.0",
-        "mido>=1.2.9, <2",
+        "mido>=1.3.0, <2",
     ],
     extras_require=extras_require,
     python_requires=">=3.10, <4",
@@ -1,4 +1,9 @@
+import io
+import mmap
+import pathlib
+import tempfile
 import unittest
+import unittest.mock
 
 import mido
 
@@ -249,30 +254,102 @@ class MidiFileToEventTest(unittest.TestCase):
             note_pair_tuple,
         )
 
-    def test_get_note_off_partner(self):
+    def test_get_note_pair_tuple_with_note_on_velocity_zero(self):
+        """Note on messages with velocity 0 are note off messages"""
+        note_on_message_list = [
+            mido.Message("note_on", note=60, velocity=100, time=0),
+            mido.Message("note_on", note=62, velocity=100, time=0),
+            mido.Message("note_on", note=60, velocity=0, time=10),
+            # The note is repeated at the same tick
+            mido.Message("note_on", note=62, velocity=100, time=10),
+            mido.Message("note_on", note=62, velocity=0, time=10),
+            mido.Message("note_on", note=62, velocity=0, time=20),
+            # Without any note off message
+            mido.Message("note_on", note=64, velocity=100, time=20),
+        ]
+        with self.assertLogs(self.midi_file_to_event._logger, "WARNING"):
+            with midi_converters.DiagnosticCollector(self.midi_file_to_event._logger):
+                note_pair_tuple = self.midi_file_to_event._get_note_pair_tuple(
+                    {"note_on": note_on_message_list}
+                )
         self.assertEqual(
-            self.midi_file_to_event._get_note_off_partner(
-                mido.Message("note_on", note=60, channel=0, velocity=100, time=50),
-                [
-                    mido.Message("note_off", note=60, channel=0, velocity=0, time=30),
-                    mido.Message("note_off", note=60, channel=1, velocity=0, time=60),
-                    mido.Message("note_off", note=61, channel=0, velocity=0, time=80),
-                ],
-            ),
-            None,
+            [
+                (note_on.note, note_on.time, note_off.time)
+                for note_on, note_off in note_pair_tuple
+            ],
+            [(60, 0, 10), (62, 0, 10), (62, 10, 20)],
         )
         self.assertEqual(
-            self.midi_file_to_event._get_note_off_partner(
-                mido.Message("note_on", note=60, channel=0, velocity=100, time=50),
-                [
-                    mido.Message("note_off", note=60, channel=0, velocity=0, time=30),
-                    mido.Message("note_off", note=60, channel=1, velocity=0, time=60),
-                    mido.Message("note_off", note=60, channel=0, velocity=0, time=80),
-                ],
+            self.midi_file_to_event._get_note_pair_tuple(
+                {
+                    "note_on": [
+                        mido.Message("note_on", note=60, velocity=100, time=0),
+                        mido.Message("note_on", note=60, velocity=100, time=5),
+                    ],
+                    "note_off": [
+                        # Note off message without sounding note
+                        mido.Message("note_off", note=62, time=0),
+                        mido.Message("note_off", note=60, time=5),
+                        mido.Message("note_off", note=60, time=6),
+                    ],
+                }
+            ),
+            (
+                (
+                    mido.Message("note_on", note=60, velocity=100, time=0),
+                    mido.Message("note_off", note=60, time=5),
+                ),
+                (
+                    mido.Message("note_on", note=60, velocity=100, time=5),
+                    mido.Message("note_off", note=60, time=6),
+                ),
             ),
-            mido.Message("note_off", note=60, channel=0, velocity=0, time=80),
         )
 
+    def test_convert_with_running_status(self):
+        """Midi files with note on messages with velocity 0 are converted"""
+        midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.Message("note_on", note=note, velocity=100, time=0),
+                        mido.Message("note_off", note=note, time=240),
+                    ]
+                    * 2
+                )
+                for note in (60, 67)
+            ]
+        )
+        running_status_midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        (
+                            mido.Message(
+                                "note_on",
+                                note=message.note,
+                                velocity=0,
+                                time=message.time,
+                            )
+                            if message.type == "note_off"
+                            else message
+                        )
+                        for message in track
+                    ]
+                )
+                for track in midi_file.tracks
+            ]
+        )
+        expected_event = self.midi_file_to_event.convert(midi_file)
+        self.assertEqual(len(expected_event[0]), 2)
+        for midi_file_data in (
+            running_status_midi_file,
+            midi_converters.MidiFileToBytes().convert(running_status_midi_file),
+        ):
+            self.assertEqual(
+                self.midi_file_to_event.convert(midi_file_data), expected_event
+            )
+
     def test_get_message_type_to_midi_message_list(self):
         self.assertEqual(
             self.midi_file_to_event._get_message_type_to_midi_message_list(
@@ -377,8 +454,7 @@ class MidiFileToEventTest(unittest.TestCase):
             music_events.NoteLike(
                 pitch_list=[
                     music_parameters.MidiPitch(69),
-                    # Floating point error
-                    music_parameters.MidiPitch(59.99999999999999),
+                    music_parameters.MidiPitch(60),
                 ],
                 volume="ppppp",
                 duration=1,
@@ -434,6 +510,448 @@ class MidiFileToEventTest(unittest.TestCase):
             ),
         )
 
+    def test_convert_midi_file_data(self):
+        """Midi files can be passed as paths, bytes, buffers and file objects"""
+        midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.Message("note_on", note=60, time=0, velocity=100),
+                        mido.Message("note_off", note=60, time=480, velocity=0),
+                        mido.Message("note_on", note=62, time=0, velocity=100),
+                        mido.Message("note_off", note=62, time=240, velocity=0),
+                    ]
+                )
+            ]
+        )
+        expected_event = self.midi_file_to_event.convert(midi_file)
+        midi_file_bytes = midi_converters.MidiFileToBytes().convert(midi_file)
+
+        for midi_file_data in (
+            midi_file_bytes,
+            bytearray(midi_file_bytes),
+            memoryview(midi_file_bytes),
+            io.BytesIO(midi_file_bytes),
+        ):
+            self.assertEqual(
+                self.midi_file_to_event.convert(midi_file_data), expected_event
+            )
+
+        with tempfile.TemporaryDirectory() as directory_path:
+            path = pathlib.Path(directory_path) / "test.mid"
+            path.write_bytes(midi_file_bytes)
+            for memory_map_file_size_threshold in (2**20, 0):
+                with unittest.mock.patch.object(
+                    midi_converters.configurations,
+                    "MEMORY_MAP_FILE_SIZE_THRESHOLD",
+                    memory_map_file_size_threshold,
+                ), unittest.mock.patch("mmap.mmap", wraps=mmap.mmap) as mmap_mock:
+                    for midi_file_data in (path, str(path)):
+                        self.assertEqual(
+                            self.midi_file_to_event.convert(midi_file_data),
+                            expected_event,
+                        )
+                    self.assertEqual(
+                        mmap_mock.called, not memory_map_file_size_threshold
+                    )
+            with open(path, "rb") as f:
+                self.assertEqual(self.midi_file_to_event.convert(f), expected_event)
+
+        self.assertRaises(TypeError, self.midi_file_to_event.convert, 100)
+
+    def test_convert_with_filter(self):
+        midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.Message("note_on", note=note, time=0, channel=channel),
+                        mido.Message("note_off", note=note, time=480, channel=channel),
+                    ]
+                    * 4
+                )
+                for note, channel in ((60, 0), (72, 1))
+            ]
+        )
+
+        def get_note_list(event):
+            return [
+                round(pitch.midi_pitch_number)
+                for consecution in event
+                for chronon in consecution
+                for pitch in getattr(chronon, "pitch_list", [])
+            ]
+
+        for filter_argument_dict, expected_note_list in (
+            ({}, [60, 72] * 4),
+            ({"track_index_tuple": (1,)}, [72] * 4),
+            ({"midi_channel_tuple": (0,)}, [60] * 4),
+            ({"message_type_tuple": ("note_off",)}, []),
+            ({"tick_range": (480, 1440)}, [60, 72] * 2),
+            ({"seconds_range": (0, 1)}, [60, 72] * 2),
+        ):
+            self.assertEqual(
+                sorted(
+                    get_note_list(
+                        midi_converters.MidiFileToEvent(**filter_argument_dict).convert(
+                            midi_file
+                        )
+                    )
+                ),
+                sorted(expected_note_list),
+            )
+
+    def test_convert_microtonal_pitches(self):
+        """Pitch bends at the start of notes are added to their pitches"""
+        event = core_events.Concurrence(
+            [
+                core_events.Consecution(
+                    [
+                        music_events.NoteLike(pitch, 1)
+                        for pitch in ("5/4", "7/4", "11/8", "13/8", "1/1")
+                    ]
+                ),
+                core_events.Consecution(
+                    [
+                        music_events.NoteLike(["3/2", "7/6"], 2),
+                        music_events.NoteLike("17/16", 3),
+                    ]
+                ),
+            ]
+        )
+        # Without MPE the tones of both consecutions would share midi
+        # channels and bend each other.
+        for event, mpe_member_channel_count in ((event[0], 0), (event, 4)):
+            expected_hertz_list = sorted(
+                pitch.hertz
+                for pitch_list in event.get_parameter("pitch_list", flat=True)
+                for pitch in pitch_list
+            )
+            midi_file = midi_converters.EventToMidiFile(
+                mpe_member_channel_count=mpe_member_channel_count
+            ).convert(event)
+            for midi_file_data in (
+                midi_file,
+                midi_converters.MidiFileToBytes().convert(midi_file),
+            ):
+                pitch_list = [
+                    pitch
+                    for consecution in self.midi_file_to_event.convert(midi_file_data)
+                    for chronon in consecution
+                    for pitch in getattr(chronon, "pitch_list", [])
+                ]
+                # Pitch bends one tick before a note belong to this note
+                # and not to the previous note of the same channel.
+                for pitch in pitch_list:
+                    self.assertIsInstance(pitch, music_parameters.MidiPitch)
+                for hertz, expected_hertz in zip(
+                    sorted(pitch.hertz for pitch in pitch_list),
+                    expected_hertz_list,
+                    strict=True,
+                ):
+                    self.assertAlmostEqual(hertz, expected_hertz, delta=0.05)
+
+    def test_convert_microtonal_pitches_with_tick_range(self):
+        """Windowed imports keep the pitch bends of the notes in the window"""
+        consecution = core_events.Consecution(
+            [music_events.NoteLike(pitch, 1) for pitch in ("1/1", "7/4", "11/8", "5/4")]
+        )
+        midi_file_bytes = midi_converters.MidiFileToBytes().convert(
+            midi_converters.EventToMidiFile(available_midi_channel_tuple=(0,)).convert(
+                consecution
+            )
+        )
+        seek_index = midi_converters.MidiFileIndexer(1).convert(midi_file_bytes)
+        for keyword_argument_dict in ({}, {"seek_index": seek_index}):
+            pitch_list = [
+                pitch
+                for consecution in midi_converters.MidiFileToEvent(
+                    tick_range=(480, 1440), **keyword_argument_dict
+                ).convert(midi_file_bytes)
+                for chronon in consecution
+                for pitch in getattr(chronon, "pitch_list", [])
+            ]
+            for pitch in pitch_list:
+                self.assertIsInstance(pitch, music_parameters.MidiPitch)
+            for hertz, expected_hertz in zip(
+                (pitch.hertz for pitch in pitch_list),
+                (note_like.pitch_list[0].hertz for note_like in consecution[1:3]),
+                strict=True,
+            ):
+                self.assertAlmostEqual(hertz, expected_hertz, delta=0.05)
+
+    def test_convert_pitch_bends_during_note(self):
+        midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.Message("pitchwheel", pitch=-4096, time=0),
+                        mido.Message("note_on", note=60, time=0),
+                        # Other channels don't change the note
+                        mido.Message("pitchwheel", pitch=100, time=1, channel=1),
+                        mido.Message("pitchwheel", pitch=0, time=3),
+                        mido.Message("pitchwheel", pitch=0, time=1),
+                        mido.Message("pitchwheel", pitch=4096, time=1),
+                        mido.Message("note_off", note=60, time=4),
+                        mido.Message("note_on", note=62, time=0),
+                        mido.Message("note_off", note=62, time=10),
+                    ]
+                )
+            ],
+            ticks_per_beat=10,
+        )
+        consecution = self.midi_file_to_event.convert(midi_file)[0]
+        glissando = consecution[0].pitch_list[0]
+        self.assertIsInstance(glissando, music_parameters.FlexPitch)
+        self.assertEqual(
+            [
+                (
+                    float(absolute_time),
+                    round(pitch.midi_pitch_number, 2),
+                )
+                for absolute_time, pitch in zip(
+                    glissando.absolute_time_tuple, glissando.parameter_tuple
+                )
+            ],
+            [(0, 59), (0.3, 59), (0.4, 60), (0.5, 60), (0.6, 61), (0.9, 61)],
+        )
+        # The pitch bend stays in effect for the next note
+        self.assertEqual(round(consecution[1].pitch_list[0].midi_pitch_number, 2), 63)
+
+    def test_convert_control_changes(self):
+        midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.Message("control_change", control=7, value=100, time=0),
+                        mido.Message("note_on", note=60, time=0),
+                        mido.Message("note_on", note=64, time=0, channel=1),
+                        mido.Message("control_change", control=1, value=10, time=5),
+                        mido.Message("control_change", control=7, value=50, time=0),
+                        mido.Message("note_off", note=60, time=5),
+                        mido.Message("note_off", note=64, time=0, channel=1),
+                        mido.Message("note_on", note=60, time=0),
+                        mido.Message("note_off", note=60, time=10),
+                    ]
+                )
+            ],
+            ticks_per_beat=10,
+        )
+
+        def get_control_envelope_list(chronon):
+            return [
+                (
+                    control_envelope.message_type,
+                    control_envelope.control,
+                    [
+                        (float(absolute_time), value)
+                        for absolute_time, value in zip(
+                            control_envelope.envelope.absolute_time_tuple,
+                            control_envelope.envelope.value_tuple,
+                        )
+                    ],
+                )
+                for control_envelope in chronon.control_envelope_tuple
+            ]
+
+        for midi_file_data in (
+            midi_file,
+            midi_converters.MidiFileToBytes().convert(midi_file),
+        ):
+            consecution = self.midi_file_to_event.convert(midi_file_data)[0]
+            self.assertEqual(
+                [get_control_envelope_list(chronon) for chronon in consecution],
+                [
+                    [
+                        ("control_change", 1, [(0, 10)]),
+                        (
+                            "control_change",
+                            7,
+                            [(0, 100), (0.4, 100), (0.5, 50), (0.9, 50)],
+                        ),
+                    ],
+                    [
+                        ("control_change", 1, [(0, 10)]),
+                        ("control_change", 7, [(0, 50)]),
+                    ],
+                ],
+            )
+        # The envelopes are rendered by 'EventToMidiFile' for each tone
+        control_change_list = []
+        absolute_tick = 0
+        for message in mido.merge_tracks(
+            midi_converters.EventToMidiFile(ticks_per_beat=10)
+            .convert(consecution)
+            .tracks
+        ):
+            absolute_tick += message.time
+            if message.type == "control_change":
+                control_change_list.append(
+                    (absolute_tick, message.channel, message.control, message.value)
+                )
+        self.assertEqual(
+            sorted(control_change_list),
+            [
+                (0, 0, 1, 10),
+                (0, 0, 7, 100),
+                (0, 1, 1, 10),
+                (0, 1, 7, 100),
+                (5, 0, 7, 50),
+                (5, 1, 7, 50),
+                (10, 2, 1, 10),
+                (10, 2, 7, 50),
+            ],
+        )
+
+
+class LazyConcurrenceTest(unittest.TestCase):
+    def setUp(self):
+        # A chord, overlapping notes, pitch bends and control changes at
+        # 10 ticks per beat.
+        self.midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.Message("control_change", control=7, value=50),
+                        mido.Message("note_on", note=60, time=0),
+                        mido.Message("note_on", note=64, time=0),
+                        mido.Message("note_on", note=67, channel=1, time=5),
+                        mido.Message("note_off", note=60, time=5),
+                        mido.Message("note_off", note=64, time=0),
+                        mido.Message("pitchwheel", channel=1, pitch=4096, time=5),
+                        mido.Message("note_off", note=67, channel=1, time=5),
+                        mido.Message("note_on", note=72, time=0),
+                        mido.Message("note_off", note=72, time=30),
+                    ]
+                )
+            ],
+            ticks_per_beat=10,
+        )
+        self.lazy_concurrence = midi_converters.MidiFileToEvent(is_lazy=True).convert(
+            self.midi_file
+        )
+        self.concurrence = midi_converters.MidiFileToEvent().convert(self.midi_file)
+
+    def test_convert(self):
+        self.assertIsInstance(self.lazy_concurrence, midi_converters.LazyConcurrence)
+        self.assertEqual(len(self.lazy_concurrence), len(self.concurrence))
+        self.assertFalse(any(map(self.lazy_concurrence.is_materialized, range(2))))
+        self.assertEqual(self.lazy_concurrence.materialize(), self.concurrence)
+        self.assertEqual(list(self.lazy_concurrence), list(self.concurrence))
+
+    def test_getitem(self):
+        """Only the accessed consecution is created and it is cached"""
+        with unittest.mock.patch.object(
+            midi_converters.MidiFileToEvent,
+            "_note_pair_list_to_chronon",
+            wraps=self.lazy_concurrence._midi_file_to_event._note_pair_list_to_chronon,
+        ) as note_pair_list_to_chronon:
+            consecution = self.lazy_concurrence[-1]
+            self.assertEqual(note_pair_list_to_chronon.call_count, 1)
+            self.assertIs(self.lazy_concurrence[1], consecution)
+            self.assertEqual(note_pair_list_to_chronon.call_count, 1)
+        self.assertEqual(consecution, self.concurrence[1])
+        self.assertFalse(self.lazy_concurrence.is_materialized(0))
+        self.assertTrue(self.lazy_concurrence.is_materialized(1))
+        self.assertEqual(
+            self.lazy_concurrence[::-1],
+            core_events.Concurrence(self.concurrence[::-1]),
+        )
+        self.assertRaises(IndexError, self.lazy_concurrence.__getitem__, 2)
+
+    def test_duration(self):
+        with unittest.mock.patch.object(
+            midi_converters.MidiFileToEvent, "_note_pair_list_to_chronon"
+        ) as note_pair_list_to_chronon:
+            self.assertEqual(self.lazy_concurrence.duration, self.concurrence.duration)
+        note_pair_list_to_chronon.assert_not_called()
+
+    def test_convert_empty_midi_file(self):
+        lazy_concurrence = midi_converters.MidiFileToEvent(is_lazy=True).convert(
+            mido.MidiFile(tracks=[mido.MidiTrack()])
+        )
+        self.assertEqual(len(lazy_concurrence), 0)
+        self.assertEqual(lazy_concurrence.duration, 0)
+        self.assertEqual(lazy_concurrence.materialize(), core_events.Concurrence([]))
+
+
+class MidiFileToFingerprintTest(unittest.TestCase):
+    def setUp(self):
+        self.midi_file_to_fingerprint = midi_converters.MidiFileToFingerprint()
+
+    @staticmethod
+    def _make_midi_file(
+        note_and_velocity_list, ticks_per_beat=480, channel=0, is_reversed=False
+    ):
+        track_list = [
+            mido.MidiTrack(
+                [
+                    mido.MetaMessage("track_name", name=str(note)),
+                    mido.Message(
+                        "note_on",
+                        note=note,
+                        velocity=velocity,
+                        channel=channel,
+                        time=index * ticks_per_beat // 2,
+                    ),
+                    mido.Message(
+                        "note_off", note=note, channel=channel, time=ticks_per_beat
+                    ),
+                ]
+            )
+            for index, (note, velocity) in enumerate(note_and_velocity_list)
+        ]
+        if is_reversed:
+            track_list.reverse()
+        return mido.MidiFile(tracks=track_list, ticks_per_beat=ticks_per_beat)
+
+    def test_convert(self):
+        note_and_velocity_list = [(60, 100), (64, 80), (67, 60)]
+        fingerprint = self.midi_file_to_fingerprint.convert(
+            self._make_midi_file(note_and_velocity_list)
+        )
+        self.assertEqual(len(fingerprint), 32)
+        for midi_file in (
+            self._make_midi_file(note_and_velocity_list, ticks_per_beat=96),
+            self._make_midi_file(note_and_velocity_list, ticks_per_beat=1001 * 2),
+            self._make_midi_file(note_and_velocity_list, channel=3),
+            self._make_midi_file(note_and_velocity_list, is_reversed=True),
+        ):
+            self.assertEqual(
+                self.midi_file_to_fingerprint.convert(
+                    midi_converters.MidiFileToBytes().convert(midi_file)
+                ),
+                fingerprint,
+            )
+        for midi_file in (
+            self._make_midi_file([(60, 100), (64, 80), (68, 60)]),
+            self._make_midi_file([(60, 100), (64, 80)]),
+            self._make_midi_file([(60, 100), (64, 80), (67, 61)]),
+        ):
+            self.assertNotEqual(
+                self.midi_file_to_fingerprint.convert(midi_file), fingerprint
+            )
+        # Other durations
+        midi_file = self._make_midi_file(note_and_velocity_list)
+        midi_file.tracks[0][-1].time += 1
+        self.assertNotEqual(
+            self.midi_file_to_fingerprint.convert(midi_file), fingerprint
+        )
+
+    def test_convert_without_velocity(self):
+        midi_file_to_fingerprint = midi_converters.MidiFileToFingerprint(
+            is_velocity_included=False
+        )
+        self.assertEqual(
+            midi_file_to_fingerprint.convert(self._make_midi_file([(60, 100)])),
+            midi_file_to_fingerprint.convert(self._make_midi_file([(60, 1)])),
+        )
+
+    def test_empty_fingerprint(self):
+        self.assertEqual(
+            self.midi_file_to_fingerprint.convert(self._make_midi_file([])),
+            self.midi_file_to_fingerprint.empty_fingerprint,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
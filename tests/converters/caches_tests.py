@@ -0,0 +1,60 @@
+import unittest
+
+from mutwo import midi_converters
+
+
+class LeastRecentlyUsedCacheTest(unittest.TestCase):
+    def test_eviction_order(self):
+        cache = midi_converters.LeastRecentlyUsedCache(2)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache.get("a")
+        cache["c"] = 3
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.cache_info().evictions, 1)
+
+    def test_get_size(self):
+        """The maximum size limits the total size of all values"""
+        cache = midi_converters.LeastRecentlyUsedCache(5, len)
+        cache["a"] = (1, 2, 3)
+        cache["b"] = (1, 2)
+        self.assertEqual(cache.cache_info().currsize, 5)
+        cache["c"] = (1,)
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.cache_info().currsize, 3)
+        # Too big values are never stored
+        cache["d"] = tuple(range(6))
+        self.assertNotIn("d", cache)
+        # Overriding a value updates the size
+        cache["b"] = (1, 2, 3, 4)
+        self.assertEqual(cache.cache_info().currsize, 5)
+        self.assertEqual(len(cache), 2)
+
+    def test_disabled(self):
+        cache = midi_converters.LeastRecentlyUsedCache(0)
+        cache["a"] = 1
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.get("a", 2), 2)
+        self.assertEqual(cache.cache_info().misses, 1)
+
+    def test_clear(self):
+        cache = midi_converters.LeastRecentlyUsedCache(2)
+        cache["a"] = 1
+        cache.get("a")
+        del cache["a"]
+        self.assertEqual(len(cache), 0)
+        cache["a"] = 1
+        cache.clear()
+        self.assertEqual(
+            cache.cache_info(),
+            midi_converters.CacheInfo(0, 0, 0, 2, 0, "least recently used"),
+        )
+
+    def test_invalid_maxsize(self):
+        self.assertRaises(ValueError, midi_converters.LeastRecentlyUsedCache, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+import collections
+import fractions
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import mido
+
+from mutwo import midi_converters
+
+
+class NoteStatisticTest(unittest.TestCase):
+    def setUp(self):
+        # (note, velocity, start, stop) at 10 ticks per beat
+        self.note_pair_tuple = tuple(
+            (
+                mido.Message("note_on", note=note, velocity=velocity, time=start),
+                mido.Message("note_off", note=note, time=stop),
+            )
+            for note, velocity, start, stop in (
+                (60, 100, 0, 10),
+                (64, 100, 0, 20),
+                (72, 50, 10, 15),
+                (62, 50, 30, 40),
+            )
+        )
+
+    def test_pitch_class_histogram(self):
+        self.assertEqual(
+            midi_converters.PitchClassHistogram().convert(self.note_pair_tuple, 10),
+            collections.Counter({0: 2, 4: 1, 2: 1}),
+        )
+        self.assertEqual(
+            midi_converters.PitchClassHistogram(is_weighted_by_duration=True).convert(
+                self.note_pair_tuple, 10
+            ),
+            collections.Counter({0: fractions.Fraction(3, 2), 4: 2, 2: 1}),
+        )
+
+    def test_velocity_histogram(self):
+        self.assertEqual(
+            midi_converters.VelocityHistogram().convert(self.note_pair_tuple, 10),
+            collections.Counter({100: 2, 50: 2}),
+        )
+
+    def test_note_density_curve(self):
+        self.assertEqual(
+            midi_converters.NoteDensityCurve().convert(self.note_pair_tuple, 10),
+            collections.Counter({0: 2, 1: 1, 3: 1}),
+        )
+        self.assertEqual(
+            midi_converters.NoteDensityCurve(fractions.Fraction(3, 2)).convert(
+                self.note_pair_tuple, 10
+            ),
+            collections.Counter({0: 3, 2: 1}),
+        )
+        self.assertRaises(ValueError, midi_converters.NoteDensityCurve, 0)
+
+    def test_polyphony_profile(self):
+        self.assertEqual(
+            midi_converters.PolyphonyProfile().convert(self.note_pair_tuple, 10),
+            collections.Counter(
+                {
+                    2: fractions.Fraction(3, 2),
+                    1: fractions.Fraction(3, 2),
+                    0: 1,
+                }
+            ),
+        )
+        self.assertEqual(
+            midi_converters.PolyphonyProfile().convert(tuple([]), 10),
+            collections.Counter(),
+        )
+
+    def test_name(self):
+        self.assertEqual(midi_converters.VelocityHistogram().name, "velocity_histogram")
+        self.assertEqual(midi_converters.VelocityHistogram("v").name, "v")
+
+
+class MidiCorpusToStatisticsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.midi_file_path_list = []
+        for index, (note_list, ticks_per_beat) in enumerate(
+            (([60, 62, 64], 480), ([67, 72], 96), ([60], 1000))
+        ):
+            track = mido.MidiTrack()
+            for note in note_list:
+                track.extend(
+                    (
+                        mido.Message("note_on", note=note, velocity=note, time=0),
+                        # Running status files use note on messages
+                        # with velocity 0 as note off messages.
+                        mido.Message(
+                            "note_on", note=note, velocity=0, time=ticks_per_beat
+                        ),
+                    )
+                )
+            path = os.path.join(self.directory.name, f"{index}.mid")
+            mido.MidiFile(tracks=[track], ticks_per_beat=ticks_per_beat).save(path)
+            self.midi_file_path_list.append(path)
+        self.invalid_midi_file_path = os.path.join(self.directory.name, "invalid.mid")
+        with open(self.invalid_midi_file_path, "wb") as f:
+            f.write(b"not a midi file")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_midi_file_to_statistics(self):
+        midi_statistics = midi_converters.MidiFileToStatistics().convert(
+            self.midi_file_path_list[0]
+        )
+        self.assertEqual(midi_statistics.file_count, 1)
+        self.assertEqual(midi_statistics.note_count, 3)
+        self.assertEqual(midi_statistics.beat_count, 3)
+        self.assertEqual(
+            midi_statistics.statistic_name_to_counter,
+            {
+                "pitch_class_histogram": collections.Counter({0: 1, 2: 1, 4: 1}),
+                "velocity_histogram": collections.Counter({60: 1, 62: 1, 64: 1}),
+                "note_density_curve": collections.Counter({0: 1, 1: 1, 2: 1}),
+                "polyphony_profile": collections.Counter({1: 3}),
+            },
+        )
+
+    def test_midi_file_to_statistics_without_events(self):
+        """No mutwo events are created"""
+        with unittest.mock.patch.object(
+            midi_converters.MidiFileToEvent, "_note_pair_list_to_chronon"
+        ) as note_pair_list_to_chronon:
+            midi_converters.MidiFileToStatistics().convert(self.midi_file_path_list[0])
+        note_pair_list_to_chronon.assert_not_called()
+
+    def test_midi_file_to_statistics_with_invalid_name(self):
+        self.assertRaises(
+            ValueError,
+            midi_converters.MidiFileToStatistics,
+            (midi_converters.VelocityHistogram(), midi_converters.VelocityHistogram()),
+        )
+
+    def test_convert(self):
+        path_list = self.midi_file_path_list + [self.invalid_midi_file_path]
+        expected_midi_statistics = midi_converters.MidiStatistics(
+            3,
+            6,
+            6,
+            {
+                "pitch_class_histogram": collections.Counter({0: 3, 2: 1, 4: 1, 7: 1}),
+                "velocity_histogram": collections.Counter(
+                    {60: 2, 62: 1, 64: 1, 67: 1, 72: 1}
+                ),
+                "note_density_curve": collections.Counter({0: 3, 1: 2, 2: 1}),
+                "polyphony_profile": collections.Counter({1: 6}),
+            },
+            (self.invalid_midi_file_path,),
+        )
+        for process_count, chunk_size in ((1, 1), (1, 10), (2, 1)):
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(
+                    midi_converters.MidiCorpusToStatistics(
+                        process_count=process_count, chunk_size=chunk_size
+                    ).convert(iter(path_list)),
+                    expected_midi_statistics,
+                )
+
+    def test_convert_empty_corpus(self):
+        self.assertEqual(
+            midi_converters.MidiCorpusToStatistics(process_count=1).convert([]),
+            midi_converters.MidiStatistics(0, 0, 0, {}),
+        )
+
+    def test_invalid_argument(self):
+        for keyword_argument_dict in ({"process_count": 0}, {"chunk_size": -1}):
+            self.assertRaises(
+                ValueError,
+                midi_converters.MidiCorpusToStatistics,
+                **keyword_argument_dict,
+            )
+
+
+class MidiCorpusToDuplicateTupleTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        os.mkdir(os.path.join(self.directory.name, "b"))
+        for path, note_list, ticks_per_beat, track_name in (
+            ("a.mid", [60, 62], 480, "piano"),
+            ("b/c.MID", [60, 62], 96, "flute"),
+            ("b/d.midi", [60, 64], 480, "piano"),
+            ("e.mid", [60, 64], 480, "violin"),
+            ("f.mid", [67], 480, "piano"),
+            ("g.mid", [], 480, "empty"),
+            ("h.mid", [], 96, "empty"),
+        ):
+            track = mido.MidiTrack([mido.MetaMessage("track_name", name=track_name)])
+            for note in note_list:
+                track.extend(
+                    (
+                        mido.Message("note_on", note=note, time=0),
+                        mido.Message("note_off", note=note, time=ticks_per_beat),
+                    )
+                )
+            mido.MidiFile(tracks=[track], ticks_per_beat=ticks_per_beat).save(
+                os.path.join(self.directory.name, path)
+            )
+        for path, content in (("i.mid", b"not a midi file"), ("j.txt", b"text")):
+            with open(os.path.join(self.directory.name, path), "wb") as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_convert(self):
+        def get_path(relative_path):
+            return os.path.join(self.directory.name, relative_path)
+
+        expected_duplicate_tuple = (
+            (get_path("a.mid"), get_path("b/c.MID")),
+            # Files of a directory come before files of its subdirectories
+            (get_path("e.mid"), get_path("b/d.midi")),
+        )
+        for process_count, chunk_size in ((1, 1), (2, 2)):
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(
+                    midi_converters.MidiCorpusToDuplicateTuple(
+                        process_count=process_count, chunk_size=chunk_size
+                    ).convert(self.directory.name),
+                    expected_duplicate_tuple,
+                )
+        self.assertEqual(
+            midi_converters.MidiCorpusToDuplicateTuple(process_count=1).convert(
+                map(get_path, ("e.mid", "f.mid", "b/d.midi"))
+            ),
+            ((get_path("e.mid"), get_path("b/d.midi")),),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
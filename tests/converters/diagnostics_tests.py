@@ -0,0 +1,81 @@
+import logging
+import unittest
+
+from mutwo import core_events
+from mutwo import midi_converters
+from mutwo import music_events
+from mutwo import music_parameters
+
+
+class DiagnosticCollectorTest(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("mutwo.midi.tests.diagnostics")
+
+    def test_report_without_active_collector(self):
+        """Without any active collector reports are logged immediately"""
+        with self.assertLogs(self.logger) as log:
+            midi_converters.DiagnosticCollector.report(
+                self.logger, "a", "Condition '%s'", 1
+            )
+            midi_converters.DiagnosticCollector.report(
+                self.logger, "a", "Condition '%s'", 2
+            )
+        self.assertEqual(len(log.records), 2)
+
+    def test_report_with_active_collector(self):
+        """Reports of the same condition are merged into one summary"""
+        with self.assertLogs(self.logger) as log:
+            with midi_converters.DiagnosticCollector(self.logger) as collector:
+                for i in range(100):
+                    midi_converters.DiagnosticCollector.report(
+                        self.logger, "a", "Condition '%s'", i
+                    )
+                midi_converters.DiagnosticCollector.report(
+                    self.logger, "b", "Other condition"
+                )
+                self.assertEqual(collector.count("a"), 100)
+                self.assertEqual(collector.count("b"), 1)
+                self.assertEqual(collector.count("c"), 0)
+            self.assertEqual(collector.count("a"), 0)
+        self.assertEqual(len(log.records), 1)
+        message = log.records[0].getMessage()
+        self.assertIn("Condition '0' (reported 100 times)", message)
+        self.assertIn("Other condition", message)
+
+    def test_nested_collector(self):
+        outer_collector = midi_converters.DiagnosticCollector(self.logger)
+        inner_collector = midi_converters.DiagnosticCollector(self.logger)
+        with self.assertLogs(self.logger):
+            with outer_collector:
+                with inner_collector:
+                    midi_converters.DiagnosticCollector.report(self.logger, "a", "A")
+                    self.assertEqual(inner_collector.count("a"), 1)
+                    self.assertEqual(outer_collector.count("a"), 0)
+                midi_converters.DiagnosticCollector.report(self.logger, "a", "A")
+                self.assertEqual(outer_collector.count("a"), 1)
+
+    def test_event_to_midi_file_summary(self):
+        """A glissando which exceeds the pitch bend range only warns once"""
+        converter = midi_converters.EventToMidiFile()
+        note = music_events.NoteLike(
+            [
+                music_parameters.FlexPitch(
+                    [
+                        [0, music_parameters.DirectPitch(440)],
+                        [1, music_parameters.DirectPitch(880)],
+                    ]
+                )
+            ],
+            duration=2,
+        )
+        logger = (
+            converter._mutwo_pitch_to_midi_pitch._cent_deviation_to_pitch_bending_number._logger
+        )
+        with self.assertLogs(logger) as log:
+            converter.convert(core_events.Consecution([note]))
+        self.assertEqual(len(log.records), 1)
+        self.assertIn("reported", log.records[0].getMessage())
+
+
+if __name__ == "__main__":
+    unittest.main()
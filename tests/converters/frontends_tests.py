@@ -1,6 +1,11 @@
+import collections
+import io
 import itertools
+import math
 import os
+import pathlib
 import unittest
+import unittest.mock
 
 import mido  # type: ignore
 
@@ -9,6 +14,7 @@ try:
 except ImportError:
     import fractions
 
+from mutwo import core_converters
 from mutwo import core_events
 from mutwo import core_parameters
 from mutwo import core_utilities
@@ -102,6 +108,172 @@ class MutwoPitchToMidiPitchTest(unittest.TestCase):
             self.assertEqual(self.converter.convert(pitch_to_tune), expected_midi_data)
 
 
+class MidiFileToBytesTest(unittest.TestCase):
+    def setUp(self):
+        self.converter = midi_converters.MidiFileToBytes()
+        self.midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.MetaMessage("track_name", name="täst"),
+                        mido.MetaMessage("set_tempo", tempo=400000),
+                        mido.Message("program_change", program=3),
+                        mido.Message("note_on", note=60, velocity=100, time=0),
+                        mido.Message("note_on", note=64, velocity=100, time=0),
+                        mido.Message("pitchwheel", pitch=-8192, time=200),
+                        mido.Message("pitchwheel", pitch=8191, time=20000),
+                        mido.Message("control_change", control=7, value=3),
+                        mido.Message("aftertouch", value=20, time=3),
+                        mido.Message("polytouch", note=60, value=20, channel=3),
+                        mido.Message("sysex", data=(1, 2, 3)),
+                        mido.Message("note_off", note=60, velocity=0, time=480),
+                        mido.Message("note_on", note=64, velocity=0),
+                    ]
+                ),
+                mido.MidiTrack([mido.Message("note_on", channel=15, time=10)]),
+            ]
+        )
+        midi_file_bytes_io = io.BytesIO()
+        self.midi_file.save(file=midi_file_bytes_io)
+        self.midi_file_bytes = midi_file_bytes_io.getvalue()
+
+    def test_convert(self):
+        """Encoding must equal mido"""
+        self.assertEqual(self.converter.convert(self.midi_file), self.midi_file_bytes)
+        midi_file = midi_converters.EventToMidiFile().convert(
+            core_events.Consecution(
+                [
+                    music_events.NoteLike(
+                        [music_parameters.FlexPitch([[0, "1/1"], [1, "9/8"]])], 1, 1
+                    ),
+                    music_events.NoteLike("c", 1, 0.5),
+                    music_events.NoteLike("e", 1, 0.5),
+                ]
+            )
+        )
+        midi_file_bytes_io = io.BytesIO()
+        midi_file.save(file=midi_file_bytes_io)
+        self.assertEqual(
+            self.converter.convert(midi_file), midi_file_bytes_io.getvalue()
+        )
+
+    def test_convert_text_and_end_of_track(self):
+        """Text is encoded with the charset of the file and 'end_of_track' is fixed"""
+        for charset in ("latin1", "utf-8"):
+            midi_file = mido.MidiFile(
+                tracks=[
+                    mido.MidiTrack(
+                        [
+                            mido.MetaMessage(message_type, **{attribute_name: "täst"})
+                            for message_type, attribute_name in (
+                                ("text", "text"),
+                                ("copyright", "text"),
+                                ("instrument_name", "name"),
+                                ("lyrics", "text"),
+                                ("marker", "text"),
+                                ("cue_marker", "text"),
+                                ("device_name", "name"),
+                            )
+                        ]
+                        + [
+                            mido.MetaMessage("end_of_track", time=5),
+                            mido.Message("note_on", time=2**21),
+                            mido.MetaMessage("end_of_track", time=2**27 - 1),
+                        ]
+                    )
+                ],
+                charset=charset,
+            )
+            midi_file_bytes_io = io.BytesIO()
+            midi_file.save(file=midi_file_bytes_io)
+            self.assertEqual(
+                self.converter.convert(midi_file), midi_file_bytes_io.getvalue()
+            )
+
+    def test_convert_to_file_like(self):
+        midi_file_bytes_io = io.BytesIO()
+        self.assertEqual(
+            self.converter.convert(self.midi_file, midi_file_bytes_io),
+            len(self.midi_file_bytes),
+        )
+        self.assertEqual(midi_file_bytes_io.getvalue(), self.midi_file_bytes)
+
+    def test_convert_to_buffer(self):
+        byte_count = len(self.midi_file_bytes)
+        for buffer in (bytearray(byte_count + 10), memoryview(bytearray(byte_count))):
+            self.assertEqual(self.converter.convert(self.midi_file, buffer), byte_count)
+            self.assertEqual(bytes(buffer[:byte_count]), self.midi_file_bytes)
+        self.assertRaises(
+            ValueError,
+            self.converter.convert,
+            self.midi_file,
+            bytearray(byte_count - 1),
+        )
+
+    def test_convert_invalid_midi_file(self):
+        self.midi_file.tracks[0].append(mido.Message("note_on", time=-1))
+        self.assertRaises(ValueError, self.converter.convert, self.midi_file)
+        self.midi_file.tracks[0][-1] = mido.Message("clock")
+        self.assertRaises(ValueError, self.converter.convert, self.midi_file)
+        self.midi_file.tracks[0].pop()
+        self.midi_file.type = 0
+        self.assertRaises(ValueError, self.converter.convert, self.midi_file)
+
+
+class EventIntervalIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.concurrence = core_events.Concurrence(
+            [
+                core_events.Consecution(
+                    [
+                        core_events.Chronon(1),
+                        core_events.Consecution(
+                            [core_events.Chronon(2), core_events.Chronon(0.5)]
+                        ),
+                        core_events.Chronon(1),
+                    ]
+                ),
+                core_events.Consecution([core_events.Chronon(10)]),
+            ]
+        )
+        self.event_interval_index = midi_converters.EventIntervalIndex(self.concurrence)
+
+    def test_get_overlapping_chronon_tuple(self):
+        for track_index, start, end, expected_time_and_duration_tuple in (
+            (0, 0, 1, ((0, 1),)),
+            (0, 0.5, 1.5, ((0, 1), (1, 2))),
+            (0, 1, 3.5, ((1, 2), (3, 0.5))),
+            (0, 3.25, 100, ((3, 0.5), (3.5, 1))),
+            (0, 4.5, 100, ()),
+            (1, 5, 6, ((0, 10),)),
+        ):
+            self.assertEqual(
+                tuple(
+                    (absolute_time, chronon.duration)
+                    for absolute_time, chronon in self.event_interval_index.get_overlapping_chronon_tuple(
+                        track_index, start, end
+                    )
+                ),
+                expected_time_and_duration_tuple,
+            )
+
+    def test_properties(self):
+        self.assertEqual(
+            self.event_interval_index.consecution_tuple, tuple(self.concurrence)
+        )
+        self.assertEqual(self.event_interval_index.duration, 10)
+        chronon = core_events.Chronon(2)
+        self.assertEqual(
+            midi_converters.EventIntervalIndex(chronon).get_overlapping_chronon_tuple(
+                0, 0, 1
+            ),
+            ((core_parameters.DirectDuration(0), chronon),),
+        )
+
+    def test_invalid_event(self):
+        self.assertRaises(TypeError, midi_converters.EventIntervalIndex, 1)
+
+
 class EventToMidiFileTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -257,6 +429,57 @@ class EventToMidiFileTest(unittest.TestCase):
             midi_message_tuple,
         )
 
+    def test_gradual_flex_tempo_to_midi_messages(self):
+        """Gradual tempo changes are approximated within the tolerance"""
+        flex_tempo = core_parameters.FlexTempo(((0, 60), (4, 120, 1), (8, 60)))
+        for tolerance in (0.25, 1, 4):
+            converter = midi_converters.EventToMidiFile(
+                tempo_tolerance_in_beats_per_minute=tolerance
+            )
+            midi_message_tuple = converter._tempo_to_midi_message_tuple(flex_tempo)
+            # Much less messages than one per tick
+            self.assertLess(len(midi_message_tuple), 8 * 480 / 10)
+            for midi_message, next_midi_message in zip(
+                midi_message_tuple, midi_message_tuple[1:]
+            ):
+                self.assertLess(midi_message.time, next_midi_message.time)
+                for tick in (midi_message.time, next_midi_message.time - 1):
+                    self.assertAlmostEqual(
+                        mido.tempo2bpm(midi_message.tempo),
+                        flex_tempo.value_at(tick / 480),
+                        delta=tolerance + 0.01,
+                    )
+            self.assertEqual(midi_message_tuple[-1].time, 8 * 480)
+
+        # Smaller tolerance needs more messages
+        self.assertGreater(
+            len(
+                midi_converters.EventToMidiFile(
+                    tempo_tolerance_in_beats_per_minute=0.1
+                )._tempo_to_midi_message_tuple(flex_tempo)
+            ),
+            len(
+                midi_converters.EventToMidiFile(
+                    tempo_tolerance_in_beats_per_minute=2
+                )._tempo_to_midi_message_tuple(flex_tempo)
+            ),
+        )
+
+    def test_tempo_cache(self):
+        converter = midi_converters.EventToMidiFile()
+        flex_tempo = core_parameters.FlexTempo(((0, 60), (4, 120)))
+        midi_message_tuple = converter._tempo_to_midi_message_tuple(flex_tempo)
+        cached_midi_message_tuple = converter._tempo_to_midi_message_tuple(flex_tempo)
+        self.assertEqual(converter._tempo_cache.cache_info().hits, 1)
+        self.assertEqual(midi_message_tuple, cached_midi_message_tuple)
+        # Messages are mutated when added to a track, so they can't be shared
+        self.assertIsNot(midi_message_tuple[0], cached_midi_message_tuple[0])
+        # Changing the tempo object changes the key
+        flex_tempo[0].duration = 2
+        self.assertNotEqual(
+            converter._tempo_to_midi_message_tuple(flex_tempo), midi_message_tuple
+        )
+
     def test_note_information_to_midi_messages(self):
         # loop only channel 0
         midi_channel = 0
@@ -639,6 +862,184 @@ class EventToMidiFileTest(unittest.TestCase):
             ),
         )
 
+    def test_chronon_extractor_cache(self):
+        """Ensure extraction functions are built once per chronon class"""
+
+        converter = midi_converters.EventToMidiFile()
+        note_like = music_events.NoteLike("c", 1, 1)
+        chronon = core_events.Chronon(1)
+        midi_channel_cycle = itertools.cycle((0,))
+
+        for _ in range(2):
+            for event in (note_like, chronon):
+                converter._chronon_to_midi_message_tuple(event, 0, midi_channel_cycle)
+        self.assertEqual(
+            set(converter._chronon_class_to_extractor),
+            {music_events.NoteLike, core_events.Chronon},
+        )
+
+        chronon_to_extracted_data = converter._chronon_class_to_extractor[
+            music_events.NoteLike
+        ]
+        (
+            pitch_list,
+            volume,
+            control_message_tuple,
+            control_envelope_tuple,
+        ) = chronon_to_extracted_data(note_like)
+        self.assertEqual(pitch_list, note_like.pitch_list)
+        self.assertEqual(volume, note_like.volume)
+        self.assertEqual(control_message_tuple, tuple([]))
+        self.assertEqual(control_envelope_tuple, tuple([]))
+
+        # A chronon without any pitch or control message is a rest
+        self.assertEqual(
+            converter._chronon_class_to_extractor[core_events.Chronon](chronon), None
+        )
+
+        # But if an instance of the same class has a pitch_list attribute,
+        # it isn't a rest anymore.
+        chronon.pitch_list = [music_parameters.WesternPitch("c")]
+        self.assertTrue(
+            converter._chronon_to_midi_message_tuple(chronon, 0, midi_channel_cycle)
+        )
+
+    def test_chronon_extractor_without_attribute_name(self):
+        """Fall back to the converter if ChrononToAttribute internals change"""
+
+        chronon_to_pitch_list = core_converters.ChrononToAttribute("pitch_list", [])
+        del chronon_to_pitch_list._attribute_name
+        self.assertEqual(
+            midi_converters.EventToMidiFile._make_attribute_getter(
+                music_events.NoteLike, chronon_to_pitch_list
+            ),
+            None,
+        )
+        converter = midi_converters.EventToMidiFile(
+            chronon_to_pitch_list=chronon_to_pitch_list
+        )
+        chronon_to_extracted_data = converter._make_chronon_to_extracted_data(
+            music_events.NoteLike
+        )
+        with unittest.mock.patch.object(
+            core_converters.ChrononToAttribute,
+            "convert",
+            return_value=[music_parameters.WesternPitch("c")],
+        ):
+            self.assertEqual(
+                chronon_to_extracted_data(music_events.NoteLike([], 1))[0],
+                [music_parameters.WesternPitch("c")],
+            )
+
+    def test_chronon_extractor_with_attribute_error(self):
+        """Custom extraction functions which raise AttributeError produce rests"""
+
+        def chronon_to_pitch_list(chronon):
+            return chronon.my_pitch_list
+
+        converter = midi_converters.EventToMidiFile(
+            chronon_to_pitch_list=chronon_to_pitch_list
+        )
+        chronon = core_events.Chronon(1)
+        midi_channel_cycle = itertools.cycle((0,))
+        self.assertEqual(
+            converter._chronon_to_midi_message_tuple(chronon, 0, midi_channel_cycle),
+            tuple([]),
+        )
+        chronon.my_pitch_list = [music_parameters.WesternPitch("c")]
+        self.assertEqual(
+            len(
+                converter._chronon_to_midi_message_tuple(chronon, 0, midi_channel_cycle)
+            ),
+            3,
+        )
+
+    def test_message_template_cache(self):
+        """Identical tones reuse a template and render the same messages"""
+
+        consecution = core_events.Consecution(
+            [
+                music_events.NoteLike(pitch, 1, 0.5)
+                for pitch in (
+                    "c",
+                    "c",
+                    "5/4",
+                    "c",
+                    [music_parameters.FlexPitch([[0, "1/1"], [1, "9/8"]])],
+                    [music_parameters.FlexPitch([[0, "1/1"], [1, "9/8"]])],
+                )
+            ]
+        )
+        concurrence = core_events.Concurrence([consecution, consecution.copy()])
+        converter = midi_converters.EventToMidiFile()
+        uncached_converter = midi_converters.EventToMidiFile(
+            message_template_cache_size=0
+        )
+        self.assertEqual(
+            converter.convert(concurrence).tracks,
+            uncached_converter.convert(concurrence).tracks,
+        )
+        cache_info = converter.message_template_cache.cache_info()
+        self.assertEqual(cache_info.misses, 4)
+        self.assertEqual(cache_info.hits, 8)
+        self.assertEqual(len(uncached_converter.message_template_cache), 0)
+
+    def test_track_cache(self):
+        """Only changed consecutions are rendered again"""
+
+        concurrence = core_events.Concurrence(
+            [
+                core_events.Consecution(
+                    [
+                        music_events.NoteLike(pitch, 1, 0.5)
+                        for pitch in (
+                            "c",
+                            "5/4",
+                            [music_parameters.FlexPitch([[0, "1/1"], [1, "9/8"]])],
+                        )
+                    ]
+                    + [core_events.Consecution([music_events.NoteLike("d", 1)])]
+                )
+                for _ in range(3)
+            ]
+        )
+        self.assertEqual(self.converter.track_cache.maxsize, 0)
+        for midi_file_type in (0, 1):
+            converter = midi_converters.EventToMidiFile(
+                midi_file_type=midi_file_type, track_cache_size=1000
+            )
+            uncached_converter = midi_converters.EventToMidiFile(
+                midi_file_type=midi_file_type
+            )
+            midi_file = converter.convert(concurrence)
+            self.assertEqual(
+                midi_file.tracks, uncached_converter.convert(concurrence).tracks
+            )
+            # Changing the returned midi file doesn't change the cache
+            for midi_track in midi_file.tracks:
+                for midi_message in midi_track:
+                    midi_message.time = 1000
+            self.assertEqual(
+                converter.convert(concurrence).tracks,
+                uncached_converter.convert(concurrence).tracks,
+            )
+            cache_info = converter.track_cache.cache_info()
+            # All consecutions are equal and share the same midi channels.
+            self.assertEqual((cache_info.misses, cache_info.hits), (1, 5))
+
+            changed_concurrence = concurrence.copy()
+            changed_concurrence[1][1].pitch_list = "e"
+            self.assertEqual(
+                converter.convert(changed_concurrence).tracks,
+                uncached_converter.convert(changed_concurrence).tracks,
+            )
+            cache_info = converter.track_cache.cache_info()
+            self.assertEqual((cache_info.misses, cache_info.hits), (2, 7))
+
+            converter.track_cache.clear()
+            converter.convert(concurrence)
+            self.assertEqual(converter.track_cache.cache_info().misses, 1)
+
     def test_consecution_to_midi_message_tuple(self):
         pass
 
@@ -761,6 +1162,167 @@ class EventToMidiFileTest(unittest.TestCase):
         self.assertIsInstance(midi_file, mido.MidiFile)
         os.remove(self.midi_file_path)
 
+    def test_convert_with_file_like_and_buffer(self):
+        """Midi files can be written to file-like objects and buffers"""
+        midi_file = self.converter.convert(self.consecution)
+        midi_file_bytes = self.converter.convert(self.consecution, return_bytes=True)
+        self.assertEqual(
+            mido.MidiFile(file=io.BytesIO(midi_file_bytes)).tracks, midi_file.tracks
+        )
+        # The number of written bytes is returned
+        midi_file_bytes_io = io.BytesIO()
+        self.assertEqual(
+            self.converter.convert(self.consecution, midi_file_bytes_io),
+            len(midi_file_bytes),
+        )
+        self.assertEqual(midi_file_bytes_io.getvalue(), midi_file_bytes)
+        buffer = bytearray(len(midi_file_bytes) + 10)
+        self.assertEqual(
+            self.converter.convert(self.consecution, memoryview(buffer)),
+            len(midi_file_bytes),
+        )
+        self.assertEqual(buffer[: len(midi_file_bytes)], midi_file_bytes)
+        self.assertRaises(
+            ValueError,
+            self.converter.convert,
+            self.consecution,
+            io.BytesIO(),
+            return_bytes=True,
+        )
+        self.converter.convert(self.consecution, pathlib.Path(self.midi_file_path))
+        with open(self.midi_file_path, "rb") as f:
+            self.assertEqual(f.read(), midi_file_bytes)
+        os.remove(self.midi_file_path)
+
+    @staticmethod
+    def _get_absolute_message_list(midi_track: mido.MidiTrack) -> list[tuple]:
+        absolute_message_list, tick = [], 0
+        for midi_message in midi_track:
+            tick += midi_message.time
+            if midi_message.type in ("note_on", "note_off"):
+                absolute_message_list.append(
+                    (midi_message.type, tick, midi_message.note)
+                )
+            elif midi_message.type in ("pitchwheel", "set_tempo", "end_of_track"):
+                absolute_message_list.append((midi_message.type, tick))
+        return absolute_message_list
+
+    def test_convert_with_render_range(self):
+        # 480 ticks per beat
+        converter = midi_converters.EventToMidiFile(
+            tempo=core_parameters.FlexTempo([[0, 60], [2, 60], [2, 120]])
+        )
+        midi_file = converter.convert(self.concurrence, render_range=(2.5, 4.5))
+        self.assertEqual(len(midi_file.tracks), 2)
+        self.assertEqual(
+            self._get_absolute_message_list(midi_file.tracks[0]),
+            [
+                # Pitch bending and tempo at the start of the render range
+                ("pitchwheel", 0),
+                ("set_tempo", 0),
+                # Note 'e' started before the render range
+                ("note_on", 0, 64),
+                ("pitchwheel", 239),
+                ("note_off", 240, 64),
+                ("note_on", 240, 65),
+                ("pitchwheel", 719),
+                ("note_off", 720, 65),
+                ("note_on", 720, 67),
+                # Clipped at the end of the render range
+                ("note_off", 960, 67),
+                ("end_of_track", 960),
+            ],
+        )
+        self.assertEqual(
+            [
+                midi_message.tempo
+                for midi_message in midi_file.tracks[0]
+                if midi_message.type == "set_tempo"
+            ],
+            [500000],
+        )
+
+    def test_convert_with_render_range_without_clipping(self):
+        converter = midi_converters.EventToMidiFile(clip_notes_to_render_range=False)
+        midi_file = converter.convert(self.consecution, render_range=(2.5, 4.5))
+        self.assertEqual(
+            [
+                midi_message
+                for midi_message in self._get_absolute_message_list(midi_file.tracks[0])
+                if midi_message[0] in ("note_off", "end_of_track")
+            ],
+            [
+                ("note_off", 240, 64),
+                ("note_off", 720, 65),
+                ("note_off", 1200, 67),
+                ("end_of_track", 1200),
+            ],
+        )
+
+    def test_convert_with_render_range_and_gradual_tempo(self):
+        """Only the tempo steps of the render range are created"""
+        converter = midi_converters.EventToMidiFile(
+            tempo=core_parameters.FlexTempo([[0, 60], [100, 120]])
+        )
+        consecution = core_events.Consecution(
+            [music_events.NoteLike("c", 1) for _ in range(100)]
+        )
+
+        def get_tempo_list(midi_file):
+            tick, tempo_list = 0, []
+            for midi_message in midi_file.tracks[0]:
+                tick += midi_message.time
+                if midi_message.type == "set_tempo":
+                    tempo_list.append((tick, midi_message.tempo))
+            return tempo_list
+
+        tempo_list = get_tempo_list(converter.convert(consecution))
+        self.assertGreater(len(tempo_list), 50)
+        start_tick, end_tick = 50 * 480, 52 * 480
+        with unittest.mock.patch.object(
+            mido, "MetaMessage", wraps=mido.MetaMessage
+        ) as meta_message:
+            windowed_tempo_list = get_tempo_list(
+                converter.convert(consecution, render_range=(50, 52))
+            )
+        expected_tempo_list = [
+            (0, [tempo for tick, tempo in tempo_list if tick <= start_tick][-1])
+        ] + [
+            (tick - start_tick, tempo)
+            for tick, tempo in tempo_list
+            if start_tick < tick <= end_tick
+        ]
+        self.assertEqual(windowed_tempo_list, expected_tempo_list)
+        self.assertEqual(
+            len(
+                [
+                    call
+                    for call in meta_message.call_args_list
+                    if call.args == ("set_tempo",)
+                ]
+            ),
+            len(expected_tempo_list),
+        )
+
+    def test_convert_with_complete_render_range(self):
+        """Rendering the complete event equals the normal conversion"""
+        event_interval_index = midi_converters.EventIntervalIndex(self.concurrence)
+        for midi_file_type in (0, 1):
+            converter = midi_converters.EventToMidiFile(midi_file_type=midi_file_type)
+            self.assertEqual(
+                converter.convert(
+                    self.concurrence,
+                    render_range=(0, self.concurrence.duration),
+                    event_interval_index=event_interval_index,
+                ).tracks,
+                converter.convert(self.concurrence).tracks,
+            )
+
+    def test_convert_with_invalid_render_range(self):
+        self.assertRaises(
+            ValueError, self.converter.convert, self.consecution, render_range=(2, 1)
+        )
+
     def test_convert_event_with_small_duration(self):
         chronon = core_events.Chronon(fractions.Fraction(1, 4))
         self.converter.convert(chronon, self.midi_file_path)
@@ -793,6 +1355,548 @@ class EventToMidiFileTest(unittest.TestCase):
             )
         )
 
+    @staticmethod
+    def _get_sounding_midi_pitch_list(
+        midi_file: mido.MidiFile,
+    ) -> list[tuple[int, float]]:
+        """Decode midi tuning standard messages and return tuned notes"""
+        resolution = midi_converters.constants.MIDI_TUNING_RESOLUTION
+        key_to_midi_pitch = list(range(128))
+        pitch_class_to_deviation = [0] * 12
+        sounding_midi_pitch_list = []
+        tick = 0
+        for message in mido.merge_tracks(midi_file.tracks):
+            tick += message.time
+            match message.type:
+                case "sysex":
+                    header, data = tuple(message.data[:4]), message.data[4:]
+                    if header == (
+                        midi_converters.constants.SINGLE_NOTE_TUNING_CHANGE_HEADER
+                    ):
+                        for index in range(2, len(data), 4):
+                            key, semitone, msb, lsb = data[index : index + 4]
+                            key_to_midi_pitch[key] = (
+                                semitone + ((msb << 7) + lsb) / resolution
+                            )
+                    elif header == midi_converters.constants.SCALE_OCTAVE_TUNING_HEADER:
+                        tuning_data = data[3:]
+                        for pitch_class in range(12):
+                            msb, lsb = tuning_data[
+                                pitch_class * 2 : pitch_class * 2 + 2
+                            ]
+                            pitch_class_to_deviation[pitch_class] = (
+                                ((msb << 7) + lsb) - resolution // 2
+                            ) / (resolution // 2)
+                case "note_on" if message.velocity:
+                    sounding_midi_pitch_list.append(
+                        (
+                            tick,
+                            round(
+                                key_to_midi_pitch[message.note]
+                                + pitch_class_to_deviation[message.note % 12],
+                                2,
+                            ),
+                        )
+                    )
+        return sorted(sounding_midi_pitch_list)
+
+    @staticmethod
+    def _get_expected_midi_pitch_list(
+        event: core_events.Concurrence, ticks_per_beat: int
+    ) -> list[tuple[int, float]]:
+        expected_midi_pitch_list = []
+        for consecution in event:
+            for absolute_time, chronon in zip(
+                consecution.absolute_time_in_floats_tuple, consecution
+            ):
+                for pitch in getattr(chronon, "pitch_list", []):
+                    expected_midi_pitch_list.append(
+                        (
+                            round(absolute_time * ticks_per_beat),
+                            round(69 + 12 * math.log2(pitch.hertz / 440), 2),
+                        )
+                    )
+        return sorted(expected_midi_pitch_list)
+
+    def test_convert_with_single_note_tuning_mode(self):
+        """Dense microtonal chords can be played on one midi channel"""
+        event = core_events.Concurrence(
+            [
+                core_events.Consecution(
+                    [
+                        music_events.NoteLike(["c", "cqs", "5/4", "11/8"], 1),
+                        music_events.NoteLike(["7/4", "cqs", "d"], 1),
+                        music_events.NoteLike([], 1),
+                        music_events.NoteLike(["5/4", "7/6", "7/4"], 2),
+                    ]
+                ),
+                core_events.Consecution(
+                    [
+                        music_events.NoteLike(["13/8", "cqs"], 2),
+                        music_events.NoteLike(["e", "5/4"], 3),
+                    ]
+                ),
+            ]
+        )
+        converter = midi_converters.EventToMidiFile(
+            available_midi_channel_tuple=(0,), tuning_mode="single_note"
+        )
+        midi_file = converter.convert(event)
+        self.assertEqual(
+            self._get_sounding_midi_pitch_list(midi_file),
+            self._get_expected_midi_pitch_list(event, midi_file.ticks_per_beat),
+        )
+        message_list = list(mido.merge_tracks(midi_file.tracks))
+        self.assertFalse(
+            [message for message in message_list if message.type == "pitchwheel"]
+        )
+        # All notes of one tick are tuned by one message
+        sysex_tick_list = list(
+            itertools.accumulate(message.time for message in message_list)
+        )
+        sysex_tick_list = [
+            tick
+            for tick, message in zip(sysex_tick_list, message_list)
+            if message.type == "sysex"
+        ]
+        self.assertEqual(sysex_tick_list, sorted(set(sysex_tick_list)))
+        # Keys which are already tuned are reused: the last chord
+        # doesn't need any retuning.
+        self.assertEqual(len(sysex_tick_list), 3)
+        # No note off is lost
+        self.assertEqual(
+            len([m for m in message_list if m.type == "note_on"]),
+            len([m for m in message_list if m.type == "note_off"]),
+        )
+
+    def test_convert_with_single_note_tuning_mode_message_count(self):
+        """Tuning keys needs fewer messages than pitch bending"""
+        event = core_events.Consecution(
+            [
+                music_events.NoteLike(pitch, 0.25)
+                for pitch in ("5/4", "11/8", "3/2", "7/4") * 50
+            ]
+        )
+        midi_file_with_pitch_bend = midi_converters.EventToMidiFile().convert(event)
+        midi_file_with_single_note_tuning = midi_converters.EventToMidiFile(
+            tuning_mode="single_note"
+        ).convert(event)
+        self.assertEqual(
+            self._get_sounding_midi_pitch_list(midi_file_with_single_note_tuning),
+            self._get_expected_midi_pitch_list(
+                core_events.Concurrence([event]),
+                midi_file_with_single_note_tuning.ticks_per_beat,
+            ),
+        )
+        self.assertLess(
+            len(midi_file_with_single_note_tuning.tracks[0]) * 1.4,
+            len(midi_file_with_pitch_bend.tracks[0]),
+        )
+
+    def test_convert_with_single_note_tuning_mode_and_glissando(self):
+        """Glissandi are still rendered with pitch bending"""
+        event = core_events.Consecution(
+            [
+                music_events.NoteLike("5/4", 1),
+                music_events.NoteLike(
+                    [music_parameters.FlexPitch([[0, "1/1"], [1, "9/8"]])], 1
+                ),
+            ]
+        )
+        midi_file = midi_converters.EventToMidiFile(tuning_mode="single_note").convert(
+            event
+        )
+        message_type_set = {message.type for message in midi_file.tracks[0]}
+        self.assertIn("sysex", message_type_set)
+        self.assertIn("pitchwheel", message_type_set)
+
+    def test_convert_with_scale_octave_tuning_mode(self):
+        event = core_events.Concurrence(
+            [
+                core_events.Consecution(
+                    [
+                        music_events.NoteLike(["c", "5/4", "3/2"], 1),
+                        music_events.NoteLike(["7/4", "dqs"], 1),
+                    ]
+                ),
+                core_events.Consecution([music_events.NoteLike([], 1)]),
+            ]
+        )
+        midi_file = midi_converters.EventToMidiFile(tuning_mode="scale_octave").convert(
+            event
+        )
+        self.assertEqual(
+            self._get_sounding_midi_pitch_list(midi_file),
+            self._get_expected_midi_pitch_list(event, midi_file.ticks_per_beat),
+        )
+
+    def test_convert_with_scale_octave_tuning_conflict(self):
+        event = core_events.Concurrence(
+            [
+                core_events.Consecution([music_events.NoteLike("5/4", 2)]),
+                core_events.Consecution(
+                    # Same pitch class as '5/4', but with another tuning
+                    [music_events.NoteLike([], 1), music_events.NoteLike("cs", 1)]
+                ),
+            ]
+        )
+        converter = midi_converters.EventToMidiFile(tuning_mode="scale_octave")
+        with self.assertLogs(converter._logger):
+            converter.convert(event)
+
+    def test_invalid_tuning_mode(self):
+        self.assertRaises(
+            ValueError, midi_converters.EventToMidiFile, tuning_mode="just"
+        )
+
+    def _get_mpe_event(self) -> core_events.Concurrence:
+        """Dense microtonal chords with glissandi in three voices"""
+        return core_events.Concurrence(
+            [
+                core_events.Consecution(
+                    [
+                        music_events.NoteLike(["c", "5/4", "7/4"], 1),
+                        music_events.NoteLike(["d", "11/8"], 0.5),
+                        music_events.NoteLike(["e", "13/8", "3/2"], 1.5),
+                        music_events.NoteLike([], 1),
+                        music_events.NoteLike(["5/4", "7/6"], 1),
+                    ]
+                ),
+                core_events.Consecution(
+                    [
+                        music_events.NoteLike(
+                            [music_parameters.FlexPitch([[0, "1/1"], [1, "9/8"]])],
+                            2,
+                        ),
+                        music_events.NoteLike(["7/4", "5/4", "fqs"], 2),
+                    ]
+                ),
+                core_events.Consecution(
+                    [
+                        music_events.NoteLike([], 0.25),
+                        core_events.Consecution(
+                            [music_events.NoteLike(p, 0.25) for p in ("g", "7/4")] * 4
+                        ),
+                    ]
+                ),
+            ]
+        )
+
+    def test_convert_with_mpe_member_channels(self):
+        event = self._get_mpe_event()
+        midi_file = midi_converters.EventToMidiFile(
+            mpe_member_channel_count=15
+        ).convert(event)
+        message_list = list(mido.merge_tracks(midi_file.tracks))
+        tick_list = list(itertools.accumulate(m.time for m in message_list))
+
+        # The MPE configuration is sent once at the start of the
+        # first track: the configuration message (15 member channels) and
+        # then the pitch bend range (2 semitones) of all member channels.
+        control_change_list = [
+            (m.channel, m.control, m.value)
+            for m in message_list
+            if m.type == "control_change"
+        ]
+        self.assertEqual(
+            control_change_list,
+            [(0, 101, 0), (0, 100, 6), (0, 6, 15)]
+            + [
+                (channel, control, value)
+                for channel in range(1, 16)
+                for control, value in ((101, 0), (100, 0), (6, 2), (38, 0))
+            ],
+        )
+        self.assertEqual(
+            midi_file.tracks[0][2 : 2 + len(control_change_list)],
+            [m for m in midi_file.tracks[0] if m.type == "control_change"],
+        )
+
+        # No tone shares its channel with another sounding tone
+        # (pitch bending starts one tick before the tone).
+        channel_to_busy_tick_range = {}
+        sounding_tone_count = 0
+        for tick, message in zip(tick_list, message_list):
+            if message.type == "note_on":
+                self.assertIn(message.channel, range(1, 16))
+                previous_end = channel_to_busy_tick_range.get(
+                    message.channel, (None, -1)
+                )[1]
+                self.assertLess(previous_end, tick - 1 if tick else tick)
+                channel_to_busy_tick_range[message.channel] = (tick, None)
+                sounding_tone_count += 1
+            elif message.type == "note_off":
+                start = channel_to_busy_tick_range[message.channel][0]
+                channel_to_busy_tick_range[message.channel] = (start, tick)
+        self.assertEqual(sounding_tone_count, 22)
+
+        # Each tone has its own pitch bend: decoding the channel state gives
+        # the pitch bend of each tone.
+        channel_to_pitch_bend = {}
+        mpe_tone_list = []
+        for message in message_list:
+            if message.type == "pitchwheel":
+                channel_to_pitch_bend[message.channel] = message.pitch
+            elif message.type == "note_on":
+                mpe_tone_list.append(
+                    (message.note, channel_to_pitch_bend[message.channel])
+                )
+        mutwo_pitch_to_midi_pitch = midi_converters.MutwoPitchToMidiPitch()
+        static_tone_list = [
+            mutwo_pitch_to_midi_pitch.convert(pitch)
+            for pitch_list in event.get_parameter("pitch_list", flat=True)
+            for pitch in pitch_list
+            if not isinstance(pitch, music_parameters.FlexPitch)
+        ]
+        self.assertEqual(len(mpe_tone_list), len(static_tone_list) + 1)
+        # Only the glissando remains
+        self.assertEqual(
+            sum(
+                (
+                    collections.Counter(mpe_tone_list)
+                    - collections.Counter(static_tone_list)
+                ).values()
+            ),
+            1,
+        )
+
+    def test_convert_with_mpe_member_channel_pool(self):
+        """Member channels are used in the order of their release"""
+        midi_file = midi_converters.EventToMidiFile(mpe_member_channel_count=4).convert(
+            core_events.Consecution(
+                [music_events.NoteLike(pitch, 1) for pitch in "cdefgab"]
+                + [music_events.NoteLike(["c", "e", "g"], 1)]
+            )
+        )
+        self.assertEqual(
+            [m.channel for m in midi_file.tracks[0] if m.type == "note_on"],
+            # Legato tones never share a channel
+            [1, 2, 3, 4, 1, 2, 3]
+            # Channel 3 is sounding until the chord starts
+            + [4, 1, 2],
+        )
+        # Equal pitch bends are only sent once per channel
+        self.assertEqual(
+            len([m for m in midi_file.tracks[0] if m.type == "pitchwheel"]), 4
+        )
+
+    def test_convert_with_mpe_member_channel_collision(self):
+        converter = midi_converters.EventToMidiFile(mpe_member_channel_count=2)
+        with self.assertLogs(converter._logger):
+            converter.convert(music_events.NoteLike(["c", "e", "g"], 1))
+
+    def test_convert_with_mpe_member_channels_and_render_range(self):
+        event = self._get_mpe_event()
+        midi_file = midi_converters.EventToMidiFile(
+            mpe_member_channel_count=15
+        ).convert(event, render_range=(1, 3))
+        message_list = list(mido.merge_tracks(midi_file.tracks))
+        self.assertEqual(
+            len([m for m in message_list if m.type == "control_change"]), 63
+        )
+        channel_set = set()
+        for message in message_list:
+            if message.type == "note_on":
+                self.assertNotIn(message.channel, channel_set)
+                channel_set.add(message.channel)
+            elif message.type == "note_off":
+                channel_set.discard(message.channel)
+
+    def test_invalid_mpe_member_channel_count(self):
+        for mpe_member_channel_count in (-1, 16):
+            self.assertRaises(
+                ValueError,
+                midi_converters.EventToMidiFile,
+                mpe_member_channel_count=mpe_member_channel_count,
+            )
+
+    @staticmethod
+    def _get_held_value_list(
+        midi_file: mido.MidiFile, message_type: str, start: int, end: int
+    ) -> list[int]:
+        """Value of the first channel controller at each tick of the range"""
+        tick_to_value = {}
+        tick = 0
+        for message in mido.merge_tracks(midi_file.tracks):
+            tick += message.time
+            if message.type == message_type:
+                tick_to_value[tick] = message.value
+        held_value_list = []
+        value = None
+        for tick in range(start, end):
+            value = tick_to_value.get(tick, value)
+            held_value_list.append(value)
+        return held_value_list
+
+    def test_convert_with_control_envelope(self):
+        note_like = music_events.NoteLike("c", 4)
+        note_like.control_envelope_tuple = (
+            midi_converters.ControlEnvelope(
+                "control_change",
+                core_events.Envelope([[0, 0, 1.5], [3, 127, 0], [4, 20]]),
+                11,
+            ),
+            midi_converters.ControlEnvelope(
+                "aftertouch", core_events.Envelope([[0, 64]])
+            ),
+        )
+        midi_file = midi_converters.EventToMidiFile().convert(note_like)
+        message_list = list(mido.merge_tracks(midi_file.tracks))
+        control_change_list = [m for m in message_list if m.type == "control_change"]
+        self.assertTrue(all(m.control == 11 for m in control_change_list))
+        # Only messages which change the value are sent
+        self.assertTrue(
+            all(
+                m0.value != m1.value
+                for m0, m1 in zip(control_change_list, control_change_list[1:])
+            )
+        )
+        self.assertEqual(len(control_change_list), 128 + 107)
+        # The envelope is stretched to the tone (it ends one tick before
+        # the tone stops) and the value at each tick is exact.
+        tick_count = 4 * 480 - 1
+        end_of_segment_tick = round(3 / 4 * tick_count)
+        self.assertEqual(
+            self._get_held_value_list(midi_file, "control_change", 0, tick_count + 1),
+            [
+                round(core_utilities.scale(tick, 0, end_of_segment_tick, 0, 127, 1.5))
+                for tick in range(end_of_segment_tick)
+            ]
+            + [
+                round(
+                    core_utilities.scale(
+                        tick, end_of_segment_tick, tick_count, 127, 20, 0
+                    )
+                )
+                for tick in range(end_of_segment_tick, tick_count + 1)
+            ],
+        )
+        self.assertEqual(
+            [(m.channel, m.value) for m in message_list if m.type == "aftertouch"],
+            [(0, 64)],
+        )
+
+    def test_convert_with_control_value_tolerance(self):
+        note_like = music_events.NoteLike("c", 4)
+        envelope = core_events.Envelope([[0, 0, -2], [1, 127]])
+        note_like.control_envelope_tuple = (
+            midi_converters.ControlEnvelope("aftertouch", envelope),
+        )
+        tick_count = 4 * 480 - 1
+        expected_value_list = [
+            round(core_utilities.scale(tick, 0, tick_count, 0, 127, -2))
+            for tick in range(tick_count + 1)
+        ]
+        midi_file = midi_converters.EventToMidiFile(control_value_tolerance=4).convert(
+            note_like
+        )
+        held_value_list = self._get_held_value_list(
+            midi_file, "aftertouch", 0, tick_count + 1
+        )
+        self.assertTrue(
+            all(
+                abs(held_value - expected_value) <= 4
+                for held_value, expected_value in zip(
+                    held_value_list, expected_value_list
+                )
+            )
+        )
+        self.assertEqual(held_value_list[-1], 127)
+        self.assertLess(
+            len([m for m in midi_file.tracks[0] if m.type == "aftertouch"]), 64
+        )
+
+    def test_convert_with_redundant_control_envelope(self):
+        """Envelopes which don't change the controller don't send messages"""
+        consecution = core_events.Consecution(
+            [music_events.NoteLike(pitch, 1) for pitch in "cde"]
+        )
+        for note_like in consecution:
+            note_like.control_envelope_tuple = (
+                midi_converters.ControlEnvelope(
+                    "control_change", core_events.Envelope([[0, 100], [1, 100]]), 1
+                ),
+            )
+        # Control messages which are passed by the user are always sent
+        consecution[1].control_message_tuple = (
+            mido.Message("control_change", control=1, value=100),
+        )
+        midi_file = midi_converters.EventToMidiFile(
+            available_midi_channel_tuple=(0,)
+        ).convert(consecution)
+        message_list = list(mido.merge_tracks(midi_file.tracks))
+        self.assertEqual(
+            [
+                (tick, m.value)
+                for tick, m in zip(
+                    itertools.accumulate(m.time for m in message_list), message_list
+                )
+                if m.type == "control_change"
+            ],
+            [(0, 100), (480, 100)],
+        )
+
+    def test_convert_with_shared_control_message(self):
+        """Control messages are copied, not moved"""
+        control_message = mido.Message("control_change", control=64, value=127)
+        converter = midi_converters.EventToMidiFile(
+            chronon_to_control_message_tuple=lambda chronon: (control_message,)
+        )
+        midi_file = converter.convert(
+            core_events.Consecution([music_events.NoteLike(pitch, 1) for pitch in "cd"])
+        )
+        tick_list = []
+        tick = 0
+        for message in mido.merge_tracks(midi_file.tracks):
+            tick += message.time
+            if message.type == "control_change":
+                tick_list.append(tick)
+        self.assertEqual(tick_list, [0, 480])
+        self.assertEqual(control_message.time, 0)
+
+    def test_convert_with_per_tone_control_envelope(self):
+        """Each tone of a chord gets its own envelope on its own channel"""
+        note_like = music_events.NoteLike(["c", "5/4", "g"], 1)
+        note_like.control_envelope_tuple = (
+            midi_converters.ControlEnvelope(
+                "polytouch", core_events.Envelope([[0, 10], [1, 20]])
+            ),
+            midi_converters.ControlEnvelope(
+                "control_change", core_events.Envelope([[0, 70]]), 74
+            ),
+        )
+        for converter in (
+            midi_converters.EventToMidiFile(mpe_member_channel_count=15),
+            midi_converters.EventToMidiFile(tuning_mode="single_note"),
+        ):
+            message_list = list(mido.merge_tracks(converter.convert(note_like).tracks))
+            channel_and_note_set = {
+                (m.channel, m.note) for m in message_list if m.type == "note_on"
+            }
+            self.assertEqual(len(channel_and_note_set), 3)
+            polytouch_list = [m for m in message_list if m.type == "polytouch"]
+            self.assertEqual(len(polytouch_list), 3 * 11)
+            self.assertEqual(
+                {(m.channel, m.note) for m in polytouch_list}, channel_and_note_set
+            )
+            self.assertEqual(
+                sorted(
+                    m.channel
+                    for m in message_list
+                    if m.type == "control_change" and m.control == 74
+                ),
+                sorted(channel for channel, _ in channel_and_note_set),
+            )
+
+    def test_convert_with_invalid_control_envelope(self):
+        note_like = music_events.NoteLike("c", 1)
+        note_like.control_envelope_tuple = (
+            midi_converters.ControlEnvelope("note_on", core_events.Envelope([[0, 1]])),
+        )
+        self.assertRaises(
+            ValueError, midi_converters.EventToMidiFile().convert, note_like
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
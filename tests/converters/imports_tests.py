@@ -0,0 +1,47 @@
+import importlib
+import subprocess
+import sys
+import unittest
+
+from mutwo import midi_converters
+
+
+class LazyImportTest(unittest.TestCase):
+    def test_lazily_exported_name_tuple(self):
+        """Ensure the lazily exported names match the '__all__' of each module"""
+        for (
+            module_name,
+            attribute_name_tuple,
+        ) in midi_converters._MODULE_NAME_TO_ATTRIBUTE_NAME_TUPLE.items():
+            module = importlib.import_module(f"mutwo.midi_converters.{module_name}")
+            self.assertEqual(module.__all__, attribute_name_tuple)
+
+    def test_all(self):
+        for name in midi_converters.__all__:
+            self.assertTrue(getattr(midi_converters, name))
+            self.assertIn(name, dir(midi_converters))
+
+    def test_flat_structure(self):
+        midi_converters.EventToMidiFile
+        self.assertFalse(hasattr(midi_converters, "frontends"))
+        self.assertRaises(AttributeError, lambda: midi_converters.NotExisting)
+
+    def test_import_is_lazy(self):
+        """Importing the package mustn't import mido and the music stack"""
+        module_name_tuple = ("mido", "mutwo.music_parameters", "mutwo.music_converters")
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from mutwo import midi_converters; "
+                f"print(any(m in sys.modules for m in {module_name_tuple}))",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,293 @@
+import os
+import random
+import tempfile
+import unittest
+import unittest.mock
+
+import mido
+
+from mutwo import midi_converters
+
+
+class MidiFileIndexerTest(unittest.TestCase):
+    def setUp(self):
+        r = random.Random(10)
+        track_list = []
+        for _ in range(3):
+            track = mido.MidiTrack([mido.MetaMessage("track_name", name="test")])
+            active_note_list = []
+            for _ in range(500):
+                time = r.choice((0, 10, 100, 480))
+                if active_note_list and r.random() < 0.5:
+                    channel, note = active_note_list.pop(
+                        r.randrange(len(active_note_list))
+                    )
+                    message = r.choice(
+                        (
+                            mido.Message("note_off", channel=channel, note=note),
+                            mido.Message(
+                                "note_on", channel=channel, note=note, velocity=0
+                            ),
+                        )
+                    )
+                else:
+                    match r.choice(
+                        (
+                            "note_on",
+                            "pitchwheel",
+                            "control_change",
+                            "set_tempo",
+                            "sysex",
+                        )
+                    ):
+                        case "note_on":
+                            channel, note = r.randint(0, 3), r.randint(0, 127)
+                            active_note_list.append((channel, note))
+                            message = mido.Message(
+                                "note_on", channel=channel, note=note, velocity=100
+                            )
+                        case "pitchwheel":
+                            message = mido.Message(
+                                "pitchwheel",
+                                channel=r.randint(0, 3),
+                                pitch=r.randint(-8192, 8191),
+                            )
+                        case "control_change":
+                            message = mido.Message(
+                                "control_change",
+                                channel=r.randint(0, 3),
+                                control=r.randint(0, 3),
+                                value=r.randint(0, 127),
+                            )
+                        case "set_tempo":
+                            message = mido.MetaMessage(
+                                "set_tempo", tempo=r.randint(250000, 1000000)
+                            )
+                        case "sysex":
+                            message = mido.Message("sysex", data=(1, 2, 3))
+                message.time = time
+                track.append(message)
+            track_list.append(track)
+        self.midi_file_bytes = midi_converters.MidiFileToBytes().convert(
+            mido.MidiFile(tracks=track_list, ticks_per_beat=480)
+        )
+        self.indexer = midi_converters.MidiFileIndexer(interval_in_beats=4)
+        self.seek_index = self.indexer.convert(self.midi_file_bytes)
+
+    def test_convert(self):
+        self.assertEqual(self.seek_index.ticks_per_beat, 480)
+        self.assertEqual(self.seek_index.interval_in_ticks, 1920)
+        self.assertEqual(self.seek_index.midi_file_size, len(self.midi_file_bytes))
+        self.assertEqual(
+            self.seek_index.set_tempo_message_tuple,
+            tuple(
+                midi_converters.MidiFileParser(message_type_tuple=("set_tempo",))
+                .convert(self.midi_file_bytes)
+                .message_type_to_midi_message_list["set_tempo"]
+            ),
+        )
+        self.assertEqual(len(self.seek_index.track_seek_index_tuple), 3)
+        for track_seek_index in self.seek_index.track_seek_index_tuple:
+            self.assertTrue(track_seek_index.checkpoint_tuple)
+            tick_list = [
+                checkpoint.tick for checkpoint in track_seek_index.checkpoint_tuple
+            ]
+            self.assertEqual(tick_list, sorted(set(tick_list)))
+            for checkpoint in track_seek_index.checkpoint_tuple:
+                self.assertTrue(
+                    track_seek_index.start <= checkpoint.position < track_seek_index.end
+                )
+                for pitchwheel_message in checkpoint.pitchwheel_message_tuple:
+                    self.assertLessEqual(pitchwheel_message.time, checkpoint.tick)
+
+    def test_checkpoint_state(self):
+        midi_file_bytes = midi_converters.MidiFileToBytes().convert(
+            mido.MidiFile(
+                tracks=[
+                    mido.MidiTrack(
+                        [
+                            mido.Message("note_on", note=60, time=0),
+                            mido.Message("note_on", note=60, time=0),
+                            mido.Message("control_change", control=7, value=3),
+                            mido.Message("pitchwheel", channel=1, pitch=-5, time=5),
+                            mido.Message("note_on", note=62, velocity=0, time=5),
+                            mido.Message("pitchwheel", pitch=100, time=10),
+                            mido.Message("control_change", control=7, value=4),
+                            mido.Message("note_off", note=60, time=10),
+                        ]
+                    )
+                ],
+                ticks_per_beat=10,
+            )
+        )
+        checkpoint_tuple = (
+            midi_converters.MidiFileIndexer(1)
+            .convert(midi_file_bytes)
+            .track_seek_index_tuple[0]
+            .checkpoint_tuple
+        )
+        self.assertEqual(
+            [
+                (checkpoint.tick, checkpoint.running_status)
+                for checkpoint in checkpoint_tuple
+            ],
+            [(10, 0x90), (20, 0xB0)],
+        )
+        # Checkpoints are placed before the first message of the next tick,
+        # the 'note_on' message with velocity 0 doesn't stop a note.
+        self.assertEqual(
+            [checkpoint.active_note_count_tuple for checkpoint in checkpoint_tuple],
+            [((0, 60, 2),), ((0, 60, 2),)],
+        )
+        pitchwheel_message_tuple = (
+            midi_converters.PitchwheelMessage("pitchwheel", 20, 0, 100),
+            midi_converters.PitchwheelMessage("pitchwheel", 5, 1, -5),
+        )
+        self.assertEqual(
+            [
+                (
+                    checkpoint.pitchwheel_message_tuple,
+                    checkpoint.control_change_message_tuple,
+                )
+                for checkpoint in checkpoint_tuple
+            ],
+            [
+                (
+                    pitchwheel_message_tuple[1:],
+                    (
+                        midi_converters.ControlChangeMessage(
+                            "control_change", 0, 0, 7, 3
+                        ),
+                    ),
+                ),
+                (
+                    pitchwheel_message_tuple,
+                    (
+                        midi_converters.ControlChangeMessage(
+                            "control_change", 20, 0, 7, 4
+                        ),
+                    ),
+                ),
+            ],
+        )
+
+    def test_get_checkpoint(self):
+        track_seek_index = self.seek_index.track_seek_index_tuple[0]
+        self.assertIsNone(track_seek_index.get_checkpoint(0))
+        first_checkpoint = track_seek_index.checkpoint_tuple[0]
+        self.assertIsNone(track_seek_index.get_checkpoint(first_checkpoint.tick))
+        self.assertEqual(
+            track_seek_index.get_checkpoint(first_checkpoint.tick + 1),
+            first_checkpoint,
+        )
+        self.assertEqual(
+            track_seek_index.get_checkpoint(10**9),
+            track_seek_index.checkpoint_tuple[-1],
+        )
+
+    def test_parse_with_seek_index(self):
+        """Parsing with a seek index doesn't change the result"""
+        last_tick = self.seek_index.track_seek_index_tuple[0].checkpoint_tuple[-1].tick
+        for tick_range in (
+            (0, 100),
+            (1920, 1921),
+            (1921, 5000),
+            (5000, 20000),
+            (last_tick, last_tick + 10000),
+        ):
+            self.assertEqual(
+                midi_converters.MidiFileParser(
+                    tick_range=tick_range, seek_index=self.seek_index
+                ).convert(self.midi_file_bytes),
+                midi_converters.MidiFileParser(tick_range=tick_range).convert(
+                    self.midi_file_bytes
+                ),
+            )
+        for seconds_range in ((0, 1), (10, 20.5)):
+            self.assertEqual(
+                midi_converters.MidiFileParser(
+                    seconds_range=seconds_range, seek_index=self.seek_index
+                ).convert(self.midi_file_bytes),
+                midi_converters.MidiFileParser(seconds_range=seconds_range).convert(
+                    self.midi_file_bytes
+                ),
+            )
+
+    def test_parse_with_invalid_seek_index(self):
+        self.assertRaises(
+            ValueError,
+            midi_converters.MidiFileParser(
+                tick_range=(0, 100), seek_index=self.seek_index
+            ).convert,
+            self.midi_file_bytes + b"\0",
+        )
+
+    def test_midi_file_to_event_with_seek_index(self):
+        self.assertEqual(
+            midi_converters.MidiFileToEvent(
+                tick_range=(5000, 20000), seek_index=self.seek_index
+            ).convert(self.midi_file_bytes),
+            midi_converters.MidiFileToEvent(tick_range=(5000, 20000)).convert(
+                self.midi_file_bytes
+            ),
+        )
+
+    def test_write_and_read(self):
+        with tempfile.TemporaryDirectory() as directory_path:
+            path = os.path.join(directory_path, "index.json")
+            self.seek_index.write(path)
+            self.assertEqual(
+                midi_converters.MidiFileSeekIndex.read(path), self.seek_index
+            )
+            with open(path, "w") as f:
+                f.write('{"version": 1}')
+            self.assertRaises(ValueError, midi_converters.MidiFileSeekIndex.read, path)
+
+    def test_is_valid(self):
+        self.assertTrue(self.seek_index.is_valid(self.midi_file_bytes))
+        changed_midi_file_bytes = bytearray(self.midi_file_bytes)
+        changed_midi_file_bytes[-10] ^= 1
+        self.assertFalse(self.seek_index.is_valid(changed_midi_file_bytes))
+        self.assertFalse(self.seek_index.is_valid(self.midi_file_bytes[:-1]))
+
+    def test_convert_with_sidecar_path(self):
+        with tempfile.TemporaryDirectory() as directory_path:
+            sidecar_path = midi_converters.MidiFileSeekIndex.get_sidecar_path(
+                os.path.join(directory_path, "test.mid")
+            )
+            self.assertTrue(sidecar_path.endswith("test.mid.mutwo-seek-index.json"))
+            # Not existing yet: build and write
+            self.assertEqual(
+                self.indexer.convert(self.midi_file_bytes, sidecar_path),
+                self.seek_index,
+            )
+            self.assertTrue(os.path.exists(sidecar_path))
+            # Valid: read
+            with unittest.mock.patch.object(
+                self.indexer, "_build", wraps=self.indexer._build
+            ) as build:
+                self.assertEqual(
+                    self.indexer.convert(self.midi_file_bytes, sidecar_path),
+                    self.seek_index,
+                )
+                build.assert_not_called()
+                # Other interval: rebuild
+                midi_converters.MidiFileIndexer(2).convert(
+                    self.midi_file_bytes, sidecar_path
+                )
+                # Changed midi file: rebuild
+                changed_midi_file_bytes = bytearray(self.midi_file_bytes)
+                # Change the track name, so that the midi file stays valid
+                changed_midi_file_bytes[self.midi_file_bytes.index(b"test")] ^= 1
+                self.assertNotEqual(
+                    self.indexer.convert(changed_midi_file_bytes, sidecar_path).digest,
+                    self.seek_index.digest,
+                )
+                build.assert_called_once()
+
+    def test_invalid_interval(self):
+        self.assertRaises(ValueError, midi_converters.MidiFileIndexer, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
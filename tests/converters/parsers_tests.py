@@ -0,0 +1,473 @@
+import io
+import random
+import struct
+import unittest
+
+import mido
+
+from mutwo import midi_converters
+
+
+class MidiFileParserTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = midi_converters.MidiFileParser()
+        r = random.Random(100)
+        track_list = []
+        for _ in range(3):
+            track = mido.MidiTrack(
+                [
+                    mido.MetaMessage("track_name", name="test"),
+                    mido.MetaMessage("set_tempo", tempo=r.randint(1, 2**24 - 1)),
+                ]
+            )
+            for _ in range(200):
+                time = r.choice((0, 1, 200, 20000, 2**21))
+                channel = r.randint(0, 15)
+                message_type = r.choice(
+                    (
+                        "note_on",
+                        "note_off",
+                        "pitchwheel",
+                        "control_change",
+                        "program_change",
+                        "aftertouch",
+                        "polytouch",
+                        "sysex",
+                        "set_tempo",
+                        "marker",
+                    )
+                )
+                match message_type:
+                    case "note_on" | "note_off":
+                        message = mido.Message(
+                            message_type,
+                            note=r.randint(0, 127),
+                            velocity=r.randint(0, 127),
+                            channel=channel,
+                        )
+                    case "pitchwheel":
+                        message = mido.Message(
+                            message_type, pitch=r.randint(-8192, 8191), channel=channel
+                        )
+                    case "control_change":
+                        message = mido.Message(
+                            message_type,
+                            control=r.randint(0, 127),
+                            value=r.randint(0, 127),
+                            channel=channel,
+                        )
+                    case "program_change" | "aftertouch" | "polytouch":
+                        message = mido.Message(message_type, channel=channel)
+                    case "sysex":
+                        message = mido.Message(message_type, data=(1, 2, 3) * 50)
+                    case "set_tempo":
+                        message = mido.MetaMessage(message_type, tempo=500000)
+                    case "marker":
+                        message = mido.MetaMessage(message_type, text="x" * 200)
+                message.time = time
+                track.append(message)
+            track_list.append(track)
+        self.midi_file = mido.MidiFile(tracks=track_list, ticks_per_beat=960)
+        self.midi_file_bytes = midi_converters.MidiFileToBytes().convert(self.midi_file)
+
+    def _get_expected_message_type_to_midi_message_list(self, midi_file):
+        message_type_to_midi_message_list = {}
+        for track in midi_file.tracks:
+            tick = 0
+            for message in track:
+                tick += message.time
+                match message.type:
+                    case "note_on" | "note_off":
+                        parsed_message = midi_converters.NoteMessage(
+                            message.type,
+                            tick,
+                            message.channel,
+                            message.note,
+                            message.velocity,
+                        )
+                    case "pitchwheel":
+                        parsed_message = midi_converters.PitchwheelMessage(
+                            message.type, tick, message.channel, message.pitch
+                        )
+                    case "control_change":
+                        parsed_message = midi_converters.ControlChangeMessage(
+                            message.type,
+                            tick,
+                            message.channel,
+                            message.control,
+                            message.value,
+                        )
+                    case "set_tempo":
+                        parsed_message = midi_converters.SetTempoMessage(
+                            message.type, tick, message.tempo
+                        )
+                    case _:
+                        continue
+                message_type_to_midi_message_list.setdefault(message.type, []).append(
+                    parsed_message
+                )
+        for midi_message_list in message_type_to_midi_message_list.values():
+            midi_message_list.sort(key=lambda message: message.time)
+        return message_type_to_midi_message_list
+
+    def test_convert(self):
+        """Parsed messages must equal the messages decoded by mido"""
+        for midi_file_data in (
+            self.midi_file_bytes,
+            bytearray(self.midi_file_bytes),
+            memoryview(self.midi_file_bytes),
+        ):
+            parsed_midi_file = self.parser.convert(midi_file_data)
+            self.assertEqual(parsed_midi_file.midi_file_type, 1)
+            self.assertEqual(parsed_midi_file.ticks_per_beat, 960)
+            self.assertEqual(parsed_midi_file.track_count, 3)
+            self.assertEqual(
+                parsed_midi_file.message_type_to_midi_message_list,
+                self._get_expected_message_type_to_midi_message_list(
+                    mido.MidiFile(file=io.BytesIO(self.midi_file_bytes))
+                ),
+            )
+
+    def test_convert_without_running_status(self):
+        """Files which don't use running status are parsed correctly"""
+        data = bytearray(b"MThd" + struct.pack(">Lhhh", 6, 0, 1, 480))
+        track_data = bytes(
+            [0, 0x90, 60, 100, 10, 0x90, 62, 100, 10, 0x80, 60, 0, 0, 0xFF, 0x2F, 0]
+        )
+        data.extend(b"MTrk" + struct.pack(">L", len(track_data)) + track_data)
+        self.assertEqual(
+            self.parser.convert(data).message_type_to_midi_message_list,
+            {
+                "note_on": [
+                    midi_converters.NoteMessage("note_on", 0, 0, 60, 100),
+                    midi_converters.NoteMessage("note_on", 10, 0, 62, 100),
+                ],
+                "note_off": [midi_converters.NoteMessage("note_off", 20, 0, 60, 0)],
+            },
+        )
+
+    def test_convert_with_system_messages(self):
+        """System common and real time messages are skipped"""
+        data = bytearray(b"MThd" + struct.pack(">Lhhh", 6, 0, 1, 480))
+        track_data = bytes(
+            [0, 0xF9, 0, 0xFA, 0, 0xFB, 0, 0xF2, 1, 2, 0, 0x90, 60, 100]
+            + [0, 0xFF, 0x2F, 0]
+        )
+        data.extend(b"MTrk" + struct.pack(">L", len(track_data)) + track_data)
+        self.assertEqual(
+            self.parser.convert(data).message_type_to_midi_message_list,
+            {"note_on": [midi_converters.NoteMessage("note_on", 0, 0, 60, 100)]},
+        )
+
+    def test_iter_track_events(self):
+        track_data = bytes(
+            [0, 0x90, 60, 100, 0x81, 0x00, 62, 0, 0, 0xF0, 2, 1, 0xF7]
+            + [10, 0xFF, 0x51, 3, 7, 161, 32, 0, 0xFF, 0x2F, 0]
+        )
+        self.assertEqual(
+            list(
+                midi_converters.MidiFileParser.iter_track_events(
+                    memoryview(track_data), 0, len(track_data)
+                )
+            ),
+            [
+                (0, 0x90, 2, 4),
+                (128, 0x90, 6, 8),
+                (128, 0xF0, 11, 13),
+                (138, 0x151, 17, 20),
+                (138, 0x12F, 24, 24),
+            ],
+        )
+
+    def test_convert_with_unknown_chunk(self):
+        """Unknown chunks are skipped"""
+        header_size = 14
+        data = (
+            self.midi_file_bytes[:header_size]
+            + b"XFIH"
+            + struct.pack(">L", 3)
+            + b"abc"
+            + self.midi_file_bytes[header_size:]
+        )
+        self.assertEqual(
+            self.parser.convert(data), self.parser.convert(self.midi_file_bytes)
+        )
+
+    def _get_note_midi_file_bytes(self, *message_list, ticks_per_beat=480):
+        return midi_converters.MidiFileToBytes().convert(
+            mido.MidiFile(
+                tracks=[mido.MidiTrack(message_list)], ticks_per_beat=ticks_per_beat
+            )
+        )
+
+    def test_convert_with_track_channel_and_message_type_filter(self):
+        expected_message_type_to_midi_message_list = {
+            message_type: [
+                message
+                for message in midi_message_list
+                if getattr(message, "channel", 0) in (0, 3)
+            ]
+            for message_type, midi_message_list in self._get_expected_message_type_to_midi_message_list(
+                mido.MidiFile(tracks=self.midi_file.tracks[1:])
+            ).items()
+        }
+        del expected_message_type_to_midi_message_list["pitchwheel"]
+        parsed_midi_file = midi_converters.MidiFileParser(
+            track_index_tuple=(1, 2),
+            midi_channel_tuple=(0, 3),
+            message_type_tuple=("note_on", "note_off", "control_change", "set_tempo"),
+        ).convert(self.midi_file_bytes)
+        self.assertEqual(parsed_midi_file.track_count, 3)
+        self.assertEqual(
+            parsed_midi_file.message_type_to_midi_message_list,
+            expected_message_type_to_midi_message_list,
+        )
+
+    def test_convert_with_tick_range(self):
+        midi_file_bytes = self._get_note_midi_file_bytes(
+            # Started before the range: omitted
+            mido.Message("note_on", note=60, time=0),
+            mido.Message("pitchwheel", pitch=100, time=5),
+            mido.Message("note_on", note=62, time=5),
+            mido.Message("note_off", note=60, time=10),
+            # Note on with velocity 0 is a note off
+            mido.Message("note_on", note=62, velocity=0, time=10),
+            mido.Message("note_on", note=64, time=10),
+            mido.Message("pitchwheel", pitch=200, time=10),
+            # Note off after the range: kept
+            mido.Message("note_off", note=64, time=10),
+            mido.Message("note_on", note=65, time=0),
+            mido.Message("note_off", note=65, time=10),
+        )
+        parsed_midi_file = midi_converters.MidiFileParser(tick_range=(10, 45)).convert(
+            midi_file_bytes
+        )
+        self.assertEqual(
+            parsed_midi_file.message_type_to_midi_message_list,
+            {
+                "note_on": [
+                    midi_converters.NoteMessage("note_on", 10, 0, 62, 64),
+                    midi_converters.NoteMessage("note_on", 30, 0, 62, 0),
+                    midi_converters.NoteMessage("note_on", 40, 0, 64, 64),
+                ],
+                "note_off": [midi_converters.NoteMessage("note_off", 60, 0, 64, 64)],
+                # Pitch bending before the range: moved to its start
+                "pitchwheel": [
+                    midi_converters.PitchwheelMessage("pitchwheel", 10, 0, 100)
+                ],
+            },
+        )
+
+    def test_convert_with_tick_range_pairs_notes(self):
+        """Notes in a tick range are paired like in the complete file"""
+        r = random.Random(3)
+        message_list = [
+            mido.Message(
+                r.choice(("note_on", "note_on", "note_off")),
+                channel=r.randint(0, 1),
+                note=r.randint(44, 46),
+                velocity=r.choice((0, 64, 64)),
+                time=r.choice((0, 0, 1, 5, 20)),
+            )
+            for _ in range(1000)
+        ]
+        midi_file_bytes = self._get_note_midi_file_bytes(
+            *message_list, ticks_per_beat=10
+        )
+        seek_index = midi_converters.MidiFileIndexer(1).convert(midi_file_bytes)
+        get_note_pair_tuple = midi_converters.MidiFileToEvent()._get_note_pair_tuple
+        note_pair_tuple = get_note_pair_tuple(
+            self.parser.convert(midi_file_bytes).message_type_to_midi_message_list
+        )
+        last_tick = sum(message.time for message in message_list)
+        for _ in range(50):
+            start_tick = r.randint(0, last_tick)
+            tick_range = (start_tick, r.randint(start_tick + 1, last_tick + 1))
+            expected_note_pair_tuple = tuple(
+                note_pair
+                for note_pair in note_pair_tuple
+                if tick_range[0] <= note_pair[0].time < tick_range[1]
+            )
+            # Notes which are sounding at a checkpoint are restored
+            for used_seek_index in (None, seek_index):
+                self.assertEqual(
+                    get_note_pair_tuple(
+                        midi_converters.MidiFileParser(
+                            tick_range=tick_range, seek_index=used_seek_index
+                        )
+                        .convert(midi_file_bytes)
+                        .message_type_to_midi_message_list
+                    ),
+                    expected_note_pair_tuple,
+                )
+
+    def test_convert_with_tick_range_and_state(self):
+        """Pitch bending, controllers and tempo at the start of the range are kept"""
+        midi_file_bytes = midi_converters.MidiFileToBytes().convert(
+            mido.MidiFile(
+                tracks=[
+                    mido.MidiTrack(
+                        [
+                            mido.MetaMessage("set_tempo", tempo=400000),
+                            mido.Message("control_change", control=7, value=1),
+                            mido.Message("control_change", control=7, value=2, time=5),
+                            mido.Message("control_change", control=1, value=3),
+                            mido.Message("pitchwheel", pitch=-1, time=2),
+                            mido.Message("pitchwheel", channel=1, pitch=-2, time=10),
+                            # Pitch bending of a note at the start of the range
+                            mido.Message("pitchwheel", channel=2, pitch=-3, time=2),
+                            mido.Message("note_on", channel=2, note=60, time=1),
+                            mido.Message("pitchwheel", channel=2, pitch=5, time=20),
+                            mido.MetaMessage("set_tempo", tempo=300000),
+                            # One tick before the end of the range: only kept
+                            # if a note of its channel starts at this tick
+                            mido.Message("pitchwheel", pitch=6, time=19),
+                            mido.Message("pitchwheel", channel=1, pitch=7),
+                            mido.Message("note_on", channel=1, note=60),
+                            mido.Message("note_off", channel=2, note=60, time=1),
+                            mido.Message("note_off", channel=1, note=60),
+                        ]
+                    ),
+                    mido.MidiTrack(
+                        [
+                            # The latest messages of all tracks are kept
+                            mido.Message("pitchwheel", pitch=-4, time=10),
+                            mido.Message("pitchwheel", channel=1, pitch=-5, time=5),
+                            mido.MetaMessage("set_tempo", tempo=600000),
+                        ]
+                    ),
+                ],
+                ticks_per_beat=10,
+            )
+        )
+        parsed_midi_file = midi_converters.MidiFileParser(tick_range=(20, 60)).convert(
+            midi_file_bytes
+        )
+        message_type_to_midi_message_list = (
+            parsed_midi_file.message_type_to_midi_message_list
+        )
+        self.assertEqual(
+            message_type_to_midi_message_list["pitchwheel"],
+            [
+                midi_converters.PitchwheelMessage("pitchwheel", 20, 0, -4),
+                midi_converters.PitchwheelMessage("pitchwheel", 20, 1, -2),
+                midi_converters.PitchwheelMessage("pitchwheel", 20, 2, -3),
+                midi_converters.PitchwheelMessage("pitchwheel", 40, 2, 5),
+                midi_converters.PitchwheelMessage("pitchwheel", 59, 1, 7),
+            ],
+        )
+        self.assertEqual(
+            message_type_to_midi_message_list["control_change"],
+            [
+                midi_converters.ControlChangeMessage("control_change", 20, 0, 1, 3),
+                midi_converters.ControlChangeMessage("control_change", 20, 0, 7, 2),
+            ],
+        )
+        self.assertEqual(
+            message_type_to_midi_message_list["set_tempo"],
+            [
+                midi_converters.SetTempoMessage("set_tempo", 20, 600000),
+                midi_converters.SetTempoMessage("set_tempo", 40, 300000),
+            ],
+        )
+        self.assertEqual(
+            midi_converters.MidiFileParser(
+                tick_range=(20, 60),
+                seek_index=midi_converters.MidiFileIndexer(1).convert(midi_file_bytes),
+            ).convert(midi_file_bytes),
+            parsed_midi_file,
+        )
+        self.assertEqual(
+            midi_converters.MidiFileParser(tick_range=(20, 60), midi_channel_tuple=(1,))
+            .convert(midi_file_bytes)
+            .message_type_to_midi_message_list["pitchwheel"],
+            message_type_to_midi_message_list["pitchwheel"][1::3],
+        )
+
+    def test_convert_with_tick_range_stops_early(self):
+        """Tracks are skipped after the end of the range"""
+        midi_file_bytes = bytearray(
+            self._get_note_midi_file_bytes(
+                mido.Message("note_on", note=60, time=0),
+                mido.Message("note_off", note=60, time=10),
+                mido.Message("note_on", note=60, time=100),
+                mido.Message("note_off", note=60, time=10),
+            )
+        )
+        # Replace the second 'note_on' status byte with an invalid
+        # running status byte.
+        midi_file_bytes[midi_file_bytes.index(b"\x64\x90") + 1] = 0xF9
+        self.assertEqual(
+            len(
+                midi_converters.MidiFileParser(tick_range=(0, 50))
+                .convert(midi_file_bytes)
+                .message_type_to_midi_message_list["note_on"]
+            ),
+            1,
+        )
+
+    def test_convert_with_seconds_range(self):
+        # 480 ticks per beat, tempo 500000 => 960 ticks per second
+        midi_file_bytes = self._get_note_midi_file_bytes(
+            mido.Message("note_on", note=60, time=0),
+            mido.Message("note_off", note=60, time=960),
+            mido.MetaMessage("set_tempo", tempo=250000),
+            # 1920 ticks per second
+            mido.Message("note_on", note=62, time=960),
+            mido.Message("note_off", note=62, time=960),
+            mido.Message("note_on", note=64, time=0),
+            mido.Message("note_off", note=64, time=960),
+        )
+        for seconds_range, expected_note_tuple in (
+            ((0, 1), (60,)),
+            ((0.5, 1.6), (62,)),
+            ((1.5, 2.5), (62, 64)),
+            ((1.6, 2.5), (64,)),
+            ((10, 20), ()),
+        ):
+            parsed_midi_file = midi_converters.MidiFileParser(
+                seconds_range=seconds_range
+            ).convert(midi_file_bytes)
+            self.assertEqual(
+                tuple(
+                    message.note
+                    for message in parsed_midi_file.message_type_to_midi_message_list.get(
+                        "note_on", []
+                    )
+                ),
+                expected_note_tuple,
+            )
+
+    def test_invalid_filter(self):
+        self.assertRaises(
+            ValueError,
+            midi_converters.MidiFileParser,
+            tick_range=(0, 1),
+            seconds_range=(0, 1),
+        )
+        self.assertRaises(
+            ValueError, midi_converters.MidiFileParser, message_type_tuple=("sysex",)
+        )
+
+    def test_convert_invalid_midi_file(self):
+        self.assertRaises(ValueError, self.parser.convert, b"MTrk")
+        self.assertRaises(ValueError, self.parser.convert, self.midi_file_bytes[:-10])
+        header = b"MThd" + struct.pack(">Lhhh", 6, 0, 1, 480)
+        # Running status without any status
+        track_data = bytes([0, 60, 100])
+        self.assertRaises(
+            ValueError,
+            self.parser.convert,
+            header + b"MTrk" + struct.pack(">L", len(track_data)) + track_data,
+        )
+        # Message exceeds end of track
+        track_data = bytes([0, 0x90, 60])
+        self.assertRaises(
+            ValueError,
+            self.parser.convert,
+            header + b"MTrk" + struct.pack(">L", len(track_data)) + track_data,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,272 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+import mido
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mutwo import midi_converters
+
+
+@unittest.skipIf(numpy is None, "numpy isn't installed")
+class MidiFileToPianoRollTest(unittest.TestCase):
+    def setUp(self):
+        # Two repeated notes (note 60), a chord, overlapping notes (note 67)
+        # and a very short note (note 72) at 480 ticks per beat.
+        self.midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.Message("note_on", note=60, velocity=100, time=0),
+                        mido.Message("note_off", note=60, time=480),
+                        mido.Message("note_on", note=60, velocity=50, time=0),
+                        mido.Message("note_on", note=64, velocity=80, time=0),
+                        mido.Message("note_off", note=60, time=240),
+                        mido.Message("note_off", note=64, time=0),
+                    ]
+                ),
+                mido.MidiTrack(
+                    [
+                        mido.Message("note_on", channel=1, note=67, velocity=20),
+                        mido.Message(
+                            "note_on", channel=2, note=67, velocity=90, time=240
+                        ),
+                        mido.Message("note_off", channel=1, note=67, time=240),
+                        mido.Message("note_off", channel=2, note=67, time=0),
+                        mido.Message("note_on", note=72, velocity=1, time=0),
+                        mido.Message("note_off", note=72, time=10),
+                    ]
+                ),
+            ],
+            ticks_per_beat=480,
+        )
+
+    def test_convert(self):
+        piano_roll = midi_converters.MidiFileToPianoRoll(4).convert(self.midi_file)
+        self.assertEqual(piano_roll.steps_per_beat, 4)
+        self.assertIsNone(piano_roll.onset_matrix)
+        matrix = piano_roll.matrix
+        self.assertEqual(matrix.shape, (128, 6))
+        self.assertEqual(matrix.dtype, numpy.uint8)
+        self.assertEqual(matrix[60].tolist(), [100] * 4 + [50] * 2)
+        self.assertEqual(matrix[64].tolist(), [0] * 4 + [80] * 2)
+        self.assertEqual(matrix[67].tolist(), [20] * 2 + [90] * 2 + [0] * 2)
+        # Short notes last at least one step
+        self.assertEqual(matrix[72].tolist(), [0] * 4 + [1] + [0])
+        self.assertEqual(int(numpy.count_nonzero(matrix)), 13)
+
+    def test_convert_with_resolution(self):
+        piano_roll = midi_converters.MidiFileToPianoRoll(1).convert(self.midi_file)
+        self.assertEqual(piano_roll.matrix[60].tolist(), [100, 50])
+        self.assertEqual(piano_roll.matrix[64].tolist(), [0, 80])
+        piano_roll = midi_converters.MidiFileToPianoRoll(480).convert(self.midi_file)
+        self.assertEqual(piano_roll.matrix.shape, (128, 720))
+        self.assertEqual(int(numpy.count_nonzero(piano_roll.matrix[72])), 10)
+
+    def test_convert_with_velocity_encoding(self):
+        velocity_matrix = (
+            midi_converters.MidiFileToPianoRoll().convert(self.midi_file).matrix
+        )
+        matrix = (
+            midi_converters.MidiFileToPianoRoll(velocity_encoding="normalized")
+            .convert(self.midi_file)
+            .matrix
+        )
+        self.assertEqual(matrix.dtype, numpy.float32)
+        self.assertTrue(numpy.allclose(matrix * 127, velocity_matrix))
+        matrix = (
+            midi_converters.MidiFileToPianoRoll(velocity_encoding="binary")
+            .convert(self.midi_file)
+            .matrix
+        )
+        self.assertEqual(matrix.dtype, bool)
+        self.assertTrue(numpy.array_equal(matrix, velocity_matrix != 0))
+
+    def test_convert_with_onset_matrix(self):
+        onset_matrix = (
+            midi_converters.MidiFileToPianoRoll(is_onset_matrix_included=True)
+            .convert(self.midi_file)
+            .onset_matrix
+        )
+        self.assertEqual(onset_matrix.dtype, bool)
+        self.assertEqual(
+            sorted(zip(*map(numpy.ndarray.tolist, numpy.nonzero(onset_matrix)))),
+            [(60, 0), (60, 4), (64, 4), (67, 0), (67, 2), (72, 4)],
+        )
+
+    def test_convert_empty_midi_file(self):
+        piano_roll = midi_converters.MidiFileToPianoRoll(
+            is_onset_matrix_included=True
+        ).convert(mido.MidiFile(tracks=[mido.MidiTrack()]))
+        self.assertEqual(piano_roll.matrix.shape, (128, 0))
+        self.assertEqual(piano_roll.onset_matrix.shape, (128, 0))
+
+    def test_invalid_argument(self):
+        for keyword_argument_dict in (
+            {"steps_per_beat": 0},
+            {"velocity_encoding": "loudness"},
+        ):
+            self.assertRaises(
+                ValueError,
+                midi_converters.MidiFileToPianoRoll,
+                **keyword_argument_dict,
+            )
+
+
+@unittest.skipIf(numpy is None, "numpy isn't installed")
+class PianoRollToMidiFileTest(unittest.TestCase):
+    def setUp(self):
+        self.converter = midi_converters.PianoRollToMidiFile()
+
+    @staticmethod
+    def _get_random_piano_roll(seed: int) -> midi_converters.PianoRoll:
+        r = random.Random(seed)
+        matrix = numpy.zeros((128, 64), dtype=numpy.uint8)
+        onset_matrix = numpy.zeros((128, 64), dtype=bool)
+        for _ in range(50):
+            pitch = r.randint(40, 80)
+            start = r.randrange(64)
+            stop = min(start + r.randint(1, 8), 64)
+            # Notes don't overlap, but they can be repeated
+            if matrix[pitch, start:stop].any():
+                continue
+            matrix[pitch, start:stop] = r.randint(1, 127)
+            onset_matrix[pitch, start] = True
+        return midi_converters.PianoRoll(matrix, 4, onset_matrix)
+
+    def test_convert(self):
+        matrix = numpy.zeros((128, 8), dtype=numpy.uint8)
+        matrix[60, 0:4] = 100
+        # Velocity changes start new notes
+        matrix[60, 4:6] = 50
+        matrix[64, 6:8] = 1
+        midi_file = self.converter.convert(midi_converters.PianoRoll(matrix, 2))
+        self.assertEqual(midi_file.type, 0)
+        self.assertEqual(midi_file.ticks_per_beat, 480)
+        self.assertEqual(
+            [
+                (message.type, message.note, message.velocity, message.time)
+                for message in midi_file.tracks[0]
+                if not message.is_meta
+            ],
+            [
+                ("note_on", 60, 100, 0),
+                ("note_off", 60, 0, 960),
+                ("note_on", 60, 50, 0),
+                ("note_off", 60, 0, 480),
+                ("note_on", 64, 1, 0),
+                ("note_off", 64, 0, 480),
+            ],
+        )
+        self.assertEqual(midi_file.tracks[0][-1].type, "end_of_track")
+
+    def test_convert_with_ticks_per_beat_smaller_than_steps_per_beat(self):
+        """Notes which are shorter than one tick last one tick"""
+        matrix = numpy.zeros((128, 4), dtype=bool)
+        matrix[60, 2] = True
+        matrix[62, 0:4] = True
+        midi_file = midi_converters.PianoRollToMidiFile(ticks_per_beat=1).convert(
+            midi_converters.PianoRoll(matrix, 4)
+        )
+        self.assertEqual(
+            [
+                (message.type, message.note, message.time)
+                for message in midi_file.tracks[0]
+                if not message.is_meta
+            ],
+            [
+                ("note_on", 62, 0),
+                ("note_off", 62, 1),
+                ("note_on", 60, 0),
+                ("note_off", 60, 1),
+            ],
+        )
+
+    def test_convert_with_onset_matrix(self):
+        matrix = numpy.zeros((128, 4), dtype=bool)
+        matrix[60] = True
+        onset_matrix = numpy.zeros((128, 4), dtype=bool)
+        onset_matrix[60, (0, 2)] = True
+        for piano_roll, expected_note_count in (
+            (midi_converters.PianoRoll(matrix, 4), 1),
+            (midi_converters.PianoRoll(matrix, 4, onset_matrix), 2),
+        ):
+            midi_file = midi_converters.PianoRollToMidiFile(velocity=30).convert(
+                piano_roll
+            )
+            note_on_list = [
+                message for message in midi_file.tracks[0] if message.type == "note_on"
+            ]
+            self.assertEqual(len(note_on_list), expected_note_count)
+            self.assertEqual({message.velocity for message in note_on_list}, {30})
+
+    def test_convert_normalized_matrix(self):
+        matrix = numpy.zeros((128, 2), dtype=numpy.float32)
+        matrix[60, 0] = 0.5
+        matrix[61, 1] = 0.001
+        midi_file = self.converter.convert(midi_converters.PianoRoll(matrix, 4))
+        self.assertEqual(
+            [
+                (message.note, message.velocity)
+                for message in midi_file.tracks[0]
+                if message.type == "note_on"
+            ],
+            [(60, 64), (61, 1)],
+        )
+
+    def test_convert_to_path(self):
+        piano_roll = self._get_random_piano_roll(0)
+        midi_file = self.converter.convert(piano_roll)
+        midi_file_bytes = midi_converters.MidiFileToBytes().convert(midi_file)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "piano_roll.mid")
+            self.converter.convert(piano_roll, path)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), midi_file_bytes)
+        buffer = io.BytesIO()
+        self.assertEqual(
+            self.converter.convert(piano_roll, buffer), len(midi_file_bytes)
+        )
+        self.assertEqual(buffer.getvalue(), midi_file_bytes)
+
+    def test_round_trip(self):
+        midi_file_to_piano_roll = midi_converters.MidiFileToPianoRoll(
+            4, is_onset_matrix_included=True
+        )
+        for seed in range(5):
+            piano_roll = self._get_random_piano_roll(seed)
+            converted_piano_roll = midi_file_to_piano_roll.convert(
+                midi_converters.MidiFileToBytes().convert(
+                    self.converter.convert(piano_roll)
+                )
+            )
+            step_count = converted_piano_roll.matrix.shape[1]
+            self.assertTrue(
+                numpy.array_equal(
+                    converted_piano_roll.matrix, piano_roll.matrix[:, :step_count]
+                )
+            )
+            self.assertTrue(
+                numpy.array_equal(
+                    converted_piano_roll.onset_matrix,
+                    piano_roll.onset_matrix[:, :step_count],
+                )
+            )
+            self.assertFalse(piano_roll.matrix[:, step_count:].any())
+
+    def test_invalid_shape(self):
+        self.assertRaises(
+            ValueError,
+            self.converter.convert,
+            midi_converters.PianoRoll(numpy.zeros((12, 4), dtype=bool), 4),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
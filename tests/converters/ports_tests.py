@@ -0,0 +1,357 @@
+import random
+import time
+import unittest
+
+import mido
+
+from mutwo import core_events
+from mutwo import core_parameters
+from mutwo import midi_converters
+from mutwo import music_events
+
+
+class FakeClock(object):
+    """Clock which only advances when it is read or when someone sleeps"""
+
+    def __init__(self, tick_in_seconds: float = 0.0001):
+        self.time = 0.0
+        self.tick_in_seconds = tick_in_seconds
+
+    def __call__(self) -> float:
+        self.time += self.tick_in_seconds
+        return self.time
+
+    def sleep(self, duration_in_seconds: float):
+        self.time += duration_in_seconds
+
+
+class FakeOutputPort(object):
+    """Output port which records each message with the time it was sent"""
+
+    def __init__(self, clock, interrupt_after_message_count=None):
+        self.clock = clock
+        self.interrupt_after_message_count = interrupt_after_message_count
+        self.sent_message_list = []
+
+    def send(self, message: mido.Message):
+        self.sent_message_list.append((self.clock(), message))
+        if len(self.sent_message_list) == self.interrupt_after_message_count:
+            raise KeyboardInterrupt()
+
+
+class EventToMidiOutputTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.event_to_midi_file = midi_converters.EventToMidiFile(
+            tempo=core_parameters.FlexTempo([[0, 60], [2, 60], [2, 120]])
+        )
+        self.converter = midi_converters.EventToMidiOutput(
+            self.event_to_midi_file,
+            lookahead_in_seconds=0.5,
+            busy_wait_in_seconds=0.001,
+            clock=self.clock,
+            sleep=self.clock.sleep,
+        )
+        self.event = core_events.Concurrence(
+            [
+                core_events.Consecution(
+                    [
+                        music_events.NoteLike(pitch, 1)
+                        for pitch in ("c", "5/4", "d", "e")
+                    ]
+                ),
+                core_events.Consecution(
+                    [music_events.NoteLike([], 1), music_events.NoteLike("g", 2)]
+                ),
+            ]
+        )
+
+    def test_convert(self):
+        output_port = FakeOutputPort(self.clock)
+        playback_metrics = self.converter.convert(self.event, output_port)
+        sent_message_list = [message for _, message in output_port.sent_message_list]
+        # The same messages as in the midi file are sent (in the same order)
+        self.assertEqual(
+            sent_message_list,
+            [
+                message
+                for message in mido.merge_tracks(
+                    self.event_to_midi_file.convert(self.event).tracks
+                )
+                if not message.is_meta
+            ],
+        )
+        # The first two beats are played at 60 BPM, the rest at 120 BPM
+        self.assertEqual(
+            sorted(
+                (round(time, 2), message.note)
+                for time, message in output_port.sent_message_list
+                if message.type == "note_on"
+            ),
+            [(0, 60), (1, 67), (1, 73), (2, 62), (2.5, 64)],
+        )
+        self.assertEqual(playback_metrics.message_count, len(sent_message_list))
+        self.assertGreaterEqual(playback_metrics.mean_latency_in_seconds, 0)
+        # Each reading of the fake clock takes 0.1 ms
+        self.assertLess(playback_metrics.max_latency_in_seconds, 0.01)
+        self.assertLess(playback_metrics.jitter_in_seconds, 0.01)
+        self.assertAlmostEqual(playback_metrics.duration_in_seconds, 3, places=2)
+
+    def test_convert_with_render_range(self):
+        output_port = FakeOutputPort(self.clock)
+        self.converter.convert(self.event, output_port, render_range=(2, 3))
+        self.assertEqual(
+            sorted(
+                message.note
+                for _, message in output_port.sent_message_list
+                if message.type == "note_on"
+            ),
+            [62, 67],
+        )
+
+    def test_convert_with_late_messages(self):
+        """Messages which are too late are sent at once and measured"""
+
+        clock = FakeClock()
+
+        class SlowOutputPort(FakeOutputPort):
+            def send(self, message):
+                super().send(message)
+                clock.time += 0.1
+
+        output_port = SlowOutputPort(clock)
+        playback_metrics = midi_converters.EventToMidiOutput(
+            self.event_to_midi_file, clock=clock, sleep=clock.sleep
+        ).convert(self.event, output_port)
+        self.assertGreater(playback_metrics.max_latency_in_seconds, 0.1)
+        self.assertGreater(playback_metrics.jitter_in_seconds, 0)
+        self.assertEqual(
+            len(output_port.sent_message_list), playback_metrics.message_count
+        )
+
+    def test_convert_interrupted(self):
+        """Sounding notes are stopped if the playback is interrupted"""
+        output_port = FakeOutputPort(self.clock)
+        self.converter.convert(self.event, output_port)
+        note_on_index = [
+            message.type == "note_on" and message.note == 67
+            for _, message in output_port.sent_message_list
+        ].index(True)
+        output_port = FakeOutputPort(
+            self.clock, interrupt_after_message_count=note_on_index + 1
+        )
+        self.assertRaises(
+            KeyboardInterrupt, self.converter.convert, self.event, output_port
+        )
+        message_list = [message for _, message in output_port.sent_message_list]
+        self.assertEqual(message_list[note_on_index].note, 67)
+        active_note_set = set()
+        for message in message_list:
+            key = (message.channel, getattr(message, "note", None))
+            if message.type == "note_on" and message.velocity:
+                active_note_set.add(key)
+            elif message.type in ("note_on", "note_off"):
+                active_note_set.remove(key)
+        self.assertFalse(active_note_set)
+        self.assertEqual(
+            [message.type for message in message_list[note_on_index + 1 :]],
+            ["note_off", "note_off"],
+        )
+
+    def test_convert_with_real_clock(self):
+        output_port = FakeOutputPort(time.monotonic)
+        playback_metrics = midi_converters.EventToMidiOutput(
+            midi_converters.EventToMidiFile(tempo=core_parameters.DirectTempo(1200))
+        ).convert(
+            core_events.Consecution(
+                [music_events.NoteLike(pitch, 0.25) for pitch in "cdef"]
+            ),
+            output_port,
+        )
+        self.assertEqual(
+            playback_metrics.message_count, len(output_port.sent_message_list)
+        )
+        time_list = [time for time, _ in output_port.sent_message_list]
+        self.assertEqual(time_list, sorted(time_list))
+        self.assertGreaterEqual(time_list[-1] - time_list[0], 0.045)
+        self.assertGreaterEqual(playback_metrics.duration_in_seconds, 0.05)
+
+    def test_invalid_argument(self):
+        self.assertRaises(
+            ValueError, midi_converters.EventToMidiOutput, lookahead_in_seconds=-1
+        )
+
+
+class FakeInputPort(object):
+    """Input port which yields messages at the given times of a fake clock"""
+
+    def __init__(self, clock, timed_message_list):
+        self.clock = clock
+        self.timed_message_list = timed_message_list
+
+    def __iter__(self):
+        for absolute_time_in_seconds, message in self.timed_message_list:
+            self.clock.time = absolute_time_in_seconds
+            yield message
+
+
+class MidiInputToEventTest(unittest.TestCase):
+    def setUp(self):
+        self.converter = midi_converters.MidiInputToEvent()
+
+    def _get_timed_message_list(self, seed: int) -> list[tuple[float, mido.Message]]:
+        """Random notes (with chords and repeated notes) at 960 ticks per second"""
+        r = random.Random(seed)
+        tick_and_message_list = []
+        tick = 0
+        for _ in range(100):
+            tick += r.choice((0, 0, 120, 240, 480))
+            duration = r.choice((1, 120, 240, 480, 960))
+            channel = r.randint(0, 1)
+            velocity = r.randint(1, 127)
+            for note in r.sample(range(60, 66), r.choice((1, 1, 2, 3))):
+                tick_and_message_list.extend(
+                    (
+                        (
+                            tick,
+                            mido.Message(
+                                "note_on", channel=channel, note=note, velocity=velocity
+                            ),
+                        ),
+                        (
+                            tick + duration,
+                            mido.Message("note_off", channel=channel, note=note),
+                        ),
+                    )
+                )
+        # Stable sort: at the same time, note off messages come first
+        tick_and_message_list.sort(
+            key=lambda item: (item[0], item[1].type == "note_on")
+        )
+        return [(tick / 960, message) for tick, message in tick_and_message_list]
+
+    @staticmethod
+    def _timed_message_list_to_midi_file(timed_message_list) -> mido.MidiFile:
+        track = mido.MidiTrack()
+        previous_tick = 0
+        for absolute_time_in_seconds, message in timed_message_list:
+            tick = round(absolute_time_in_seconds * 960)
+            track.append(message.copy(time=tick - previous_tick))
+            previous_tick = tick
+        return mido.MidiFile(tracks=[track], ticks_per_beat=480)
+
+    def test_convert(self):
+        """Recording gives the same event as converting a midi file"""
+        for seed in range(3):
+            timed_message_list = self._get_timed_message_list(seed)
+            self.assertEqual(
+                self.converter.convert(timed_message_list),
+                midi_converters.MidiFileToEvent().convert(
+                    self._timed_message_list_to_midi_file(timed_message_list)
+                ),
+            )
+
+    def test_convert_notes_without_duration(self):
+        """Notes without duration at the same time are one chord"""
+        timed_message_list = [
+            (0, mido.Message("note_on", note=60)),
+            (0, mido.Message("note_off", note=60)),
+            (0, mido.Message("note_on", note=61)),
+            (0, mido.Message("note_off", note=61)),
+            (0.5, mido.Message("note_on", note=62)),
+            (0.5, mido.Message("note_off", note=62)),
+            (1, mido.Message("note_on", note=63)),
+            (1.5, mido.Message("note_off", note=63)),
+        ]
+        concurrence = self.converter.convert(timed_message_list)
+        self.assertEqual(
+            concurrence,
+            midi_converters.MidiFileToEvent().convert(
+                self._timed_message_list_to_midi_file(timed_message_list)
+            ),
+        )
+        self.assertEqual(len(concurrence[0][0].pitch_list), 2)
+
+    def test_convert_input_port(self):
+        clock = FakeClock()
+        timed_message_list = self._get_timed_message_list(10)
+        # The recording starts with the first message
+        input_port = FakeInputPort(
+            clock,
+            [(time + 100, message) for time, message in timed_message_list],
+        )
+        first_time = timed_message_list[0][0]
+        self.assertEqual(
+            midi_converters.MidiInputToEvent(clock=clock).convert(input_port),
+            self.converter.convert(
+                [(time - first_time, message) for time, message in timed_message_list]
+            ),
+        )
+
+    def test_convert_note_on_with_velocity_zero(self):
+        self.assertEqual(
+            self.converter.convert(
+                [
+                    (0, mido.Message("note_on", note=60)),
+                    (0, mido.Message("control_change", control=64, value=127)),
+                    (0.5, mido.Message("note_on", note=60, velocity=0)),
+                ]
+            ),
+            self.converter.convert(
+                [
+                    (0, mido.Message("note_on", note=60)),
+                    (0.5, mido.Message("note_off", note=60)),
+                ]
+            ),
+        )
+
+    def test_snapshot(self):
+        self.converter.reset()
+        for absolute_time_in_seconds, message in (
+            (0, mido.Message("note_on", note=60)),
+            (0.5, mido.Message("note_on", note=62)),
+            (1, mido.Message("note_off", note=62)),
+        ):
+            self.converter.add_message(message, absolute_time_in_seconds)
+        # The second note can't be added yet, because the first note is
+        # still sounding.
+        self.assertEqual(self.converter.snapshot(), core_events.Concurrence([]))
+        self.converter.add_message(mido.Message("note_off", note=60), 1.5)
+        snapshot = self.converter.snapshot()
+        self.assertEqual(
+            [
+                [
+                    (
+                        chronon.duration,
+                        [
+                            round(pitch.midi_pitch_number)
+                            for pitch in getattr(chronon, "pitch_list", [])
+                        ],
+                    )
+                    for chronon in consecution
+                ]
+                for consecution in snapshot
+            ],
+            [[(3, [60])], [(1, []), (1, [62])]],
+        )
+        # Snapshots are copies
+        snapshot[0].append(core_events.Chronon(1))
+        self.assertNotEqual(self.converter.snapshot(), snapshot)
+
+    def test_finish_with_sounding_note(self):
+        """Notes without note off are ignored, but don't block other notes"""
+        self.converter.reset()
+        for absolute_time_in_seconds, message in (
+            (0, mido.Message("note_on", note=60)),
+            (0.5, mido.Message("note_on", note=62)),
+            (1, mido.Message("note_off", note=62)),
+            (1, mido.Message("note_off", note=64)),
+        ):
+            self.converter.add_message(message, absolute_time_in_seconds)
+        concurrence = self.converter.finish()
+        self.assertEqual(len(concurrence), 1)
+        self.assertEqual(round(concurrence[0][1].pitch_list[0].midi_pitch_number), 62)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+import json
+import os
+import struct
+import tempfile
+import unittest
+
+import mido
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mutwo import core_events
+from mutwo import midi_converters
+from mutwo import music_events
+from mutwo import music_parameters
+
+
+class MidiFileToNoteStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.converter = midi_converters.MidiFileToNoteStore()
+        self.midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.MetaMessage("set_tempo", tempo=500000),
+                        mido.Message("note_on", note=60, velocity=100),
+                        mido.Message("note_on", note=64, velocity=90, time=0),
+                        mido.Message("note_off", note=60, time=480),
+                        mido.Message("note_off", note=64, time=0),
+                        mido.MetaMessage("set_tempo", tempo=250000, time=480),
+                    ]
+                ),
+                mido.MidiTrack(
+                    [
+                        mido.Message("pitchwheel", channel=1, pitch=-4096, time=239),
+                        mido.Message("note_on", channel=1, note=67, time=1),
+                        mido.Message("pitchwheel", channel=1, pitch=100, time=10),
+                        mido.Message("note_off", channel=1, note=67, time=230),
+                        # Pitch bends of other tracks are applied
+                        mido.Message("note_on", note=72, velocity=1, time=240),
+                        mido.Message("note_on", note=72, velocity=0, time=480),
+                    ]
+                ),
+            ],
+            ticks_per_beat=480,
+        )
+
+    def test_convert(self):
+        note_store = self.converter.convert(self.midi_file, metadata={"name": "a"})
+        self.assertEqual(note_store.ticks_per_beat, 480)
+        self.assertEqual(note_store.midi_file_type, 1)
+        self.assertEqual(note_store.track_count, 2)
+        self.assertEqual(note_store.metadata, {"name": "a"})
+        self.assertEqual(note_store.note_count, 4)
+        self.assertEqual(
+            [
+                getattr(note_store, field_name).tolist()
+                for field_name, _, _ in midi_converters.NoteStore._COLUMN_TUPLE
+            ],
+            [
+                [0, 0, 240, 720],
+                [480, 480, 240, 480],
+                [60, 64, 67, 72],
+                [0, 0, -4096, 0],
+                [100, 90, 64, 1],
+                [0, 0, 1, 0],
+                [0, 0, 1, 1],
+                [0, 960],
+                [500000, 250000],
+            ],
+        )
+
+    def test_convert_midi_file_data(self):
+        """Paths, bytes and mido midi files give the same note store"""
+        midi_file_bytes = midi_converters.MidiFileToBytes().convert(self.midi_file)
+        note_store = self.converter.convert(midi_file_bytes)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.mid")
+            with open(path, "wb") as f:
+                f.write(midi_file_bytes)
+            self.assertEqual(self.converter.convert(path), note_store)
+        self.assertEqual(self.converter.convert(self.midi_file), note_store)
+
+    def test_convert_empty_midi_file(self):
+        note_store = self.converter.convert(mido.MidiFile(tracks=[]))
+        self.assertEqual(note_store.note_count, 0)
+        self.assertEqual(note_store.track_count, 0)
+
+
+@unittest.skipIf(numpy is None, "numpy isn't installed")
+class NoteStoreFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.mutwo-note-store")
+        midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.Message("pitchwheel", pitch=8191),
+                        mido.Message("note_on", note=127, velocity=127, time=1),
+                        mido.Message("note_off", note=127, time=2**20),
+                    ]
+                )
+            ],
+        )
+        self.note_store = midi_converters.MidiFileToNoteStore().convert(
+            midi_file, self.path, {"composer": "Hildegard"}
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read(self):
+        note_store = midi_converters.NoteStore.read(self.path)
+        self.assertIsInstance(note_store.onset_tick_array, numpy.memmap)
+        self.assertFalse(note_store.onset_tick_array.flags.writeable)
+        self.assertEqual(note_store.metadata, {"composer": "Hildegard"})
+        self.assertEqual(note_store.duration_array.dtype, numpy.dtype("<i8"))
+        for field_name in note_store._fields:
+            self.assertEqual(
+                (
+                    numpy.asarray(getattr(note_store, field_name)).tolist()
+                    if field_name.endswith("_array")
+                    else getattr(note_store, field_name)
+                ),
+                (
+                    getattr(self.note_store, field_name)
+                    if not field_name.endswith("_array")
+                    else getattr(self.note_store, field_name).tolist()
+                ),
+            )
+
+    def test_read_with_numpy_memmap(self):
+        """Each column can be read without mutwo"""
+        with open(self.path, "rb") as f:
+            f.seek(12)
+            (header_size,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_size))
+        dtype, offset, length = header["column"]["bend"]
+        self.assertEqual(offset % 64, 0)
+        self.assertEqual(
+            numpy.memmap(
+                self.path, dtype, mode="r", offset=offset, shape=(length,)
+            ).tolist(),
+            [8191],
+        )
+
+    def test_write_read_note_store(self):
+        note_store = midi_converters.NoteStore.read(self.path)
+        path = os.path.join(self.directory.name, "copy")
+        note_store.write(path)
+        with open(self.path, "rb") as f0, open(path, "rb") as f1:
+            self.assertEqual(f0.read(), f1.read())
+
+    def test_read_invalid_file(self):
+        path = os.path.join(self.directory.name, "invalid")
+        for content in (b"", b"MThd", b"MUTWONS\0" + struct.pack("<II", 1, 2) + b"{}"):
+            with open(path, "wb") as f:
+                f.write(content)
+            self.assertRaises(ValueError, midi_converters.NoteStore.read, path)
+
+
+class NoteStoreToEventTest(unittest.TestCase):
+    def test_convert(self):
+        """A note store gives the same event as its midi file"""
+        event = core_events.Consecution(
+            [
+                music_events.NoteLike(pitch_list, duration)
+                for pitch_list, duration in (
+                    ("c", 1),
+                    ("5/4", 0.5),
+                    ([], 1),
+                    ("d 3/2", 0.25),
+                    ("e", 2),
+                )
+            ]
+        )
+        event[-1].pitch_list[0] += music_parameters.DirectPitchInterval(30)
+        midi_file_bytes = midi_converters.MidiFileToBytes().convert(
+            midi_converters.EventToMidiFile().convert(event)
+        )
+        note_store = midi_converters.MidiFileToNoteStore().convert(midi_file_bytes)
+        self.assertTrue(any(note_store.bend_array))
+        self.assertEqual(
+            midi_converters.NoteStoreToEvent().convert(note_store),
+            midi_converters.MidiFileToEvent(
+                message_type_tuple=("note_on", "note_off", "pitchwheel")
+            ).convert(midi_file_bytes),
+        )
+
+    @unittest.skipIf(numpy is None, "numpy isn't installed")
+    def test_convert_memory_mapped_note_store(self):
+        midi_file = mido.MidiFile(
+            tracks=[
+                mido.MidiTrack(
+                    [
+                        mido.Message("note_on", note=note, time=0)
+                        for note in (60, 64, 67)
+                    ]
+                    + [
+                        mido.Message("note_off", note=note, time=480 if i == 0 else 0)
+                        for i, note in enumerate((60, 64, 67))
+                    ]
+                )
+            ]
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test")
+            midi_converters.MidiFileToNoteStore().convert(midi_file, path)
+            event = midi_converters.NoteStoreToEvent().convert(
+                midi_converters.NoteStore.read(path)
+            )
+        self.assertEqual(event, midi_converters.MidiFileToEvent().convert(midi_file))
+        self.assertEqual(len(event[0][0].pitch_list), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()